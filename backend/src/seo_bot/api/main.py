@@ -7,10 +7,11 @@ from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 
 from ..config import settings
 from ..health import health_checker
+from ..instrumentation import PrometheusMiddleware, render_metrics
 from ..middleware.api_gateway import APIGatewayMiddleware, CORSMiddleware as CustomCORSMiddleware
 from ..middleware.rate_limiting import RateLimitMiddleware, rate_limiter
 from ..middleware.auth import AuthMiddleware
@@ -145,6 +146,9 @@ def configure_middleware(app: FastAPI):
     
     # Gzip compression
     app.add_middleware(GZipMiddleware, minimum_size=1000)
+    
+    # Request metrics (outermost, so timings include all other middleware)
+    app.add_middleware(PrometheusMiddleware)
 
 
 def include_routers(app: FastAPI):
@@ -156,6 +160,12 @@ def include_routers(app: FastAPI):
         tags=["Health"]
     )
     
+    # Prometheus scrape endpoint
+    @app.get("/metrics", include_in_schema=False)
+    async def metrics():
+        body, content_type = render_metrics()
+        return Response(content=body, media_type=content_type)
+    
     # API v1 routes
     from .v1 import router as v1_router
     app.include_router(
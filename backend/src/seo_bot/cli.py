@@ -25,6 +25,7 @@ from .linking.entities import create_entity_manager
 from .tech.budgets import PerformanceBudgetManager
 from .tech.accessibility import AccessibilityChecker
 from .tech.audit import TechnicalSEOAuditor
+from .tech.audit_cache import AuditResultStore
 from .content.stc_check import SearchTaskCompletionChecker
 from .adapters.cms.base import ContentItem, ContentType, PublishStatus
 from .adapters.cms.markdown import MarkdownAdapter
@@ -42,6 +43,7 @@ from .monitor.dashboard import launch_dashboard
 from .monitor.alerts import run_alert_monitoring
 from .ctr.statistical_tests import run_ctr_analysis, TestMethod
 from .governance.quality import run_quality_audit
+from .governance.batch import AuditDocument, run_batch_quality_audit
 from .prune.optimization import run_content_analysis
 
 # Import research system
@@ -169,6 +171,7 @@ def cluster(
     method: str = typer.Option("hdbscan", help="Clustering method: hdbscan, kmeans, agglomerative"),
     min_cluster_size: int = typer.Option(3, help="Minimum cluster size"),
     max_clusters: int = typer.Option(50, help="Maximum number of clusters"),
+    project: Optional[str] = typer.Option(None, help="Project directory path, to report internal link equity"),
 ):
     """Cluster keywords by semantic similarity."""
     if len(keywords) < 2:
@@ -177,7 +180,8 @@ def cluster(
     
     manager = KeywordClusterManager(
         min_cluster_size=min_cluster_size,
-        max_clusters=max_clusters
+        max_clusters=max_clusters,
+        project_id=Path(project).name if project else None
     )
     
     try:
@@ -558,7 +562,10 @@ def enhanced_cluster(
         print(f"Min cluster size: {min_cluster_size}")
         
         # Perform enhanced clustering
-        cluster_manager = KeywordClusterManager(min_cluster_size=min_cluster_size)
+        cluster_manager = KeywordClusterManager(
+            min_cluster_size=min_cluster_size,
+            project_id=project_path.name
+        )
         results = cluster_manager.cluster_keywords(keywords, method=method)
         
         # Display results
@@ -613,6 +620,7 @@ def tech_audit(
     project: Optional[str] = typer.Option(None, help="Project directory path"),
     output: Optional[str] = typer.Option(None, help="Output file for audit results"),
     format: str = typer.Option("json", help="Output format: json"),
+    cache_dir: Optional[str] = typer.Option(None, help="Reuse results for unchanged pages from this directory"),
 ):
     """Run comprehensive technical SEO audit."""
     import asyncio
@@ -621,11 +629,13 @@ def tech_audit(
         try:
             print(f"[bold green]Running technical SEO audit for: {url}[/bold green]")
             
-            async with TechnicalSEOAuditor(settings) as auditor:
+            result_store = AuditResultStore(cache_dir) if cache_dir else None
+            async with TechnicalSEOAuditor(settings, result_store=result_store) as auditor:
                 result = await auditor.audit_page_technical_seo(url)
                 
                 # Display summary
                 print(f"\n[bold]Technical SEO Audit Results[/bold]")
+                print(f"Result: {result.cache_status}")
                 print(f"SEO Health Score: [bold]{result.seo_health_score}[/bold]/100")
                 print(f"Total Issues: {result.total_issues}")
                 print(f"Critical: [red]{result.critical_issues}[/red], High: [yellow]{result.high_issues}[/yellow], Medium: {result.medium_issues}, Low: {result.low_issues}")
@@ -671,10 +681,13 @@ def performance_budget(
     output: Optional[str] = typer.Option(None, help="Output file for results"),
     auto_optimize: bool = typer.Option(False, help="Apply automatic optimizations"),
     dry_run: bool = typer.Option(False, help="Simulate optimizations without applying them"),
+    history_db: Optional[str] = typer.Option(None, help="SQLite file for storing and reusing PageSpeed results"),
+    max_age_hours: int = typer.Option(24, help="Reuse stored PageSpeed results younger than this"),
 ):
     """Check and enforce performance budgets."""
     import asyncio
     from .config import PerformanceBudgetsConfig
+    from .tech.performance_history import PerformanceHistoryStore
     
     async def run_performance_check():
         try:
@@ -689,7 +702,12 @@ def performance_budget(
             
             budgets_config = project_config.performance_budgets if project_config else PerformanceBudgetsConfig()
             
-            async with PerformanceBudgetManager(settings) as manager:
+            history_store = (
+                PerformanceHistoryStore(history_db, freshness_ttl=timedelta(hours=max_age_hours))
+                if history_db else None
+            )
+            
+            async with PerformanceBudgetManager(settings, history_store=history_store) as manager:
                 # Test performance
                 result = await manager.test_page_performance(url, device_type="mobile")
                 
@@ -701,6 +719,8 @@ def performance_budget(
                 
                 # Display results
                 print(f"\n[bold]Performance Test Results[/bold]")
+                if result.from_history:
+                    print(f"[dim]Stored result from {result.timestamp.isoformat()}[/dim]")
                 print(f"Template Type: {template_type}")
                 print(f"Performance Score: [bold]{result.performance_score}[/bold]/100")
                 print(f"Core Web Vitals: {'✓ PASS' if result.passes_cwv_thresholds else '✗ FAIL'}")
@@ -734,6 +754,17 @@ def performance_budget(
                     if dry_run:
                         print("[yellow]Note: This was a dry run - no changes were applied[/yellow]")
                 
+                # Regressions against earlier runs
+                if history_store:
+                    regressions = history_store.detect_regressions(url, "mobile")
+                    if regressions:
+                        print(f"\n[bold yellow]Regressions vs. previous runs ({len(regressions)})[/bold yellow]")
+                        for regression in regressions:
+                            print(
+                                f"  • {regression['metric']}: {regression['current_value']} "
+                                f"(baseline {regression['baseline_value']}, {regression['relative_change']:+.1%})"
+                            )
+                
                 # Export if requested
                 if output:
                     export_data = {
@@ -765,6 +796,7 @@ def accessibility_check(
     wcag_level: str = typer.Option("AA", help="WCAG compliance level: A, AA, AAA"),
     output: Optional[str] = typer.Option(None, help="Output file for results"),
     include_lighthouse: bool = typer.Option(True, help="Include Lighthouse accessibility score"),
+    cache_dir: Optional[str] = typer.Option(None, help="Reuse results for unchanged pages from this directory"),
 ):
     """Run WCAG accessibility compliance check."""
     import asyncio
@@ -781,11 +813,13 @@ def accessibility_check(
                 print(f"[red]Invalid WCAG level: {wcag_level}. Use A, AA, or AAA[/red]")
                 raise typer.Exit(1)
             
-            async with AccessibilityChecker(settings, target_level) as checker:
+            result_store = AuditResultStore(cache_dir) if cache_dir else None
+            async with AccessibilityChecker(settings, target_level, result_store=result_store) as checker:
                 result = await checker.audit_page_accessibility(url, include_lighthouse)
                 
                 # Display summary
                 print(f"\n[bold]Accessibility Audit Results[/bold]")
+                print(f"Result: {result.cache_status}")
                 print(f"WCAG {wcag_level} Compliant: {'✓ YES' if result.wcag_aa_compliant else '✗ NO'}")
                 print(f"Compliance Score: [bold]{result.compliance_percentage}%[/bold]")
                 
@@ -836,6 +870,7 @@ def task_completion_audit(
     url: str = typer.Option(..., help="URL to audit"),
     is_money_page: bool = typer.Option(False, help="Mark as money page (requires 2+ task completers)"),
     output: Optional[str] = typer.Option(None, help="Output file for results"),
+    cache_dir: Optional[str] = typer.Option(None, help="Reuse results for unchanged pages from this directory"),
 ):
     """Audit task completion elements on a page."""
     import asyncio
@@ -844,11 +879,13 @@ def task_completion_audit(
         try:
             print(f"[bold green]Auditing task completion for: {url}[/bold green]")
             
-            async with SearchTaskCompletionChecker() as checker:
+            result_store = AuditResultStore(cache_dir) if cache_dir else None
+            async with SearchTaskCompletionChecker(result_store=result_store) as checker:
                 result = await checker.audit_page_task_completion(url, is_money_page)
                 
                 # Display summary
                 print(f"\n[bold]Task Completion Audit Results[/bold]")
+                print(f"Result: {result.cache_status}")
                 print(f"Total Task Completers: [bold]{result.total_task_completers}[/bold]")
                 print(f"Valid Task Completers: {result.valid_task_completers}")
                 print(f"Meets Requirements: {'✓' if result.meets_minimum_requirement else '✗'}")
@@ -1316,16 +1353,108 @@ def run_ctr_tests(
     asyncio.run(run_testing())
 
 
+AUDIT_CONTENT_SUFFIXES = {".md", ".markdown", ".html", ".htm", ".txt"}
+
+
+def _iter_audit_documents(content_dir: Path):
+    """Lazily read every content file under a directory as an audit document."""
+    for path in sorted(content_dir.rglob("*")):
+        if path.is_file() and path.suffix.lower() in AUDIT_CONTENT_SUFFIXES:
+            content_id = path.relative_to(content_dir).with_suffix("").as_posix()
+            yield AuditDocument(content_id=content_id, content=path.read_text(encoding='utf-8', errors='replace'))
+
+
+def _load_scored_hashes(report_path: Path) -> set:
+    """Content hashes already present in a JSONL audit report."""
+    hashes = set()
+    if not report_path.exists():
+        return hashes
+    with open(report_path, encoding='utf-8') as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if record.get("content_hash") and not record.get("error"):
+                hashes.add(record["content_hash"])
+    return hashes
+
+
 @app.command()
 def quality_audit(
     project: str = typer.Option(..., help="Project directory path"),
-    content_id: str = typer.Option(..., help="Content ID to audit"),
-    content_file: str = typer.Option(..., help="Content file to analyze"),
-    output: Optional[str] = typer.Option(None, help="Output file for audit report"),
+    content_id: Optional[str] = typer.Option(None, help="Content ID to audit"),
+    content_file: Optional[str] = typer.Option(None, help="Content file to analyze"),
+    content_dir: Optional[str] = typer.Option(None, help="Directory of content files to audit in batch"),
+    output: Optional[str] = typer.Option(None, help="Output file for audit report (JSONL in batch mode)"),
+    workers: Optional[int] = typer.Option(None, help="Worker processes for batch mode (defaults to CPU count)"),
+    chunk_size: int = typer.Option(16, help="Documents per worker task in batch mode"),
 ):
-    """Run content quality audit and governance check."""
+    """Run content quality audit and governance check.
+    
+    Audits a single file (--content-id/--content-file) or, with --content-dir,
+    every content file in a directory on a process pool. Batch results are
+    appended to a JSONL report as they complete, and content whose hash is
+    already in the report is skipped.
+    """
     import asyncio
     
+    async def run_batch_audit(project_path: Path, project_config):
+        source_dir = Path(content_dir)
+        if not source_dir.is_dir():
+            print(f"[red]Content directory not found: {content_dir}[/red]")
+            raise typer.Exit(1)
+        
+        report_path = Path(output) if output else project_path / "quality_audit.jsonl"
+        report_path.parent.mkdir(parents=True, exist_ok=True)
+        scored_hashes = _load_scored_hashes(report_path)
+        
+        print(f"[bold green]Running batch quality audit for {source_dir}[/bold green]")
+        if scored_hashes:
+            print(f"Skipping content already in {report_path} ({len(scored_hashes)} hashes)")
+        
+        level_counts = {}
+        scored = skipped = failed = 0
+        with open(report_path, 'a', encoding='utf-8') as report:
+            async for result in run_batch_quality_audit(
+                project_id=project_path.name,
+                documents=_iter_audit_documents(source_dir),
+                settings=settings,
+                governance_config=project_config.governance,
+                workers=workers,
+                chunk_size=chunk_size,
+                scored_hashes=scored_hashes
+            ):
+                if result.skipped:
+                    skipped += 1
+                    continue
+                
+                record = {
+                    "content_id": result.document.content_id,
+                    "content_hash": result.content_hash,
+                    "audit_date": datetime.now().isoformat(),
+                }
+                if result.error is not None:
+                    failed += 1
+                    record["error"] = result.error
+                else:
+                    scored += 1
+                    level = result.quality_score.quality_level.value
+                    level_counts[level] = level_counts.get(level, 0) + 1
+                    record["quality_score"] = result.quality_score.__dict__
+                report.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+                report.flush()
+        
+        table = Table(title="Batch Quality Audit")
+        table.add_column("Quality Level", style="cyan")
+        table.add_column("Documents", justify="right")
+        for level, count in sorted(level_counts.items()):
+            table.add_row(level.upper(), str(count))
+        console.print(table)
+        
+        print(f"Scored: {scored}  Skipped: {skipped}  Failed: {failed}")
+        print(f"\n[green]✓ Audit report written to {report_path}[/green]")
+    
     async def run_audit():
         try:
             project_path = Path(project)
@@ -1337,6 +1466,14 @@ def quality_audit(
             
             project_config = load_project_config(project_path)
             
+            if content_dir:
+                await run_batch_audit(project_path, project_config)
+                return
+            
+            if not content_id or not content_file:
+                print("[red]Provide --content-id and --content-file, or --content-dir[/red]")
+                raise typer.Exit(1)
+            
             # Load content file
             content_path = Path(content_file)
             if not content_path.exists():
@@ -1420,6 +1557,7 @@ def dashboard(
     domain: str = typer.Option(..., help="Domain to monitor"),
     port: int = typer.Option(8000, help="Dashboard port"),
     host: str = typer.Option("127.0.0.1", help="Dashboard host"),
+    history_db: Optional[str] = typer.Option(None, help="Metric history database (defaults to <project>/dashboard_metrics.db)"),
 ):
     """Launch real-time monitoring dashboard."""
     import asyncio
@@ -1445,7 +1583,8 @@ def dashboard(
                 settings=settings,
                 monitoring_config=project_config.monitoring,
                 port=port,
-                host=host
+                host=host,
+                history_db=Path(history_db) if history_db else project_path / "dashboard_metrics.db"
             )
             
             print(f"[green]✓ Dashboard server started successfully[/green]")
@@ -1535,7 +1674,8 @@ def alert_config(
 def prune_content(
     project: str = typer.Option(..., help="Project directory path"),
     domain: str = typer.Option(..., help="Domain to analyze"),
-    output: Optional[str] = typer.Option(None, help="Output file for pruning report"),
+    output: Optional[str] = typer.Option(None, help="Output file for pruning report (.jsonl/.parquet stream every record)"),
+    sitemap_url: Optional[str] = typer.Option(None, help="Sitemap to read URLs from (default: /sitemap.xml)"),
     implement: bool = typer.Option(False, help="Implement recommendations (dry run by default)"),
     high_priority_only: bool = typer.Option(False, help="Only show high priority recommendations"),
 ):
@@ -1553,19 +1693,25 @@ def prune_content(
             
             print(f"[bold green]Analyzing content for pruning opportunities: {domain}[/bold green]")
             
+            # Large sites stream records straight to a JSONL/Parquet file
+            stream_output = output and Path(output).suffix.lower() in ('.jsonl', '.parquet')
+            
             # Run content analysis
             analysis_result = await run_content_analysis(
                 domain=domain,
-                settings=settings
+                settings=settings,
+                output_path=Path(output) if stream_output else None,
+                sitemap_url=sitemap_url
             )
             
+            impact = analysis_result['impact_summary']
+            
             # Display summary
             print(f"\n[bold]Content Analysis Summary[/bold]")
             print(f"Total URLs Analyzed: {analysis_result['total_urls_analyzed']}")
-            print(f"Recommendations Generated: {len(analysis_result['recommendations'])}")
+            print(f"Recommendations Generated: {impact['total_recommendations']}")
             
             # Show impact summary
-            impact = analysis_result['impact_summary']
             print(f"\n[bold]Expected Impact[/bold]")
             print(f"Current Total Traffic: {impact['traffic_analysis']['current_total_traffic']:,} clicks")
             print(f"Traffic to Remove: {impact['traffic_analysis']['traffic_to_remove']:,} clicks")
@@ -1622,7 +1768,9 @@ def prune_content(
                     print()
             
             # Export report if requested
-            if output:
+            if stream_output:
+                print(f"[green]✓ Pruning records written to {output}[/green]")
+            elif output:
                 from .prune.optimization import ContentPruningManager
                 manager = ContentPruningManager(settings)
                 success = await manager.export_analysis_report(analysis_result, Path(output))
@@ -147,6 +147,7 @@ class GovernanceConfig(BaseModel):
     
     max_programmatic_per_week: int = Field(default=500, ge=1)
     similarity_threshold: float = Field(default=0.85, ge=0.0, le=1.0)
+    similarity_index_path: Optional[Path] = None
     human_review_required: List[str] = ["ymyl", "legal", "medical"]
     quality_score_minimum: float = Field(default=7.0, ge=0.0, le=10.0)
     content_velocity_limit: int = Field(default=100, ge=1)  # pages per day
@@ -243,6 +244,9 @@ class Settings(BaseSettings):
     log_level: str = "INFO"
     log_format: str = "json"
     
+    # Nightly link equity snapshots (warm start for PageRank)
+    link_equity_dir: str = "./data/link_equity"
+    
     class Config:
         env_file = ".env"
         env_file_encoding = "utf-8"
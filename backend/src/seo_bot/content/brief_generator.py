@@ -11,9 +11,10 @@ from sqlalchemy.orm import Session
 from ..config import ContentQualityConfig, settings
 from ..db import get_db_session
 from ..logging import get_logger, LoggerMixin
-from ..models import ContentBrief, Keyword, Cluster, Project, Author
+from ..models import ContentBrief, Keyword, Cluster, Project, Author, Page
 from ..keywords.serp_gap import SERPGapAnalyzer, SERPAnalysis
 from ..linking.entities import EntityLinkingManager
+from ..linking.pagerank import LinkEquityEngine, current_link_equity
 
 
 @dataclass
@@ -435,10 +436,22 @@ class TaskCompleterGenerator:
 class InternalLinkingStrategy:
     """Develops internal linking strategy for content briefs."""
     
-    def __init__(self, entity_manager: Optional[EntityLinkingManager] = None):
-        """Initialize internal linking strategy."""
+    def __init__(
+        self,
+        entity_manager: Optional[EntityLinkingManager] = None,
+        link_equity: Optional[LinkEquityEngine] = None
+    ):
+        """
+        Initialize internal linking strategy.
+        
+        Args:
+            entity_manager: Entity linking manager for entity-based links
+            link_equity: PageRank engine over the project's internal links; when
+                given, link targets with the least equity are suggested first
+        """
         self.logger = get_logger(self.__class__.__name__)
         self.entity_manager = entity_manager
+        self.link_equity = link_equity
     
     def develop_linking_strategy(
         self,
@@ -518,11 +531,26 @@ class InternalLinkingStrategy:
                     'slug': page.slug,
                     'url': page.url,
                     'target_keywords': page.target_keywords or [],
-                    'content_type': page.content_type
+                    'content_type': page.content_type,
+                    'link_equity': self._page_equity(page.url)
                 })
         
         return related_pages
     
+    def _page_equity(self, url: Optional[str]) -> Optional[float]:
+        """Link equity of a page relative to the site average (1.0), if known."""
+        if self.link_equity is None or not url:
+            return None
+        score = self.link_equity.score(url)
+        return None if score is None else score * len(self.link_equity.graph)
+    
+    def _by_link_need(self, pages: List[Dict]) -> List[Dict]:
+        """Pages ordered by link equity, least first; unchanged without an engine."""
+        if self.link_equity is None:
+            return pages
+        # Pages without any internal links yet need equity most
+        return sorted(pages, key=lambda p: -1.0 if p.get('link_equity') is None else p['link_equity'])
+    
     def _identify_hub_opportunities(self, primary_keyword: str, related_pages: List[Dict]) -> List[Dict]:
         """Identify opportunities for hub page creation."""
         opportunities = []
@@ -549,11 +577,11 @@ class InternalLinkingStrategy:
         
         for keyword in secondary_keywords:
             # Find pages that could be targeted for this keyword
-            relevant_pages = [
+            relevant_pages = self._by_link_need([
                 p for p in related_pages
                 if keyword.lower() in ' '.join(p['target_keywords']).lower()
                 or keyword.lower() in p['title'].lower()
-            ]
+            ])
             
             if relevant_pages:
                 targets.append({
@@ -591,7 +619,7 @@ class InternalLinkingStrategy:
             section_suggestions = []
             
             # Find related pages that could be linked from this section
-            for page in related_pages:
+            for page in self._by_link_need(related_pages):
                 page_keywords = [kw.lower() for kw in page.get('target_keywords', [])]
                 
                 # Simple relevance matching
@@ -652,13 +680,18 @@ class InternalLinkingStrategy:
 class ContentBriefGenerator(LoggerMixin):
     """Main content brief generation system."""
     
-    def __init__(self, project_id: str, quality_config: Optional[ContentQualityConfig] = None):
+    def __init__(
+        self,
+        project_id: str,
+        quality_config: Optional[ContentQualityConfig] = None,
+        link_equity: Optional[LinkEquityEngine] = None
+    ):
         """Initialize content brief generator."""
         self.project_id = project_id
         self.quality_config = quality_config or ContentQualityConfig()
         self.serp_processor = SERPAnalysisProcessor()
         self.task_generator = TaskCompleterGenerator()
-        self.linking_strategy = InternalLinkingStrategy()
+        self.linking_strategy = InternalLinkingStrategy(link_equity=link_equity)
         
         # Initialize SERP gap analyzer
         self.serp_analyzer = SERPGapAnalyzer()
@@ -1050,5 +1083,8 @@ def create_brief_generator(project_id: str) -> ContentBriefGenerator:
         quality_config = ContentQualityConfig()
         if project.config and 'content_quality' in project.config:
             quality_config = ContentQualityConfig(**project.config['content_quality'])
-        
-        return ContentBriefGenerator(project_id, quality_config)
\ No newline at end of file
+        domain = project.domain
+    
+    # Link targets are ordered by equity when the project has a link graph
+    link_equity = current_link_equity(domain)
+    return ContentBriefGenerator(project_id, quality_config, link_equity)
\ No newline at end of file
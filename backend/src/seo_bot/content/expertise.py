@@ -8,11 +8,12 @@ from pathlib import Path
 from typing import Dict, List, Optional, Set, Tuple, Union
 from urllib.parse import urlparse
 
-import httpx
 from sqlalchemy.orm import Session
 
 from ..config import TrustSignalsConfig, settings
 from ..db import get_db_session
+from ..governance.textprofile import get_text_profile
+from ..instrumentation import traced_httpx_client
 from ..logging import get_logger, LoggerMixin
 from ..models import Author, ContentBrief, Page, Project
 
@@ -104,7 +105,8 @@ class AuthorValidator:
         has_credentials = bool(author.credentials and len(author.credentials) > 0)
         has_social_profiles = any([author.linkedin_url, author.twitter_url, author.website_url])
         
-        bio_word_count = len(author.bio.split()) if author.bio else 0
+        # Bios may carry markup; the shared profile counts words of the text only
+        bio_word_count = get_text_profile(author.bio).word_count if author.bio else 0
         credentials_count = len(author.credentials) if author.credentials else 0
         
         # Calculate expertise match score
@@ -229,7 +231,7 @@ class CitationValidator:
     def __init__(self):
         """Initialize citation validator."""
         self.logger = get_logger(self.__class__.__name__)
-        self.session = httpx.Client(timeout=10)
+        self.session = traced_httpx_client('citations', asynchronous=False, timeout=10)
     
     def validate_citation(self, citation_url: str, citation_text: str, content_topic: str) -> CitationValidation:
         """
@@ -462,13 +464,20 @@ class TrustSignalAnalyzer(LoggerMixin):
         self.citation_validator = CitationValidator()
         self.review_manager = ExpertReviewManager()
     
-    def assess_trust_signals(self, page: Page, author: Optional[Author] = None) -> TrustSignalAssessment:
+    def assess_trust_signals(
+        self,
+        page: Page,
+        author: Optional[Author] = None,
+        content: Optional[str] = None
+    ) -> TrustSignalAssessment:
         """
         Perform comprehensive trust signal assessment for a page.
         
         Args:
             page: Page to assess
             author: Author of the page (optional)
+            content: Page body (optional); its shared text profile supplies
+                the word count instead of the stored ``page.word_count``
             
         Returns:
             Complete trust signal assessment
@@ -486,7 +495,7 @@ class TrustSignalAnalyzer(LoggerMixin):
         
         # Validate citations
         citations = self._extract_and_validate_citations(page)
-        citation_density = self._calculate_citation_density(citations, page.word_count)
+        citation_density = self._calculate_citation_density(citations, page, content)
         primary_source_ratio = self._calculate_primary_source_ratio(citations)
         
         # Check schema markup
@@ -578,8 +587,14 @@ class TrustSignalAnalyzer(LoggerMixin):
         
         return citations
     
-    def _calculate_citation_density(self, citations: List[CitationValidation], word_count: int) -> float:
-        """Calculate citations per 1000 words."""
+    def _calculate_citation_density(
+        self,
+        citations: List[CitationValidation],
+        page: Page,
+        content: Optional[str] = None
+    ) -> float:
+        """Calculate citations per 1000 words of ``content`` (or the stored word count)."""
+        word_count = get_text_profile(content).word_count if content else (page.word_count or 0)
         if word_count == 0:
             return 0.0
         
@@ -14,7 +14,9 @@ import aiohttp
 from bs4 import BeautifulSoup, Comment
 
 from ..config import ContentQualityConfig
+from ..instrumentation import traced_client_session
 from ..models import Page, Project
+from ..tech.audit_cache import CACHE_STATUS_FRESH, AuditResultStore, compute_content_hash, compute_ruleset_hash
 
 
 logger = logging.getLogger(__name__)
@@ -153,15 +155,27 @@ class TaskCompletionAuditResult:
     
     # Detailed task completer data
     task_completers: List[TaskCompleter]
+    
+    # Incremental audit bookkeeping
+    content_hash: Optional[str] = None
+    cache_status: str = CACHE_STATUS_FRESH  # "fresh" or "reused"
 
 
 class SearchTaskCompletionChecker:
     """Validates and optimizes search task completion elements."""
     
-    def __init__(self, content_config: Optional[ContentQualityConfig] = None):
+    # Bump when detection/validation logic changes so stored results are re-evaluated
+    RULESET_VERSION = "1"
+    
+    def __init__(
+        self,
+        content_config: Optional[ContentQualityConfig] = None,
+        result_store: Optional[AuditResultStore] = None
+    ):
         """Initialize the task completion checker."""
         self.content_config = content_config or ContentQualityConfig()
         self.session: Optional[aiohttp.ClientSession] = None
+        self.result_store = result_store
         
         # Task completer patterns and selectors
         self.task_completer_patterns = {
@@ -230,7 +244,7 @@ class SearchTaskCompletionChecker:
     
     async def __aenter__(self):
         """Async context manager entry."""
-        self.session = aiohttp.ClientSession()
+        self.session = traced_client_session("task_completion")
         return self
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
@@ -253,6 +267,15 @@ class SearchTaskCompletionChecker:
         # Fetch page content
         html_content = await self._fetch_page_content(page_url, user_agent)
         
+        # Reuse previous findings when page and rules are unchanged
+        content_hash = compute_content_hash(html_content)
+        ruleset_hash = self.get_ruleset_hash(is_money_page)
+        if self.result_store:
+            cached = self.result_store.get("task_completion", page_url, content_hash, ruleset_hash)
+            if cached is not None:
+                logger.info(f"Reusing task completion audit for unchanged page: {page_url}")
+                return cached
+        
         # Parse HTML and detect task completers
         soup = BeautifulSoup(html_content, 'html.parser')
         task_completers = await self._detect_task_completers(soup, page_url)
@@ -262,11 +285,26 @@ class SearchTaskCompletionChecker:
             await self._validate_task_completer(completer, soup)
         
         # Calculate metrics and generate audit result
-        return self._generate_audit_result(
+        result = self._generate_audit_result(
             page_url=page_url,
             task_completers=task_completers,
             is_money_page=is_money_page
         )
+        result.content_hash = content_hash
+        
+        if self.result_store:
+            self.result_store.put("task_completion", page_url, content_hash, ruleset_hash, result)
+        
+        return result
+    
+    def get_ruleset_hash(self, is_money_page: bool = False) -> str:
+        """Hash of the patterns and options that determine audit findings."""
+        return compute_ruleset_hash(
+            self.RULESET_VERSION,
+            {task_type.value: patterns for task_type, patterns in self.task_completer_patterns.items()},
+            self.content_config.task_completers_required,
+            {"is_money_page": is_money_page}
+        )
     
     async def _fetch_page_content(self, url: str, user_agent: str = None) -> str:
         """Fetch page content for analysis."""
@@ -944,6 +982,8 @@ class SearchTaskCompletionChecker:
         return {
             "page_url": result.page_url,
             "audit_timestamp": result.audit_timestamp.isoformat(),
+            "cache_status": result.cache_status,
+            "content_hash": result.content_hash,
             "summary": {
                 "total_task_completers": result.total_task_completers,
                 "valid_task_completers": result.valid_task_completers,
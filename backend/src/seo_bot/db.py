@@ -9,6 +9,7 @@ from sqlalchemy.engine import Engine
 from sqlalchemy.orm import Session, sessionmaker
 
 from .config import settings
+from .instrumentation import instrument_engine
 from .models import Base
 
 
@@ -27,6 +28,9 @@ engine = create_engine(
 )
 
 
+instrument_engine(engine)
+
+
 # Enable foreign key constraints for SQLite
 @event.listens_for(Engine, "connect")
 def set_sqlite_pragma(dbapi_connection, connection_record):
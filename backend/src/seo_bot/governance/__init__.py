@@ -14,6 +14,7 @@ from .quality import (
     SpamSignal,
     run_quality_audit
 )
+from .textprofile import TextProfile, get_text_profile
 
 __all__ = [
     'QualityGovernanceManager',
@@ -27,5 +28,7 @@ __all__ = [
     'ReviewPriority',
     'ContentCategory',
     'SpamSignal',
-    'run_quality_audit'
+    'run_quality_audit',
+    'TextProfile',
+    'get_text_profile'
 ]
\ No newline at end of file
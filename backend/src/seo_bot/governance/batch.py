@@ -0,0 +1,227 @@
+"""Parallel batch quality audits.
+
+Quality scoring is pure CPU work, so a full-site audit is sharded across a
+process pool: documents are read lazily, grouped into chunks and submitted
+to a bounded work queue, and results are yielded as soon as a chunk
+finishes so the caller can stream them to a report. Content whose hash has
+already been scored (in an earlier report or earlier in the same run) is
+skipped without being sent to a worker.
+"""
+
+import asyncio
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Iterable, List, Optional, Set, Tuple
+
+from ..config import GovernanceConfig, Settings
+from .quality import ContentCategory, QualityGovernanceManager, QualityScore, QualityScorer
+from .textprofile import content_hash
+
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_CHUNK_SIZE = 16
+
+
+@dataclass
+class AuditDocument:
+    """A document queued for a batch audit."""
+    content_id: str
+    content: str
+    title: str = ""
+    meta_description: str = ""
+    target_keywords: List[str] = field(default_factory=list)
+    citations: List[str] = field(default_factory=list)
+    author_credentials: List[str] = field(default_factory=list)
+    content_category: ContentCategory = ContentCategory.GENERAL
+
+
+@dataclass
+class AuditResult:
+    """Outcome of auditing one document."""
+    document: AuditDocument
+    content_hash: str
+    quality_score: Optional[QualityScore] = None
+    skipped: bool = False
+    error: Optional[str] = None
+
+
+# Scorer built once per worker process by the pool initializer
+_worker_scorer: Optional[QualityScorer] = None
+
+
+def _init_worker(governance_config: GovernanceConfig) -> None:
+    global _worker_scorer
+    _worker_scorer = QualityScorer(governance_config)
+
+
+def _score_chunk(scorer: QualityScorer,
+                 chunk: List[AuditDocument]) -> List[Tuple[Optional[QualityScore], Optional[str]]]:
+    """``(quality_score, error)`` for each document of a chunk, in order."""
+    results = []
+    for document in chunk:
+        try:
+            quality_score = scorer.score_content(
+                content=document.content,
+                title=document.title,
+                meta_description=document.meta_description,
+                target_keywords=document.target_keywords,
+                citations=document.citations,
+                author_credentials=document.author_credentials,
+                content_category=document.content_category
+            )
+            results.append((quality_score, None))
+        except Exception as e:
+            results.append((None, str(e)))
+    return results
+
+
+def _worker_score_chunk(chunk: List[AuditDocument]) -> List[Tuple[Optional[QualityScore], Optional[str]]]:
+    return _score_chunk(_worker_scorer, chunk)
+
+
+class BatchQualityAuditor:
+    """Scores documents on a process pool and streams the results."""
+
+    def __init__(self,
+                 governance_config: GovernanceConfig,
+                 workers: Optional[int] = None,
+                 chunk_size: int = DEFAULT_CHUNK_SIZE,
+                 scored_hashes: Optional[Iterable[str]] = None):
+        """Initialize the auditor.
+
+        Args:
+            governance_config: Governance configuration for the scorers
+            workers: Worker processes; defaults to the CPU count, 1 scores in-process
+            chunk_size: Documents sent to a worker at a time
+            scored_hashes: Content hashes to skip because they were already scored
+        """
+        self.governance_config = governance_config
+        self.workers = max(1, workers or os.cpu_count() or 1)
+        self.chunk_size = max(1, chunk_size)
+        self.scored_hashes: Set[str] = set(scored_hashes or ())
+        # Chunks in flight per worker; bounds memory while keeping workers busy
+        self.max_pending = self.workers * 2
+
+    async def stream(self, documents: Iterable[AuditDocument]) -> AsyncIterator[AuditResult]:
+        """Audit ``documents``, yielding results as chunks complete.
+
+        Skipped documents are yielded immediately; scored documents are
+        yielded in chunk completion order, which may differ from input order.
+        """
+        loop = asyncio.get_running_loop()
+        pool = None
+        scorer = None
+        if self.workers > 1:
+            pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                initializer=_init_worker,
+                initargs=(self.governance_config,)
+            )
+        else:
+            scorer = QualityScorer(self.governance_config)
+
+        pending = {}
+        chunk: List[Tuple[str, AuditDocument]] = []
+
+        def results_for(batch, outcomes) -> List[AuditResult]:
+            results = []
+            for (digest, document), (quality_score, error) in zip(batch, outcomes):
+                if error is not None:
+                    # Allow a retry in a later run
+                    self.scored_hashes.discard(digest)
+                    logger.warning(f"Quality audit failed for {document.content_id}: {error}")
+                results.append(AuditResult(document, digest, quality_score, error=error))
+            return results
+
+        async def submit(batch) -> List[AuditResult]:
+            """Queue a chunk; returns results of chunks that finished while waiting for room."""
+            documents_only = [document for _, document in batch]
+            if pool is None:
+                return results_for(batch, _score_chunk(scorer, documents_only))
+            pending[loop.run_in_executor(pool, _worker_score_chunk, documents_only)] = batch
+            finished = []
+            while len(pending) >= self.max_pending:
+                finished.extend(await collect(asyncio.FIRST_COMPLETED))
+            return finished
+
+        async def collect(return_when) -> List[AuditResult]:
+            done, _ = await asyncio.wait(list(pending), return_when=return_when)
+            finished = []
+            for future in done:
+                finished.extend(results_for(pending.pop(future), future.result()))
+            return finished
+
+        try:
+            for document in documents:
+                digest = content_hash(document.content)
+                if digest in self.scored_hashes:
+                    yield AuditResult(document, digest, skipped=True)
+                    continue
+                self.scored_hashes.add(digest)
+
+                chunk.append((digest, document))
+                if len(chunk) >= self.chunk_size:
+                    for result in await submit(chunk):
+                        yield result
+                    chunk = []
+
+                    # Hand back chunks that already finished without blocking
+                    if pending and any(future.done() for future in pending):
+                        for result in await collect(asyncio.FIRST_COMPLETED):
+                            yield result
+
+            if chunk:
+                for result in await submit(chunk):
+                    yield result
+            while pending:
+                for result in await collect(asyncio.FIRST_COMPLETED):
+                    yield result
+        finally:
+            if pool is not None:
+                pool.shutdown(wait=True, cancel_futures=True)
+
+
+async def run_batch_quality_audit(project_id: str,
+                                  documents: Iterable[AuditDocument],
+                                  settings: Settings,
+                                  governance_config: GovernanceConfig,
+                                  workers: Optional[int] = None,
+                                  chunk_size: int = DEFAULT_CHUNK_SIZE,
+                                  scored_hashes: Optional[Iterable[str]] = None) -> AsyncIterator[AuditResult]:
+    """Run a quality audit over many documents, streaming each result.
+
+    Scoring runs on the process pool; similarity indexing and review
+    queueing run in this process as results arrive.
+    """
+    manager = QualityGovernanceManager(settings, governance_config)
+    auditor = BatchQualityAuditor(governance_config, workers, chunk_size, scored_hashes)
+
+    scored = skipped = failed = 0
+    async for result in auditor.stream(documents):
+        if result.skipped:
+            skipped += 1
+        elif result.error is not None:
+            failed += 1
+        else:
+            scored += 1
+            document = result.document
+            await manager.apply_governance(
+                document.content_id,
+                document.content,
+                result.quality_score,
+                document.title,
+                document.content_category
+            )
+        yield result
+
+    if governance_config.similarity_index_path:
+        manager.similarity_detector.save()
+
+    logger.info(
+        f"Batch quality audit for {project_id} completed: {scored} scored, "
+        f"{skipped} skipped, {failed} failed ({auditor.workers} workers)"
+    )
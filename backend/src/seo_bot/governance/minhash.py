@@ -0,0 +1,256 @@
+"""MinHash signatures and banded LSH index for near-duplicate detection."""
+
+import json
+import re
+import zlib
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple, Union
+
+import numpy as np
+
+
+# Mersenne prime used by the universal hash family
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+# Multiplier of the rolling shingle hash
+_SHINGLE_BASE = np.uint64(1000003)
+
+_TOKEN_PATTERN = re.compile(r'\w+')
+
+
+def _optimal_bands(threshold: float, num_perm: int) -> Tuple[int, int]:
+    """Bands and rows per band minimizing false positives plus false negatives.
+
+    A pair with Jaccard ``s`` becomes a candidate with probability
+    ``1 - (1 - s**r)**b``; the split that best separates pairs either side
+    of ``threshold`` is chosen.
+    """
+    grid = np.linspace(0.0, 1.0, 201)
+    step = grid[1] - grid[0]
+    below = grid < threshold
+    best, best_error = (num_perm, 1), float('inf')
+    for bands in range(1, num_perm + 1):
+        rows = num_perm // bands
+        if rows == 0:
+            break
+        probability = 1 - (1 - grid ** rows) ** bands
+        error = (probability[below].sum() + (1 - probability[~below]).sum()) * step
+        if error < best_error:
+            best, best_error = (bands, rows), error
+    return best
+
+
+def rolling_hashes(token_hashes: np.ndarray, size: int) -> np.ndarray:
+    """64-bit polynomial hash of every run of ``size`` consecutive tokens, in position order."""
+    size = min(size, len(token_hashes))
+    if size == 0:
+        return np.empty(0, dtype=np.uint64)
+    count = len(token_hashes) - size + 1
+    rolling = np.zeros(count, dtype=np.uint64)
+    for offset in range(size):
+        rolling = rolling * _SHINGLE_BASE + token_hashes[offset:offset + count]
+    return rolling
+
+
+def window_hashes(token_hashes: np.ndarray, size: int) -> np.ndarray:
+    """32-bit hash of every run of ``size`` consecutive tokens, in position order."""
+    rolling = rolling_hashes(token_hashes, size)
+    mixed = (rolling ^ (rolling >> np.uint64(32))) & _MAX_HASH
+    return mixed.astype(np.uint32)
+
+
+def token_hashes(tokens: List[str]) -> np.ndarray:
+    """Stable per-token hashes (CRC32) of lowercased tokens."""
+    cache: Dict[str, int] = {}
+    return np.fromiter(
+        (cache.setdefault(token, zlib.crc32(token.encode())) for token in tokens),
+        dtype=np.uint64,
+        count=len(tokens)
+    )
+
+
+def shingle_hashes(text: str, shingle_size: int = 5) -> np.ndarray:
+    """Sorted unique 32-bit hashes of a text's word shingles."""
+    tokens = _TOKEN_PATTERN.findall(text.lower())
+    if not tokens:
+        return np.empty(0, dtype=np.uint32)
+    return np.unique(window_hashes(token_hashes(tokens), shingle_size))
+
+
+def jaccard(a: np.ndarray, b: np.ndarray) -> float:
+    """Exact Jaccard similarity of two sorted unique hash sets."""
+    if len(a) == 0 and len(b) == 0:
+        return 1.0
+    intersection = len(np.intersect1d(a, b, assume_unique=True))
+    return intersection / (len(a) + len(b) - intersection)
+
+
+class MinHashLSHIndex:
+    """Near-duplicate index over word shingles.
+
+    Documents are reduced to ``num_perm`` MinHash values, split into bands;
+    two documents become candidates when any band matches exactly, so a
+    lookup costs one dictionary probe per band instead of a scan over the
+    corpus. Candidates are re-ranked by exact shingle Jaccard similarity.
+    """
+
+    def __init__(self,
+                 threshold: float = 0.85,
+                 num_perm: int = 128,
+                 shingle_size: int = 5,
+                 bands: Optional[int] = None,
+                 seed: int = 1):
+        """Initialize an empty index."""
+        if not 0 < threshold <= 1:
+            raise ValueError("threshold must be between 0 and 1")
+
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        self.seed = seed
+        if bands is None:
+            self.bands, self.rows = _optimal_bands(threshold, num_perm)
+        else:
+            self.bands, self.rows = bands, num_perm // bands
+
+        generator = np.random.RandomState(seed)
+        self._a = generator.randint(1, 1 << 31, size=num_perm).astype(np.uint64)
+        self._b = generator.randint(0, 1 << 31, size=num_perm).astype(np.uint64)
+
+        self.signatures: Dict[str, np.ndarray] = {}
+        self.shingles: Dict[str, np.ndarray] = {}
+        self.buckets: List[Dict[bytes, Set[str]]] = [{} for _ in range(self.bands)]
+
+    def __len__(self) -> int:
+        return len(self.signatures)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.signatures
+
+    def signature(self, hashes: np.ndarray) -> np.ndarray:
+        """MinHash signature of a shingle hash set."""
+        if len(hashes) == 0:
+            return np.full(self.num_perm, _MAX_HASH, dtype=np.uint32)
+        values = hashes.astype(np.uint64)[:, None]
+        permuted = ((values * self._a + self._b) % _MERSENNE_PRIME) & _MAX_HASH
+        return permuted.min(axis=0).astype(np.uint32)
+
+    def _band_keys(self, signature: np.ndarray) -> Iterable[Tuple[int, bytes]]:
+        for band in range(self.bands):
+            yield band, signature[band * self.rows:(band + 1) * self.rows].tobytes()
+
+    def _insert(self, key: str, hashes: np.ndarray, signature: np.ndarray) -> None:
+        self.signatures[key] = signature
+        self.shingles[key] = hashes
+        for band, band_key in self._band_keys(signature):
+            self.buckets[band].setdefault(band_key, set()).add(key)
+
+    def add(self, key: str, text: str) -> None:
+        """Index a document, replacing any earlier version under the same key."""
+        if key in self.signatures:
+            self.remove(key)
+        hashes = shingle_hashes(text, self.shingle_size)
+        self._insert(key, hashes, self.signature(hashes))
+
+    def add_signature(self, key: str, signature: np.ndarray) -> None:
+        """Index a precomputed signature without keeping its shingles.
+
+        The key is returned by :meth:`candidates`, but :meth:`query` cannot
+        re-rank it and never reports it.
+        """
+        if key in self.signatures:
+            self.remove(key)
+        self._insert(key, np.empty(0, dtype=np.uint32), signature)
+
+    def remove(self, key: str) -> bool:
+        """Drop a document from the index."""
+        signature = self.signatures.pop(key, None)
+        if signature is None:
+            return False
+        self.shingles.pop(key, None)
+        for band, band_key in self._band_keys(signature):
+            bucket = self.buckets[band].get(band_key)
+            if bucket is not None:
+                bucket.discard(key)
+                if not bucket:
+                    del self.buckets[band][band_key]
+        return True
+
+    def candidates(self, signature: np.ndarray) -> Set[str]:
+        """Keys sharing at least one band with a signature."""
+        found: Set[str] = set()
+        for band, band_key in self._band_keys(signature):
+            bucket = self.buckets[band].get(band_key)
+            if bucket:
+                found.update(bucket)
+        return found
+
+    def query(self,
+              text: str,
+              threshold: Optional[float] = None,
+              exclude: Optional[str] = None) -> List[Tuple[str, float]]:
+        """Indexed documents with Jaccard similarity at or above the threshold.
+
+        Returns ``(key, similarity)`` pairs, most similar first.
+        """
+        threshold = self.threshold if threshold is None else threshold
+        hashes = shingle_hashes(text, self.shingle_size)
+        matches = []
+        for key in self.candidates(self.signature(hashes)):
+            if key == exclude:
+                continue
+            similarity = jaccard(hashes, self.shingles[key])
+            if similarity >= threshold:
+                matches.append((key, similarity))
+        matches.sort(key=lambda match: (-match[1], match[0]))
+        return matches
+
+    def save(self, path: Union[str, Path]) -> None:
+        """Write signatures and shingle sets to a compressed ``.npz`` file."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        keys = list(self.signatures)
+        lengths = np.array([len(self.shingles[key]) for key in keys], dtype=np.int64)
+        config = {
+            'threshold': self.threshold,
+            'num_perm': self.num_perm,
+            'shingle_size': self.shingle_size,
+            'bands': self.bands,
+            'seed': self.seed,
+            'keys': keys,
+        }
+        with open(path, 'wb') as handle:
+            np.savez_compressed(
+                handle,
+                config=np.frombuffer(json.dumps(config).encode(), dtype=np.uint8),
+                signatures=(np.stack([self.signatures[key] for key in keys])
+                            if keys else np.empty((0, self.num_perm), dtype=np.uint32)),
+                shingles=(np.concatenate([self.shingles[key] for key in keys])
+                          if keys else np.empty(0, dtype=np.uint32)),
+                offsets=np.concatenate([[0], np.cumsum(lengths)]),
+            )
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> "MinHashLSHIndex":
+        """Read an index written by :meth:`save` and rebuild its band buckets."""
+        with np.load(path) as data:
+            config = json.loads(data['config'].tobytes().decode())
+            signatures = data['signatures']
+            shingles = data['shingles']
+            offsets = data['offsets']
+
+        index = cls(
+            threshold=config['threshold'],
+            num_perm=config['num_perm'],
+            shingle_size=config['shingle_size'],
+            bands=config['bands'],
+            seed=config['seed'],
+        )
+        for position, key in enumerate(config['keys']):
+            index._insert(
+                key,
+                shingles[offsets[position]:offsets[position + 1]],
+                signatures[position]
+            )
+        return index
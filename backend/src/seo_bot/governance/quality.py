@@ -7,20 +7,22 @@ content velocity limits, and YMYL content review queue management.
 import asyncio
 import logging
 import hashlib
+import json
 import re
 from datetime import datetime, timedelta, timezone
 from typing import Dict, List, Optional, Set, Tuple, Union
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from enum import Enum
 from pathlib import Path
 
 import numpy as np
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
-import textstat
 
 from ..config import GovernanceConfig, Settings
 from ..models import AlertSeverity
+from .minhash import MinHashLSHIndex
+from .segments import PassageIndex, PassageMatch
+from .textprofile import TextProfile, get_text_profile
+from .textscan import PhraseAutomaton, TextScan, phrase_tokens
 
 
 logger = logging.getLogger(__name__)
@@ -102,6 +104,7 @@ class ContentSimilarity:
     match_type: str  # exact, near_duplicate, similar
     similar_segments: List[str]
     recommendation: str
+    passages: List[PassageMatch] = field(default_factory=list)
 
 
 @dataclass
@@ -139,62 +142,94 @@ class ReviewTask:
 class ContentSimilarityDetector:
     """Detects duplicate and near-duplicate content."""
     
-    def __init__(self, similarity_threshold: float = 0.85):
+    def __init__(self,
+                 similarity_threshold: float = 0.85,
+                 num_perm: int = 128,
+                 shingle_size: int = 5,
+                 index_path: Optional[Union[str, Path]] = None):
         """Initialize similarity detector.
         
         Args:
-            similarity_threshold: Threshold for considering content similar
+            similarity_threshold: Shingle Jaccard similarity for considering content similar
+            num_perm: MinHash signature length
+            shingle_size: Words per shingle
+            index_path: File the index is loaded from and saved to
         """
         self.similarity_threshold = similarity_threshold
-        self.vectorizer = TfidfVectorizer(
-            max_features=10000,
-            stop_words='english',
-            ngram_range=(1, 3),
-            max_df=0.8,
-            min_df=2
-        )
-        self.content_vectors = {}
+        self.index_path = Path(index_path) if index_path else None
         self.content_metadata = {}
+        
+        if self.index_path and self.index_path.exists():
+            self.index = MinHashLSHIndex.load(self.index_path)
+            # Stored signatures only compare under the configuration they were built with
+            requested = {'threshold': similarity_threshold, 'num_perm': num_perm, 'shingle_size': shingle_size}
+            differing = {
+                name: (getattr(self.index, name), value)
+                for name, value in requested.items() if getattr(self.index, name) != value
+            }
+            if differing:
+                logger.warning(
+                    f"Similarity index {self.index_path} was built with a different configuration; "
+                    "using the stored one: " +
+                    ", ".join(f"{name}={stored} (requested {value})" for name, (stored, value) in differing.items())
+                )
+            metadata_path = self.index_path.with_suffix('.json')
+            if metadata_path.exists():
+                self.content_metadata = json.loads(metadata_path.read_text())
+        else:
+            self.index = MinHashLSHIndex(
+                threshold=similarity_threshold,
+                num_perm=num_perm,
+                shingle_size=shingle_size
+            )
+        
+        passages_path = self.index_path.with_suffix('.passages.npz') if self.index_path else None
+        if passages_path and passages_path.exists():
+            self.passages = PassageIndex.load(passages_path)
+        else:
+            self.passages = PassageIndex()
     
     def add_content(self, content_id: str, content: str, url: str = None):
-        """Add content to similarity index."""
+        """Add content to similarity index, replacing any earlier version."""
         try:
-            # Preprocess content
             processed_content = self._preprocess_content(content)
             
-            # Store metadata
             self.content_metadata[content_id] = {
                 'url': url,
                 'content_hash': hashlib.md5(content.encode()).hexdigest(),
                 'word_count': len(content.split()),
-                'added_at': datetime.now(timezone.utc)
+                'added_at': datetime.now(timezone.utc).isoformat()
             }
             
-            # Vectorize and store
-            if processed_content.strip():
-                if not self.content_vectors:
-                    # First content - fit vectorizer
-                    vector = self.vectorizer.fit_transform([processed_content])
-                else:
-                    # Additional content - transform only
-                    try:
-                        vector = self.vectorizer.transform([processed_content])
-                    except ValueError:
-                        # Refit if vocabulary has changed significantly
-                        all_content = [processed_content]
-                        for cid, metadata in self.content_metadata.items():
-                            if cid != content_id and cid in self.content_vectors:
-                                # Would need to store original content for refitting
-                                pass
-                        vector = self.vectorizer.fit_transform(all_content)
-                
-                self.content_vectors[content_id] = vector
+            if processed_content:
+                self.index.add(content_id, processed_content)
+            else:
+                self.index.remove(content_id)
+            
+            # Passages are indexed on the original text so offsets point into it
+            self.passages.add(content_id, content)
             
             logger.debug(f"Added content {content_id} to similarity index")
             
         except Exception as e:
             logger.error(f"Failed to add content to similarity index: {e}")
     
+    def remove_content(self, content_id: str) -> bool:
+        """Remove content from the similarity index."""
+        self.content_metadata.pop(content_id, None)
+        self.passages.remove(content_id)
+        return self.index.remove(content_id)
+    
+    def save(self, path: Optional[Union[str, Path]] = None):
+        """Persist the index and content metadata."""
+        path = Path(path) if path else self.index_path
+        if path is None:
+            raise ValueError("No index path configured")
+        
+        self.index.save(path)
+        self.passages.save(path.with_suffix('.passages.npz'))
+        path.with_suffix('.json').write_text(json.dumps(self.content_metadata))
+    
     def find_similar_content(self, content: str, content_id: str = None) -> List[ContentSimilarity]:
         """Find similar content in the index."""
         similar_content = []
@@ -202,50 +237,64 @@ class ContentSimilarityDetector:
         try:
             processed_content = self._preprocess_content(content)
             
-            if not processed_content.strip() or not self.content_vectors:
+            if not processed_content or not len(self.index):
                 return similar_content
             
-            # Vectorize new content
-            query_vector = self.vectorizer.transform([processed_content])
+            # LSH candidates re-ranked by exact shingle Jaccard similarity
+            matches = self.index.query(
+                processed_content,
+                threshold=self.similarity_threshold,
+                exclude=content_id
+            )
+            
+            passages = self.passages.find(
+                content,
+                exclude=content_id,
+                sources={stored_id for stored_id, _ in matches}
+            ) if matches else {}
             
-            # Calculate similarities
-            for stored_id, stored_vector in self.content_vectors.items():
-                if stored_id == content_id:
-                    continue
+            for stored_id, similarity in matches:
+                metadata = self.content_metadata.get(stored_id, {})
+                shared = passages.get(stored_id, [])
                 
-                similarity = cosine_similarity(query_vector, stored_vector)[0][0]
+                # Determine match type
+                if similarity >= 0.95:
+                    match_type = "exact"
+                    recommendation = "Content appears to be duplicate - consider consolidating"
+                elif similarity >= 0.85:
+                    match_type = "near_duplicate"
+                    recommendation = "Content is very similar - ensure sufficient differentiation"
+                else:
+                    match_type = "similar"
+                    recommendation = "Content has similarities - verify uniqueness"
                 
-                if similarity >= self.similarity_threshold:
-                    metadata = self.content_metadata.get(stored_id, {})
-                    
-                    # Determine match type
-                    if similarity >= 0.95:
-                        match_type = "exact"
-                        recommendation = "Content appears to be duplicate - consider consolidating"
-                    elif similarity >= 0.85:
-                        match_type = "near_duplicate"
-                        recommendation = "Content is very similar - ensure sufficient differentiation"
-                    else:
-                        match_type = "similar"
-                        recommendation = "Content has similarities - verify uniqueness"
-                    
-                    similar_content.append(ContentSimilarity(
-                        similarity_score=similarity,
-                        matching_content_id=stored_id,
-                        matching_url=metadata.get('url'),
-                        match_type=match_type,
-                        similar_segments=self._find_similar_segments(content, stored_id),
-                        recommendation=recommendation
-                    ))
-            
-            # Sort by similarity score
-            similar_content.sort(key=lambda x: x.similarity_score, reverse=True)
+                similar_content.append(ContentSimilarity(
+                    similarity_score=similarity,
+                    matching_content_id=stored_id,
+                    matching_url=metadata.get('url'),
+                    match_type=match_type,
+                    similar_segments=[passage.text for passage in shared[:5]],
+                    recommendation=recommendation,
+                    passages=shared
+                ))
             
         except Exception as e:
             logger.error(f"Failed to find similar content: {e}")
         
         return similar_content
     
+    def find_overlapping_passages(self, content: str, content_id: str = None) -> Dict[str, List[PassageMatch]]:
+        """Passages of content duplicated anywhere in the index, by source content ID.
+        
+        Unlike find_similar_content this also reports documents that share
+        only some passages with the content.
+        """
+        try:
+            return self.passages.find(content, exclude=content_id)
+        except Exception as e:
+            logger.error(f"Failed to find overlapping passages: {e}")
+            return {}
+    
     def _preprocess_content(self, content: str) -> str:
         """Preprocess content for similarity analysis."""
         # Remove HTML tags
@@ -261,203 +310,170 @@ class ContentSimilarityDetector:
         content = content.lower()
         
         return content.strip()
-    
-    def _find_similar_segments(self, content: str, stored_id: str) -> List[str]:
-        """Find specific similar segments between content pieces."""
-        # Simplified implementation - would use more sophisticated text alignment
-        segments = []
-        
-        # Split content into sentences
-        sentences = re.split(r'[.!?]+', content)
-        
-        # Find sentences that appear in both pieces
-        for sentence in sentences:
-            if len(sentence.strip()) > 50:  # Only check substantial sentences
-                # In a real implementation, would check against stored content
-                segments.append(sentence.strip()[:100] + "...")
-        
-        return segments[:5]  # Return top 5 similar segments
 
 
 class SpamDetector:
-    """Detects various spam signals in content."""
+    """Detects various spam signals in content.
+    
+    All signals are derived from the document's shared ``TextProfile``;
+    boilerplate phrases and target keywords are matched against its tokens
+    by one precompiled phrase automaton.
+    """
+    
+    # Compiled automata kept for distinct keyword sets
+    MAX_CACHED_AUTOMATA = 256
     
     def __init__(self, governance_config: GovernanceConfig):
         """Initialize spam detector."""
         self.governance_config = governance_config
         
-        # Keyword stuffing patterns
-        self.keyword_patterns = [
-            r'(\b\w+\b)(?:\s+\1){3,}',  # Repeated words
-            r'(\b\w+\b)(?:\s+\w+){0,2}\s+\1(?:\s+\w+){0,2}\s+\1',  # Close repetitions
+        # Boilerplate phrases
+        self.boilerplate_phrases = [
+            'click here for more information',
+            'this article will teach you',
+            'in this article, we will cover',
+            'if you liked this article',
+            'share this article',
+            'subscribe to our newsletter'
         ]
         
-        # Boilerplate patterns
-        self.boilerplate_patterns = [
-            r'click here for more information',
-            r'this article will teach you',
-            r'in this article, we will cover',
-            r'if you liked this article',
-            r'share this article',
-            r'subscribe to our newsletter'
-        ]
+        self._automata: Dict[Tuple[str, ...], PhraseAutomaton] = {}
+        self.boilerplate_automaton = self._automaton(())
     
-    def detect_spam_signals(self, content: str, target_keywords: List[str] = None) -> List[SpamSignal]:
+    @staticmethod
+    def _keyword_label(keyword: str) -> str:
+        return "keyword:" + ' '.join(phrase_tokens(keyword))
+    
+    def _automaton(self, keywords: Tuple[str, ...]) -> PhraseAutomaton:
+        """Phrase automaton for boilerplate plus a keyword set, compiled once per set."""
+        automaton = self._automata.get(keywords)
+        if automaton is None:
+            phrases = [(f"boilerplate:{i}", phrase) for i, phrase in enumerate(self.boilerplate_phrases)]
+            phrases.extend((self._keyword_label(keyword), keyword) for keyword in keywords)
+            automaton = PhraseAutomaton(phrases)
+            if len(self._automata) >= self.MAX_CACHED_AUTOMATA:
+                self._automata.pop(next(iter(self._automata)))
+            self._automata[keywords] = automaton
+        return automaton
+    
+    def detect_spam_signals(self,
+                            content: str,
+                            target_keywords: List[str] = None,
+                            profile: Optional[TextProfile] = None) -> List[SpamSignal]:
         """Detect spam signals in content."""
+        if profile is None:
+            profile = get_text_profile(content)
+        scan = profile.scan
+        automaton = self._automaton(tuple(sorted(set(target_keywords or []))))
+        matches = profile.phrase_positions(automaton)
+        
         signals = []
         
         # Check keyword stuffing
-        if self._detect_keyword_stuffing(content, target_keywords):
+        if self._detect_keyword_stuffing(scan, matches, automaton.lengths, target_keywords):
             signals.append(SpamSignal.KEYWORD_STUFFING)
         
         # Check readability
-        if self._detect_poor_readability(content):
+        if self._detect_poor_readability(scan):
             signals.append(SpamSignal.LOW_READABILITY)
         
         # Check thin content
-        if self._detect_thin_content(content):
+        if self._detect_thin_content(scan):
             signals.append(SpamSignal.THIN_CONTENT)
         
         # Check excessive linking
-        if self._detect_excessive_linking(content):
+        if self._detect_excessive_linking(scan):
             signals.append(SpamSignal.EXCESSIVE_LINKING)
         
         # Check boilerplate text
-        if self._detect_boilerplate(content):
+        if self._detect_boilerplate(matches):
             signals.append(SpamSignal.BOILERPLATE_TEXT)
         
         # Check auto-generated patterns
-        if self._detect_auto_generated(content):
+        if self._detect_auto_generated(scan):
             signals.append(SpamSignal.AUTO_GENERATED)
         
         return signals
     
-    def _detect_keyword_stuffing(self, content: str, target_keywords: List[str] = None) -> bool:
+    def _detect_keyword_stuffing(self,
+                                 scan: TextScan,
+                                 matches: Dict[str, List[int]],
+                                 lengths: Dict[str, int],
+                                 target_keywords: List[str] = None) -> bool:
         """Detect keyword stuffing."""
-        if not target_keywords:
-            return False
-        
-        word_count = len(content.split())
-        if word_count == 0:
+        if not target_keywords or scan.word_count == 0:
             return False
         
         for keyword in target_keywords:
-            keyword_lower = keyword.lower()
-            content_lower = content.lower()
-            
-            # Count keyword occurrences
-            keyword_count = content_lower.count(keyword_lower)
-            keyword_density = keyword_count / word_count
+            label = self._keyword_label(keyword)
+            positions = matches.get(label, [])
             
             # Check density threshold (typically 2-3% max)
-            if keyword_density > 0.03:
+            if len(positions) / scan.word_count > 0.03:
                 return True
             
-            # Check for unnatural repetition patterns
-            for pattern in self.keyword_patterns:
-                if re.search(pattern.replace(r'\b\w+\b', re.escape(keyword_lower)), content_lower):
+            # Check for unnatural repetition: 4+ back-to-back occurrences, or
+            # 3+ occurrences each separated by at most two words
+            length = lengths.get(label, 0)
+            back_to_back = close = 1
+            for previous, current in zip(positions, positions[1:]):
+                gap = current - previous - length
+                back_to_back = back_to_back + 1 if gap == 0 else 1
+                close = close + 1 if 0 <= gap <= 2 else 1
+                if back_to_back >= 4 or close >= 3:
                     return True
         
         return False
     
-    def _detect_poor_readability(self, content: str) -> bool:
+    def _detect_poor_readability(self, scan: TextScan) -> bool:
         """Detect poor readability."""
-        try:
-            # Remove HTML and clean content
-            clean_content = re.sub(r'<[^>]+>', '', content)
-            
-            if len(clean_content.split()) < 100:
-                return False  # Too short to assess
-            
-            # Flesch Reading Ease score
-            flesch_score = textstat.flesch_reading_ease(clean_content)
-            
-            # Score below 30 is considered very difficult
-            if flesch_score < 30:
-                return True
-            
-            # Grade level too high
-            grade_level = textstat.flesch_kincaid_grade(clean_content)
-            if grade_level > 16:
-                return True
-            
-            return False
-            
-        except Exception:
-            return False
+        if scan.word_count < 100:
+            return False  # Too short to assess
+        
+        # Score below 30 is considered very difficult
+        if scan.flesch_reading_ease() < 30:
+            return True
+        
+        # Grade level too high
+        return scan.flesch_kincaid_grade() > 16
     
-    def _detect_thin_content(self, content: str) -> bool:
+    def _detect_thin_content(self, scan: TextScan) -> bool:
         """Detect thin content."""
-        # Remove HTML tags
-        clean_content = re.sub(r'<[^>]+>', '', content)
-        word_count = len(clean_content.split())
-        
         # Check word count
-        if word_count < 300:
+        if scan.word_count < 300:
             return True
         
         # Check for low information density
-        sentences = re.split(r'[.!?]+', clean_content)
-        if len(sentences) < 5:
-            return True
-        
-        # Check average sentence length
-        avg_sentence_length = word_count / len(sentences) if sentences else 0
-        if avg_sentence_length < 8:  # Very short sentences may indicate thin content
+        if scan.sentence_count < 5:
             return True
         
-        return False
+        # Very short sentences may indicate thin content
+        return scan.word_count / scan.sentence_count < 8
     
-    def _detect_excessive_linking(self, content: str) -> bool:
+    def _detect_excessive_linking(self, scan: TextScan) -> bool:
         """Detect excessive internal/external linking."""
-        # Count links
-        link_count = len(re.findall(r'<a\s+[^>]*href=', content, re.IGNORECASE))
-        
-        # Count words
-        clean_content = re.sub(r'<[^>]+>', '', content)
-        word_count = len(clean_content.split())
-        
-        if word_count == 0:
+        if scan.word_count == 0:
             return False
         
         # More than 1 link per 50 words is excessive
-        link_ratio = link_count / word_count
-        return link_ratio > 0.02
+        return scan.link_count / scan.word_count > 0.02
     
-    def _detect_boilerplate(self, content: str) -> bool:
+    def _detect_boilerplate(self, matches: Dict[str, List[int]]) -> bool:
         """Detect boilerplate text patterns."""
-        content_lower = content.lower()
-        
-        boilerplate_count = 0
-        for pattern in self.boilerplate_patterns:
-            if re.search(pattern, content_lower):
-                boilerplate_count += 1
+        boilerplate_count = sum(1 for label in matches if label.startswith("boilerplate:"))
         
         # Too many boilerplate phrases
         return boilerplate_count >= 3
     
-    def _detect_auto_generated(self, content: str) -> bool:
+    def _detect_auto_generated(self, scan: TextScan) -> bool:
         """Detect auto-generated content patterns."""
-        # Check for repetitive sentence structures
-        sentences = re.split(r'[.!?]+', content)
-        
-        if len(sentences) < 5:
+        if scan.sentence_count < 5:
             return False
         
-        # Check for similar sentence starts
-        sentence_starts = []
-        for sentence in sentences:
-            sentence = sentence.strip()
-            if len(sentence) > 10:
-                # Get first 3 words
-                words = sentence.split()[:3]
-                if len(words) >= 2:
-                    sentence_starts.append(' '.join(words).lower())
-        
         # If more than 30% of sentences start similarly, flag as auto-generated
-        if sentence_starts:
-            unique_starts = len(set(sentence_starts))
-            if unique_starts / len(sentence_starts) < 0.7:
+        if scan.sentence_starts:
+            unique_starts = len(set(scan.sentence_starts))
+            if unique_starts / len(scan.sentence_starts) < 0.7:
                 return True
         
         return False
@@ -473,6 +489,12 @@ class QualityScorer:
         self.similarity_detector = ContentSimilarityDetector(
             governance_config.similarity_threshold
         )
+        self.cta_automaton = PhraseAutomaton(
+            (phrase, phrase) for phrase in [
+                'learn more', 'read more', 'click here', 'download',
+                'subscribe', 'contact us', 'get started'
+            ]
+        )
     
     def score_content(self, 
                       content: str,
@@ -481,8 +503,15 @@ class QualityScorer:
                       target_keywords: List[str] = None,
                       citations: List[str] = None,
                       author_credentials: List[str] = None,
-                      content_category: ContentCategory = ContentCategory.GENERAL) -> QualityScore:
-        """Calculate comprehensive quality score."""
+                      content_category: ContentCategory = ContentCategory.GENERAL,
+                      profile: Optional[TextProfile] = None) -> QualityScore:
+        """Calculate comprehensive quality score.
+        
+        Every assessment reads the same ``TextProfile``; pass one in to reuse
+        an analysis made earlier, otherwise it is looked up by content hash.
+        """
+        if profile is None:
+            profile = get_text_profile(content)
         
         # Initialize scores
         content_quality = 0.0
@@ -495,39 +524,39 @@ class QualityScorer:
         recommendations = []
         
         # Content quality assessment
-        content_metrics = self._assess_content_quality(content, title, target_keywords)
+        content_metrics = self._assess_content_quality(profile, title, target_keywords)
         content_quality = content_metrics['score']
         issues.extend(content_metrics['issues'])
         recommendations.extend(content_metrics['recommendations'])
         
         # Technical quality assessment
-        technical_metrics = self._assess_technical_quality(content, title, meta_description)
+        technical_metrics = self._assess_technical_quality(profile, title, meta_description)
         technical_quality = technical_metrics['score']
         issues.extend(technical_metrics['issues'])
         recommendations.extend(technical_metrics['recommendations'])
         
         # Trustworthiness assessment
         trust_metrics = self._assess_trustworthiness(
-            content, citations, author_credentials, content_category
+            profile, citations, author_credentials, content_category
         )
         trustworthiness = trust_metrics['score']
         issues.extend(trust_metrics['issues'])
         recommendations.extend(trust_metrics['recommendations'])
         
         # User experience assessment
-        ux_metrics = self._assess_user_experience(content)
+        ux_metrics = self._assess_user_experience(profile)
         user_experience = ux_metrics['score']
         issues.extend(ux_metrics['issues'])
         recommendations.extend(ux_metrics['recommendations'])
         
         # SEO optimization assessment
-        seo_metrics = self._assess_seo_optimization(content, title, meta_description, target_keywords)
+        seo_metrics = self._assess_seo_optimization(profile, title, meta_description, target_keywords)
         seo_optimization = seo_metrics['score']
         issues.extend(seo_metrics['issues'])
         recommendations.extend(seo_metrics['recommendations'])
         
         # Detect spam signals
-        spam_signals = self.spam_detector.detect_spam_signals(content, target_keywords)
+        spam_signals = self.spam_detector.detect_spam_signals(content, target_keywords, profile=profile)
         
         # Calculate overall score (weighted average)
         overall_score = (
@@ -561,7 +590,7 @@ class QualityScorer:
             trustworthiness=trustworthiness,
             user_experience=user_experience,
             seo_optimization=seo_optimization,
-            word_count=len(content.split()),
+            word_count=profile.word_count,
             readability_score=content_metrics.get('readability_score', 0),
             unique_information_score=content_metrics.get('unique_info_score', 0),
             citation_score=trust_metrics.get('citation_score', 0),
@@ -573,14 +602,14 @@ class QualityScorer:
             spam_signals=spam_signals
         )
     
-    def _assess_content_quality(self, content: str, title: str, target_keywords: List[str]) -> Dict:
+    def _assess_content_quality(self, profile: TextProfile, title: str, target_keywords: List[str]) -> Dict:
         """Assess content quality."""
         score = 0.0
         issues = []
         recommendations = []
         
         # Word count assessment
-        word_count = len(content.split())
+        word_count = profile.word_count
         if word_count < 300:
             issues.append("Content is too short (under 300 words)")
             score += 2.0
@@ -593,25 +622,19 @@ class QualityScorer:
             score += 8.0  # Very long content can be less engaging
         
         # Readability assessment
-        try:
-            clean_content = re.sub(r'<[^>]+>', '', content)
-            readability_score = textstat.flesch_reading_ease(clean_content)
-            
-            if readability_score >= 60:
-                score += 9.0
-            elif readability_score >= 30:
-                score += 7.0
-                recommendations.append("Improve readability with shorter sentences")
-            else:
-                score += 4.0
-                issues.append("Content is difficult to read")
-        except:
-            readability_score = 50
-            score += 6.0
+        readability_score = profile.flesch_reading_ease()
+        if readability_score >= 60:
+            score += 9.0
+        elif readability_score >= 30:
+            score += 7.0
+            recommendations.append("Improve readability with shorter sentences")
+        else:
+            score += 4.0
+            issues.append("Content is difficult to read")
         
         # Content structure assessment
-        headings = len(re.findall(r'<h[1-6][^>]*>', content, re.IGNORECASE))
-        paragraphs = len(re.findall(r'<p[^>]*>', content, re.IGNORECASE))
+        headings = len(profile.headings)
+        paragraphs = profile.tag_counts['p']
         
         if headings >= 3 and paragraphs >= 5:
             score += 9.0
@@ -635,7 +658,7 @@ class QualityScorer:
             'originality_score': 8.0  # Would calculate based on similarity analysis
         }
     
-    def _assess_technical_quality(self, content: str, title: str, meta_description: str) -> Dict:
+    def _assess_technical_quality(self, profile: TextProfile, title: str, meta_description: str) -> Dict:
         """Assess technical SEO quality."""
         score = 0.0
         issues = []
@@ -668,8 +691,8 @@ class QualityScorer:
             score += 9.0
         
         # Image optimization
-        images = re.findall(r'<img[^>]*>', content, re.IGNORECASE)
-        images_with_alt = re.findall(r'<img[^>]*alt=', content, re.IGNORECASE)
+        images = profile.image_alts
+        images_with_alt = [alt for alt in images if alt is not None]
         
         if images:
             alt_ratio = len(images_with_alt) / len(images)
@@ -694,7 +717,7 @@ class QualityScorer:
         }
     
     def _assess_trustworthiness(self, 
-                                content: str,
+                                profile: TextProfile,
                                 citations: List[str],
                                 author_credentials: List[str],
                                 content_category: ContentCategory) -> Dict:
@@ -749,7 +772,7 @@ class QualityScorer:
         score += citation_score
         
         # Date freshness (if content includes dates)
-        date_patterns = re.findall(r'\b(20\d{2})\b', content)
+        date_patterns = [word for word in profile.words if len(word) == 4 and word.startswith('20') and word.isdigit()]
         if date_patterns:
             recent_dates = [int(year) for year in date_patterns if int(year) >= 2020]
             if recent_dates:
@@ -770,15 +793,15 @@ class QualityScorer:
             'citation_score': citation_score
         }
     
-    def _assess_user_experience(self, content: str) -> Dict:
+    def _assess_user_experience(self, profile: TextProfile) -> Dict:
         """Assess user experience factors."""
         score = 0.0
         issues = []
         recommendations = []
         
         # Content formatting
-        lists = len(re.findall(r'<[uo]l[^>]*>', content, re.IGNORECASE))
-        bold_text = len(re.findall(r'<(b|strong)[^>]*>', content, re.IGNORECASE))
+        lists = profile.tag_counts['ul'] + profile.tag_counts['ol']
+        bold_text = profile.tag_counts['b'] + profile.tag_counts['strong']
         
         if lists >= 2 and bold_text >= 3:
             score += 9.0
@@ -790,8 +813,8 @@ class QualityScorer:
             issues.append("Content lacks formatting (lists, bold text)")
         
         # Paragraph length assessment
-        paragraphs = re.findall(r'<p[^>]*>(.*?)</p>', content, re.IGNORECASE | re.DOTALL)
-        long_paragraphs = sum(1 for p in paragraphs if len(p.split()) > 100)
+        paragraphs = profile.paragraph_word_counts
+        long_paragraphs = sum(1 for words in paragraphs if words > 100)
         
         if long_paragraphs == 0:
             score += 9.0
@@ -803,12 +826,7 @@ class QualityScorer:
             issues.append("Many paragraphs are too long")
         
         # Call-to-action presence
-        cta_patterns = [
-            r'learn more', r'read more', r'click here', r'download',
-            r'subscribe', r'contact us', r'get started'
-        ]
-        
-        has_cta = any(re.search(pattern, content, re.IGNORECASE) for pattern in cta_patterns)
+        has_cta = bool(profile.phrase_positions(self.cta_automaton))
         if has_cta:
             score += 8.0
         else:
@@ -825,7 +843,7 @@ class QualityScorer:
         }
     
     def _assess_seo_optimization(self, 
-                                 content: str,
+                                 profile: TextProfile,
                                  title: str,
                                  meta_description: str,
                                  target_keywords: List[str]) -> Dict:
@@ -843,7 +861,6 @@ class QualityScorer:
             }
         
         primary_keyword = target_keywords[0].lower()
-        content_lower = content.lower()
         title_lower = title.lower()
         
         # Keyword in title
@@ -854,8 +871,8 @@ class QualityScorer:
             score += 3.0
         
         # Keyword density
-        word_count = len(content.split())
-        keyword_count = content_lower.count(primary_keyword)
+        word_count = profile.word_count
+        keyword_count = len(profile.keyword_positions(primary_keyword))
         
         if word_count > 0:
             keyword_density = keyword_count / word_count
@@ -873,7 +890,7 @@ class QualityScorer:
             score += 5.0
         
         # Internal linking
-        internal_links = len(re.findall(r'<a[^>]*href="(?!http)', content, re.IGNORECASE))
+        internal_links = sum(1 for link in profile.links if not link.href.lower().startswith('http'))
         if internal_links >= 3:
             score += 9.0
         elif internal_links >= 1:
@@ -904,7 +921,8 @@ class QualityGovernanceManager:
         self.governance_config = governance_config
         self.quality_scorer = QualityScorer(governance_config)
         self.similarity_detector = ContentSimilarityDetector(
-            governance_config.similarity_threshold
+            governance_config.similarity_threshold,
+            index_path=governance_config.similarity_index_path
         )
         
         # Track content velocity
@@ -937,6 +955,18 @@ class QualityGovernanceManager:
             content_category=content_category
         )
         
+        await self.apply_governance(content_id, content, quality_score, title, content_category)
+        
+        return quality_score
+    
+    async def apply_governance(self,
+                               content_id: str,
+                               content: str,
+                               quality_score: QualityScore,
+                               title: str = "",
+                               content_category: ContentCategory = ContentCategory.GENERAL) -> List[ContentSimilarity]:
+        """Index already-scored content for similarity and queue it for review if needed."""
+        
         # Check for similarity with existing content
         similar_content = self.similarity_detector.find_similar_content(content, content_id)
         
@@ -951,7 +981,7 @@ class QualityGovernanceManager:
                 content_id, content, title, quality_score, content_category, similar_content
             )
         
-        return quality_score
+        return similar_content
     
     def _requires_human_review(self,
                                quality_score: QualityScore,
@@ -1222,6 +1252,9 @@ async def run_quality_audit(project_id: str,
         content_category=ContentCategory.GENERAL
     )
     
+    if governance_config.similarity_index_path:
+        manager.similarity_detector.save()
+    
     logger.info(f"Quality audit completed for {content_id}: {quality_score.overall_score:.1f}/10")
     
     return quality_score
\ No newline at end of file
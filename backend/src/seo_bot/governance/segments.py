@@ -0,0 +1,335 @@
+"""Inverted index of sentence and word-window fingerprints for passage overlap.
+
+Each document contributes the hashes of its normalized sentences and a
+winnowed subset of its word k-gram hashes (the minimum of every ``window``
+consecutive k-gram hashes). Winnowing keeps roughly ``2 / (window + 1)`` of
+the k-grams while guaranteeing that any shared run of at least
+``window + kgram_size - 1`` words is fingerprinted in both documents. A
+lookup only touches the postings of the query's own fingerprints, so its
+cost does not grow with the number of indexed documents.
+"""
+
+import hashlib
+import json
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple, Union
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from .minhash import rolling_hashes, token_hashes
+
+
+_TOKEN_PATTERN = re.compile(r'\w+')
+_TAG_PATTERN = re.compile(r'<[^>]+>')
+_SENTENCE_PATTERN = re.compile(r'[^.!?\n]+[.!?]*')
+
+
+@dataclass
+class PassageMatch:
+    """A passage of the query text that also appears in an indexed document."""
+    source_id: str
+    text: str
+    start: int  # Character offsets in the query text
+    end: int
+    source_start: int  # Character offsets in the source document
+    source_end: int
+
+
+@dataclass
+class _Fingerprints:
+    """Sorted fingerprint hashes of one document with their positions."""
+    window_hash: np.ndarray  # uint64, sorted
+    window_pos: np.ndarray  # token position of the k-gram
+    window_start: np.ndarray  # character span of the k-gram
+    window_end: np.ndarray
+    sentence_hash: np.ndarray  # uint64, sorted
+    sentence_start: np.ndarray
+    sentence_end: np.ndarray
+
+
+def _mix64(values: np.ndarray) -> np.ndarray:
+    """Finalize polynomial hashes so nearby inputs spread over all 64 bits."""
+    values = values ^ (values >> np.uint64(33))
+    values = values * np.uint64(0xff51afd7ed558ccd)
+    return values ^ (values >> np.uint64(33))
+
+
+def _sentence_hash(normalized: str) -> int:
+    return int.from_bytes(hashlib.blake2b(normalized.encode(), digest_size=8).digest(), 'little')
+
+
+class PassageIndex:
+    """Finds passages a text shares with indexed documents.
+
+    Offsets refer to the text exactly as given; HTML tags are blanked out
+    rather than removed so positions are preserved.
+    """
+
+    def __init__(self,
+                 kgram_size: int = 6,
+                 window: int = 8,
+                 min_sentence_words: int = 6,
+                 max_postings: int = 1000):
+        """Initialize an empty index.
+
+        Args:
+            kgram_size: Words per hashed window
+            window: Winnowing window; shared runs of ``window + kgram_size - 1``
+                words or more are always found
+            min_sentence_words: Shortest sentence indexed as a whole
+            max_postings: Fingerprints shared by more documents than this are
+                treated as boilerplate and skipped at lookup time
+        """
+        self.kgram_size = kgram_size
+        self.window = window
+        self.min_sentence_words = min_sentence_words
+        self.max_postings = max_postings
+
+        self.documents: Dict[str, _Fingerprints] = {}
+        self.postings: Dict[int, Set[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self.documents)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.documents
+
+    def _tokenize(self, text: str) -> Tuple[str, List[str], np.ndarray, np.ndarray]:
+        """Tag-blanked text, lowercased tokens and their character spans."""
+        blanked = _TAG_PATTERN.sub(lambda match: ' ' * len(match.group()), text)
+        matches = list(_TOKEN_PATTERN.finditer(blanked))
+        tokens = [match.group().lower() for match in matches]
+        starts = np.fromiter((match.start() for match in matches), dtype=np.int64, count=len(matches))
+        ends = np.fromiter((match.end() for match in matches), dtype=np.int64, count=len(matches))
+        return blanked, tokens, starts, ends
+
+    def _sentences(self, blanked: str) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        hashes, starts, ends = [], [], []
+        for match in _SENTENCE_PATTERN.finditer(blanked):
+            words = _TOKEN_PATTERN.findall(match.group().lower())
+            if len(words) < self.min_sentence_words:
+                continue
+            # Trim surrounding whitespace from the reported span
+            leading = len(match.group()) - len(match.group().lstrip())
+            trailing = len(match.group()) - len(match.group().rstrip())
+            hashes.append(_sentence_hash(' '.join(words)))
+            starts.append(match.start() + leading)
+            ends.append(match.end() - trailing)
+        return (np.array(hashes, dtype=np.uint64),
+                np.array(starts, dtype=np.int64),
+                np.array(ends, dtype=np.int64))
+
+    def _windows(self, tokens: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """Winnowed k-gram hashes and their token positions."""
+        if len(tokens) < self.kgram_size:
+            return np.empty(0, dtype=np.uint64), np.empty(0, dtype=np.int64)
+
+        hashes = _mix64(rolling_hashes(token_hashes(tokens), self.kgram_size))
+        if len(hashes) <= self.window:
+            positions = np.array([int(np.argmin(hashes))])
+        else:
+            windows = sliding_window_view(hashes, self.window)
+            positions = np.unique(windows.argmin(axis=1) + np.arange(len(windows)))
+        return hashes[positions], positions
+
+    def _fingerprint(self, text: str) -> Tuple[str, np.ndarray, np.ndarray, _Fingerprints]:
+        blanked, tokens, token_starts, token_ends = self._tokenize(text)
+        window_hash, window_pos = self._windows(tokens)
+        sentence_hash, sentence_start, sentence_end = self._sentences(blanked)
+
+        window_order = np.argsort(window_hash, kind='stable')
+        sentence_order = np.argsort(sentence_hash, kind='stable')
+        window_pos = window_pos[window_order]
+        prints = _Fingerprints(
+            window_hash=window_hash[window_order],
+            window_pos=window_pos,
+            window_start=token_starts[window_pos] if len(window_pos) else window_pos,
+            window_end=token_ends[window_pos + self.kgram_size - 1] if len(window_pos) else window_pos,
+            sentence_hash=sentence_hash[sentence_order],
+            sentence_start=sentence_start[sentence_order],
+            sentence_end=sentence_end[sentence_order],
+        )
+        return blanked, token_starts, token_ends, prints
+
+    def _keys(self, prints: _Fingerprints) -> Set[int]:
+        return set(prints.window_hash.tolist()) | set(prints.sentence_hash.tolist())
+
+    def _insert(self, key: str, prints: _Fingerprints) -> None:
+        self.documents[key] = prints
+        for fingerprint in self._keys(prints):
+            self.postings.setdefault(fingerprint, set()).add(key)
+
+    def add(self, key: str, text: str) -> None:
+        """Index a document, replacing any earlier version under the same key."""
+        if key in self.documents:
+            self.remove(key)
+        self._insert(key, self._fingerprint(text)[3])
+
+    def remove(self, key: str) -> bool:
+        """Drop a document from the index."""
+        prints = self.documents.pop(key, None)
+        if prints is None:
+            return False
+        for fingerprint in self._keys(prints):
+            holders = self.postings.get(fingerprint)
+            if holders is not None:
+                holders.discard(key)
+                if not holders:
+                    del self.postings[fingerprint]
+        return True
+
+    def find(self,
+             text: str,
+             exclude: Optional[str] = None,
+             sources: Optional[Set[str]] = None) -> Dict[str, List[PassageMatch]]:
+        """Passages of ``text`` found in indexed documents, grouped by source.
+
+        Args:
+            text: Query text
+            exclude: Key to ignore (typically the query's own document)
+            sources: Restrict results to these keys
+
+        Returns:
+            Source key to its shared passages, in query order
+        """
+        blanked, token_starts, token_ends, query = self._fingerprint(text)
+
+        candidates: Set[str] = set()
+        for fingerprint in self._keys(query):
+            holders = self.postings.get(fingerprint)
+            if holders and len(holders) <= self.max_postings:
+                candidates.update(holders)
+        candidates.discard(exclude)
+        if sources is not None:
+            candidates &= sources
+
+        results = {}
+        for key in candidates:
+            spans = self._window_spans(query, self.documents[key], token_starts, token_ends)
+            spans.extend(self._sentence_spans(query, self.documents[key]))
+            passages = self._merge(spans)
+            if passages:
+                results[key] = [
+                    PassageMatch(key, blanked[start:end], start, end, source_start, source_end)
+                    for start, end, source_start, source_end in passages
+                ]
+        return results
+
+    def _window_spans(self,
+                      query: _Fingerprints,
+                      source: _Fingerprints,
+                      token_starts: np.ndarray,
+                      token_ends: np.ndarray) -> List[Tuple[int, int, int, int]]:
+        """Runs of matching k-grams on the same alignment, as character spans."""
+        anchors = []
+        lo = np.searchsorted(source.window_hash, query.window_hash, side='left')
+        hi = np.searchsorted(source.window_hash, query.window_hash, side='right')
+        for index in np.flatnonzero(hi > lo):
+            for match in range(lo[index], hi[index]):
+                anchors.append((
+                    int(source.window_pos[match] - query.window_pos[index]),
+                    int(query.window_pos[index]),
+                    int(source.window_start[match]),
+                    int(source.window_end[match]),
+                ))
+
+        # Consecutive fingerprints of one shared run are at most a window apart
+        gap = self.window + self.kgram_size
+        spans = []
+        anchors.sort()
+        run = None
+        for diagonal, position, source_start, source_end in anchors:
+            if run and run[0] == diagonal and position - run[2] <= gap:
+                run[2] = position
+                run[4] = max(run[4], source_end)
+                continue
+            if run:
+                spans.append(self._run_span(run, token_starts, token_ends))
+            run = [diagonal, position, position, source_start, source_end]
+        if run:
+            spans.append(self._run_span(run, token_starts, token_ends))
+        return spans
+
+    def _run_span(self, run, token_starts: np.ndarray, token_ends: np.ndarray) -> Tuple[int, int, int, int]:
+        _, first, last, source_start, source_end = run
+        return (int(token_starts[first]), int(token_ends[last + self.kgram_size - 1]), source_start, source_end)
+
+    def _sentence_spans(self, query: _Fingerprints, source: _Fingerprints) -> List[Tuple[int, int, int, int]]:
+        spans = []
+        lo = np.searchsorted(source.sentence_hash, query.sentence_hash, side='left')
+        hi = np.searchsorted(source.sentence_hash, query.sentence_hash, side='right')
+        for index in np.flatnonzero(hi > lo):
+            match = lo[index]
+            spans.append((
+                int(query.sentence_start[index]),
+                int(query.sentence_end[index]),
+                int(source.sentence_start[match]),
+                int(source.sentence_end[match]),
+            ))
+        return spans
+
+    @staticmethod
+    def _merge(spans: List[Tuple[int, int, int, int]]) -> List[Tuple[int, int, int, int]]:
+        """Union spans overlapping in the query text."""
+        merged: List[List[int]] = []
+        for start, end, source_start, source_end in sorted(spans):
+            if merged and start <= merged[-1][1]:
+                current = merged[-1]
+                current[1] = max(current[1], end)
+                current[2] = min(current[2], source_start)
+                current[3] = max(current[3], source_end)
+            else:
+                merged.append([start, end, source_start, source_end])
+        return [tuple(span) for span in merged]
+
+    def save(self, path: Union[str, Path]) -> None:
+        """Write every document's fingerprints to a compressed ``.npz`` file."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        keys = list(self.documents)
+        config = {
+            'kgram_size': self.kgram_size,
+            'window': self.window,
+            'min_sentence_words': self.min_sentence_words,
+            'max_postings': self.max_postings,
+            'keys': keys,
+        }
+        arrays = {}
+        for field in _Fingerprints.__dataclass_fields__:
+            parts = [getattr(self.documents[key], field) for key in keys]
+            lengths = [len(part) for part in parts]
+            dtype = np.uint64 if field.endswith('hash') else np.int64
+            arrays[field] = np.concatenate(parts).astype(dtype) if parts else np.empty(0, dtype=dtype)
+            arrays[f'{field}_offsets'] = np.concatenate([[0], np.cumsum(lengths, dtype=np.int64)])
+
+        with open(path, 'wb') as handle:
+            np.savez_compressed(
+                handle,
+                config=np.frombuffer(json.dumps(config).encode(), dtype=np.uint8),
+                **arrays
+            )
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> "PassageIndex":
+        """Read an index written by :meth:`save` and rebuild its postings."""
+        with np.load(path) as data:
+            config = json.loads(data['config'].tobytes().decode())
+            arrays = {name: data[name] for name in data.files if name != 'config'}
+
+        index = cls(
+            kgram_size=config['kgram_size'],
+            window=config['window'],
+            min_sentence_words=config['min_sentence_words'],
+            max_postings=config['max_postings'],
+        )
+        for position, key in enumerate(config['keys']):
+            fields = {}
+            for field in _Fingerprints.__dataclass_fields__:
+                offsets = arrays[f'{field}_offsets']
+                fields[field] = arrays[field][offsets[position]:offsets[position + 1]]
+            index._insert(key, _Fingerprints(**fields))
+        return index
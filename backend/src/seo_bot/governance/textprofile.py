@@ -0,0 +1,227 @@
+"""Shared per-document text profile.
+
+Quality scoring, spam detection, publishing quality gates and trust signal
+assessment all need the same basic facts about a document: its words,
+sentences, syllables, headings, links and where keywords occur. A
+:class:`TextProfile` computes them once, and :func:`get_text_profile`
+caches profiles by content hash so a document that moves from the
+publishing pipeline into governance is only analyzed once per process.
+"""
+
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from .textscan import PhraseAutomaton, TextScan, phrase_tokens, scan_text
+
+
+# Same tag grammar as the scanner, so both passes agree on what a tag is
+_TAG_PATTERN = re.compile(r"<(/?)([a-zA-Z][\w-]*)(\s[^<>]*|/)?>")
+_ATTRIBUTE_PATTERN = re.compile(r"""([\w-]+)\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s"'>]+))""")
+# Markdown ATX headings; trailing "#"s are stripped in Python to avoid backtracking
+_MARKDOWN_HEADING = re.compile(r"^(#{1,6})[ \t]+([^\n]*)", re.MULTILINE)
+_HEADING_TAGS = {f"h{level}": level for level in range(1, 7)}
+
+# Profiles kept in the process-wide cache
+PROFILE_CACHE_SIZE = 256
+
+
+@dataclass
+class Heading:
+    """An HTML or Markdown heading."""
+    level: int
+    text: str
+
+
+@dataclass
+class Link:
+    """An anchor with an href."""
+    href: str
+    text: str = ""
+
+    @property
+    def is_absolute(self) -> bool:
+        return self.href.lower().startswith(('http://', 'https://'))
+
+
+def _attributes(raw: Optional[str]) -> Dict[str, str]:
+    if not raw:
+        return {}
+    return {
+        match.group(1).lower(): next(value for value in match.groups()[1:] if value is not None)
+        for match in _ATTRIBUTE_PATTERN.finditer(raw)
+    }
+
+
+def _strip_tags(fragment: str) -> str:
+    return ' '.join(_TAG_PATTERN.sub(' ', fragment).split())
+
+
+@dataclass
+class TextProfile:
+    """Words, sentences, syllables, structure and keyword positions of one document."""
+    content_hash: str
+    scan: TextScan
+    headings: List[Heading] = field(default_factory=list)
+    links: List[Link] = field(default_factory=list)
+    # Alt text of every <img>; None when the attribute is missing
+    image_alts: List[Optional[str]] = field(default_factory=list)
+    # Whitespace-separated word count inside each <p>...</p>
+    paragraph_word_counts: List[int] = field(default_factory=list)
+    _keyword_positions: Dict[str, List[int]] = field(default_factory=dict, repr=False)
+    _phrase_matches: Dict[int, Tuple[PhraseAutomaton, Dict[str, List[int]]]] = field(
+        default_factory=dict, repr=False
+    )
+
+    @classmethod
+    def from_content(cls, content: str) -> "TextProfile":
+        """Analyze a document (HTML, Markdown or plain text)."""
+        profile = cls(content_hash=content_hash(content), scan=scan_text(content))
+
+        headings: List[Tuple[int, Heading]] = []
+        open_heading: Optional[Tuple[int, int]] = None
+        open_link: Optional[Tuple[str, int]] = None
+        open_paragraph: Optional[int] = None
+        for match in _TAG_PATTERN.finditer(content):
+            closing, name = match.group(1), match.group(2).lower()
+            if closing:
+                if name in _HEADING_TAGS and open_heading is not None:
+                    level, start = open_heading
+                    headings.append((start, Heading(level, _strip_tags(content[start:match.start()]))))
+                    open_heading = None
+                elif name == 'a' and open_link is not None:
+                    href, start = open_link
+                    profile.links.append(Link(href, _strip_tags(content[start:match.start()])))
+                    open_link = None
+                elif name == 'p' and open_paragraph is not None:
+                    profile.paragraph_word_counts.append(len(content[open_paragraph:match.start()].split()))
+                    open_paragraph = None
+                continue
+
+            if name in _HEADING_TAGS:
+                open_heading = (_HEADING_TAGS[name], match.end())
+            elif name == 'a':
+                href = _attributes(match.group(3)).get('href')
+                if href is not None:
+                    open_link = (href, match.end())
+            elif name == 'p':
+                open_paragraph = match.end()
+            elif name == 'img':
+                profile.image_alts.append(_attributes(match.group(3)).get('alt'))
+
+        for match in _MARKDOWN_HEADING.finditer(content):
+            text = match.group(2).strip().rstrip('#').strip()
+            headings.append((match.start(), Heading(len(match.group(1)), text)))
+
+        # HTML and Markdown headings in document order
+        profile.headings = [heading for _, heading in sorted(headings, key=lambda item: item[0])]
+
+        return profile
+
+    @property
+    def words(self) -> List[str]:
+        return self.scan.words
+
+    @property
+    def word_count(self) -> int:
+        return self.scan.word_count
+
+    @property
+    def sentence_count(self) -> int:
+        return self.scan.sentence_count
+
+    @property
+    def syllable_count(self) -> int:
+        return self.scan.syllable_count
+
+    @property
+    def tag_counts(self):
+        return self.scan.tag_counts
+
+    @property
+    def sentences(self) -> List[str]:
+        """Sentences as lowercased, space-joined word tokens."""
+        words = self.scan.words
+        return [' '.join(words[start:end]) for start, end in self.scan.sentence_bounds]
+
+    @property
+    def heading_levels(self) -> List[int]:
+        return [heading.level for heading in self.headings]
+
+    def flesch_reading_ease(self) -> float:
+        return self.scan.flesch_reading_ease()
+
+    def flesch_kincaid_grade(self) -> float:
+        return self.scan.flesch_kincaid_grade()
+
+    def keyword_positions(self, keyword: str) -> List[int]:
+        """Word positions where a (multi-word) keyword starts."""
+        key = ' '.join(phrase_tokens(keyword))
+        positions = self._keyword_positions.get(key)
+        if positions is None:
+            automaton = PhraseAutomaton([(key, key)])
+            positions = [start for _, start in automaton.find(self.scan.words)]
+            self._keyword_positions[key] = positions
+        return positions
+
+    def keyword_density(self, keyword: str) -> float:
+        """Keyword occurrences per word."""
+        if self.word_count == 0:
+            return 0.0
+        return len(self.keyword_positions(keyword)) / self.word_count
+
+    def phrase_positions(self, automaton: PhraseAutomaton) -> Dict[str, List[int]]:
+        """Start positions of every phrase compiled into ``automaton``, by label."""
+        cached = self._phrase_matches.get(id(automaton))
+        if cached is not None and cached[0] is automaton:
+            return cached[1]
+        positions: Dict[str, List[int]] = {}
+        for label, start in automaton.find(self.scan.words):
+            positions.setdefault(label, []).append(start)
+        self._phrase_matches[id(automaton)] = (automaton, positions)
+        return positions
+
+
+def content_hash(content: str) -> str:
+    """SHA-256 of a document's text."""
+    return hashlib.sha256(content.encode('utf-8', errors='replace')).hexdigest()
+
+
+_profile_cache: "OrderedDict[str, TextProfile]" = OrderedDict()
+_profile_cache_lock = threading.Lock()
+_profile_cache_stats = {'hits': 0, 'misses': 0}
+
+
+def get_text_profile(content: str) -> TextProfile:
+    """Profile for ``content``, reused across callers while it stays in the cache."""
+    key = content_hash(content or "")
+    with _profile_cache_lock:
+        profile = _profile_cache.get(key)
+        if profile is not None:
+            _profile_cache.move_to_end(key)
+            _profile_cache_stats['hits'] += 1
+            return profile
+        _profile_cache_stats['misses'] += 1
+
+    profile = TextProfile.from_content(content or "")
+    with _profile_cache_lock:
+        _profile_cache[key] = profile
+        while len(_profile_cache) > PROFILE_CACHE_SIZE:
+            _profile_cache.popitem(last=False)
+    return profile
+
+
+def profile_cache_info() -> Dict[str, int]:
+    """Hit, miss and size counters of the profile cache."""
+    with _profile_cache_lock:
+        return {**_profile_cache_stats, 'size': len(_profile_cache)}
+
+
+def clear_text_profile_cache() -> None:
+    """Drop every cached profile and reset the counters."""
+    with _profile_cache_lock:
+        _profile_cache.clear()
+        _profile_cache_stats.update(hits=0, misses=0)
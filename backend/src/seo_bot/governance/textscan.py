@@ -0,0 +1,204 @@
+"""Single-pass text scanning for spam and quality signals.
+
+One linear tokenization of the raw content yields word, sentence,
+syllable, tag and link counts together with phrase matches from a
+precompiled token-level Aho-Corasick automaton. Every step is linear in
+the input, so there are no backtracking regexes whose cost can explode on
+long or adversarial documents.
+"""
+
+import re
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+# Tags, words and runs of sentence terminators. Tag attributes must start
+# with whitespace and stop at the next angle bracket, so no quantifiers
+# overlap and an unclosed "<" costs at most the distance to the next one.
+_TOKEN_PATTERN = re.compile(r"<(/?)([a-zA-Z][\w-]*)(\s[^<>]*|/)?>|(\w+(?:'\w+)*)|([.!?]+)")
+_VOWEL_GROUPS = re.compile(r'[aeiouy]+')
+_PHRASE_TOKENS = re.compile(r"\w+(?:'\w+)*")
+
+# Sentences shorter than this (in characters) are not compared for
+# templated openings
+_MIN_START_SENTENCE_CHARS = 10
+
+
+def phrase_tokens(phrase: str) -> List[str]:
+    """Lowercased word tokens of a phrase, as the scanner sees them."""
+    return _PHRASE_TOKENS.findall(phrase.lower())
+
+
+def count_syllables(word: str) -> int:
+    """Heuristic syllable count (vowel groups, silent trailing e)."""
+    word = word.lower()
+    count = len(_VOWEL_GROUPS.findall(word))
+    if word.endswith('e') and not word.endswith(('le', 'ee')) and count > 1:
+        count -= 1
+    return max(count, 1)
+
+
+class PhraseAutomaton:
+    """Aho-Corasick automaton over word tokens.
+
+    Phrases are matched on lowercased word tokens, so punctuation and
+    spacing between words do not matter. Feeding a token is amortized O(1)
+    regardless of how many phrases are compiled.
+    """
+
+    def __init__(self, phrases: Optional[Iterable[Tuple[str, str]]] = None):
+        """Compile ``(label, phrase)`` pairs."""
+        self.transitions: List[Dict[str, int]] = [{}]
+        self.outputs: List[List[Tuple[str, int]]] = [[]]
+        self.fail: List[int] = [0]
+        self.lengths: Dict[str, int] = {}
+        for label, phrase in phrases or []:
+            self.add(label, phrase)
+        self.build()
+
+    def add(self, label: str, phrase: str) -> None:
+        """Add a phrase; call :meth:`build` before matching."""
+        words = phrase_tokens(phrase)
+        if not words:
+            return
+        state = 0
+        for word in words:
+            nxt = self.transitions[state].get(word)
+            if nxt is None:
+                nxt = len(self.transitions)
+                self.transitions.append({})
+                self.outputs.append([])
+                self.fail.append(0)
+                self.transitions[state][word] = nxt
+            state = nxt
+        self.outputs[state].append((label, len(words)))
+        self.lengths[label] = len(words)
+
+    def build(self) -> None:
+        """Compute failure links breadth-first."""
+        queue = list(self.transitions[0].values())
+        for state in queue:
+            self.fail[state] = 0
+        head = 0
+        while head < len(queue):
+            state = queue[head]
+            head += 1
+            for word, nxt in self.transitions[state].items():
+                queue.append(nxt)
+                fallback = self.fail[state]
+                while fallback and word not in self.transitions[fallback]:
+                    fallback = self.fail[fallback]
+                candidate = self.transitions[fallback].get(word, 0)
+                self.fail[nxt] = candidate if candidate != nxt else 0
+                self.outputs[nxt] = self.outputs[nxt] + self.outputs[self.fail[nxt]]
+
+    def step(self, state: int, word: str) -> int:
+        """Next state after consuming a token."""
+        while state and word not in self.transitions[state]:
+            state = self.fail[state]
+        return self.transitions[state].get(word, 0)
+
+    def find(self, words: Iterable[str]) -> List[Tuple[str, int]]:
+        """``(label, start_token)`` for every phrase occurrence in a token stream."""
+        matches = []
+        state = 0
+        for position, word in enumerate(words):
+            state = self.step(state, word)
+            for label, length in self.outputs[state]:
+                matches.append((label, position - length + 1))
+        return matches
+
+
+@dataclass
+class TextScan:
+    """Counts and phrase matches collected in one pass over a text."""
+    words: List[str] = field(default_factory=list)  # lowercased word tokens
+    sentence_count: int = 0
+    syllable_count: int = 0
+    link_count: int = 0
+    tag_counts: Counter = field(default_factory=Counter)
+    # Phrase label -> token positions where it starts
+    phrase_positions: Dict[str, List[int]] = field(default_factory=dict)
+    # Phrase label -> length in tokens
+    phrase_lengths: Dict[str, int] = field(default_factory=dict)
+    sentence_starts: List[str] = field(default_factory=list)
+    # (first word, end word) index range of every sentence
+    sentence_bounds: List[Tuple[int, int]] = field(default_factory=list)
+
+    @property
+    def word_count(self) -> int:
+        return len(self.words)
+
+    def flesch_reading_ease(self) -> float:
+        if not self.words:
+            return 0.0
+        sentences = max(self.sentence_count, 1)
+        return 206.835 - 1.015 * (self.word_count / sentences) - 84.6 * (self.syllable_count / self.word_count)
+
+    def flesch_kincaid_grade(self) -> float:
+        if not self.words:
+            return 0.0
+        sentences = max(self.sentence_count, 1)
+        return 0.39 * (self.word_count / sentences) + 11.8 * (self.syllable_count / self.word_count) - 15.59
+
+
+def scan_text(content: str, automaton: Optional[PhraseAutomaton] = None) -> TextScan:
+    """Tokenize ``content`` once and collect every count the detectors need."""
+    scan = TextScan()
+    words = scan.words
+    syllables: Dict[str, int] = {}
+    state = 0
+
+    sentence_words = 0
+    sentence_chars_start = None
+    sentence_head: List[str] = []
+
+    def close_sentence(end: int) -> None:
+        nonlocal sentence_words, sentence_chars_start
+        if sentence_words:
+            scan.sentence_count += 1
+            scan.sentence_bounds.append((len(words) - sentence_words, len(words)))
+            if end - sentence_chars_start > _MIN_START_SENTENCE_CHARS and len(sentence_head) >= 2:
+                scan.sentence_starts.append(' '.join(sentence_head))
+        sentence_words = 0
+        sentence_chars_start = None
+        sentence_head.clear()
+
+    for match in _TOKEN_PATTERN.finditer(content):
+        tag, word, terminator = match.group(2), match.group(4), match.group(5)
+
+        if word is not None:
+            token = word.lower()
+            position = len(words)
+            words.append(token)
+
+            count = syllables.get(token)
+            if count is None:
+                count = syllables[token] = count_syllables(token)
+            scan.syllable_count += count
+
+            if sentence_chars_start is None:
+                sentence_chars_start = match.start()
+            sentence_words += 1
+            if len(sentence_head) < 3:
+                sentence_head.append(token)
+
+            if automaton is not None:
+                state = automaton.step(state, token)
+                for label, length in automaton.outputs[state]:
+                    scan.phrase_positions.setdefault(label, []).append(position - length + 1)
+                    scan.phrase_lengths[label] = length
+
+        elif terminator is not None:
+            close_sentence(match.start())
+
+        elif tag is not None:
+            if not match.group(1):
+                name = tag.lower()
+                scan.tag_counts[name] += 1
+                if name == 'a' and 'href=' in (match.group(3) or '').lower():
+                    scan.link_count += 1
+
+    close_sentence(len(content))
+    return scan
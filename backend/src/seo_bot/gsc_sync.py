@@ -0,0 +1,373 @@
+"""Search Console sync engine and readers for the GSCData table.
+
+Search analytics rows are pulled once per property and day, paging with
+the API's maximum row limit, and bulk-written to ``gsc_data``. A
+per-property high-water mark (``gsc_sync_state``) lets daily runs fetch
+only the dates that have become final since the last sync. Coverage
+monitoring, pruning and keyword discovery read from the table instead of
+querying the API for their own URL subsets.
+"""
+
+import logging
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence
+from urllib.parse import urlparse
+
+from sqlalchemy import func, insert
+from sqlalchemy.orm import Session
+
+from .models import GSCData, GSCSyncState, Project
+
+
+logger = logging.getLogger(__name__)
+
+
+# Largest page size the searchanalytics.query endpoint accepts
+MAX_ROW_LIMIT = 25000
+
+# Country/device value of rows aggregated over that dimension
+ALL_DIMENSION = "all"
+
+# Query value of page-level total rows (GSC omits anonymized queries from
+# page+query rows, so page totals are stored separately)
+PAGE_TOTAL_QUERY = ""
+
+# Keep IN (...) lists below SQLite's bound-parameter limit
+_IN_CHUNK = 500
+
+
+@dataclass
+class GSCSyncResult:
+    """Outcome of syncing one Search Console property."""
+    project_id: str
+    site_url: str
+    start_date: Optional[date]
+    end_date: Optional[date]
+    days_synced: int
+    rows_written: int
+    api_requests: int
+    high_water_mark: Optional[date]
+
+
+def normalize_domain(site: str) -> str:
+    """Bare host of a domain, URL or ``sc-domain:`` property."""
+    if site.startswith("sc-domain:"):
+        site = site[len("sc-domain:"):]
+    host = urlparse(site if "://" in site else f"https://{site}").hostname or site
+    return host.lower().removeprefix("www.")
+
+
+def find_project(session: Session, site: str) -> Optional[Project]:
+    """Project whose domain matches a domain, URL or Search Console property."""
+    domain = normalize_domain(site)
+    return session.query(Project).filter(
+        func.lower(Project.domain).in_([domain, f"www.{domain}"])
+    ).first()
+
+
+def _day_bounds(day: date) -> datetime:
+    """Stored timestamp for a GSC date (midnight UTC)."""
+    return datetime.combine(day, time.min, tzinfo=timezone.utc)
+
+
+class GSCSyncEngine:
+    """Incremental, paged Search Console ingestion into ``gsc_data``.
+
+    ``service`` is a ``searchconsole`` v1 API client (or any object with the
+    same ``searchanalytics().query(siteUrl=..., body=...).execute()`` shape).
+    """
+
+    def __init__(self,
+                 service,
+                 row_limit: int = MAX_ROW_LIMIT,
+                 batch_size: int = 5000,
+                 data_delay_days: int = 3,
+                 initial_lookback_days: int = 480,
+                 search_type: str = "web",
+                 include_page_totals: bool = True):
+        """Initialize the sync engine."""
+        if not 0 < row_limit <= MAX_ROW_LIMIT:
+            raise ValueError(f"row_limit must be between 1 and {MAX_ROW_LIMIT}")
+
+        self.service = service
+        self.row_limit = row_limit
+        self.batch_size = batch_size
+        self.data_delay_days = data_delay_days
+        self.initial_lookback_days = initial_lookback_days
+        self.search_type = search_type
+        self.include_page_totals = include_page_totals
+        self.api_requests = 0
+
+    @classmethod
+    def from_credentials(cls, credentials_file: str, **kwargs) -> "GSCSyncEngine":
+        """Build an engine authenticated with a service account file."""
+        from google.oauth2 import service_account
+        from googleapiclient.discovery import build
+
+        credentials = service_account.Credentials.from_service_account_file(
+            credentials_file,
+            scopes=['https://www.googleapis.com/auth/webmasters.readonly']
+        )
+        return cls(build('searchconsole', 'v1', credentials=credentials), **kwargs)
+
+    def get_high_water_mark(self, session: Session, project_id: str, site_url: str) -> Optional[date]:
+        """Last fully synced date for a property."""
+        state = self._get_state(session, project_id, site_url)
+        return state.last_synced_date if state else None
+
+    def _get_state(self, session: Session, project_id: str, site_url: str) -> Optional[GSCSyncState]:
+        return session.query(GSCSyncState).filter(
+            GSCSyncState.project_id == project_id,
+            GSCSyncState.site_url == site_url
+        ).first()
+
+    def _fetch_pages(self, site_url: str, day: date, dimensions: List[str]) -> Iterator[List[Dict[str, Any]]]:
+        """Yield pages of rows for one day until the API runs out."""
+        start_row = 0
+        while True:
+            response = self.service.searchanalytics().query(
+                siteUrl=site_url,
+                body={
+                    'startDate': day.isoformat(),
+                    'endDate': day.isoformat(),
+                    'dimensions': dimensions,
+                    'type': self.search_type,
+                    'dataState': 'final',
+                    'rowLimit': self.row_limit,
+                    'startRow': start_row
+                }
+            ).execute()
+            self.api_requests += 1
+
+            rows = response.get('rows', [])
+            if rows:
+                yield rows
+            if len(rows) < self.row_limit:
+                return
+            start_row += self.row_limit
+
+    def _day_rows(self, project_id: str, site_url: str, day: date) -> Iterator[Dict[str, Any]]:
+        """Table mappings for every row of one day."""
+        stamp = _day_bounds(day)
+        passes = [['page', 'query']]
+        if self.include_page_totals:
+            passes.append(['page'])
+
+        for dimensions in passes:
+            for rows in self._fetch_pages(site_url, day, dimensions):
+                for row in rows:
+                    keys = row.get('keys', [])
+                    yield {
+                        'project_id': project_id,
+                        'date': stamp,
+                        'page': keys[0],
+                        'query': keys[1] if len(keys) > 1 else PAGE_TOTAL_QUERY,
+                        'country': ALL_DIMENSION,
+                        'device': ALL_DIMENSION,
+                        'clicks': int(row.get('clicks', 0)),
+                        'impressions': int(row.get('impressions', 0)),
+                        'ctr': float(row.get('ctr', 0.0)),
+                        'position': float(row.get('position', 0.0)),
+                        'data_freshness': 'final',
+                    }
+
+    def _write_day(self, session: Session, project_id: str, day: date, rows: Iterable[Dict[str, Any]]) -> int:
+        """Replace one day's aggregated rows with a batched bulk insert."""
+        session.query(GSCData).filter(
+            GSCData.project_id == project_id,
+            GSCData.date == _day_bounds(day),
+            GSCData.country == ALL_DIMENSION,
+            GSCData.device == ALL_DIMENSION
+        ).delete(synchronize_session=False)
+
+        written = 0
+        batch = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= self.batch_size:
+                session.execute(insert(GSCData), batch)
+                written += len(batch)
+                batch = []
+        if batch:
+            session.execute(insert(GSCData), batch)
+            written += len(batch)
+        return written
+
+    def sync_property(self,
+                      session: Session,
+                      project_id: str,
+                      site_url: str,
+                      start_date: Optional[date] = None,
+                      end_date: Optional[date] = None) -> GSCSyncResult:
+        """Sync every final day after the high-water mark (or an explicit range).
+
+        Each day is committed with the advanced high-water mark, so an
+        interrupted sync resumes where it stopped.
+        """
+        end_date = end_date or (datetime.now(timezone.utc).date() - timedelta(days=self.data_delay_days))
+        state = self._get_state(session, project_id, site_url)
+        if state is None:
+            state = GSCSyncState(project_id=project_id, site_url=site_url, rows_synced=0)
+            session.add(state)
+
+        if start_date is None:
+            if state.last_synced_date:
+                start_date = state.last_synced_date + timedelta(days=1)
+            else:
+                start_date = end_date - timedelta(days=self.initial_lookback_days - 1)
+
+        requests_before = self.api_requests
+        rows_written = 0
+        days_synced = 0
+        day = start_date
+
+        while day <= end_date:
+            written = self._write_day(session, project_id, day, self._day_rows(project_id, site_url, day))
+            if state.last_synced_date is None or day > state.last_synced_date:
+                state.last_synced_date = day
+            state.rows_synced = (state.rows_synced or 0) + written
+            state.last_run_at = datetime.now(timezone.utc)
+            session.commit()
+
+            rows_written += written
+            days_synced += 1
+            day += timedelta(days=1)
+
+        if days_synced == 0:
+            state.last_run_at = datetime.now(timezone.utc)
+            session.commit()
+
+        logger.info(
+            f"Synced {rows_written} GSC rows over {days_synced} days for {site_url} "
+            f"({self.api_requests - requests_before} API requests)"
+        )
+
+        return GSCSyncResult(
+            project_id=project_id,
+            site_url=site_url,
+            start_date=start_date if days_synced else None,
+            end_date=end_date if days_synced else None,
+            days_synced=days_synced,
+            rows_written=rows_written,
+            api_requests=self.api_requests - requests_before,
+            high_water_mark=state.last_synced_date
+        )
+
+    def sync_project(self, session: Session, project: Project) -> GSCSyncResult:
+        """Sync a project's property (its base URL)."""
+        return self.sync_property(session, project.id, project.base_url)
+
+
+def _date_filter(query, start_date: Optional[datetime], end_date: Optional[datetime]):
+    if start_date is not None:
+        query = query.filter(GSCData.date >= _day_bounds(start_date.date() if isinstance(start_date, datetime) else start_date))
+    if end_date is not None:
+        query = query.filter(GSCData.date <= _day_bounds(end_date.date() if isinstance(end_date, datetime) else end_date))
+    return query
+
+
+def _metrics(clicks: int, impressions: int, weighted_position: float) -> Dict[str, float]:
+    """Summed clicks/impressions with derived CTR and impression-weighted position."""
+    clicks = int(clicks or 0)
+    impressions = int(impressions or 0)
+    return {
+        'clicks': clicks,
+        'impressions': impressions,
+        'ctr': clicks / impressions if impressions else 0.0,
+        'position': (weighted_position or 0.0) / impressions if impressions else 0.0,
+    }
+
+
+def page_performance(session: Session,
+                     project_id: str,
+                     start_date: Optional[datetime] = None,
+                     end_date: Optional[datetime] = None,
+                     pages: Optional[Sequence[str]] = None) -> Dict[str, Dict[str, float]]:
+    """Clicks, impressions, CTR and position per page over a date range."""
+    columns = (
+        GSCData.page,
+        func.sum(GSCData.clicks),
+        func.sum(GSCData.impressions),
+        func.sum(GSCData.position * GSCData.impressions),
+    )
+
+    def run(page_subset: Optional[Sequence[str]]):
+        query = session.query(*columns).filter(
+            GSCData.project_id == project_id,
+            GSCData.query == PAGE_TOTAL_QUERY
+        )
+        query = _date_filter(query, start_date, end_date)
+        if page_subset is not None:
+            query = query.filter(GSCData.page.in_(page_subset))
+        return query.group_by(GSCData.page).all()
+
+    if pages is None:
+        rows = run(None)
+    else:
+        pages = list(dict.fromkeys(pages))
+        rows = [row for i in range(0, len(pages), _IN_CHUNK) for row in run(pages[i:i + _IN_CHUNK])]
+
+    return {page: _metrics(clicks, impressions, weighted) for page, clicks, impressions, weighted in rows}
+
+
+def query_performance(session: Session,
+                      project_id: str,
+                      start_date: Optional[datetime] = None,
+                      end_date: Optional[datetime] = None,
+                      min_impressions: int = 0,
+                      limit: Optional[int] = None) -> List[Dict[str, Any]]:
+    """Queries with summed metrics over a date range, most impressions first."""
+    impressions = func.sum(GSCData.impressions)
+    query = session.query(
+        GSCData.query,
+        func.sum(GSCData.clicks),
+        impressions,
+        func.sum(GSCData.position * GSCData.impressions),
+    ).filter(
+        GSCData.project_id == project_id,
+        GSCData.query.isnot(None),
+        GSCData.query != PAGE_TOTAL_QUERY
+    )
+    query = _date_filter(query, start_date, end_date).group_by(GSCData.query)
+    if min_impressions:
+        query = query.having(impressions >= min_impressions)
+    query = query.order_by(impressions.desc())
+    if limit is not None:
+        query = query.limit(limit)
+
+    return [
+        {'query': text, **_metrics(clicks, total_impressions, weighted)}
+        for text, clicks, total_impressions, weighted in query.all()
+    ]
+
+
+def synced_through(session: Session, project_id: str) -> Optional[date]:
+    """Latest high-water mark across a project's properties."""
+    return session.query(func.max(GSCSyncState.last_synced_date)).filter(
+        GSCSyncState.project_id == project_id
+    ).scalar()
+
+
+def load_page_performance(domain: str,
+                          start_date: Optional[datetime] = None,
+                          end_date: Optional[datetime] = None,
+                          pages: Optional[Sequence[str]] = None,
+                          session_scope=None) -> Optional[Dict[str, Dict[str, float]]]:
+    """Page metrics for a domain from synced GSCData.
+
+    Returns None when the domain has no project or has never been synced,
+    so callers can fall back to querying the API.
+    """
+    if session_scope is None:
+        from .db import get_db_session as session_scope
+
+    try:
+        with session_scope() as session:
+            project = find_project(session, domain)
+            if project is None or synced_through(session, project.id) is None:
+                return None
+            return page_performance(session, project.id, start_date, end_date, pages)
+    except Exception as e:
+        logger.error(f"Failed to read synced GSC data for {domain}: {e}")
+        return None
@@ -10,6 +10,7 @@ import os
 from sqlalchemy import text
 from .db import db_manager, get_db_session
 from .config import settings
+from .instrumentation import traced_httpx_client
 
 
 class HealthChecker:
@@ -95,8 +96,7 @@ class HealthChecker:
         if pagespeed_key:
             start_time = time.time()
             try:
-                import httpx
-                async with httpx.AsyncClient() as client:
+                async with traced_httpx_client('health') as client:
                     response = await client.get(
                         "https://www.googleapis.com/pagespeedonline/v5/runPagespeed",
                         params={"url": "https://www.google.com", "key": pagespeed_key},
@@ -118,8 +118,7 @@ class HealthChecker:
         if openai_key:
             start_time = time.time()
             try:
-                import httpx
-                async with httpx.AsyncClient() as client:
+                async with traced_httpx_client('health') as client:
                     response = await client.get(
                         "https://api.openai.com/v1/models",
                         headers={"Authorization": f"Bearer {openai_key}"},
@@ -0,0 +1,352 @@
+"""Prometheus/OpenMetrics instrumentation for the API, Celery workers, database and outbound HTTP.
+
+Metrics are recorded with ``prometheus_client``. When ``PROMETHEUS_MULTIPROC_DIR``
+is set (gunicorn or Celery prefork), every process writes its samples to
+memory-mapped files in that directory and ``/metrics`` aggregates them on
+scrape. Without ``prometheus_client`` installed all hooks are no-ops.
+"""
+
+import logging
+import os
+import sys
+import time
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import urlparse
+
+try:
+    from prometheus_client import CollectorRegistry, Counter, Gauge, Histogram, REGISTRY
+    from prometheus_client import multiprocess
+    from prometheus_client.openmetrics.exposition import CONTENT_TYPE_LATEST, generate_latest
+    PROMETHEUS_AVAILABLE = True
+except ImportError:
+    PROMETHEUS_AVAILABLE = False
+    CONTENT_TYPE_LATEST = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+
+
+logger = logging.getLogger(__name__)
+
+
+# Latency buckets (seconds) covering fast API calls through slow crawls
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+TASK_BUCKETS = (0.1, 0.5, 1.0, 5.0, 15.0, 30.0, 60.0, 300.0, 900.0, 1800.0, 3600.0)
+
+# Celery message header carrying the publish timestamp
+PUBLISHED_AT_HEADER = "x_published_at"
+
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+# Metrics this copy of the module created, by name
+_METRICS: Dict[str, Any] = {}
+
+
+def _register(metric_class, name: str, documentation: str, *args, **kwargs):
+    """Create a metric in the default registry.
+
+    When another copy of this module (imported under a different package
+    path) already registered the name, prometheus_client raises ValueError
+    and that copy's metric is shared. Names registered by anything else get
+    an unregistered metric, so hooks keep working but are not exported.
+    """
+    try:
+        metric = metric_class(name, documentation, *args, **kwargs)
+    except ValueError:
+        metric = _metric_from_other_copy(name)
+        if metric is None:
+            logger.warning(f"Metric {name} is already registered; this copy of the module will not export it")
+            metric = metric_class(name, documentation, *args, registry=None, **kwargs)
+    _METRICS[name] = metric
+    return metric
+
+
+def _metric_from_other_copy(name: str):
+    this = sys.modules.get(__name__)
+    for module_name, module in list(sys.modules.items()):
+        if module is not this and module_name.split('.')[-2:] == ['seo_bot', 'instrumentation']:
+            metric = getattr(module, '_METRICS', {}).get(name)
+            if metric is not None:
+                return metric
+    return None
+
+
+if PROMETHEUS_AVAILABLE:
+    HTTP_REQUEST_DURATION = _register(
+        Histogram,
+        "seo_bot_http_request_duration_seconds",
+        "API request latency by route template",
+        ["method", "route", "status"],
+        buckets=LATENCY_BUCKETS
+    )
+    CELERY_TASK_DURATION = _register(
+        Histogram,
+        "seo_bot_celery_task_duration_seconds",
+        "Celery task run time",
+        ["task", "queue", "state"],
+        buckets=TASK_BUCKETS
+    )
+    CELERY_QUEUE_WAIT = _register(
+        Histogram,
+        "seo_bot_celery_queue_wait_seconds",
+        "Time between publishing a Celery task and a worker starting it",
+        ["queue"],
+        buckets=TASK_BUCKETS
+    )
+    DB_POOL_CHECKOUTS = _register(
+        Counter,
+        "seo_bot_db_pool_checkouts",
+        "Database connections checked out of the pool"
+    )
+    DB_POOL_IN_USE = _register(
+        Gauge,
+        "seo_bot_db_pool_connections_in_use",
+        "Database connections currently checked out",
+        multiprocess_mode="livesum"
+    )
+    OUTBOUND_HTTP_DURATION = _register(
+        Histogram,
+        "seo_bot_outbound_http_duration_seconds",
+        "Outbound HTTP request latency by host",
+        ["client", "host", "status"],
+        buckets=LATENCY_BUCKETS
+    )
+    DASHBOARD_COLLECTION_DURATION = _register(
+        Histogram,
+        "seo_bot_dashboard_collection_duration_seconds",
+        "Dashboard metric collection time per source",
+        ["source", "outcome"],
+        buckets=LATENCY_BUCKETS
+    )
+
+
+def multiprocess_enabled() -> bool:
+    """Check if samples are shared across worker processes."""
+    return bool(os.environ.get("PROMETHEUS_MULTIPROC_DIR") or os.environ.get("prometheus_multiproc_dir"))
+
+
+def render_metrics() -> Tuple[bytes, str]:
+    """Render all metrics in OpenMetrics text format, returning (body, content type)."""
+    if not PROMETHEUS_AVAILABLE:
+        return b"# EOF\n", CONTENT_TYPE_LATEST
+
+    if multiprocess_enabled():
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+
+    return generate_latest(registry), CONTENT_TYPE_LATEST
+
+
+def mark_worker_dead(pid: int) -> None:
+    """Drop live gauges of an exited worker process.
+
+    Connected to Celery's ``worker_process_shutdown`` by :func:`instrument_celery`;
+    under gunicorn, call it from the ``child_exit`` server hook.
+    """
+    if PROMETHEUS_AVAILABLE and multiprocess_enabled():
+        multiprocess.mark_process_dead(pid)
+
+
+def _status_class(status: Optional[int]) -> str:
+    """Collapse status codes to ``2xx``-style classes to bound label cardinality."""
+    return f"{status // 100}xx" if status else "error"
+
+
+class PrometheusMiddleware:
+    """ASGI middleware timing requests per route template.
+
+    Labels use the matched route path (``/api/v1/projects/{project_id}``),
+    never the raw URL, so label cardinality stays bounded.
+    """
+
+    def __init__(self, app, excluded_paths: Tuple[str, ...] = ("/metrics",)):
+        self.app = app
+        self.excluded_paths = excluded_paths
+
+    async def __call__(self, scope, receive, send):
+        if not PROMETHEUS_AVAILABLE or scope["type"] != "http" or scope["path"] in self.excluded_paths:
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+        start = time.perf_counter()
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            HTTP_REQUEST_DURATION.labels(
+                method=scope["method"],
+                route=self._route_template(scope),
+                status=str(status_code)
+            ).observe(time.perf_counter() - start)
+
+    def _route_template(self, scope) -> str:
+        """Path template of the route that handled the request."""
+        route = scope.get("route")
+        if route is not None and hasattr(route, "path"):
+            return route.path
+
+        # Older Starlette releases do not record the matched route in the scope
+        from starlette.routing import Match
+
+        app = scope.get("app")
+        for candidate in getattr(app, "routes", ()):
+            match, _ = candidate.matches(scope)
+            if match == Match.FULL:
+                return getattr(candidate, "path", UNMATCHED_ROUTE)
+        return UNMATCHED_ROUTE
+
+
+def instrument_celery(celery_app) -> None:
+    """Record Celery task duration and queue wait through task signals."""
+    if not PROMETHEUS_AVAILABLE:
+        return
+
+    from celery import signals
+
+    started_at = {}
+
+    @signals.worker_process_shutdown.connect(weak=False)
+    def worker_process_exited(pid=None, **kwargs):
+        mark_worker_dead(pid or os.getpid())
+
+    @signals.before_task_publish.connect(weak=False)
+    def stamp_publish_time(headers=None, **kwargs):
+        if headers is not None:
+            headers[PUBLISHED_AT_HEADER] = time.time()
+
+    @signals.task_prerun.connect(weak=False)
+    def task_started(task_id=None, task=None, **kwargs):
+        started_at[task_id] = time.perf_counter()
+
+        published_at = getattr(task.request, PUBLISHED_AT_HEADER, None)
+        if published_at is None:
+            published_at = (getattr(task.request, "headers", None) or {}).get(PUBLISHED_AT_HEADER)
+        if published_at is not None:
+            CELERY_QUEUE_WAIT.labels(queue=_task_queue(task)).observe(max(0.0, time.time() - float(published_at)))
+
+    @signals.task_postrun.connect(weak=False)
+    def task_finished(task_id=None, task=None, state=None, **kwargs):
+        start = started_at.pop(task_id, None)
+        if start is not None:
+            CELERY_TASK_DURATION.labels(
+                task=task.name,
+                queue=_task_queue(task),
+                state=state or "UNKNOWN"
+            ).observe(time.perf_counter() - start)
+
+
+def _task_queue(task) -> str:
+    """Queue a task was delivered from."""
+    delivery_info = getattr(task.request, "delivery_info", None) or {}
+    return delivery_info.get("routing_key") or delivery_info.get("queue") or "default"
+
+
+def instrument_engine(engine) -> None:
+    """Count pool checkouts and track in-use connections for a SQLAlchemy engine."""
+    if not PROMETHEUS_AVAILABLE:
+        return
+
+    from sqlalchemy import event
+
+    @event.listens_for(engine, "checkout")
+    def on_checkout(dbapi_connection, connection_record, connection_proxy):
+        DB_POOL_CHECKOUTS.inc()
+        DB_POOL_IN_USE.inc()
+
+    @event.listens_for(engine, "checkin")
+    def on_checkin(dbapi_connection, connection_record):
+        DB_POOL_IN_USE.dec()
+
+
+def observe_outbound_request(client: str, url: str, status: Optional[int], seconds: float) -> None:
+    """Record one outbound HTTP request."""
+    if PROMETHEUS_AVAILABLE:
+        OUTBOUND_HTTP_DURATION.labels(
+            client=client,
+            host=urlparse(url).hostname or "unknown",
+            status=_status_class(status)
+        ).observe(seconds)
+
+
+def observe_dashboard_collection(source: str, outcome: str, seconds: float) -> None:
+    """Record one dashboard collection from a metric source (``ok``, ``timeout``, ``error`` or ``empty``)."""
+    if PROMETHEUS_AVAILABLE:
+        DASHBOARD_COLLECTION_DURATION.labels(source=source, outcome=outcome).observe(seconds)
+
+
+def aiohttp_trace_config(client: str = "aiohttp") -> Optional[Any]:
+    """TraceConfig timing requests made through an ``aiohttp.ClientSession``."""
+    if not PROMETHEUS_AVAILABLE:
+        return None
+
+    import aiohttp
+
+    async def on_request_start(session, context, params):
+        context.started = time.perf_counter()
+
+    async def on_request_end(session, context, params):
+        observe_outbound_request(client, str(params.url), params.response.status, time.perf_counter() - context.started)
+
+    async def on_request_exception(session, context, params):
+        observe_outbound_request(client, str(params.url), None, time.perf_counter() - context.started)
+
+    trace_config = aiohttp.TraceConfig()
+    trace_config.on_request_start.append(on_request_start)
+    trace_config.on_request_end.append(on_request_end)
+    trace_config.on_request_exception.append(on_request_exception)
+    return trace_config
+
+
+def httpx_event_hooks(client: str = "httpx", asynchronous: bool = True) -> dict:
+    """Event hooks timing requests made through an ``httpx.AsyncClient`` (or ``httpx.Client``)."""
+    if not PROMETHEUS_AVAILABLE:
+        return {}
+
+    def on_request(request):
+        request.extensions["seo_bot_started"] = time.perf_counter()
+
+    def on_response(response):
+        started = response.request.extensions.get("seo_bot_started")
+        if started is not None:
+            observe_outbound_request(client, str(response.request.url), response.status_code, time.perf_counter() - started)
+
+    if not asynchronous:
+        return {"request": [on_request], "response": [on_response]}
+
+    async def on_request_async(request):
+        on_request(request)
+
+    async def on_response_async(response):
+        on_response(response)
+
+    return {"request": [on_request_async], "response": [on_response_async]}
+
+
+def traced_httpx_client(client: str = "httpx", asynchronous: bool = True, **kwargs):
+    """Create an ``httpx.AsyncClient`` (or ``httpx.Client``) with outbound timing attached."""
+    import httpx
+
+    hooks = httpx_event_hooks(client, asynchronous)
+    if hooks:
+        event_hooks = {name: list(callbacks) for name, callbacks in (kwargs.get("event_hooks") or {}).items()}
+        for name, callbacks in hooks.items():
+            event_hooks.setdefault(name, []).extend(callbacks)
+        kwargs["event_hooks"] = event_hooks
+    return httpx.AsyncClient(**kwargs) if asynchronous else httpx.Client(**kwargs)
+
+
+def traced_client_session(client: str = "aiohttp", **kwargs):
+    """Create an ``aiohttp.ClientSession`` with outbound timing attached."""
+    import aiohttp
+
+    trace_config = aiohttp_trace_config(client)
+    if trace_config is not None:
+        kwargs["trace_configs"] = list(kwargs.get("trace_configs", [])) + [trace_config]
+    return aiohttp.ClientSession(**kwargs)
@@ -5,6 +5,7 @@ from celery import Celery
 from kombu import Queue, Exchange
 
 from ..config import settings
+from ..instrumentation import instrument_celery
 
 # Configure Celery
 def create_celery_app() -> Celery:
@@ -85,6 +86,16 @@ def create_celery_app() -> Celery:
                 'schedule': 86400.0,  # Daily
                 'options': {'queue': 'analytics'}
             },
+            'sync-gsc-data': {
+                'task': 'seo_bot.jobs.analytics_tasks.sync_gsc_data',
+                'schedule': 86400.0,  # Daily
+                'options': {'queue': 'analytics'}
+            },
+            'refresh-link-equity': {
+                'task': 'seo_bot.jobs.analytics_tasks.refresh_link_equity',
+                'schedule': 86400.0,  # Nightly, warm-started from the last snapshot
+                'options': {'queue': 'analytics'}
+            },
             'cleanup-old-data': {
                 'task': 'seo_bot.jobs.monitoring_tasks.cleanup_old_data',
                 'schedule': 604800.0,  # Weekly
@@ -98,6 +109,8 @@ def create_celery_app() -> Celery:
         }
     )
     
+    instrument_celery(celery_app)
+    
     return celery_app
 
 # Create global Celery instance
@@ -461,4 +461,99 @@ def generate_custom_report(
             state='FAILURE',
             meta={'error': str(exc), 'status': 'Report generation failed'}
         )
-        raise
\ No newline at end of file
+        raise
+
+@celery_app.task(bind=True, base=CallbackTask, name='seo_bot.jobs.analytics_tasks.sync_gsc_data')
+def sync_gsc_data(self, project_id: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Sync new Search Console days into GSCData for active projects.
+    
+    Args:
+        project_id: Limit the sync to one project
+        
+    Returns:
+        Per-project sync results
+    """
+    from ..config import settings
+    from ..db import get_db_session
+    from ..gsc_sync import GSCSyncEngine
+    from ..models import Project
+    
+    if not settings.google_search_console_credentials_file:
+        logger.warning("No GSC credentials configured, skipping sync")
+        return {'status': 'skipped', 'results': []}
+    
+    engine = GSCSyncEngine.from_credentials(settings.google_search_console_credentials_file)
+    results = []
+    
+    with get_db_session() as session:
+        query = session.query(Project).filter(Project.status == 'active')
+        if project_id:
+            query = query.filter(Project.id == project_id)
+        
+        for project in query.all():
+            try:
+                result = engine.sync_project(session, project)
+                results.append({
+                    'project_id': project.id,
+                    'days_synced': result.days_synced,
+                    'rows_written': result.rows_written,
+                    'api_requests': result.api_requests,
+                    'high_water_mark': result.high_water_mark.isoformat() if result.high_water_mark else None
+                })
+            except Exception as exc:
+                session.rollback()
+                logger.error(f"GSC sync failed for project {project.id}: {exc}")
+                results.append({'project_id': project.id, 'error': str(exc)})
+    
+    return {
+        'status': 'completed',
+        'results': results,
+        'completed_at': datetime.utcnow().isoformat()
+    }
+
+
+@celery_app.task(bind=True, base=CallbackTask, name='seo_bot.jobs.analytics_tasks.refresh_link_equity')
+def refresh_link_equity(self, project_id: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Recompute internal link equity for active projects, warm-started from
+    the previous night's snapshot, and save a new snapshot.
+    
+    Args:
+        project_id: Limit the refresh to one project
+        
+    Returns:
+        Per-project refresh results
+    """
+    from ..db import get_db_session
+    from ..linking.pagerank import refresh_link_equity as refresh_project_equity
+    from ..models import Project
+    
+    with get_db_session() as session:
+        query = session.query(Project.id, Project.domain).filter(Project.status == 'active')
+        if project_id:
+            query = query.filter(Project.id == project_id)
+        projects = query.all()
+    
+    results = []
+    for project in projects:
+        try:
+            engine = refresh_project_equity(project.domain)
+            if engine is None:
+                results.append({'project_id': project.id, 'status': 'skipped'})
+                continue
+            results.append({
+                'project_id': project.id,
+                'pages': len(engine.graph),
+                'links': engine.graph.link_count,
+                'iterations': engine.iterations
+            })
+        except Exception as exc:
+            logger.error(f"Link equity refresh failed for project {project.id}: {exc}")
+            results.append({'project_id': project.id, 'error': str(exc)})
+    
+    return {
+        'status': 'completed',
+        'results': results,
+        'completed_at': datetime.utcnow().isoformat()
+    }
@@ -10,11 +10,12 @@ import re
 import statistics
 import traceback
 from collections import Counter, defaultdict
-from typing import Any, Dict, List, Optional, Set, Tuple, Union
+from typing import Any, Dict, List, Mapping, Optional, Set, Tuple, Union
 
 import numpy as np
 from sqlalchemy.orm import Session
 
+from ..linking.pagerank import load_keyword_equity
 from ..models import Cluster, Keyword
 
 logger = logging.getLogger(__name__)
@@ -452,13 +453,21 @@ class ClusterLabeler:
 class HubSpokeAnalyzer:
     """Identifies hub and spoke relationships in keyword clusters."""
     
-    def __init__(self, hub_threshold: float = 0.7) -> None:
+    def __init__(
+        self,
+        hub_threshold: float = 0.7,
+        keyword_equity: Optional[Mapping[str, float]] = None
+    ) -> None:
         """Initialize hub-spoke analyzer.
         
         Args:
             hub_threshold: Similarity threshold for hub identification
+            keyword_equity: Internal link equity of the page ranking for each
+                keyword, relative to the site average (see
+                ``LinkEquityEngine.keyword_equity``)
         """
         self.hub_threshold = hub_threshold
+        self.keyword_equity = keyword_equity
     
     def _calculate_similarity_matrix(self, embeddings: np.ndarray) -> np.ndarray:
         """Calculate cosine similarity matrix.
@@ -551,8 +560,34 @@ class HubSpokeAnalyzer:
                 'total_keywords': len(keywords),
                 'hub_coverage': len(spokes) / max(len(keywords) - 1, 1)
             }
+            if self.keyword_equity is not None:
+                relationships[cluster_id].update(self._equity_flow(hub, spokes))
         
         return relationships
+    
+    def _equity_flow(self, hub: str, spokes: List[str]) -> Dict[str, Any]:
+        """Link equity of a cluster's hub and spokes.
+        
+        Args:
+            hub: Hub keyword
+            spokes: Spoke keywords
+            
+        Returns:
+            Hub and spoke equity, and the spokes below the cluster's median
+            equity (least first) that the hub should link to
+        """
+        equity = {keyword: self.keyword_equity.get(keyword, 0.0) for keyword in [hub] + spokes}
+        spoke_equity = {keyword: equity[keyword] for keyword in spokes}
+        median = float(np.median(list(equity.values())))
+        needing = sorted(
+            (keyword for keyword, score in spoke_equity.items() if score < median),
+            key=spoke_equity.get
+        )
+        return {
+            'hub_equity': equity[hub],
+            'spoke_equity': spoke_equity,
+            'spokes_needing_equity': needing
+        }
 
 
 class SemanticRelationshipMapper:
@@ -1114,7 +1149,8 @@ class KeywordClusterManager:
         min_cluster_size: int = 3,
         min_samples: int = 2,
         cluster_selection_epsilon: float = 0.5,
-        max_clusters: int = 50
+        max_clusters: int = 50,
+        project_id: Optional[str] = None
     ) -> None:
         """Initialize cluster manager.
         
@@ -1123,6 +1159,8 @@ class KeywordClusterManager:
             min_samples: Minimum samples for core points
             cluster_selection_epsilon: Cluster selection threshold
             max_clusters: Maximum number of clusters
+            project_id: Project whose internal link equity is reported for
+                hubs and spokes (omit to skip link equity)
         """
         self.clusterer = KeywordClusterer(
             min_cluster_size=min_cluster_size,
@@ -1131,7 +1169,8 @@ class KeywordClusterManager:
             max_clusters=max_clusters
         )
         self.labeler = ClusterLabeler()
-        self.hub_spoke_analyzer = HubSpokeAnalyzer()
+        keyword_equity = load_keyword_equity(project_id) if project_id else None
+        self.hub_spoke_analyzer = HubSpokeAnalyzer(keyword_equity=keyword_equity)
         self.relationship_mapper = SemanticRelationshipMapper()
         self.hierarchy_builder = TopicHierarchyBuilder()
         self.validator = StatisticalValidator()
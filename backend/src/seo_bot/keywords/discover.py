@@ -13,6 +13,7 @@ from sqlalchemy.orm import Session
 
 from ..config import KeywordsConfig, settings
 from ..db import get_db_session
+from ..gsc_sync import PAGE_TOTAL_QUERY, GSCSyncEngine, query_performance
 from ..logging import get_logger, LoggerMixin
 from ..models import GSCData, Keyword, Project
 from .score import KeywordScorer, SearchIntent
@@ -77,27 +78,40 @@ class GSCIntegrator:
         site_url: str,
         days: int = 30,
         min_impressions: int = 10,
-        max_queries: int = 1000
+        max_queries: int = 1000,
+        session: Optional[Session] = None,
+        project_id: Optional[str] = None
     ) -> List[Dict]:
         """
         Fetch queries from Google Search Console.
         
+        With a session and project, the property is first synced
+        incrementally into GSCData and queries are read from the table;
+        otherwise the API is queried directly.
+        
         Args:
             site_url: Site URL in GSC
             days: Days back to fetch data
             min_impressions: Minimum impressions threshold
             max_queries: Maximum queries to return
+            session: Database session for table-backed reads
+            project_id: Project owning the property
             
         Returns:
             List of query data dictionaries
         """
+        end_date = datetime.now().date()
+        start_date = end_date - timedelta(days=days)
+        
+        if session is not None and project_id is not None:
+            return self._fetch_queries_from_table(
+                session, project_id, site_url, start_date, end_date, min_impressions, max_queries
+            )
+        
         service = self.get_service()
         if not service:
             return []
         
-        end_date = datetime.now().date()
-        start_date = end_date - timedelta(days=days)
-        
         request = {
             'startDate': start_date.isoformat(),
             'endDate': end_date.isoformat(),
@@ -135,12 +149,48 @@ class GSCIntegrator:
             self.logger.error(f"Failed to fetch GSC queries: {e}")
             return []
     
+    def _fetch_queries_from_table(
+        self,
+        session: Session,
+        project_id: str,
+        site_url: str,
+        start_date,
+        end_date,
+        min_impressions: int,
+        max_queries: int
+    ) -> List[Dict]:
+        """Sync new days into GSCData, then aggregate queries from it."""
+        service = self.get_service()
+        if service:
+            try:
+                GSCSyncEngine(service).sync_property(session, project_id, site_url)
+            except Exception as e:
+                session.rollback()
+                self.logger.error(f"Failed to sync GSC data: {e}")
+        
+        try:
+            queries = query_performance(
+                session, project_id, start_date, end_date,
+                min_impressions=min_impressions, limit=max_queries
+            )
+            self.logger.info(
+                f"Read {len(queries)} queries from GSC data",
+                site_url=site_url,
+                date_range=f"{start_date} to {end_date}"
+            )
+            return queries
+        
+        except Exception as e:
+            self.logger.error(f"Failed to read GSC queries from database: {e}")
+            return []
+    
     def get_existing_gsc_keywords(self, session: Session, project_id: str) -> List[str]:
         """Get existing keywords from GSC data in database."""
         try:
             gsc_data = session.query(GSCData).filter(
                 GSCData.project_id == project_id,
-                GSCData.query.isnot(None)
+                GSCData.query.isnot(None),
+                GSCData.query != PAGE_TOTAL_QUERY
             ).distinct(GSCData.query).limit(5000).all()
             
             keywords = [data.query for data in gsc_data if data.query]
@@ -407,8 +457,10 @@ class KeywordDiscoverer(LoggerMixin):
             if use_gsc and self.gsc_integrator.credentials_file:
                 self.logger.info("Fetching keywords from Google Search Console")
                 
-                # Try API first
-                gsc_queries = self.gsc_integrator.fetch_queries(project.base_url)
+                # Sync new days into GSCData and aggregate queries from it
+                gsc_queries = self.gsc_integrator.fetch_queries(
+                    project.base_url, session=session, project_id=project.id
+                )
                 if gsc_queries:
                     for query_data in gsc_queries:
                         discovered_keywords.append(DiscoveredKeyword(
@@ -11,6 +11,7 @@ import httpx
 import numpy as np
 
 from ..config import settings
+from ..instrumentation import traced_httpx_client
 from ..logging import get_logger, LoggerMixin
 
 
@@ -184,7 +185,9 @@ class ContentAnalyzer:
     def __init__(self):
         """Initialize content analyzer."""
         self.logger = get_logger(self.__class__.__name__)
-        self.session = httpx.Client(
+        self.session = traced_httpx_client(
+            'serp_content',
+            asynchronous=False,
             timeout=30,
             headers={
                 'User-Agent': 'SEO-Bot Content Analyzer 1.0'
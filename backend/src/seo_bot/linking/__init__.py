@@ -13,6 +13,8 @@ from .entities import (
     EntityPage,
     create_entity_manager,
 )
+from .graph import InternalLinkGraph, LinkGraphReport, load_link_graph
+from .pagerank import LinkEquityEngine
 
 __all__ = [
     # Main manager
@@ -31,4 +33,10 @@ __all__ = [
     "EntityRelationship",
     "EntityMention",
     "EntityPage",
+    
+    # Internal link graph
+    "InternalLinkGraph",
+    "LinkGraphReport",
+    "load_link_graph",
+    "LinkEquityEngine",
 ]
\ No newline at end of file
@@ -0,0 +1,276 @@
+"""Internal PageRank and link-equity engine.
+
+:class:`LinkEquityEngine` scores every page of a project by PageRank over
+its ``InternalLink`` graph, and by personalized PageRank for a set of seed
+pages (equity flowing from a hub, for example). When links change, scores
+are recomputed by power iteration warm-started from the previous scores,
+which converges in a fraction of the iterations of a cold start because
+most of the site's equity does not move. Scores can be saved and loaded so
+a nightly job warm-starts from the last run: :func:`load_link_equity`
+builds the engine over the current graph from the last snapshot, and
+:func:`refresh_link_equity` writes a new one.
+"""
+
+import json
+import logging
+from pathlib import Path
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple, Union
+
+import numpy as np
+from scipy import sparse
+
+from ..config import settings
+from ..models import Page, Project
+from .graph import (
+    DEFAULT_DAMPING,
+    PAGERANK_MAX_ITERATIONS,
+    PAGERANK_TOLERANCE,
+    InternalLinkGraph,
+    load_link_graph,
+)
+
+
+logger = logging.getLogger(__name__)
+
+
+class LinkEquityEngine:
+    """PageRank-based link equity over an internal link graph."""
+
+    def __init__(self,
+                 graph: InternalLinkGraph,
+                 damping: float = DEFAULT_DAMPING,
+                 tolerance: float = PAGERANK_TOLERANCE,
+                 max_iterations: int = PAGERANK_MAX_ITERATIONS):
+        """Initialize the engine.
+
+        Args:
+            graph: Internal link graph to score
+            damping: PageRank damping factor
+            tolerance: L1 change at which power iteration stops
+            max_iterations: Power iteration limit
+        """
+        self.graph = graph
+        self.damping = damping
+        self.tolerance = tolerance
+        self.max_iterations = max_iterations
+        self.scores: Optional[np.ndarray] = None
+        # Iterations used by the last computation
+        self.iterations = 0
+
+    @classmethod
+    def for_domain(cls, domain: str, session_scope=None, **kwargs) -> Optional["LinkEquityEngine"]:
+        """Engine over the link graph of the project for ``domain``, or None."""
+        graph = load_link_graph(domain, session_scope)
+        return cls(graph, **kwargs) if graph is not None else None
+
+    def compute(self, previous: Optional[Mapping[str, float]] = None) -> np.ndarray:
+        """Global PageRank of every page.
+
+        Args:
+            previous: Scores by URL from an earlier run to warm-start from;
+                pages without a previous score start at the mean
+        """
+        start = self._start_vector(previous) if previous else self.scores
+        self.scores, self.iterations = self.graph.power_iteration(
+            self.damping, start=start, tolerance=self.tolerance, max_iterations=self.max_iterations
+        )
+        logger.debug(f"Link equity for {len(self.graph)} pages computed in {self.iterations} iterations")
+        return self.scores
+
+    def update_links(self,
+                     added: Iterable[Tuple[str, str]] = (),
+                     removed: Iterable[Tuple[str, str]] = ()) -> np.ndarray:
+        """Apply link changes and recompute, warm-started from the current scores."""
+        previous = self.scores_by_url() if self.scores is not None else None
+        self.graph = self.graph.with_links(added, removed)
+        return self.compute(previous)
+
+    def personalized(self,
+                     seeds: Union[Iterable[str], Mapping[str, float]],
+                     warm_start: bool = True) -> Dict[str, float]:
+        """Personalized PageRank: equity flowing from ``seeds``.
+
+        Args:
+            seeds: Seed URLs, or seed URLs mapped to teleport weights
+            warm_start: Start from the global scores (computed if needed)
+
+        Returns:
+            Scores by URL of pages with non-zero score
+        """
+        weights = seeds if isinstance(seeds, Mapping) else {url: 1.0 for url in seeds}
+        teleport = np.zeros(len(self.graph))
+        for url, weight in weights.items():
+            node = self.graph.index.get(url)
+            if node is not None:
+                teleport[node] = weight
+        if teleport.sum() <= 0:
+            return {}
+
+        start = None
+        if warm_start:
+            if self.scores is None:
+                self.compute()
+            start = self.scores
+        rank, iterations = self.graph.power_iteration(
+            self.damping, personalization=teleport, start=start,
+            tolerance=self.tolerance, max_iterations=self.max_iterations
+        )
+        nonzero = np.flatnonzero(rank)
+        return {self.graph.urls[i]: float(rank[i]) for i in nonzero.tolist()}
+
+    def score(self, url: str) -> Optional[float]:
+        """Score of one page; None for pages not in the graph."""
+        node = self.graph.index.get(url)
+        if node is None:
+            return None
+        return float(self._scores()[node])
+
+    def scores_by_url(self) -> Dict[str, float]:
+        return dict(zip(self.graph.urls, self._scores().tolist()))
+
+    def relative_scores(self) -> np.ndarray:
+        """Scores scaled so that an average page has 1.0."""
+        return self._scores() * len(self.graph)
+
+    def rank_by_need(self, urls: Iterable[str]) -> List[Tuple[str, Optional[float]]]:
+        """``(url, score)`` with the pages most in need of equity first.
+
+        Pages not in the graph (no links at all yet) come first.
+        """
+        scored = [(url, self.score(url)) for url in urls]
+        return sorted(scored, key=lambda item: -1.0 if item[1] is None else item[1])
+
+    def keyword_equity(self, session, project_id: str) -> Dict[str, float]:
+        """Relative equity of the best page targeting each keyword of a project."""
+        relative = self.relative_scores()
+        equity: Dict[str, float] = {}
+        pages = session.query(Page.url, Page.target_keywords).filter(Page.project_id == project_id)
+        for url, keywords in pages:
+            node = self.graph.index.get(url)
+            if node is None:
+                continue
+            for keyword in keywords or []:
+                equity[keyword] = max(equity.get(keyword, 0.0), float(relative[node]))
+        return equity
+
+    def save(self, path: Union[str, Path]) -> None:
+        """Write the graph and scores to a compressed ``.npz`` file."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        config = {'damping': self.damping, 'urls': self.graph.urls}
+        matrix = self.graph.matrix
+        with open(path, 'wb') as handle:
+            np.savez_compressed(
+                handle,
+                config=np.frombuffer(json.dumps(config).encode(), dtype=np.uint8),
+                indptr=matrix.indptr,
+                indices=matrix.indices,
+                scores=self.scores if self.scores is not None else np.empty(0),
+            )
+
+    @classmethod
+    def load(cls, path: Union[str, Path], **kwargs) -> "LinkEquityEngine":
+        """Engine saved with :meth:`save`."""
+        with np.load(Path(path)) as data:
+            config = json.loads(data['config'].tobytes().decode())
+            urls = config['urls']
+            matrix = sparse.csr_matrix(
+                (np.ones(len(data['indices']), dtype=np.float32), data['indices'], data['indptr']),
+                shape=(len(urls), len(urls))
+            )
+            scores = data['scores']
+        engine = cls(InternalLinkGraph(urls, matrix), damping=config['damping'], **kwargs)
+        engine.scores = scores if len(scores) == len(urls) else None
+        return engine
+
+    def _scores(self) -> np.ndarray:
+        if self.scores is None:
+            self.compute()
+        return self.scores
+
+    def _start_vector(self, previous: Mapping[str, float]) -> np.ndarray:
+        known = np.array([previous.get(url, np.nan) for url in self.graph.urls], dtype=np.float64)
+        missing = np.isnan(known)
+        if missing.all():
+            return None
+        known[missing] = known[~missing].mean()
+        return known
+
+
+def snapshot_path(domain: str, directory: Optional[Union[str, Path]] = None) -> Path:
+    """Where the nightly link equity snapshot of ``domain`` is kept."""
+    return Path(directory or settings.link_equity_dir) / f"{domain.lower()}.npz"
+
+
+def load_link_equity(domain: str,
+                     session_scope=None,
+                     snapshot_dir: Optional[Union[str, Path]] = None) -> Optional[LinkEquityEngine]:
+    """Scored engine over the current link graph of ``domain``, or None.
+
+    Scores are warm-started from the last snapshot when one exists.
+    """
+    engine = LinkEquityEngine.for_domain(domain, session_scope)
+    if engine is None:
+        return None
+
+    previous = None
+    path = snapshot_path(domain, snapshot_dir)
+    if path.exists():
+        try:
+            previous = LinkEquityEngine.load(path).scores_by_url()
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable link equity snapshot {path}: {e}")
+    engine.compute(previous)
+    return engine
+
+
+def current_link_equity(domain: str,
+                        session_scope=None,
+                        snapshot_dir: Optional[Union[str, Path]] = None) -> Optional[LinkEquityEngine]:
+    """Engine from the nightly snapshot of ``domain``, computed only when there is none.
+
+    For readers that rank pages per request: the snapshot is at most a day
+    behind the link graph, while :func:`load_link_equity` reloads the graph
+    and reruns PageRank.
+    """
+    path = snapshot_path(domain, snapshot_dir)
+    if path.exists():
+        try:
+            engine = LinkEquityEngine.load(path)
+            if engine.scores is not None:
+                return engine
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable link equity snapshot {path}: {e}")
+    return load_link_equity(domain, session_scope, snapshot_dir)
+
+
+def refresh_link_equity(domain: str,
+                        session_scope=None,
+                        snapshot_dir: Optional[Union[str, Path]] = None) -> Optional[LinkEquityEngine]:
+    """Recompute the link equity of ``domain`` from its last snapshot and save a new one."""
+    engine = load_link_equity(domain, session_scope, snapshot_dir)
+    if engine is not None:
+        engine.save(snapshot_path(domain, snapshot_dir))
+    return engine
+
+
+def load_keyword_equity(project_id: str,
+                        session_scope=None,
+                        snapshot_dir: Optional[Union[str, Path]] = None) -> Optional[Dict[str, float]]:
+    """Relative equity per keyword of a project, or None without a link graph.
+
+    See :meth:`LinkEquityEngine.keyword_equity`.
+    """
+    if session_scope is None:
+        from ..db import get_db_session as session_scope
+
+    try:
+        with session_scope() as session:
+            project = session.get(Project, project_id)
+            if project is None:
+                return None
+            engine = current_link_equity(project.domain, session_scope, snapshot_dir)
+            return engine.keyword_equity(session, project_id) if engine is not None else None
+    except Exception as e:
+        logger.error(f"Failed to load keyword link equity for project {project_id}: {e}")
+        return None
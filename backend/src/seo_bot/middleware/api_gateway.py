@@ -109,7 +109,7 @@ class APIGatewayMiddleware(BaseHTTPMiddleware):
     async def _validate_api_key(self, request: Request) -> None:
         """Validate API key for protected endpoints."""
         # Skip validation for public endpoints
-        public_paths = ['/health', '/docs', '/redoc', '/openapi.json']
+        public_paths = ['/health', '/metrics', '/docs', '/redoc', '/openapi.json']
         if any(request.url.path.startswith(path) for path in public_paths):
             return
         
@@ -201,6 +201,7 @@ class AuthMiddleware:
         # Paths that don't require authentication
         self.public_paths = [
             '/health',
+            '/metrics',
             '/docs',
             '/redoc',
             '/openapi.json',
@@ -277,7 +277,7 @@ class RateLimitMiddleware:
         request = Request(scope, receive)
         
         # Skip rate limiting for certain paths
-        skip_paths = ['/docs', '/redoc', '/openapi.json', '/favicon.ico']
+        skip_paths = ['/metrics', '/docs', '/redoc', '/openapi.json', '/favicon.ico']
         if any(request.url.path.startswith(path) for path in skip_paths):
             await self.app(scope, receive, send)
             return
@@ -8,9 +8,11 @@ from enum import Enum
 from sqlalchemy import (
     Boolean,
     Column,
+    Date,
     DateTime,
     Float,
     ForeignKey,
+    Index,
     Integer,
     JSON,
     String,
@@ -449,12 +451,36 @@ class GSCData(Base, TimestampMixin):
     __table_args__ = (
         UniqueConstraint('project_id', 'date', 'page', 'query', 'country', 'device', 
                         name='_gsc_unique_row_uc'),
+        Index('ix_gsc_data_project_page_date', 'project_id', 'page', 'date'),
+        Index('ix_gsc_data_project_query_date', 'project_id', 'query', 'date'),
     )
     
     def __repr__(self):
         return f"<GSCData(page='{self.page[:50]}...', query='{self.query}')>"
 
 
+class GSCSyncState(Base, TimestampMixin):
+    """GSCSyncState tracks how far Search Console data has been synced per property."""
+    
+    __tablename__ = "gsc_sync_state"
+    
+    id = Column(GUID(), primary_key=True, default=lambda: str(uuid4()))
+    project_id = Column(GUID(), ForeignKey("projects.id"), nullable=False)
+    site_url = Column(String(500), nullable=False)
+    
+    # Last fully synced date (high-water mark)
+    last_synced_date = Column(Date)
+    last_run_at = Column(DateTime(timezone=True))
+    rows_synced = Column(Integer, default=0)
+    
+    __table_args__ = (
+        UniqueConstraint('project_id', 'site_url', name='_gsc_sync_state_uc'),
+    )
+    
+    def __repr__(self):
+        return f"<GSCSyncState(site_url='{self.site_url}', last_synced_date={self.last_synced_date})>"
+
+
 class ContentBrief(Base, TimestampMixin):
     """ContentBrief stores content planning and requirements."""
     
@@ -11,8 +11,10 @@ from .coverage import (
 from .dashboard import (
     DashboardServer,
     MetricsCollector,
+    SourceCollection,
     DashboardDataProcessor,
     DashboardWebSocketManager,
+    DashboardStateCache,
     MetricData,
     KPIWidget,
     ChartData,
@@ -23,12 +25,17 @@ from .dashboard import (
     export_dashboard_config
 )
 
+from .metric_store import MetricHistoryStore
+
+from .anomaly import OnlineAnomalyDetector, AnomalyScore
+
 from .alerts import (
     AlertManager,
     Alert,
     AlertRule,
     NotificationDelivery,
     AnomalyDetector,
+    MetricSample,
     AlertType,
     AlertStatus,
     AlertChannel,
@@ -44,8 +51,10 @@ __all__ = [
     'run_coverage_monitor',
     'DashboardServer',
     'MetricsCollector',
+    'SourceCollection',
     'DashboardDataProcessor',
     'DashboardWebSocketManager',
+    'DashboardStateCache',
     'MetricData',
     'KPIWidget',
     'ChartData',
@@ -54,11 +63,15 @@ __all__ = [
     'TimeRange',
     'launch_dashboard',
     'export_dashboard_config',
+    'MetricHistoryStore',
     'AlertManager',
     'Alert',
     'AlertRule',
     'NotificationDelivery',
     'AnomalyDetector',
+    'OnlineAnomalyDetector',
+    'MetricSample',
+    'AnomalyScore',
     'AlertType',
     'AlertStatus',
     'AlertChannel',
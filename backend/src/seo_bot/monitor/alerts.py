@@ -10,20 +10,18 @@ import json
 import smtplib
 import hashlib
 from datetime import datetime, timedelta, timezone
-from typing import Dict, List, Optional, Set, Tuple, Union, Any
+from collections import deque
+from typing import Any, Deque, Dict, Hashable, List, Optional, Set, Tuple, Union
 from dataclasses import dataclass, asdict
 from enum import Enum
 from pathlib import Path
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 
-import httpx
-import numpy as np
-from sklearn.preprocessing import StandardScaler
-from sklearn.ensemble import IsolationForest
-
 from ..config import MonitoringConfig, Settings
+from ..instrumentation import traced_httpx_client
 from ..models import AlertSeverity
+from .anomaly import AnomalyScore, OnlineAnomalyDetector
 
 
 logger = logging.getLogger(__name__)
@@ -158,90 +156,157 @@ class NotificationTemplate:
     include_logs: bool = False
 
 
+@dataclass
+class MetricSample:
+    """A single metric observation submitted for rule evaluation."""
+    metric_name: str
+    value: float
+    project_id: str
+    url: Optional[str] = None
+    timestamp: Optional[datetime] = None
+
+
+class RuleRegistry(dict):
+    """Rule dictionary that records a version on every mutation.
+    
+    AlertManager rebuilds its rule index only when the version changes.
+    """
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.version = 0
+    
+    def _touch(self):
+        self.version += 1
+    
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self._touch()
+    
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self._touch()
+    
+    def pop(self, *args):
+        result = super().pop(*args)
+        self._touch()
+        return result
+    
+    def popitem(self):
+        result = super().popitem()
+        self._touch()
+        return result
+    
+    def clear(self):
+        super().clear()
+        self._touch()
+    
+    def update(self, *args, **kwargs):
+        super().update(*args, **kwargs)
+        self._touch()
+    
+    def setdefault(self, key, default=None):
+        result = super().setdefault(key, default)
+        self._touch()
+        return result
+
+
+class AlertRuleIndex:
+    """Rules grouped by metric name and targeted project.
+    
+    Lookup returns the rules for a metric that apply to all projects plus
+    those targeting the given project, in registration order.
+    """
+    
+    def __init__(self, rules: List[AlertRule]):
+        """Build the index from rules in registration order."""
+        self._global: Dict[str, List[Tuple[int, AlertRule]]] = {}
+        self._by_project: Dict[Tuple[str, str], List[Tuple[int, AlertRule]]] = {}
+        
+        for order, rule in enumerate(rules):
+            if rule.project_ids:
+                for project_id in rule.project_ids:
+                    self._by_project.setdefault((rule.metric_name, project_id), []).append((order, rule))
+            else:
+                self._global.setdefault(rule.metric_name, []).append((order, rule))
+    
+    def lookup(self, metric_name: str, project_id: str) -> List[AlertRule]:
+        """Rules applicable to a metric sample."""
+        global_rules = self._global.get(metric_name, [])
+        project_rules = self._by_project.get((metric_name, project_id))
+        if not project_rules:
+            return [rule for _, rule in global_rules]
+        return [rule for _, rule in sorted(global_rules + project_rules, key=lambda entry: entry[0])]
+
+
 class AnomalyDetector:
-    """Machine learning-based anomaly detection."""
+    """Streaming anomaly detection over metric series.
+    
+    Thin facade over OnlineAnomalyDetector: history is absorbed in O(1)
+    per value and scoring never rescans it. Series are keyed by metric
+    name, project and URL (see ``series_key``); seeding, scoring and
+    updates all use the same key.
+    """
     
-    def __init__(self, sensitivity: float = 0.1):
+    def __init__(self, sensitivity: float = 0.1, z_threshold: float = 3.0, window_size: int = 256):
         """Initialize anomaly detector.
         
         Args:
             sensitivity: Detection sensitivity (0.0-1.0, lower = more sensitive)
+            z_threshold: Deviation, in standard deviations, treated as anomalous
+            window_size: Number of recent values kept per series
         """
         self.sensitivity = sensitivity
-        self.models = {}
-        self.scalers = {}
-        self.historical_data = {}
+        self.online = OnlineAnomalyDetector(window_size=window_size, z_threshold=z_threshold)
         
-    def train_model(self, metric_name: str, historical_values: List[float]):
-        """Train anomaly detection model for a metric."""
+    @staticmethod
+    def series_key(metric_name: str, project_id: Optional[str] = None, url: Optional[str] = None) -> Tuple:
+        """Key of the series a metric sample belongs to."""
+        return (metric_name, project_id, url)
+    
+    def train_model(self,
+                    metric_name: str,
+                    historical_values: List[float],
+                    project_id: Optional[str] = None,
+                    url: Optional[str] = None,
+                    timestamps: List[datetime] = None):
+        """Seed a series baseline from historical values, oldest first."""
         if len(historical_values) < 20:
             logger.warning(f"Insufficient data to train anomaly model for {metric_name}")
             return
         
-        # Prepare data
-        values = np.array(historical_values).reshape(-1, 1)
-        
-        # Scale data
-        scaler = StandardScaler()
-        scaled_values = scaler.fit_transform(values)
-        
-        # Train isolation forest
-        model = IsolationForest(
-            contamination=self.sensitivity,
-            random_state=42,
-            n_estimators=100
-        )
-        model.fit(scaled_values)
-        
-        # Store model and scaler
-        self.models[metric_name] = model
-        self.scalers[metric_name] = scaler
-        self.historical_data[metric_name] = values.flatten()
-        
-        logger.info(f"Trained anomaly detection model for {metric_name}")
+        self.online.seed(self.series_key(metric_name, project_id, url), historical_values, timestamps)
+        logger.info(f"Seeded anomaly baseline for {metric_name}")
     
-    def detect_anomaly(self, metric_name: str, value: float) -> Tuple[bool, float]:
-        """Detect if a value is anomalous.
+    def detect_anomaly(self,
+                       metric_name: str,
+                       value: float,
+                       timestamp: datetime = None,
+                       project_id: Optional[str] = None,
+                       url: Optional[str] = None) -> Tuple[bool, float]:
+        """Detect if a value is anomalous without absorbing it.
         
         Returns:
-            Tuple of (is_anomaly, anomaly_score)
+            Tuple of (is_anomaly, anomaly_score) where a more negative score is more anomalous
         """
-        if metric_name not in self.models:
-            return False, 0.0
-        
-        model = self.models[metric_name]
-        scaler = self.scalers[metric_name]
-        
-        # Scale the value
-        scaled_value = scaler.transform([[value]])
-        
-        # Get anomaly score
-        anomaly_score = model.decision_function(scaled_value)[0]
-        is_anomaly = model.predict(scaled_value)[0] == -1
-        
-        # Additional statistical checks
-        if metric_name in self.historical_data:
-            historical = self.historical_data[metric_name]
-            mean = np.mean(historical)
-            std = np.std(historical)
-            
-            # Z-score check (3 sigma rule)
-            z_score = abs(value - mean) / std if std > 0 else 0
-            if z_score > 3:
-                is_anomaly = True
-                anomaly_score = min(anomaly_score, -0.5)
-        
-        return is_anomaly, anomaly_score
+        result = self.online.score(self.series_key(metric_name, project_id, url), value, timestamp, update=False)
+        return result.is_anomaly, -result.z_score
     
-    def update_historical_data(self, metric_name: str, value: float):
+    def update_historical_data(self,
+                               metric_name: str,
+                               value: float,
+                               timestamp: datetime = None,
+                               project_id: Optional[str] = None,
+                               url: Optional[str] = None):
         """Update historical data with new value."""
-        if metric_name in self.historical_data:
-            # Keep last 1000 values
-            data = list(self.historical_data[metric_name])
-            data.append(value)
-            if len(data) > 1000:
-                data = data[-1000:]
-            self.historical_data[metric_name] = np.array(data)
+        self.online.update(self.series_key(metric_name, project_id, url), value, timestamp)
+    
+    def score_batch(self,
+                    series_keys: List[Hashable],
+                    values: List[float],
+                    timestamps: List[datetime] = None) -> List[AnomalyScore]:
+        """Score and absorb a batch of samples across many series at once."""
+        return self.online.score_batch(series_keys, values, timestamps)
 
 
 class NotificationDelivery:
@@ -302,7 +367,7 @@ class NotificationDelivery:
             if attachments:
                 payload["attachments"] = attachments
             
-            async with httpx.AsyncClient() as client:
+            async with traced_httpx_client('alerts') as client:
                 response = await client.post(webhook_url, json=payload)
                 response.raise_for_status()
             
@@ -318,7 +383,7 @@ class NotificationDelivery:
                            payload: Dict) -> bool:
         """Send webhook notification."""
         try:
-            async with httpx.AsyncClient() as client:
+            async with traced_httpx_client('alerts') as client:
                 response = await client.post(webhook_url, json=payload, timeout=10.0)
                 response.raise_for_status()
             
@@ -357,12 +422,14 @@ class AlertManager:
         
         # Alert storage (would use database in production)
         self.active_alerts: Dict[str, Alert] = {}
-        self.alert_rules: Dict[str, AlertRule] = {}
+        self.alert_rules: Dict[str, AlertRule] = RuleRegistry()
+        self._rule_index: Optional[AlertRuleIndex] = None
+        self._rule_index_version = -1
         self.notification_templates: Dict[str, NotificationTemplate] = {}
         self.suppression_windows: List[Tuple[datetime, datetime]] = []
         
         # Metrics for rule evaluation
-        self.metric_history: Dict[str, List[Tuple[datetime, float]]] = {}
+        self.metric_history: Dict[str, Deque[Tuple[datetime, float]]] = {}
         
         # Initialize default rules and templates
         self._setup_default_rules()
@@ -494,6 +561,19 @@ class AlertManager:
             key = f"{template.alert_type.value}_{template.channel.value}"
             self.notification_templates[key] = template
     
+    @property
+    def rule_index(self) -> AlertRuleIndex:
+        """Index of rules by metric and project, rebuilt when rules change."""
+        version = getattr(self.alert_rules, "version", None)
+        if self._rule_index is None or version is None or version != self._rule_index_version:
+            self._rule_index = AlertRuleIndex(list(self.alert_rules.values()))
+            self._rule_index_version = version if version is not None else -1
+        return self._rule_index
+    
+    def reindex_rules(self):
+        """Rebuild the rule index after editing a rule's metric or targeting in place."""
+        self._rule_index = None
+    
     async def evaluate_metric(self, 
                               metric_name: str,
                               value: float,
@@ -501,60 +581,88 @@ class AlertManager:
                               url: str = None,
                               timestamp: datetime = None) -> List[Alert]:
         """Evaluate a metric value against alert rules."""
-        if timestamp is None:
-            timestamp = datetime.now(timezone.utc)
-        
-        # Store metric value
-        if metric_name not in self.metric_history:
-            self.metric_history[metric_name] = []
-        
-        self.metric_history[metric_name].append((timestamp, value))
-        
-        # Keep only last 1000 values
-        if len(self.metric_history[metric_name]) > 1000:
-            self.metric_history[metric_name] = self.metric_history[metric_name][-1000:]
+        return await self.evaluate_metrics([
+            MetricSample(metric_name, value, project_id, url, timestamp)
+        ])
+    
+    async def evaluate_metrics(self,
+                               samples: List[MetricSample],
+                               tick_time: datetime = None) -> List[Alert]:
+        """Evaluate a collection tick of metric samples against alert rules.
+        
+        Samples without a timestamp are stamped with ``tick_time``.
+        Suppression is resolved once per distinct timestamp and cooldowns
+        once per rule; rules are looked up through the metric/project index.
+        """
+        if not samples:
+            return []
+        
+        if tick_time is None:
+            tick_time = datetime.now(timezone.utc)
+        timestamps = [sample.timestamp or tick_time for sample in samples]
+        
+        # Store metric values
+        for sample, timestamp in zip(samples, timestamps):
+            history = self.metric_history.get(sample.metric_name)
+            if history is None:
+                history = self.metric_history[sample.metric_name] = deque(maxlen=1000)
+            history.append((timestamp, sample.value))
+        
+        # Score every sample against its series baseline before absorbing the tick
+        anomalies = self.anomaly_detector.score_batch(
+            [AnomalyDetector.series_key(sample.metric_name, sample.project_id, sample.url) for sample in samples],
+            [sample.value for sample in samples],
+            timestamps
+        )
         
-        # Update anomaly detector
-        self.anomaly_detector.update_historical_data(metric_name, value)
+        rule_index = self.rule_index
+        suppressed_at: Dict[datetime, bool] = {}
+        cooldown_until: Dict[str, Optional[datetime]] = {}
         
         # Evaluate against rules
         triggered_alerts = []
         
-        for rule in self.alert_rules.values():
-            if not rule.enabled:
-                continue
-            
-            if rule.metric_name != metric_name:
+        for sample, timestamp, anomaly in zip(samples, timestamps, anomalies):
+            rules = rule_index.lookup(sample.metric_name, sample.project_id)
+            if not rules:
                 continue
             
-            # Check project targeting
-            if rule.project_ids and project_id not in rule.project_ids:
-                continue
+            in_window = suppressed_at.get(timestamp)
+            if in_window is None:
+                in_window = suppressed_at[timestamp] = self._in_suppression_window(timestamp)
             
-            # Check if we're in suppression window
-            if self._is_suppressed(rule, timestamp):
-                continue
-            
-            # Check cooldown
-            if self._is_in_cooldown(rule, timestamp):
-                continue
-            
-            # Evaluate condition
-            should_alert = await self._evaluate_rule_condition(rule, value, metric_name)
-            
-            if should_alert:
-                alert = await self._create_alert(rule, value, project_id, url, timestamp)
-                triggered_alerts.append(alert)
+            for rule in rules:
+                if not rule.enabled:
+                    continue
+                
+                # Check if we're in suppression window
+                if in_window and rule.suppress_during_maintenance:
+                    continue
+                
+                # Check cooldown
+                if rule.id not in cooldown_until:
+                    cooldown_until[rule.id] = self._cooldown_end(rule)
+                if cooldown_until[rule.id] is not None and timestamp < cooldown_until[rule.id]:
+                    continue
+                
+                # Evaluate condition
+                should_alert = await self._evaluate_rule_condition(rule, sample.value, sample.metric_name, anomaly)
                 
-                # Update rule last triggered
-                rule.last_triggered = timestamp
+                if should_alert:
+                    alert = await self._create_alert(rule, sample.value, sample.project_id, sample.url, timestamp)
+                    triggered_alerts.append(alert)
+                    
+                    # Update rule last triggered
+                    rule.last_triggered = timestamp
+                    cooldown_until[rule.id] = self._cooldown_end(rule)
         
         return triggered_alerts
     
     async def _evaluate_rule_condition(self, 
                                        rule: AlertRule,
                                        value: float,
-                                       metric_name: str) -> bool:
+                                       metric_name: str,
+                                       anomaly: Optional[AnomalyScore] = None) -> bool:
         """Evaluate if a rule condition is met."""
         
         if rule.condition == "gt":
@@ -564,6 +672,8 @@ class AlertManager:
         elif rule.condition == "eq":
             return abs(value - rule.threshold_value) < 0.001
         elif rule.condition == "anomaly":
+            if anomaly is not None:
+                return anomaly.is_anomaly
             is_anomaly, _ = self.anomaly_detector.detect_anomaly(metric_name, value)
             return is_anomaly
         
@@ -624,20 +734,26 @@ class AlertManager:
         if not rule.suppress_during_maintenance:
             return False
         
-        # Check maintenance windows
+        return self._in_suppression_window(timestamp)
+    
+    def _in_suppression_window(self, timestamp: datetime) -> bool:
+        """Check if a timestamp falls in any maintenance window."""
         for start, end in self.suppression_windows:
             if start <= timestamp <= end:
                 return True
         
         return False
     
+    def _cooldown_end(self, rule: AlertRule) -> Optional[datetime]:
+        """End of the rule's cooldown period, if it has triggered."""
+        if not rule.last_triggered:
+            return None
+        return rule.last_triggered + timedelta(minutes=rule.cooldown_minutes)
+    
     def _is_in_cooldown(self, rule: AlertRule, timestamp: datetime) -> bool:
         """Check if rule is in cooldown period."""
-        if not rule.last_triggered:
-            return False
-        
-        cooldown_delta = timedelta(minutes=rule.cooldown_minutes)
-        return timestamp < rule.last_triggered + cooldown_delta
+        cooldown_end = self._cooldown_end(rule)
+        return cooldown_end is not None and timestamp < cooldown_end
     
     async def _send_alert_notifications(self, alert: Alert, rule: AlertRule):
         """Send alert notifications through configured channels."""
@@ -0,0 +1,314 @@
+"""Online anomaly detection over many metric series.
+
+Series state is kept in struct-of-arrays form (one row per series) so a
+whole collection tick can be scored and absorbed with a few vectorized
+NumPy operations, independent of how long each series' history is.
+"""
+
+import logging
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Hashable, List, Optional, Sequence
+
+import numpy as np
+
+
+logger = logging.getLogger(__name__)
+
+# Ring buffer width before any series outgrows it
+INITIAL_RING_WIDTH = 16
+
+
+@dataclass
+class AnomalyScore:
+    """Anomaly assessment for a single sample."""
+    series_key: Hashable
+    value: float
+    is_anomaly: bool
+    z_score: float
+    expected_value: Optional[float]
+    seasonal_z_score: Optional[float] = None
+
+
+class OnlineAnomalyDetector:
+    """Streaming z-score detector with windowed, EWMA and seasonal baselines.
+
+    Each series keeps:
+
+    - a ring buffer of its last ``window_size`` values with windowed Welford
+      statistics (the evicted value is removed as the new one is added); the
+      buffer starts narrow and widens only as the longest series grows, so
+      many short series do not each reserve a full window;
+    - an EWMA mean/variance that adapts to level shifts;
+    - per-slot EWMA mean/variance for a seasonal cycle (hour of day by
+      default), updated only for the slot a sample falls in.
+
+    A sample is anomalous when it deviates from both the windowed and EWMA
+    baselines (or from its seasonal baseline, once that slot has enough
+    observations) by more than ``z_threshold`` standard deviations. Samples
+    are scored before they are absorbed, so an outlier never masks itself.
+    """
+
+    def __init__(self,
+                 window_size: int = 256,
+                 z_threshold: float = 3.0,
+                 min_samples: int = 20,
+                 ewma_alpha: float = 0.05,
+                 season_slots: int = 24,
+                 season_slot_seconds: int = 3600,
+                 min_seasonal_samples: int = 5,
+                 initial_series_capacity: int = 64):
+        """Initialize an empty detector."""
+        if window_size < 2:
+            raise ValueError("window_size must be at least 2")
+
+        self.window_size = window_size
+        self.z_threshold = z_threshold
+        self.min_samples = min_samples
+        self.ewma_alpha = ewma_alpha
+        self.season_slots = season_slots
+        self.season_slot_seconds = season_slot_seconds
+        self.min_seasonal_samples = min_seasonal_samples
+
+        self._index: Dict[Hashable, int] = {}
+        self._keys: List[Hashable] = []
+        self._capacity = 0
+        self._ring_width = min(window_size, INITIAL_RING_WIDTH)
+        self._allocate(max(1, initial_series_capacity))
+
+    def _allocate(self, capacity: int) -> None:
+        """Grow per-series arrays to ``capacity`` rows."""
+        def grow(array: Optional[np.ndarray], shape, dtype, fill=0):
+            grown = np.full(shape, fill, dtype=dtype)
+            if array is not None:
+                grown[:len(array)] = array
+            return grown
+
+        first = self._capacity == 0
+        get = (lambda name: None) if first else (lambda name: getattr(self, name))
+
+        self._ring = grow(get("_ring"), (capacity, self._ring_width), np.float64)
+        self._head = grow(get("_head"), capacity, np.int64)
+        self._count = grow(get("_count"), capacity, np.int64)
+        self._mean = grow(get("_mean"), capacity, np.float64)
+        self._m2 = grow(get("_m2"), capacity, np.float64)
+        self._ewma_mean = grow(get("_ewma_mean"), capacity, np.float64)
+        self._ewma_var = grow(get("_ewma_var"), capacity, np.float64)
+        self._season_mean = grow(get("_season_mean"), (capacity, self.season_slots), np.float64)
+        self._season_var = grow(get("_season_var"), (capacity, self.season_slots), np.float64)
+        self._season_count = grow(get("_season_count"), (capacity, self.season_slots), np.int64)
+        self._capacity = capacity
+
+    def _widen_ring(self, needed: int) -> None:
+        """Widen every ring buffer to hold at least ``needed`` values.
+
+        Until a series fills its window its values sit at positions
+        ``0..count-1``, so widening keeps every ring in place.
+        """
+        if needed <= self._ring_width:
+            return
+        width = min(self.window_size, max(needed, self._ring_width * 2))
+        ring = np.zeros((self._capacity, width), dtype=np.float64)
+        ring[:, :self._ring_width] = self._ring
+        self._ring = ring
+        self._ring_width = width
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def series_rows(self, keys: Sequence[Hashable]) -> np.ndarray:
+        """Row index for each key, registering unseen series."""
+        rows = np.empty(len(keys), dtype=np.int64)
+        for i, key in enumerate(keys):
+            row = self._index.get(key)
+            if row is None:
+                row = len(self._keys)
+                if row >= self._capacity:
+                    self._allocate(self._capacity * 2)
+                self._index[key] = row
+                self._keys.append(key)
+            rows[i] = row
+        return rows
+
+    def _season_slot(self, timestamps: Optional[Sequence[datetime]], size: int) -> np.ndarray:
+        """Seasonal slot of each sample (slot 0 when no timestamps are given)."""
+        if timestamps is None or self.season_slots <= 1:
+            return np.zeros(size, dtype=np.int64)
+        epoch_seconds = np.array([ts.timestamp() for ts in timestamps], dtype=np.float64)
+        return (epoch_seconds // self.season_slot_seconds).astype(np.int64) % self.season_slots
+
+    def _score_rows(self, rows: np.ndarray, slots: np.ndarray, values: np.ndarray):
+        """Vectorized z-scores of values against current series state."""
+        count = self._count[rows]
+        window = np.minimum(count, self.window_size)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            window_std = np.sqrt(np.where(window > 1, self._m2[rows] / (window - 1), 0.0))
+            window_z = np.where(window_std > 0, np.abs(values - self._mean[rows]) / window_std, 0.0)
+
+            ewma_std = np.sqrt(self._ewma_var[rows])
+            ewma_z = np.where(ewma_std > 0, np.abs(values - self._ewma_mean[rows]) / ewma_std, 0.0)
+
+            season_count = self._season_count[rows, slots]
+            season_std = np.sqrt(self._season_var[rows, slots])
+            season_ready = (season_count >= self.min_seasonal_samples) & (season_std > 0)
+            season_z = np.where(
+                season_ready,
+                np.abs(values - self._season_mean[rows, slots]) / season_std,
+                np.nan
+            )
+
+        # Both trend baselines must agree; a seasonal deviation is enough on its own
+        trend_z = np.minimum(window_z, ewma_z)
+        z_scores = np.where(season_ready, np.maximum(trend_z, season_z), trend_z)
+        is_anomaly = (count >= self.min_samples) & (z_scores > self.z_threshold)
+        expected = np.where(season_ready, self._season_mean[rows, slots], self._mean[rows])
+
+        return is_anomaly, z_scores, expected, count > 0, season_z
+
+    def _absorb_unique(self, rows: np.ndarray, slots: np.ndarray, values: np.ndarray) -> None:
+        """Update state for rows that appear at most once."""
+        count = self._count[rows]
+        self._widen_ring(min(int(count.max()) + 1, self.window_size))
+        head = self._head[rows]
+        full = count >= self.window_size
+
+        # Windowed Welford: remove the evicted value when the ring is full
+        evicted = self._ring[rows, head]
+        mean = self._mean[rows]
+        m2 = self._m2[rows]
+        n_before = np.minimum(count, self.window_size)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            n_removed = n_before - 1
+            mean_removed = np.where(full & (n_removed > 0), (mean * n_before - evicted) / np.maximum(n_removed, 1), mean)
+            m2_removed = np.where(full, m2 - (evicted - mean) * (evicted - mean_removed), m2)
+        mean = np.where(full, mean_removed, mean)
+        m2 = np.maximum(0.0, m2_removed)
+        n_after = np.where(full, n_before, n_before + 1)
+
+        delta = values - mean
+        mean = mean + delta / n_after
+        m2 = m2 + delta * (values - mean)
+
+        self._mean[rows] = mean
+        self._m2[rows] = m2
+        self._ring[rows, head] = values
+        self._head[rows] = (head + 1) % self.window_size
+
+        # EWMA mean/variance, seeded by the first value
+        alpha = self.ewma_alpha
+        first = count == 0
+        ewma_delta = values - self._ewma_mean[rows]
+        self._ewma_mean[rows] = np.where(first, values, self._ewma_mean[rows] + alpha * ewma_delta)
+        self._ewma_var[rows] = np.where(
+            first, 0.0, (1 - alpha) * (self._ewma_var[rows] + alpha * ewma_delta ** 2)
+        )
+
+        # Seasonal slot: running mean for the first observations, then EWMA
+        season_count = self._season_count[rows, slots]
+        season_mean = self._season_mean[rows, slots]
+        season_alpha = np.maximum(alpha, 1.0 / (season_count + 1))
+        season_delta = values - season_mean
+        self._season_mean[rows, slots] = season_mean + season_alpha * season_delta
+        self._season_var[rows, slots] = np.where(
+            season_count == 0, 0.0,
+            (1 - season_alpha) * (self._season_var[rows, slots] + season_alpha * season_delta ** 2)
+        )
+        self._season_count[rows, slots] = season_count + 1
+
+        self._count[rows] = count + 1
+
+    def _absorb(self, rows: np.ndarray, slots: np.ndarray, values: np.ndarray) -> None:
+        """Update state, applying repeated series in arrival order."""
+        if len(rows) == len(np.unique(rows)):
+            self._absorb_unique(rows, slots, values)
+            return
+
+        # Occurrence rank of each row within the batch; each rank is a duplicate-free pass
+        order = np.argsort(rows, kind="stable")
+        sorted_rows = rows[order]
+        run_starts = np.flatnonzero(np.r_[True, sorted_rows[1:] != sorted_rows[:-1]])
+        run_lengths = np.diff(np.r_[run_starts, len(rows)])
+        ranks = np.empty(len(rows), dtype=np.int64)
+        ranks[order] = np.arange(len(rows)) - np.repeat(run_starts, run_lengths)
+
+        for rank in range(int(ranks.max()) + 1):
+            mask = ranks == rank
+            self._absorb_unique(rows[mask], slots[mask], values[mask])
+
+    def score_batch(self,
+                    keys: Sequence[Hashable],
+                    values: Sequence[float],
+                    timestamps: Optional[Sequence[datetime]] = None,
+                    update: bool = True) -> List[AnomalyScore]:
+        """Score a batch of samples against their series, then absorb them."""
+        values = np.asarray(values, dtype=np.float64)
+        if len(values) == 0:
+            return []
+
+        rows = self.series_rows(keys)
+        slots = self._season_slot(timestamps, len(values))
+
+        is_anomaly, z_scores, expected, has_history, season_z = self._score_rows(rows, slots, values)
+
+        if update:
+            self._absorb(rows, slots, values)
+
+        return [
+            AnomalyScore(
+                series_key=key,
+                value=float(values[i]),
+                is_anomaly=bool(is_anomaly[i]),
+                z_score=float(z_scores[i]),
+                expected_value=float(expected[i]) if has_history[i] else None,
+                seasonal_z_score=None if np.isnan(season_z[i]) else float(season_z[i])
+            )
+            for i, key in enumerate(keys)
+        ]
+
+    def score(self, key: Hashable, value: float, timestamp: Optional[datetime] = None, update: bool = True) -> AnomalyScore:
+        """Score a single sample (O(1) in history length)."""
+        return self.score_batch([key], [value], [timestamp] if timestamp else None, update=update)[0]
+
+    def update(self, key: Hashable, value: float, timestamp: Optional[datetime] = None) -> None:
+        """Absorb a sample without scoring it."""
+        rows = self.series_rows([key])
+        slots = self._season_slot([timestamp] if timestamp else None, 1)
+        self._absorb(rows, slots, np.array([value], dtype=np.float64))
+
+    def seed(self, key: Hashable, values: Sequence[float], timestamps: Optional[Sequence[datetime]] = None) -> None:
+        """Warm a series with historical values, oldest first."""
+        values = np.asarray(values, dtype=np.float64)
+        if len(values) == 0:
+            return
+        rows = np.full(len(values), self.series_rows([key])[0], dtype=np.int64)
+        slots = self._season_slot(timestamps, len(values))
+        for i in range(len(values)):
+            self._absorb_unique(rows[i:i + 1], slots[i:i + 1], values[i:i + 1])
+
+    def series_stats(self, key: Hashable) -> Optional[Dict[str, float]]:
+        """Current baseline statistics for a series."""
+        row = self._index.get(key)
+        if row is None:
+            return None
+
+        window = min(int(self._count[row]), self.window_size)
+        return {
+            "count": int(self._count[row]),
+            "window_mean": float(self._mean[row]),
+            "window_std": float(np.sqrt(self._m2[row] / (window - 1))) if window > 1 else 0.0,
+            "ewma_mean": float(self._ewma_mean[row]),
+            "ewma_std": float(np.sqrt(self._ewma_var[row]))
+        }
+
+    def recent_values(self, key: Hashable) -> np.ndarray:
+        """Values currently in a series' ring buffer, oldest first."""
+        row = self._index.get(key)
+        if row is None:
+            return np.zeros(0)
+
+        count = min(int(self._count[row]), self.window_size)
+        head = int(self._head[row])
+        ordered = np.roll(self._ring[row], -head)
+        return ordered[-count:] if count else np.zeros(0)
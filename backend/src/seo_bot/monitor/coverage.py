@@ -18,6 +18,8 @@ from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
 
 from ..config import CoverageSLAConfig, Settings
+from ..gsc_sync import load_page_performance
+from ..linking.graph import InternalLinkGraph, LinkGraphReport, load_link_graph
 from ..models import AlertSeverity, CoverageMetrics, IndexationStatus
 
 
@@ -95,9 +97,23 @@ class GSCAdapter:
     
     async def get_indexation_data(self, domain: str, 
                                   start_date: datetime,
-                                  end_date: datetime) -> Dict:
-        """Get indexation data from GSC."""
+                                  end_date: datetime,
+                                  use_synced: bool = True) -> Dict:
+        """Get indexation data from GSC.
+        
+        Page totals come from the synced GSCData table when available;
+        otherwise the API is queried. Callers that have already found the
+        table empty pass ``use_synced=False`` to go straight to the API.
+        """
         try:
+            loop = asyncio.get_event_loop()
+            if use_synced:
+                synced = await loop.run_in_executor(
+                    None, lambda: load_page_performance(domain, start_date, end_date)
+                )
+                if synced is not None:
+                    return {'rows': [{'keys': [page], **metrics} for page, metrics in synced.items()]}
+            
             request = {
                 'startDate': start_date.strftime('%Y-%m-%d'),
                 'endDate': end_date.strftime('%Y-%m-%d'),
@@ -106,7 +122,6 @@ class GSCAdapter:
             }
             
             # Execute request in thread pool to avoid blocking
-            loop = asyncio.get_event_loop()
             response = await loop.run_in_executor(
                 None,
                 lambda: self.service.searchanalytics().query(
@@ -391,18 +406,39 @@ class CoverageFreshnessMonitor:
             logger.error(f"Failed to schedule freshness review: {e}")
             return False
     
-    async def get_orphaned_pages(self) -> List[str]:
-        """Identify orphaned pages with insufficient internal links."""
-        orphaned_pages = []
+    async def get_link_graph_report(self,
+                                    link_graph: Optional[InternalLinkGraph] = None) -> Optional[LinkGraphReport]:
+        """Orphan, click-depth and link-equity report from the internal link graph.
         
-        # This would typically:
-        # 1. Query sitemap for all pages
-        # 2. Analyze internal link structure
-        # 3. Identify pages with < min_internal_links
+        The graph is loaded from the project's InternalLink table unless one
+        (e.g. built from a crawl) is given. Returns None when neither exists.
+        """
+        if link_graph is None:
+            loop = asyncio.get_event_loop()
+            link_graph = await loop.run_in_executor(None, lambda: load_link_graph(self.domain))
+            if link_graph is None:
+                logger.warning(f"No internal link graph available for {self.domain}")
+                return None
         
+        home_url = self.domain if '://' in self.domain else f"https://{self.domain}/"
+        return link_graph.analyze(
+            home_url=home_url if home_url in link_graph else None,
+            min_inbound=self.sla_config.min_internal_links
+        )
+    
+    async def get_orphaned_pages(self, link_graph: Optional[InternalLinkGraph] = None) -> List[str]:
+        """Identify orphaned pages with insufficient internal links.
+        
+        Pages nothing links to come first, then pages unreachable from the
+        home page, then pages with fewer than ``min_internal_links`` inbound links.
+        """
         logger.info(f"Checking for pages with < {self.sla_config.min_internal_links} internal links")
         
-        return orphaned_pages
+        report = await self.get_link_graph_report(link_graph)
+        if report is None:
+            return []
+        
+        return report.orphaned + report.unreachable + report.weakly_linked
     
     async def auto_resolve_coverage_issues(self, 
                                            violations: List[CoverageViolation]) -> Dict[str, int]:
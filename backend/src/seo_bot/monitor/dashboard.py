@@ -5,11 +5,14 @@ system health monitoring, and historical trend analysis.
 """
 
 import asyncio
+import copy
 import logging
 import json
+import time
+from collections import OrderedDict, defaultdict
 from datetime import datetime, timedelta, timezone
-from typing import Dict, List, Optional, Tuple, Union, Any
-from dataclasses import dataclass, asdict
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple, Union
+from dataclasses import dataclass, asdict, replace
 from enum import Enum
 from pathlib import Path
 
@@ -20,10 +23,19 @@ from fastapi.responses import HTMLResponse, JSONResponse
 from fastapi.staticfiles import StaticFiles
 import uvicorn
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 from ..config import Settings, MonitoringConfig
+from ..instrumentation import observe_dashboard_collection
 from ..models import AlertSeverity
+from ..tech.sketch import DDSketch
 from .coverage import CoverageFreshnessMonitor, CoverageSLAReport
 from .alerts import AlertManager, Alert
+from .metric_store import MetricHistoryStore, RAW, MINUTE, HOUR, DAY
 
 
 logger = logging.getLogger(__name__)
@@ -48,6 +60,46 @@ class TimeRange(Enum):
     LAST_QUARTER = "90d"
 
 
+# Rollup resolution read for each dashboard time range
+RANGE_RESOLUTION = {
+    TimeRange.LAST_HOUR: MINUTE,
+    TimeRange.LAST_DAY: MINUTE,
+    TimeRange.LAST_WEEK: HOUR,
+    TimeRange.LAST_MONTH: HOUR,
+    TimeRange.LAST_QUARTER: DAY,
+}
+
+RESOLUTION_NAMES = {"raw": RAW, "1m": MINUTE, "1h": HOUR, "1d": DAY}
+
+TIME_RANGE_SPANS = {
+    TimeRange.LAST_HOUR: timedelta(hours=1),
+    TimeRange.LAST_DAY: timedelta(days=1),
+    TimeRange.LAST_WEEK: timedelta(days=7),
+    TimeRange.LAST_MONTH: timedelta(days=30),
+    TimeRange.LAST_QUARTER: timedelta(days=90),
+}
+
+# KPI widgets (metric name, title, format) and charts (metric type, title, chart type)
+KPI_WIDGET_CONFIGS = [
+    ("organic_traffic", "Organic Traffic", "number"),
+    ("organic_ctr", "Organic CTR", "percentage"),
+    ("average_position", "Avg Position", "number"),
+    ("performance_score", "Performance Score", "number"),
+    ("avg_content_quality", "Content Quality", "number"),
+    ("indexation_rate", "Indexation Rate", "percentage")
+]
+
+CHART_CONFIGS = [
+    (MetricType.TRAFFIC, "Traffic Metrics", "line"),
+    (MetricType.RANKINGS, "Rankings Metrics", "line"),
+    (MetricType.TECHNICAL, "Technical Metrics", "line"),
+    (MetricType.CONTENT, "Content Metrics", "bar")
+]
+
+# Metric types that feed the system health assessment
+HEALTH_METRIC_TYPES = (MetricType.TECHNICAL, MetricType.CONTENT, MetricType.TRAFFIC)
+
+
 @dataclass
 class MetricData:
     """Individual metric data point."""
@@ -56,6 +108,7 @@ class MetricData:
     metric_name: str
     metric_type: MetricType
     dimensions: Dict[str, str] = None
+    stale: bool = False
     
     def to_dict(self) -> Dict:
         """Convert to dictionary for JSON serialization."""
@@ -78,6 +131,7 @@ class KPIWidget:
     format_type: str  # number, percentage, currency, duration
     threshold_warning: Optional[float] = None
     threshold_critical: Optional[float] = None
+    stale: bool = False
 
 
 @dataclass
@@ -104,14 +158,44 @@ class DashboardState:
     uptime_percentage: float
 
 
+@dataclass
+class SourceCollection:
+    """Outcome of collecting one metric source."""
+    source: str
+    metrics: List[MetricData]
+    stale: bool
+    outcome: str  # ok, timeout, error, empty
+    latency_seconds: float
+    collected_at: datetime
+    error: Optional[str] = None
+
+
 class MetricsCollector:
-    """Collects metrics from various sources."""
+    """Collects metrics from various sources.
+    
+    Sources run concurrently, each under its own deadline. A source that
+    times out, fails or returns nothing is served from its last known good
+    result with every metric marked ``stale``, so one slow integration
+    never holds back the others.
+    """
     
-    def __init__(self, settings: Settings):
+    DEFAULT_SOURCE_TIMEOUTS = {"traffic": 10.0, "technical": 20.0, "content": 10.0}
+    
+    def __init__(self,
+                 settings: Settings,
+                 source_timeouts: Optional[Dict[str, float]] = None,
+                 default_timeout: float = 10.0):
         """Initialize metrics collector."""
         self.settings = settings
         self.metrics_buffer = []
         self.max_buffer_size = 10000
+        self.source_timeouts = {**self.DEFAULT_SOURCE_TIMEOUTS, **(source_timeouts or {})}
+        self.default_timeout = default_timeout
+        
+        # Last known good metrics per (source, project) and latest outcome per source
+        self.last_known_good: Dict[Tuple[str, str], List[MetricData]] = {}
+        self.last_collection: Dict[Tuple[str, str], SourceCollection] = {}
+        self.source_latency: Dict[str, DDSketch] = defaultdict(DDSketch)
         
     async def collect_traffic_metrics(self, project_id: str) -> List[MetricData]:
         """Collect traffic metrics from GSC."""
@@ -223,27 +307,106 @@ class MetricsCollector:
         
         return metrics
     
+    def _sources(self, project_id: str, domain: str) -> Dict[str, Callable[[], Awaitable[List[MetricData]]]]:
+        """Collection coroutines by source name."""
+        return {
+            "traffic": lambda: self.collect_traffic_metrics(project_id),
+            "technical": lambda: self.collect_technical_metrics(domain),
+            "content": lambda: self.collect_content_metrics(project_id),
+        }
+    
+    async def _collect_source(self,
+                              source: str,
+                              project_id: str,
+                              collect: Callable[[], Awaitable[List[MetricData]]]) -> SourceCollection:
+        """Collect one source under its deadline, falling back to its last known good result."""
+        timeout = self.source_timeouts.get(source, self.default_timeout)
+        started = time.perf_counter()
+        error = None
+        
+        try:
+            metrics = await asyncio.wait_for(collect(), timeout=timeout)
+            outcome = "ok" if metrics else "empty"
+        except asyncio.TimeoutError:
+            metrics, outcome = [], "timeout"
+            error = f"timed out after {timeout:.1f}s"
+        except Exception as e:
+            metrics, outcome = [], "error"
+            error = str(e)
+        
+        latency = time.perf_counter() - started
+        self.source_latency[source].add(latency)
+        observe_dashboard_collection(source, outcome, latency)
+        
+        key = (source, project_id)
+        if outcome == "ok":
+            self.last_known_good[key] = metrics
+            stale = False
+        else:
+            logger.warning(f"Metric source {source} for {project_id} {error or 'returned no data'}; serving last known good")
+            metrics = [replace(metric, stale=True) for metric in self.last_known_good.get(key, [])]
+            stale = True
+        
+        result = SourceCollection(
+            source=source,
+            metrics=metrics,
+            stale=stale,
+            outcome=outcome,
+            latency_seconds=latency,
+            collected_at=datetime.now(timezone.utc),
+            error=error
+        )
+        self.last_collection[key] = result
+        return result
+    
+    async def collect_sources(self, project_id: str, domain: str) -> Dict[str, SourceCollection]:
+        """Collect every source concurrently, each within its own deadline."""
+        sources = self._sources(project_id, domain)
+        results = await asyncio.gather(*(
+            self._collect_source(source, project_id, collect) for source, collect in sources.items()
+        ))
+        return {result.source: result for result in results}
+    
     async def collect_all_metrics(self, project_id: str, domain: str) -> List[MetricData]:
-        """Collect all metrics for a project."""
-        all_metrics = []
+        """Collect all metrics for a project.
         
-        # Collect from all sources
-        traffic_metrics = await self.collect_traffic_metrics(project_id)
-        technical_metrics = await self.collect_technical_metrics(domain)
-        content_metrics = await self.collect_content_metrics(project_id)
+        Metrics from sources that missed their deadline are their last
+        known good values with ``stale`` set.
+        """
+        results = await self.collect_sources(project_id, domain)
         
-        all_metrics.extend(traffic_metrics)
-        all_metrics.extend(technical_metrics)
-        all_metrics.extend(content_metrics)
+        all_metrics = []
+        for result in results.values():
+            all_metrics.extend(result.metrics)
         
-        # Buffer metrics
-        self.metrics_buffer.extend(all_metrics)
+        # Buffer fresh metrics
+        self.metrics_buffer.extend(m for m in all_metrics if not m.stale)
         
         # Trim buffer if too large
         if len(self.metrics_buffer) > self.max_buffer_size:
             self.metrics_buffer = self.metrics_buffer[-self.max_buffer_size:]
         
         return all_metrics
+    
+    def get_source_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Collection latency percentiles and latest outcome per source."""
+        stats = {}
+        for source, sketch in self.source_latency.items():
+            latest = max(
+                (c for (name, _), c in self.last_collection.items() if name == source),
+                key=lambda c: c.collected_at,
+                default=None
+            )
+            stats[source] = {
+                "collections": sketch.count,
+                "latency_p50_seconds": sketch.quantile(0.5),
+                "latency_p95_seconds": sketch.quantile(0.95),
+                "latency_max_seconds": sketch.max,
+                "timeout_seconds": self.source_timeouts.get(source, self.default_timeout),
+                "last_outcome": latest.outcome if latest else None,
+                "last_error": latest.error if latest else None,
+            }
+        return stats
 
 
 class DashboardDataProcessor:
@@ -272,16 +435,7 @@ class DashboardDataProcessor:
             historical_by_name = {m.metric_name: m for m in historical_24h}
         
         # Create widgets for key metrics
-        widget_configs = [
-            ("organic_traffic", "Organic Traffic", "number"),
-            ("organic_ctr", "Organic CTR", "percentage"),
-            ("average_position", "Avg Position", "number"),
-            ("performance_score", "Performance Score", "number"),
-            ("avg_content_quality", "Content Quality", "number"),
-            ("indexation_rate", "Indexation Rate", "percentage")
-        ]
-        
-        for metric_name, title, format_type in widget_configs:
+        for metric_name, title, format_type in KPI_WIDGET_CONFIGS:
             current_metric = current_by_name.get(metric_name)
             historical_metric = historical_by_name.get(metric_name)
             
@@ -311,7 +465,8 @@ class DashboardDataProcessor:
                     previous_value=previous_value,
                     change_percentage=change_pct,
                     trend_direction=trend,
-                    format_type=format_type
+                    format_type=format_type,
+                    stale=current_metric.stale
                 ))
         
         return widgets
@@ -346,14 +501,7 @@ class DashboardDataProcessor:
             by_type[metric_type].append(metric)
         
         # Create charts for each type
-        chart_configs = [
-            (MetricType.TRAFFIC, "Traffic Metrics", "line"),
-            (MetricType.RANKINGS, "Rankings Metrics", "line"),
-            (MetricType.TECHNICAL, "Technical Metrics", "line"),
-            (MetricType.CONTENT, "Content Metrics", "bar")
-        ]
-        
-        for metric_type, title, chart_type in chart_configs:
+        for metric_type, title, chart_type in CHART_CONFIGS:
             if metric_type in by_type:
                 charts.append(ChartData(
                     chart_id=f"chart_{metric_type.value}",
@@ -459,53 +607,447 @@ class DashboardDataProcessor:
         return health
 
 
+def _json_default(obj: Any) -> Any:
+    """Encode values the JSON encoders do not handle natively."""
+    if isinstance(obj, Enum):
+        return obj.value
+    if isinstance(obj, datetime):
+        return obj.isoformat()
+    if isinstance(obj, np.generic):
+        return obj.item()
+    return str(obj)
+
+
+def dumps_payload(data: Any) -> str:
+    """Serialize a WebSocket payload, using orjson when it is installed."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(data, default=_json_default, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+    return json.dumps(data, default=_json_default)
+
+
+def compute_state_delta(old: Any, new: Any) -> Tuple[List[Tuple[List, Any]], List[List]]:
+    """Difference between two JSON-like states as (set operations, removed paths).
+
+    Paths are lists of dict keys and list indices. Dicts are compared key by
+    key and equal-length lists element by element; anything else that
+    differs is replaced whole.
+    """
+    changed: List[Tuple[List, Any]] = []
+    removed: List[List] = []
+
+    def walk(before: Any, after: Any, path: List) -> None:
+        if isinstance(before, dict) and isinstance(after, dict):
+            for key, value in after.items():
+                if key not in before:
+                    changed.append((path + [key], value))
+                else:
+                    walk(before[key], value, path + [key])
+            removed.extend(path + [key] for key in before if key not in after)
+        elif isinstance(before, list) and isinstance(after, list) and len(before) == len(after):
+            for index, (item_before, item_after) in enumerate(zip(before, after)):
+                walk(item_before, item_after, path + [index])
+        elif type(before) is not type(after) or before != after:
+            changed.append((path, after))
+
+    walk(old, new, [])
+    return changed, removed
+
+
+def apply_state_delta(state: Any, changed: List[Tuple[List, Any]], removed: List[List]) -> Any:
+    """Apply a delta from ``compute_state_delta`` to a copy of ``state``."""
+    state = copy.deepcopy(state)
+    for path, value in changed:
+        if not path:
+            state = copy.deepcopy(value)
+            continue
+        target = state
+        for key in path[:-1]:
+            target = target[key]
+        target[path[-1]] = copy.deepcopy(value)
+    for path in removed:
+        target = state
+        for key in path[:-1]:
+            target = target[key]
+        del target[path[-1]]
+    return state
+
+
+@dataclass
+class _ClientConnection:
+    """Per-connection delivery state."""
+    websocket: WebSocket
+    project_id: str
+    connected_at: datetime
+    acked_version: Optional[int] = None
+    pending: Optional[str] = None
+    sender: Optional[asyncio.Task] = None
+    send_started: float = 0.0
+    dropped_updates: int = 0
+
+
 class DashboardWebSocketManager:
-    """Manages WebSocket connections for real-time updates."""
+    """Manages WebSocket connections for real-time updates.
+
+    Connections are indexed by project. Dashboard states are versioned per
+    project and each client receives a delta against the last version it
+    acknowledged (or a full snapshot), serialized once per distinct base
+    version. Sends run concurrently; a client still busy with an earlier
+    payload keeps only the newest pending one, and a client stuck on a
+    single send for ``stall_timeout`` seconds is dropped.
+    """
     
-    def __init__(self):
+    def __init__(self,
+                 history_size: int = 16,
+                 send_timeout: float = 5.0,
+                 stall_timeout: float = 60.0):
         """Initialize WebSocket manager."""
-        self.active_connections: List[WebSocket] = []
-        self.connection_metadata: Dict[WebSocket, Dict] = {}
+        self.history_size = history_size
+        self.send_timeout = send_timeout
+        self.stall_timeout = stall_timeout
+        self.clients: Dict[WebSocket, _ClientConnection] = {}
+        self.project_connections: Dict[str, Set[WebSocket]] = defaultdict(set)
+        self.state_history: Dict[str, "OrderedDict[int, Dict]"] = defaultdict(OrderedDict)
+        self.state_versions: Dict[str, int] = defaultdict(int)
+    
+    @property
+    def active_connections(self) -> List[WebSocket]:
+        """All connected WebSockets."""
+        return list(self.clients)
     
     async def connect(self, websocket: WebSocket, project_id: str):
         """Accept a WebSocket connection."""
         await websocket.accept()
-        self.active_connections.append(websocket)
-        self.connection_metadata[websocket] = {
-            "project_id": project_id,
-            "connected_at": datetime.now(timezone.utc)
-        }
+        self.clients[websocket] = _ClientConnection(
+            websocket=websocket,
+            project_id=project_id,
+            connected_at=datetime.now(timezone.utc)
+        )
+        self.project_connections[project_id].add(websocket)
         logger.info(f"WebSocket connected for project {project_id}")
     
     def disconnect(self, websocket: WebSocket):
         """Remove a WebSocket connection."""
-        if websocket in self.active_connections:
-            self.active_connections.remove(websocket)
-            self.connection_metadata.pop(websocket, None)
-            logger.info("WebSocket disconnected")
+        client = self.clients.pop(websocket, None)
+        if client is None:
+            return
+        
+        connections = self.project_connections.get(client.project_id)
+        if connections is not None:
+            connections.discard(websocket)
+            if not connections:
+                del self.project_connections[client.project_id]
+        
+        if client.sender is not None and not client.sender.done():
+            try:
+                current = asyncio.current_task()
+            except RuntimeError:
+                current = None
+            if client.sender is not current:
+                client.sender.cancel()
+        logger.info("WebSocket disconnected")
+    
+    def acknowledge(self, websocket: WebSocket, version: Optional[int]):
+        """Record the latest state version a client has applied (None requests a full resync)."""
+        client = self.clients.get(websocket)
+        if client is None:
+            return
+        
+        if version is None or version not in self.state_history.get(client.project_id, {}):
+            client.acked_version = None
+        elif client.acked_version is None or version > client.acked_version:
+            client.acked_version = version
+    
+    async def handle_message(self, websocket: WebSocket, message: str):
+        """Process a client control message (acks and resync requests)."""
+        try:
+            data = json.loads(message)
+        except ValueError:
+            return
+        if not isinstance(data, dict):
+            return
+        
+        if data.get("type") == "ack":
+            version = data.get("version")
+            self.acknowledge(websocket, version if isinstance(version, int) else None)
+        elif data.get("type") == "resync":
+            self.acknowledge(websocket, None)
     
     async def broadcast_update(self, data: Dict, project_id: str = None):
         """Broadcast update to connected clients."""
-        disconnected = []
+        connections = self.project_connections.get(project_id, ()) if project_id else self.clients
+        if not connections:
+            return
         
-        for connection in self.active_connections:
-            try:
-                # Filter by project if specified
-                if project_id:
-                    conn_project = self.connection_metadata.get(connection, {}).get("project_id")
-                    if conn_project != project_id:
-                        continue
-                
-                await connection.send_text(json.dumps(data, default=str))
-            except WebSocketDisconnect:
-                disconnected.append(connection)
-            except Exception as e:
-                logger.error(f"Error broadcasting to WebSocket: {e}")
-                disconnected.append(connection)
+        payload = dumps_payload(data)
+        await self._dispatch({connection: payload for connection in connections})
+    
+    async def broadcast_state(self, project_id: str, state: Dict) -> int:
+        """Publish a new dashboard state version to a project's clients.
+        
+        Returns the version number assigned to the state.
+        """
+        self.state_versions[project_id] += 1
+        version = self.state_versions[project_id]
+        history = self.state_history[project_id]
+        history[version] = state
+        while len(history) > self.history_size:
+            history.popitem(last=False)
+        
+        connections = self.project_connections.get(project_id)
+        if not connections:
+            return version
+        
+        payloads: Dict[Optional[int], str] = {}
+        outgoing = {}
+        for connection in connections:
+            base = self.clients[connection].acked_version
+            if base not in history or base == version:
+                base = None
+            if base not in payloads:
+                payloads[base] = self._encode_state(version, state, base, history.get(base))
+            outgoing[connection] = payloads[base]
+        
+        await self._dispatch(outgoing)
+        return version
+    
+    def _encode_state(self,
+                      version: int,
+                      state: Dict,
+                      base_version: Optional[int],
+                      base_state: Optional[Dict]) -> str:
+        """Serialize a full snapshot or a delta against ``base_state``."""
+        if base_version is None:
+            return dumps_payload({"type": "dashboard_update", "version": version, "data": state})
+        
+        changed, removed = compute_state_delta(base_state, state)
+        return dumps_payload({
+            "type": "dashboard_delta",
+            "version": version,
+            "base_version": base_version,
+            "set": changed,
+            "unset": removed
+        })
+    
+    async def _dispatch(self, outgoing: Dict[WebSocket, str]):
+        """Queue payloads per client and wait briefly for the sends to finish."""
+        now = time.monotonic()
+        senders = []
+        
+        for connection, payload in outgoing.items():
+            client = self.clients.get(connection)
+            if client is None:
+                continue
+            
+            busy = client.sender is not None and not client.sender.done()
+            if busy and now - client.send_started > self.stall_timeout:
+                logger.warning(f"Dropping stalled WebSocket client for project {client.project_id}")
+                self.disconnect(connection)
+                continue
+            
+            # Slow consumers skip intermediate updates rather than queueing them
+            if client.pending is not None:
+                client.dropped_updates += 1
+            client.pending = payload
+            
+            if not busy:
+                client.sender = asyncio.create_task(self._drain(client))
+            senders.append(client.sender)
         
-        # Clean up disconnected clients
-        for conn in disconnected:
-            self.disconnect(conn)
+        if senders:
+            await asyncio.wait(senders, timeout=self.send_timeout)
+    
+    async def _drain(self, client: _ClientConnection):
+        """Send a client's pending payloads until none is left."""
+        try:
+            while client.pending is not None:
+                payload, client.pending = client.pending, None
+                client.send_started = time.monotonic()
+                await client.websocket.send_text(payload)
+        except WebSocketDisconnect:
+            self.disconnect(client.websocket)
+        except Exception as e:
+            logger.error(f"Error broadcasting to WebSocket: {e}")
+            self.disconnect(client.websocket)
+
+
+def time_range_cutoff(time_range: TimeRange, now: Optional[datetime] = None) -> datetime:
+    """Start of the window covered by a time range."""
+    now = now or datetime.now(timezone.utc)
+    return now - TIME_RANGE_SPANS[time_range]
+
+
+@dataclass
+class _CachedDashboard:
+    """Dashboard state for one project and time range, with its per-widget parts."""
+    computed_at: float
+    versions: Dict[str, int]
+    historical: Dict[MetricType, List[MetricData]]
+    kpi_widgets: Dict[str, Dict]
+    charts: Dict[MetricType, Dict]
+    system_health: Dict[str, Any]
+    state: Dict
+
+
+class DashboardStateCache:
+    """Memoized dashboard states with change-driven, per-widget recomputation.
+
+    Each arriving metric bumps a version for its name and its type. A cached
+    state is served while it is younger than ``ttl`` and none of those
+    versions moved; otherwise only the KPI widgets, charts and health
+    components whose input series changed are rebuilt (everything is
+    rebuilt once the TTL lapses, since the time window has moved).
+    Concurrent requests for the same project and range share one build.
+    Metrics are collected on demand when nothing has been recorded for a
+    project within ``ttl`` (no update loop is feeding it).
+    """
+    
+    def __init__(self,
+                 data_processor: DashboardDataProcessor,
+                 metric_store: MetricHistoryStore,
+                 collect: Callable[[str], Awaitable[List[MetricData]]],
+                 ttl: float = 60.0):
+        """Initialize the cache."""
+        self.data_processor = data_processor
+        self.metric_store = metric_store
+        self.collect = collect
+        self.ttl = ttl
+        
+        self.entries: Dict[Tuple[str, TimeRange], _CachedDashboard] = {}
+        self.latest_metrics: Dict[str, Dict[str, MetricData]] = {}
+        self.series_versions: Dict[str, Dict[str, int]] = defaultdict(dict)
+        # Monotonic time of each project's latest record()
+        self.recorded_at: Dict[str, float] = {}
+        self.stats = {"hits": 0, "full_builds": 0, "partial_builds": 0, "coalesced": 0}
+        self._inflight: Dict[Tuple[str, TimeRange], asyncio.Future] = {}
+    
+    def record(self, project_id: str, metrics: List[MetricData]):
+        """Register newly arrived metrics, invalidating the widgets that use them."""
+        latest = self.latest_metrics.setdefault(project_id, {})
+        versions = self.series_versions[project_id]
+        self.recorded_at[project_id] = time.monotonic()
+        
+        for metric in metrics:
+            latest[metric.metric_name] = metric
+            for key in (f"name:{metric.metric_name}", f"type:{metric.metric_type.value}"):
+                versions[key] = versions.get(key, 0) + 1
+    
+    def invalidate(self, project_id: Optional[str] = None):
+        """Drop cached states for a project, or for every project."""
+        for key in [key for key in self.entries if project_id is None or key[0] == project_id]:
+            del self.entries[key]
+    
+    async def get(self, project_id: str, time_range: TimeRange, domain: str = "example.com") -> Dict:
+        """Current dashboard state, rebuilding only what changed."""
+        key = (project_id, time_range)
+        entry = self.entries.get(key)
+        if (
+            entry is not None and
+            time.monotonic() - entry.computed_at < self.ttl and
+            entry.versions == self.series_versions[project_id]
+        ):
+            self.stats["hits"] += 1
+            return entry.state
+        
+        future = self._inflight.get(key)
+        if future is None:
+            future = asyncio.ensure_future(self._build(project_id, time_range, domain, entry))
+            self._inflight[key] = future
+            future.add_done_callback(lambda _: self._inflight.pop(key, None))
+        else:
+            self.stats["coalesced"] += 1
+        
+        # Shielded so one cancelled request does not cancel the shared build
+        return await asyncio.shield(future)
+    
+    async def _build(self,
+                     project_id: str,
+                     time_range: TimeRange,
+                     domain: str,
+                     previous: Optional[_CachedDashboard]) -> Dict:
+        """Build a state, reusing components of ``previous`` whose inputs are unchanged."""
+        # Collect when nothing (e.g. the update loop) has recorded metrics within the TTL
+        recorded_at = self.recorded_at.get(project_id)
+        if recorded_at is None or time.monotonic() - recorded_at >= self.ttl:
+            self.record(project_id, await self.collect(project_id))
+        
+        started = time.monotonic()
+        versions = dict(self.series_versions[project_id])
+        current = dict(self.latest_metrics[project_id])
+        
+        if previous is not None and started - previous.computed_at >= self.ttl:
+            previous = None
+        if previous is None:
+            self.stats["full_builds"] += 1
+        else:
+            self.stats["partial_builds"] += 1
+        
+        def changed(key: str) -> bool:
+            return previous is None or previous.versions.get(key) != versions.get(key)
+        
+        changed_types = {metric_type for metric_type in MetricType if changed(f"type:{metric_type.value}")}
+        
+        # Charts: re-query history only for metric types that received data
+        historical = dict(previous.historical) if previous else {}
+        charts = dict(previous.charts) if previous else {}
+        cutoff = time_range_cutoff(time_range)
+        for metric_type in changed_types:
+            historical[metric_type] = self.metric_store.query(
+                project_id,
+                since=cutoff,
+                resolution=RANGE_RESOLUTION[time_range],
+                metric_types=[metric_type.value]
+            )
+            type_charts = self.data_processor.create_chart_data(historical[metric_type], time_range)
+            if type_charts:
+                charts[metric_type] = asdict(type_charts[0])
+            else:
+                charts.pop(metric_type, None)
+        
+        # KPI widgets: one per configured metric, rebuilt when its own series changed
+        kpi_widgets = dict(previous.kpi_widgets) if previous else {}
+        for metric_name, _, _ in KPI_WIDGET_CONFIGS:
+            if not changed(f"name:{metric_name}"):
+                continue
+            metric = current.get(metric_name)
+            widgets = self.data_processor.create_kpi_widgets(
+                [metric] if metric else [],
+                historical.get(metric.metric_type, []) if metric else []
+            )
+            if widgets:
+                kpi_widgets[metric_name] = asdict(widgets[0])
+            else:
+                kpi_widgets.pop(metric_name, None)
+        
+        # Get active alerts (placeholder)
+        active_alerts = []
+        
+        if previous is None or changed_types.intersection(HEALTH_METRIC_TYPES):
+            system_health = self.data_processor.calculate_system_health(list(current.values()), active_alerts)
+        else:
+            system_health = previous.system_health
+        
+        # Same layout as asdict(DashboardState), assembled from the cached parts
+        state = {
+            "project_id": project_id,
+            "domain": domain,
+            "last_updated": datetime.now(timezone.utc),
+            "kpi_widgets": [kpi_widgets[name] for name, _, _ in KPI_WIDGET_CONFIGS if name in kpi_widgets],
+            "charts": [charts[metric_type] for metric_type, _, _ in CHART_CONFIGS if metric_type in charts],
+            "active_alerts": active_alerts,
+            "system_health": system_health,
+            "uptime_percentage": 99.9  # Would calculate from actual data
+        }
+        
+        self.entries[(project_id, time_range)] = _CachedDashboard(
+            computed_at=started,
+            versions=versions,
+            historical=historical,
+            kpi_widgets=kpi_widgets,
+            charts=charts,
+            system_health=system_health,
+            state=state
+        )
+        return state
 
 
 class DashboardServer:
@@ -513,7 +1055,10 @@ class DashboardServer:
     
     def __init__(self, 
                  settings: Settings,
-                 monitoring_config: MonitoringConfig):
+                 monitoring_config: MonitoringConfig,
+                 metric_store: Optional[MetricHistoryStore] = None,
+                 compaction_interval: timedelta = timedelta(hours=1),
+                 state_cache_ttl: float = 60.0):
         """Initialize dashboard server."""
         self.settings = settings
         self.monitoring_config = monitoring_config
@@ -522,9 +1067,16 @@ class DashboardServer:
         self.metrics_collector = MetricsCollector(settings)
         self.data_processor = DashboardDataProcessor()
         
-        # In-memory storage for demo (would use Redis/database in production)
-        self.metrics_storage = []
-        self.dashboard_cache = {}
+        self.metric_store = metric_store or MetricHistoryStore()
+        self.compaction_interval = compaction_interval
+        self.last_compaction = datetime.now(timezone.utc)
+        self.project_domains: Dict[str, str] = {}
+        self.state_cache = DashboardStateCache(
+            self.data_processor,
+            self.metric_store,
+            collect=self._collect_project_metrics,
+            ttl=state_cache_ttl
+        )
         
         self._setup_routes()
         self._setup_static_files()
@@ -550,19 +1102,25 @@ class DashboardServer:
                 logger.error(f"Error getting dashboard data: {e}")
                 raise HTTPException(status_code=500, detail=str(e))
         
+        @self.app.get("/api/sources")
+        async def get_source_stats():
+            """Get per-source collection latency and status."""
+            return JSONResponse(self.metrics_collector.get_source_stats())
+        
         @self.app.get("/api/metrics/{project_id}")
         async def get_metrics(project_id: str, 
                               time_range: str = "24h",
-                              metric_type: str = None):
+                              metric_type: str = None,
+                              resolution: str = None):
             """Get metrics data for a project."""
             try:
-                # Filter metrics
-                filtered_metrics = [m for m in self.metrics_storage 
-                                  if m.timestamp >= self._get_time_cutoff(TimeRange(time_range))]
-                
-                if metric_type:
-                    filtered_metrics = [m for m in filtered_metrics 
-                                      if m.metric_type == MetricType(metric_type)]
+                range_enum = TimeRange(time_range)
+                filtered_metrics = self.metric_store.query(
+                    project_id,
+                    since=self._get_time_cutoff(range_enum),
+                    resolution=RESOLUTION_NAMES[resolution] if resolution else RANGE_RESOLUTION[range_enum],
+                    metric_types=[MetricType(metric_type).value] if metric_type else None
+                )
                 
                 return JSONResponse([m.to_dict() for m in filtered_metrics])
             except Exception as e:
@@ -575,8 +1133,9 @@ class DashboardServer:
             await self.websocket_manager.connect(websocket, project_id)
             try:
                 while True:
-                    # Keep connection alive
-                    await websocket.receive_text()
+                    # Clients acknowledge applied state versions
+                    message = await websocket.receive_text()
+                    await self.websocket_manager.handle_message(websocket, message)
             except WebSocketDisconnect:
                 self.websocket_manager.disconnect(websocket)
     
@@ -587,76 +1146,50 @@ class DashboardServer:
     
     async def _get_dashboard_state(self, project_id: str, time_range: TimeRange) -> Dict:
         """Get current dashboard state."""
-        # Get current metrics
-        current_metrics = await self.metrics_collector.collect_all_metrics(project_id, "example.com")
-        
-        # Get historical metrics
-        cutoff_time = self._get_time_cutoff(time_range)
-        historical_metrics = [m for m in self.metrics_storage if m.timestamp >= cutoff_time]
-        
-        # Create KPI widgets
-        kpi_widgets = self.data_processor.create_kpi_widgets(current_metrics, historical_metrics)
-        
-        # Create charts
-        charts = self.data_processor.create_chart_data(historical_metrics, time_range)
-        
-        # Get active alerts (placeholder)
-        active_alerts = []
-        
-        # Calculate system health
-        system_health = self.data_processor.calculate_system_health(current_metrics, active_alerts)
-        
-        # Calculate uptime
-        uptime_percentage = 99.9  # Would calculate from actual data
-        
-        dashboard_state = DashboardState(
-            project_id=project_id,
-            domain="example.com",
-            last_updated=datetime.now(timezone.utc),
-            kpi_widgets=kpi_widgets,
-            charts=charts,
-            active_alerts=active_alerts,
-            system_health=system_health,
-            uptime_percentage=uptime_percentage
+        return await self.state_cache.get(
+            project_id, time_range, self.project_domains.get(project_id, "example.com")
         )
-        
-        return asdict(dashboard_state)
+    
+    async def _collect_project_metrics(self, project_id: str) -> List[MetricData]:
+        """Collect a project's metrics on demand (before the update loop has run)."""
+        metrics = await self.metrics_collector.collect_all_metrics(
+            project_id, self.project_domains.get(project_id, "example.com")
+        )
+        self.metric_store.append(project_id, [m for m in metrics if not m.stale])
+        return metrics
+    
+    def record_metrics(self, project_id: str, metrics: List[MetricData]):
+        """Persist newly collected metrics and invalidate the widgets they feed."""
+        # Stale values were stored when first collected
+        self.metric_store.append(project_id, [m for m in metrics if not m.stale])
+        self.state_cache.record(project_id, metrics)
     
     def _get_time_cutoff(self, time_range: TimeRange) -> datetime:
         """Get time cutoff for the given range."""
-        now = datetime.now(timezone.utc)
-        if time_range == TimeRange.LAST_HOUR:
-            return now - timedelta(hours=1)
-        elif time_range == TimeRange.LAST_DAY:
-            return now - timedelta(days=1)
-        elif time_range == TimeRange.LAST_WEEK:
-            return now - timedelta(days=7)
-        elif time_range == TimeRange.LAST_MONTH:
-            return now - timedelta(days=30)
-        else:
-            return now - timedelta(days=90)
+        return time_range_cutoff(time_range)
     
     async def start_background_updates(self, project_id: str, domain: str):
         """Start background task for metrics collection and updates."""
+        self.project_domains[project_id] = domain
+        
         async def update_loop():
             while True:
                 try:
                     # Collect new metrics
                     new_metrics = await self.metrics_collector.collect_all_metrics(project_id, domain)
-                    self.metrics_storage.extend(new_metrics)
+                    self.record_metrics(project_id, new_metrics)
                     
-                    # Trim old metrics (keep last 30 days)
-                    cutoff = datetime.now(timezone.utc) - timedelta(days=30)
-                    self.metrics_storage = [m for m in self.metrics_storage if m.timestamp >= cutoff]
+                    # Apply retention periodically rather than on every tick
+                    now = datetime.now(timezone.utc)
+                    if now - self.last_compaction >= self.compaction_interval:
+                        self.metric_store.compact(now)
+                        self.last_compaction = now
                     
                     # Get updated dashboard state
                     dashboard_state = await self._get_dashboard_state(project_id, TimeRange.LAST_DAY)
                     
-                    # Broadcast update to connected clients
-                    await self.websocket_manager.broadcast_update({
-                        "type": "dashboard_update",
-                        "data": dashboard_state
-                    }, project_id)
+                    # Broadcast a delta against each client's acknowledged state
+                    await self.websocket_manager.broadcast_state(project_id, dashboard_state)
                     
                     # Wait before next update
                     await asyncio.sleep(30)  # Update every 30 seconds
@@ -779,13 +1312,52 @@ class DashboardServer:
         const projectId = 'demo-project';
         const ws = new WebSocket(`ws://localhost:8000/ws/${projectId}`);
         
+        // Recent states by version; deltas are applied to the version they are based on
+        const states = new Map();
+        
         ws.onmessage = function(event) {
             const data = JSON.parse(event.data);
+            let state;
             if (data.type === 'dashboard_update') {
-                updateDashboard(data.data);
+                state = data.data;
+            } else if (data.type === 'dashboard_delta') {
+                const base = states.get(data.base_version);
+                if (!base) {
+                    ws.send(JSON.stringify({type: 'resync'}));
+                    return;
+                }
+                state = applyDelta(base, data.set, data.unset);
+            } else {
+                return;
             }
+            
+            states.set(data.version, state);
+            while (states.size > 8) {
+                states.delete(states.keys().next().value);
+            }
+            ws.send(JSON.stringify({type: 'ack', version: data.version}));
+            updateDashboard(state);
         };
         
+        function applyDelta(base, changed, removed) {
+            let state = structuredClone(base);
+            for (const [path, value] of changed) {
+                if (path.length === 0) {
+                    state = value;
+                    continue;
+                }
+                let target = state;
+                for (const key of path.slice(0, -1)) target = target[key];
+                target[path[path.length - 1]] = value;
+            }
+            for (const path of removed) {
+                let target = state;
+                for (const key of path.slice(0, -1)) target = target[key];
+                delete target[path[path.length - 1]];
+            }
+            return state;
+        }
+        
         // Load initial dashboard data
         async function loadDashboard() {
             try {
@@ -893,10 +1465,12 @@ async def launch_dashboard(project_id: str,
                            settings: Settings,
                            monitoring_config: MonitoringConfig,
                            port: int = 8000,
-                           host: str = "127.0.0.1") -> DashboardServer:
+                           host: str = "127.0.0.1",
+                           history_db: Optional[Path] = None) -> DashboardServer:
     """Launch the monitoring dashboard server."""
     
-    dashboard = DashboardServer(settings, monitoring_config)
+    metric_store = MetricHistoryStore(history_db) if history_db else None
+    dashboard = DashboardServer(settings, monitoring_config, metric_store=metric_store)
     
     # Start background metrics collection
     await dashboard.start_background_updates(project_id, domain)
@@ -0,0 +1,263 @@
+"""Durable metric history for the monitoring dashboard.
+
+Raw samples are appended to an indexed SQLite table and folded into
+1-minute, 1-hour and 1-day rollups as they arrive, so dashboard reads
+never rescan raw history. Each resolution has its own retention period;
+``compact`` drops expired rows and returns their pages to the file.
+"""
+
+import json
+import logging
+import sqlite3
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Sequence, Union
+
+if TYPE_CHECKING:
+    from .dashboard import MetricData
+
+
+logger = logging.getLogger(__name__)
+
+
+# Rollup resolutions in seconds; RAW reads the appended samples directly
+RAW = 0
+MINUTE = 60
+HOUR = 3600
+DAY = 86400
+
+ROLLUP_RESOLUTIONS = (MINUTE, HOUR, DAY)
+
+DEFAULT_RETENTION = {
+    RAW: timedelta(days=2),
+    MINUTE: timedelta(days=2),
+    HOUR: timedelta(days=35),
+    DAY: timedelta(days=400),
+}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS metric_points (
+    project_id TEXT NOT NULL,
+    metric_name TEXT NOT NULL,
+    metric_type TEXT NOT NULL,
+    dimensions TEXT NOT NULL,
+    ts REAL NOT NULL,
+    value REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_metric_points_project_ts ON metric_points (project_id, ts);
+CREATE INDEX IF NOT EXISTS idx_metric_points_ts ON metric_points (ts);
+
+CREATE TABLE IF NOT EXISTS metric_rollups (
+    resolution INTEGER NOT NULL,
+    project_id TEXT NOT NULL,
+    metric_name TEXT NOT NULL,
+    dimensions TEXT NOT NULL,
+    bucket REAL NOT NULL,
+    metric_type TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    sum REAL NOT NULL,
+    min REAL NOT NULL,
+    max REAL NOT NULL,
+    last_value REAL NOT NULL,
+    last_ts REAL NOT NULL,
+    PRIMARY KEY (resolution, project_id, bucket, metric_name, dimensions)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_metric_rollups_bucket ON metric_rollups (resolution, bucket);
+"""
+
+_ROLLUP_UPSERT = """
+INSERT INTO metric_rollups (
+    resolution, project_id, metric_name, dimensions, bucket, metric_type,
+    count, sum, min, max, last_value, last_ts
+) VALUES (?, ?, ?, ?, ?, ?, 1, ?, ?, ?, ?, ?)
+ON CONFLICT (resolution, project_id, bucket, metric_name, dimensions) DO UPDATE SET
+    count = count + excluded.count,
+    sum = sum + excluded.sum,
+    min = min(min, excluded.min),
+    max = max(max, excluded.max),
+    last_value = CASE WHEN excluded.last_ts >= last_ts THEN excluded.last_value ELSE last_value END,
+    last_ts = max(last_ts, excluded.last_ts)
+"""
+
+
+def _encode_dimensions(dimensions: Optional[Dict[str, str]]) -> str:
+    """Canonical text form of a dimension dict (key order independent)."""
+    return json.dumps(dimensions, sort_keys=True, separators=(",", ":")) if dimensions else ""
+
+
+def _decode_dimensions(encoded: str) -> Optional[Dict[str, str]]:
+    """Inverse of ``_encode_dimensions``."""
+    return json.loads(encoded) if encoded else None
+
+
+def _epoch(timestamp: datetime) -> float:
+    """POSIX timestamp, treating naive datetimes as UTC."""
+    if timestamp.tzinfo is None:
+        timestamp = timestamp.replace(tzinfo=timezone.utc)
+    return timestamp.timestamp()
+
+
+class MetricHistoryStore:
+    """Append-only SQLite store of dashboard metrics with downsampled rollups.
+
+    Every appended sample updates the bucket it falls in at each rollup
+    resolution (count, sum, min, max and the latest value), so reading a
+    90-day chart touches at most 90 rows per series.
+    """
+
+    def __init__(self,
+                 db_path: Union[str, Path] = ":memory:",
+                 retention: Optional[Dict[int, timedelta]] = None):
+        """Open (or create) the history database."""
+        self.db_path = str(db_path)
+        self.retention = {**DEFAULT_RETENTION, **(retention or {})}
+
+        if self.db_path != ":memory:":
+            Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+
+        self.conn = sqlite3.connect(self.db_path)
+        self.conn.row_factory = sqlite3.Row
+        # Must precede table creation to take effect on a new database
+        self.conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+        if self.db_path != ":memory:":
+            self.conn.execute("PRAGMA journal_mode = WAL")
+        self.conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self.conn.close()
+
+    def append(self, project_id: str, metrics: Iterable["MetricData"]) -> int:
+        """Persist samples for a project and fold them into every rollup."""
+        points = []
+        rollups = []
+
+        for metric in metrics:
+            ts = _epoch(metric.timestamp)
+            value = float(metric.value)
+            dimensions = _encode_dimensions(metric.dimensions)
+            metric_type = metric.metric_type.value
+
+            points.append((project_id, metric.metric_name, metric_type, dimensions, ts, value))
+            for resolution in ROLLUP_RESOLUTIONS:
+                bucket = ts - ts % resolution
+                rollups.append((
+                    resolution, project_id, metric.metric_name, dimensions, bucket, metric_type,
+                    value, value, value, value, ts
+                ))
+
+        if not points:
+            return 0
+
+        with self.conn:
+            self.conn.executemany(
+                "INSERT INTO metric_points (project_id, metric_name, metric_type, dimensions, ts, value) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                points
+            )
+            self.conn.executemany(_ROLLUP_UPSERT, rollups)
+
+        return len(points)
+
+    def query(self,
+              project_id: str,
+              since: datetime,
+              until: Optional[datetime] = None,
+              resolution: int = RAW,
+              metric_types: Optional[Sequence[str]] = None,
+              metric_names: Optional[Sequence[str]] = None) -> List["MetricData"]:
+        """Samples (or rollup bucket means) for a project, oldest first.
+
+        Rollup rows are returned as one MetricData per bucket, timestamped
+        at the bucket start, with the bucket mean as its value.
+        """
+        from .dashboard import MetricData, MetricType
+
+        if resolution != RAW and resolution not in ROLLUP_RESOLUTIONS:
+            raise ValueError(f"Unsupported rollup resolution: {resolution}")
+
+        until_ts = _epoch(until) if until is not None else float("inf")
+        if resolution == RAW:
+            sql = (
+                "SELECT metric_name, metric_type, dimensions, ts, value FROM metric_points "
+                "WHERE project_id = ? AND ts >= ? AND ts <= ?"
+            )
+            params: list = [project_id, _epoch(since), until_ts]
+        else:
+            # Include the bucket that straddles ``since``
+            sql = (
+                "SELECT metric_name, metric_type, dimensions, bucket AS ts, sum / count AS value "
+                "FROM metric_rollups WHERE resolution = ? AND project_id = ? AND bucket >= ? AND bucket <= ?"
+            )
+            since_ts = _epoch(since)
+            params = [resolution, project_id, since_ts - since_ts % resolution, until_ts]
+
+        if metric_types:
+            sql += f" AND metric_type IN ({', '.join('?' for _ in metric_types)})"
+            params.extend(metric_types)
+        if metric_names:
+            sql += f" AND metric_name IN ({', '.join('?' for _ in metric_names)})"
+            params.extend(metric_names)
+        sql += " ORDER BY ts"
+
+        return [
+            MetricData(
+                timestamp=datetime.fromtimestamp(row["ts"], tz=timezone.utc),
+                value=row["value"],
+                metric_name=row["metric_name"],
+                metric_type=MetricType(row["metric_type"]),
+                dimensions=_decode_dimensions(row["dimensions"])
+            )
+            for row in self.conn.execute(sql, params)
+        ]
+
+    def rollup_stats(self,
+                     project_id: str,
+                     metric_name: str,
+                     resolution: int,
+                     since: datetime) -> List[Dict[str, float]]:
+        """Full bucket statistics (count, mean, min, max, last) for one metric."""
+        since_ts = _epoch(since)
+        rows = self.conn.execute(
+            "SELECT bucket, dimensions, count, sum, min, max, last_value FROM metric_rollups "
+            "WHERE resolution = ? AND project_id = ? AND bucket >= ? AND metric_name = ? ORDER BY bucket",
+            (resolution, project_id, since_ts - since_ts % resolution, metric_name)
+        ).fetchall()
+
+        return [
+            {
+                "bucket": datetime.fromtimestamp(row["bucket"], tz=timezone.utc),
+                "dimensions": _decode_dimensions(row["dimensions"]),
+                "count": row["count"],
+                "mean": row["sum"] / row["count"],
+                "min": row["min"],
+                "max": row["max"],
+                "last": row["last_value"],
+            }
+            for row in rows
+        ]
+
+    def compact(self, now: Optional[datetime] = None) -> Dict[int, int]:
+        """Drop rows past each resolution's retention and reclaim free pages."""
+        now = now or datetime.now(timezone.utc)
+        deleted = {}
+
+        with self.conn:
+            cursor = self.conn.execute(
+                "DELETE FROM metric_points WHERE ts < ?",
+                (_epoch(now - self.retention[RAW]),)
+            )
+            deleted[RAW] = cursor.rowcount
+
+            for resolution in ROLLUP_RESOLUTIONS:
+                cursor = self.conn.execute(
+                    "DELETE FROM metric_rollups WHERE resolution = ? AND bucket < ?",
+                    (resolution, _epoch(now - self.retention[resolution]))
+                )
+                deleted[resolution] = cursor.rowcount
+
+        self.conn.execute("PRAGMA incremental_vacuum")
+
+        if any(deleted.values()):
+            logger.info(f"Compacted metric history: {deleted}")
+        return deleted
@@ -15,12 +15,29 @@ from pathlib import Path
 
 import numpy as np
 import pandas as pd
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
+from scipy import sparse
 
 from ..config import Settings
+from ..gsc_sync import load_page_performance
+from ..linking.graph import InternalLinkGraph
 from ..models import AlertSeverity
 from ..monitor.coverage import GSCAdapter
+from .similarity import hash_counts, labeled_pairs, tfidf_from_counts, tfidf_matrix, top_terms
+from .valuation import (
+    ACTIONS,
+    EFFORT_LEVELS,
+    IMPACT_TEMPLATES,
+    RULES,
+    SEO_BENEFITS,
+    VALUE_TIERS,
+    MetricColumns,
+    RecommendationColumns,
+    effort,
+    merge_groups,
+    merge_scores,
+    recommend,
+    value_tiers,
+)
 
 
 logger = logging.getLogger(__name__)
@@ -164,6 +181,75 @@ class ContentConsolidationPlan:
     estimated_completion_time: int  # hours
 
 
+class ImpactSummary:
+    """Incrementally accumulated impact summary of pruning recommendations.
+    
+    Holds only counters, so a summary over any number of pages takes
+    constant memory.
+    """
+    
+    def __init__(self):
+        """Initialize empty counters."""
+        self.total_recommendations = 0
+        self.action_counts = {action.value: 0 for action in ContentAction}
+        self.priority_counts = {priority: 0 for priority in ["high", "medium", "low"]}
+        self.current_total_traffic = 0
+        self.traffic_to_remove = 0
+        self.traffic_to_consolidate = 0
+        self.total_effort_hours = 0.0
+        self.high_priority_hours = 0.0
+        self.quick_wins = 0
+    
+    def add_metrics(self, metrics: ContentMetrics) -> None:
+        """Count a page's current traffic."""
+        self.current_total_traffic += metrics.organic_clicks
+    
+    def add_recommendation(self, rec: PruningRecommendation, organic_clicks: int = 0) -> None:
+        """Count a recommendation; ``organic_clicks`` is the recommended page's traffic."""
+        self.total_recommendations += 1
+        self.action_counts[rec.action.value] += 1
+        if rec.priority in self.priority_counts:
+            self.priority_counts[rec.priority] += 1
+        
+        if rec.action in [ContentAction.DELETE, ContentAction.NOINDEX]:
+            self.traffic_to_remove += organic_clicks
+        if rec.action == ContentAction.MERGE:
+            self.traffic_to_consolidate += rec.estimated_traffic_impact or 0
+        
+        self.total_effort_hours += rec.estimated_hours
+        if rec.priority == "high":
+            self.high_priority_hours += rec.estimated_hours
+        if rec.estimated_hours <= 1.0:
+            self.quick_wins += 1
+    
+    def as_dict(self) -> Dict[str, Any]:
+        """Summary in the report format."""
+        return {
+            "total_recommendations": self.total_recommendations,
+            "action_breakdown": dict(self.action_counts),
+            "traffic_analysis": {
+                "current_total_traffic": self.current_total_traffic,
+                "traffic_to_remove": self.traffic_to_remove,
+                "traffic_to_consolidate": self.traffic_to_consolidate,
+                "estimated_net_impact": self.traffic_to_consolidate - self.traffic_to_remove
+            },
+            "effort_analysis": {
+                "total_estimated_hours": self.total_effort_hours,
+                "high_priority_hours": self.high_priority_hours,
+                "quick_wins": self.quick_wins
+            },
+            "priority_breakdown": dict(self.priority_counts),
+            "content_quality_impact": "Expected improvement in overall site quality through pruning",
+            "seo_benefits": [
+                "Eliminate thin content",
+                "Reduce keyword cannibalization", 
+                "Improve topical authority",
+                "Better crawl budget utilization",
+                "Enhanced user experience"
+            ]
+        }
+
+
 class ContentAnalyzer:
     """Analyzes content performance and value."""
     
@@ -185,11 +271,7 @@ class ContentAnalyzer:
         start_date = end_date - timedelta(days=analysis_period_days)
         
         try:
-            if self.gsc_adapter:
-                # Get GSC data for all URLs
-                gsc_data = await self._get_gsc_data_for_urls(urls, domain, start_date, end_date)
-            else:
-                gsc_data = {}
+            gsc_data = await self._get_gsc_data_for_urls(urls, domain, start_date, end_date)
             
             for url in urls:
                 try:
@@ -209,24 +291,31 @@ class ContentAnalyzer:
                                      domain: str,
                                      start_date: datetime,
                                      end_date: datetime) -> Dict[str, Dict]:
-        """Get GSC data for specific URLs."""
+        """Get GSC data for specific URLs.
+        
+        Reads the synced GSCData table when the domain has been synced and
+        falls back to a single API request otherwise.
+        """
+        loop = asyncio.get_event_loop()
+        synced = await loop.run_in_executor(
+            None, lambda: load_page_performance(domain, start_date, end_date, pages=urls)
+        )
+        if synced is not None:
+            return synced
+        
         gsc_data = {}
+        if not self.gsc_adapter:
+            return gsc_data
         
         try:
-            # Get performance data from GSC
-            request = {
-                'startDate': start_date.strftime('%Y-%m-%d'),
-                'endDate': end_date.strftime('%Y-%m-%d'),
-                'dimensions': ['page'],
-                'rowLimit': 25000
-            }
-            
-            response = await self.gsc_adapter.get_indexation_data(domain, start_date, end_date)
+            # The synced table was just read, so query the API directly
+            response = await self.gsc_adapter.get_indexation_data(domain, start_date, end_date, use_synced=False)
             
             # Process response
+            wanted = set(urls)
             for row in response.get('rows', []):
                 page_url = row.get('keys', [''])[0]
-                if page_url in urls:
+                if page_url in wanted:
                     gsc_data[page_url] = {
                         'clicks': row.get('clicks', 0),
                         'impressions': row.get('impressions', 0),
@@ -303,62 +392,66 @@ class ContentAnalyzer:
     
     def calculate_content_value(self, metrics: ContentMetrics) -> ContentValue:
         """Calculate overall content value based on metrics."""
-        
-        # Scoring factors
-        traffic_score = min(100, metrics.organic_clicks * 2)  # Max 100 for 50+ clicks
-        impression_score = min(100, metrics.organic_impressions / 10)  # Max 100 for 1000+ impressions
-        position_score = max(0, 100 - metrics.average_position * 2)  # Better position = higher score
-        quality_score = metrics.quality_score * 10  # Convert to 0-100 scale
-        link_score = min(100, metrics.internal_links_in * 5)  # Max 100 for 20+ inbound links
-        freshness_score = max(0, 100 - (metrics.content_age_days / 365) * 20)  # Newer = better
-        
-        # Weighted average
-        total_score = (
-            traffic_score * 0.25 +
-            impression_score * 0.20 +
-            position_score * 0.15 +
-            quality_score * 0.15 +
-            link_score * 0.15 +
-            freshness_score * 0.10
-        )
-        
-        # Determine value level
-        if total_score >= 70:
-            return ContentValue.HIGH
-        elif total_score >= 40:
-            return ContentValue.MEDIUM
-        elif total_score >= 15:
-            return ContentValue.LOW
-        else:
-            return ContentValue.ZERO
+        return self.calculate_content_values([metrics])[0]
     
-    def identify_orphaned_content(self, all_metrics: List[ContentMetrics]) -> List[ContentMetrics]:
-        """Identify orphaned or poorly connected content."""
-        orphaned = []
-        
-        for metrics in all_metrics:
-            # Content with very few inbound links is potentially orphaned
-            if metrics.internal_links_in <= 2:
-                # Also check if it has low visibility
-                if metrics.organic_impressions < 100 and metrics.average_position > 30:
-                    orphaned.append(metrics)
-        
-        return orphaned
+    def calculate_content_values(self, all_metrics: List[ContentMetrics]) -> List[ContentValue]:
+        """Content value of many pages at once (see ``valuation.value_scores``)."""
+        tiers = value_tiers(MetricColumns.from_records(all_metrics))
+        return [ContentValue(VALUE_TIERS[tier]) for tier in tiers.tolist()]
+    
+    def identify_orphaned_content(self,
+                                  all_metrics: List[ContentMetrics],
+                                  link_graph: Optional[InternalLinkGraph] = None,
+                                  home_url: Optional[str] = None) -> List[ContentMetrics]:
+        """Identify orphaned or poorly connected content.
+        
+        With a link graph, a page is orphaned when no page links to it or it
+        cannot be reached from the home page (the graph's root URL when
+        ``home_url`` is omitted or not in the graph). Without one, and for
+        pages the graph does not cover, inbound-link counters and visibility
+        are used.
+        """
+        if link_graph is None:
+            return [metrics for metrics in all_metrics if self.is_orphaned(metrics)]
+        
+        disconnected = link_graph.disconnected(home_url if home_url in link_graph else None)
+        return [
+            metrics for metrics in all_metrics
+            if (self.is_orphaned(metrics) if metrics.url not in link_graph
+                else disconnected[link_graph.index[metrics.url]])
+        ]
+    
+    def is_orphaned(self, metrics: ContentMetrics) -> bool:
+        """Whether a page is poorly linked and barely visible (without a link graph)."""
+        # Content with very few inbound links is potentially orphaned,
+        # when it also has low visibility
+        return (
+            metrics.internal_links_in <= 2 and
+            metrics.organic_impressions < 100 and
+            metrics.average_position > 30
+        )
 
 
 class ContentSimilarityAnalyzer:
     """Analyzes content similarity for merge recommendations."""
     
-    def __init__(self):
-        """Initialize similarity analyzer."""
-        self.vectorizer = TfidfVectorizer(
-            max_features=5000,
-            stop_words='english',
-            ngram_range=(1, 2),
-            max_df=0.8,
-            min_df=2
-        )
-        self.content_vectors = {}
+    def __init__(self, block_size: int = 1024, workers: Optional[int] = None):
+        """Initialize similarity analyzer.
+        
+        Args:
+            block_size: Documents per block of the pairwise similarity product
+            workers: Worker processes for vectorizing and similarity blocks
+                (None runs in-process)
+        """
+        self.vectorizer_params = {
+            'max_features': 5000,
+            'ngram_range': (1, 2),
+            'max_df': 0.8,
+            'min_df': 2
+        }
+        self.block_size = block_size
+        self.workers = workers
+        self.documents = {}
         self.content_metadata = {}
     
     def add_content(self, url: str, title: str, content: str, keywords: List[str] = None):
@@ -375,45 +468,68 @@ class ContentSimilarityAnalyzer:
             'content_hash': hash(content)
         }
         
-        # Preprocess and store
+        # Preprocess and store; the vectorizer is fit over the whole corpus
         processed_content = self._preprocess_content(full_text)
         
         if processed_content.strip():
-            # Fit or transform based on whether this is first content
-            if not self.content_vectors:
-                vector = self.vectorizer.fit_transform([processed_content])
-            else:
-                try:
-                    vector = self.vectorizer.transform([processed_content])
-                except ValueError:
-                    # Vocabulary has changed, refit
-                    all_content = [processed_content]
-                    vector = self.vectorizer.fit_transform(all_content)
-            
-            self.content_vectors[url] = vector
+            self.documents[url] = processed_content
+        else:
+            self.documents.pop(url, None)
     
     def find_similar_content(self, similarity_threshold: float = 0.7) -> List[Tuple[str, str, float]]:
         """Find pairs of similar content above threshold."""
-        similar_pairs = []
-        
-        urls = list(self.content_vectors.keys())
-        
-        for i, url1 in enumerate(urls):
-            for j, url2 in enumerate(urls[i+1:], i+1):
-                
-                vector1 = self.content_vectors[url1]
-                vector2 = self.content_vectors[url2]
-                
-                # Calculate cosine similarity
-                similarity = cosine_similarity(vector1, vector2)[0][0]
-                
-                if similarity >= similarity_threshold:
-                    similar_pairs.append((url1, url2, similarity))
+        urls = list(self.documents)
+        if len(urls) < 2:
+            return []
         
-        # Sort by similarity score
-        similar_pairs.sort(key=lambda x: x[2], reverse=True)
+        try:
+            matrix = tfidf_matrix(
+                [self.documents[url] for url in urls],
+                workers=self.workers,
+                **self.vectorizer_params
+            )
+        except ValueError as e:
+            # Corpus too small or uniform for the document-frequency cutoffs
+            logger.warning(f"Could not vectorize content for similarity analysis: {e}")
+            return []
+        
+        # Sorted by similarity score
+        return labeled_pairs(urls, matrix, similarity_threshold, self.block_size, self.workers)
+    
+    def document_counts(self, title: str, content: str, max_terms: Optional[int] = None) -> sparse.csr_matrix:
+        """Hashed n-gram counts of one page, for :meth:`find_similar_counts`.
+        
+        Args:
+            title: Page title
+            content: Page content (HTML is stripped)
+            max_terms: Keep only this many of the most frequent terms
+        """
+        counts = hash_counts(
+            [self._preprocess_content(f"{title} {content}")],
+            ngram_range=self.vectorizer_params['ngram_range']
+        )
+        return top_terms(counts, max_terms) if max_terms else counts
+    
+    def find_similar_counts(self,
+                            urls: List[str],
+                            counts: sparse.csr_matrix,
+                            similarity_threshold: float = 0.7) -> List[Tuple[str, str, float]]:
+        """Like :meth:`find_similar_content`, over rows of :meth:`document_counts`."""
+        if len(urls) < 2:
+            return []
         
-        return similar_pairs
+        try:
+            matrix = tfidf_from_counts(
+                counts,
+                max_features=self.vectorizer_params['max_features'],
+                min_df=self.vectorizer_params['min_df'],
+                max_df=self.vectorizer_params['max_df']
+            )
+        except ValueError as e:
+            logger.warning(f"Could not vectorize content for similarity analysis: {e}")
+            return []
+        
+        return labeled_pairs(urls, matrix, similarity_threshold, self.block_size, self.workers)
     
     def analyze_keyword_overlap(self, url1: str, url2: str) -> Dict[str, Any]:
         """Analyze keyword overlap between two pieces of content."""
@@ -471,25 +587,13 @@ class ContentSimilarityAnalyzer:
 class PruningRecommendationEngine:
     """Generates specific pruning and optimization recommendations."""
     
-    def __init__(self):
-        """Initialize recommendation engine."""
-        self.similarity_analyzer = ContentSimilarityAnalyzer()
-    
     def generate_recommendations(self, 
                                  all_metrics: List[ContentMetrics],
                                  similarity_pairs: List[Tuple[str, str, float]] = None) -> List[PruningRecommendation]:
         """Generate comprehensive pruning recommendations."""
         
-        recommendations = []
-        analyzer = ContentAnalyzer(None)  # For value calculation
-        
-        # Analyze each piece of content
-        for metrics in all_metrics:
-            content_value = analyzer.calculate_content_value(metrics)
-            
-            # Generate recommendation based on value and metrics
-            recommendation = self._generate_single_recommendation(metrics, content_value)
-            recommendations.append(recommendation)
+        # Value and recommend every page in one columnar pass
+        recommendations = self.generate_page_recommendations(all_metrics)
         
         # Add merge recommendations based on similarity
         if similarity_pairs:
@@ -504,115 +608,105 @@ class PruningRecommendationEngine:
         
         return recommendations
     
+    def generate_page_recommendations(self, all_metrics: List[ContentMetrics]) -> List[PruningRecommendation]:
+        """One recommendation per page, valued and decided with NumPy masks."""
+        columns = MetricColumns.from_records(all_metrics)
+        return self._build_recommendations(all_metrics, recommend(columns))
+    
     def _generate_single_recommendation(self, 
                                         metrics: ContentMetrics,
                                         content_value: ContentValue) -> PruningRecommendation:
         """Generate recommendation for a single piece of content."""
-        
-        # Determine action based on value and specific metrics
-        if content_value == ContentValue.ZERO:
-            if metrics.organic_clicks == 0 and metrics.organic_impressions < 10:
-                action = ContentAction.DELETE
-                reason = "Zero traffic and minimal visibility"
-                confidence = 0.9
-                priority = "high"
-            else:
-                action = ContentAction.NOINDEX
-                reason = "Very low value but some minimal visibility"
-                confidence = 0.7
-                priority = "medium"
-        
-        elif content_value == ContentValue.LOW:
-            if metrics.internal_links_in <= 1:
-                action = ContentAction.REDIRECT
-                reason = "Low value content with poor internal linking"
-                confidence = 0.8
-                priority = "medium"
-            else:
-                action = ContentAction.IMPROVE
-                reason = "Low value but connected - improvement opportunity"
-                confidence = 0.6
-                priority = "low"
-        
-        elif content_value == ContentValue.MEDIUM:
-            if metrics.quality_score < 6.0:
-                action = ContentAction.IMPROVE
-                reason = "Medium traffic but quality issues"
-                confidence = 0.7
-                priority = "medium"
-            else:
-                action = ContentAction.KEEP
-                reason = "Decent performance, maintain current state"
-                confidence = 0.8
-                priority = "low"
-        
-        else:  # HIGH value
-            action = ContentAction.KEEP
-            reason = "High-value content, maintain and optimize"
-            confidence = 0.9
-            priority = "low"
-        
-        # Generate detailed analysis
-        detailed_analysis = self._create_detailed_analysis(metrics, content_value)
-        
-        # Assess impact
-        impact_assessment = self._assess_impact(metrics, action)
-        
-        # Estimate effort
-        effort_level, estimated_hours = self._estimate_effort(action, metrics)
-        
-        return PruningRecommendation(
-            url=metrics.url,
-            title=metrics.title,
-            action=action,
-            confidence=confidence,
-            reason=reason,
-            detailed_analysis=detailed_analysis,
-            impact_assessment=impact_assessment,
-            priority=priority,
-            effort_level=effort_level,
-            estimated_hours=estimated_hours,
-            seo_benefit=self._calculate_seo_benefit(action, metrics)
-        )
+        columns = MetricColumns.from_records([metrics])
+        tiers = np.array([VALUE_TIERS.index(content_value.value)])
+        return self._build_recommendations([metrics], recommend(columns, tiers))[0]
+    
+    def _build_recommendations(self,
+                               all_metrics: List[ContentMetrics],
+                               decisions: RecommendationColumns) -> List[PruningRecommendation]:
+        """Recommendation objects from columnar decisions."""
+        actions = [ContentAction(action) for action in ACTIONS]
+        values = [ContentValue(tier) for tier in VALUE_TIERS]
+        recommendations = []
+        for metrics, tier, rule, effort_level, hours in zip(
+            all_metrics,
+            decisions.value_tier.tolist(),
+            decisions.rule.tolist(),
+            decisions.effort.tolist(),
+            decisions.hours.tolist()
+        ):
+            action_code, reason, confidence, priority = RULES[rule]
+            action = actions[action_code]
+            recommendations.append(PruningRecommendation(
+                url=metrics.url,
+                title=metrics.title,
+                action=action,
+                confidence=confidence,
+                reason=reason,
+                detailed_analysis=self._create_detailed_analysis(metrics, values[tier]),
+                impact_assessment=IMPACT_TEMPLATES[action.value].format(clicks=metrics.organic_clicks),
+                priority=priority,
+                effort_level=EFFORT_LEVELS[effort_level],
+                estimated_hours=hours,
+                seo_benefit=SEO_BENEFITS[action.value]
+            ))
+        return recommendations
     
     def _generate_merge_recommendations(self, 
                                         similarity_pairs: List[Tuple[str, str, float]],
                                         all_metrics: List[ContentMetrics]) -> List[PruningRecommendation]:
-        """Generate merge recommendations based on content similarity."""
+        """Generate merge recommendations based on content similarity.
+        
+        Pages linked by high-similarity pairs are grouped with a union-find
+        and the group's best performer is kept. A page is merged into it only
+        when the two are themselves a high-similarity pair; pages related to
+        the primary only through others in the chain are left alone.
+        """
+        index_by_url = {m.url: i for i, m in enumerate(all_metrics)}
+        left, right, similarity = [], [], []
+        for url1, url2, score in similarity_pairs:
+            if score >= 0.8 and url1 in index_by_url and url2 in index_by_url:  # High similarity threshold for merge
+                left.append(index_by_url[url1])
+                right.append(index_by_url[url2])
+                similarity.append(score)
+        if not left:
+            return []
+        
+        # Only pages that appear in a pair take part in merge scoring
+        involved = sorted(set(left) | set(right))
+        local = {page: i for i, page in enumerate(involved)}
+        group_metrics = [all_metrics[page] for page in involved]
+        groups = merge_groups(
+            len(involved),
+            np.array([local[page] for page in left]),
+            np.array([local[page] for page in right]),
+            np.array(similarity, dtype=np.float64),
+            merge_scores(group_metrics)
+        )
         
         merge_recommendations = []
-        metrics_by_url = {m.url: m for m in all_metrics}
-        
-        for url1, url2, similarity in similarity_pairs:
-            if similarity >= 0.8:  # High similarity threshold for merge
-                
-                metrics1 = metrics_by_url.get(url1)
-                metrics2 = metrics_by_url.get(url2)
-                
-                if not metrics1 or not metrics2:
+        for primary, secondaries, primary_similarity in groups:
+            primary_metrics = group_metrics[primary]
+            for secondary, score in zip(secondaries.tolist(), primary_similarity.tolist()):
+                if score < 0.8:
                     continue
-                
-                # Determine which should be primary (better performance)
-                primary_url, secondary_url = self._determine_merge_primary(metrics1, metrics2)
-                primary_metrics = metrics_by_url[primary_url]
-                secondary_metrics = metrics_by_url[secondary_url]
-                
-                recommendation = PruningRecommendation(
-                    url=secondary_url,
+                secondary_metrics = group_metrics[secondary]
+                merge_recommendations.append(PruningRecommendation(
+                    url=secondary_metrics.url,
                     title=secondary_metrics.title,
                     action=ContentAction.MERGE,
-                    confidence=min(0.9, similarity),
-                    reason=f"High content similarity ({similarity:.1%}) with {primary_url}",
+                    confidence=min(0.9, score),
+                    reason=f"High content similarity ({score:.1%}) with {primary_metrics.url}",
                     detailed_analysis={
-                        "similarity_score": f"{similarity:.1%}",
-                        "merge_target": primary_url,
+                        "similarity_score": f"{score:.1%}",
+                        "merge_target": primary_metrics.url,
                         "traffic_consolidation": f"{secondary_metrics.organic_clicks + primary_metrics.organic_clicks} total clicks",
                         "ranking_opportunities": "Potential to improve rankings through content consolidation"
                     },
                     impact_assessment=f"Positive - consolidate {secondary_metrics.organic_clicks + primary_metrics.organic_clicks} clicks to single URL",
-                    target_url=primary_url,
+                    target_url=primary_metrics.url,
                     target_title=primary_metrics.title,
-                    similarity_score=similarity,
+                    similarity_score=score,
                     merge_strategy="consolidate_content",
                     redirect_type="301",
                     estimated_traffic_impact=secondary_metrics.organic_clicks,
@@ -621,39 +715,10 @@ class PruningRecommendationEngine:
                     effort_level="high",
                     estimated_hours=6.0,
                     seo_benefit="Content consolidation improves topical authority and eliminates cannibalization"
-                )
-                
-                merge_recommendations.append(recommendation)
+                ))
         
         return merge_recommendations
     
-    def _determine_merge_primary(self, 
-                                 metrics1: ContentMetrics,
-                                 metrics2: ContentMetrics) -> Tuple[str, str]:
-        """Determine which content should be primary in a merge."""
-        
-        # Score based on multiple factors
-        score1 = (
-            metrics1.organic_clicks * 2 +
-            metrics1.organic_impressions / 10 +
-            metrics1.internal_links_in * 5 +
-            (100 - metrics1.average_position) +
-            metrics1.quality_score * 5
-        )
-        
-        score2 = (
-            metrics2.organic_clicks * 2 +
-            metrics2.organic_impressions / 10 +
-            metrics2.internal_links_in * 5 +
-            (100 - metrics2.average_position) +
-            metrics2.quality_score * 5
-        )
-        
-        if score1 >= score2:
-            return metrics1.url, metrics2.url
-        else:
-            return metrics2.url, metrics1.url
-    
     def _create_detailed_analysis(self, 
                                   metrics: ContentMetrics,
                                   content_value: ContentValue) -> Dict[str, str]:
@@ -671,58 +736,16 @@ class PruningRecommendationEngine:
     
     def _assess_impact(self, metrics: ContentMetrics, action: ContentAction) -> str:
         """Assess the impact of the recommended action."""
-        
-        if action == ContentAction.DELETE:
-            return f"Minimal impact - removing {metrics.organic_clicks} clicks from low-value content"
-        elif action == ContentAction.REDIRECT:
-            return f"Neutral to positive - redirect {metrics.organic_clicks} clicks to better content"
-        elif action == ContentAction.MERGE:
-            return "Positive - consolidate traffic and improve topical authority"
-        elif action == ContentAction.IMPROVE:
-            return f"Positive - potential to increase {metrics.organic_clicks} clicks through optimization"
-        elif action == ContentAction.NOINDEX:
-            return "Neutral - remove from search while preserving for internal use"
-        else:  # KEEP
-            return "Maintain current performance"
+        return IMPACT_TEMPLATES[action.value].format(clicks=metrics.organic_clicks)
     
     def _estimate_effort(self, action: ContentAction, metrics: ContentMetrics) -> Tuple[str, float]:
         """Estimate effort level and hours for action."""
-        
-        if action == ContentAction.DELETE:
-            return "low", 0.5
-        elif action == ContentAction.REDIRECT:
-            return "low", 1.0
-        elif action == ContentAction.NOINDEX:
-            return "low", 0.5
-        elif action == ContentAction.IMPROVE:
-            # More effort for longer content
-            hours = max(2.0, metrics.word_count / 500)
-            if hours > 6:
-                return "high", hours
-            elif hours > 3:
-                return "medium", hours
-            else:
-                return "low", hours
-        elif action == ContentAction.MERGE:
-            return "high", 6.0
-        else:  # KEEP
-            return "low", 0.5
+        levels, hours = effort(np.array([ACTIONS.index(action.value)]), np.array([float(metrics.word_count)]))
+        return EFFORT_LEVELS[levels[0]], float(hours[0])
     
     def _calculate_seo_benefit(self, action: ContentAction, metrics: ContentMetrics) -> str:
         """Calculate SEO benefit of the action."""
-        
-        if action == ContentAction.DELETE:
-            return "Remove low-quality content to improve overall site quality"
-        elif action == ContentAction.REDIRECT:
-            return "Consolidate link equity and eliminate thin content"
-        elif action == ContentAction.MERGE:
-            return "Increase topical authority and eliminate keyword cannibalization"
-        elif action == ContentAction.IMPROVE:
-            return "Enhance content quality to improve rankings and CTR"
-        elif action == ContentAction.NOINDEX:
-            return "Remove from search index while preserving internal value"
-        else:  # KEEP
-            return "Maintain current SEO value"
+        return SEO_BENEFITS[action.value]
     
     def _priority_order(self, priority: str) -> int:
         """Convert priority to numeric order for sorting."""
@@ -742,81 +765,71 @@ class ContentPruningManager:
     async def analyze_site_content(self, 
                                    domain: str,
                                    urls: List[str] = None,
-                                   analysis_period_days: int = 90) -> Dict[str, Any]:
-        """Perform comprehensive content analysis for a site."""
+                                   analysis_period_days: int = 90,
+                                   output_path: Optional[Path] = None,
+                                   sitemap_url: Optional[str] = None,
+                                   fetch_concurrency: Optional[int] = None) -> Dict[str, Any]:
+        """Perform comprehensive content analysis for a site.
+        
+        Pages are fetched (from ``urls`` or the site's sitemap) and analyzed
+        by the streaming pipeline. With ``output_path`` (``.jsonl`` or
+        ``.parquet``) every record is written to the file as it is produced
+        and only a summary is returned; otherwise the full result is built
+        in memory.
+        """
+        from .pipeline import DEFAULT_FETCH_CONCURRENCY, CollectingRecordWriter, StreamingPruningPipeline, open_record_writer
         
         logger.info(f"Starting content analysis for {domain}")
         
-        # If no URLs provided, would typically fetch from sitemap
-        if not urls:
-            urls = await self._get_site_urls(domain)
-        
-        # Analyze content performance
-        all_metrics = await self.content_analyzer.analyze_content_performance(
-            urls, domain, analysis_period_days
+        pipeline = StreamingPruningPipeline(
+            self,
+            fetch_concurrency=fetch_concurrency or DEFAULT_FETCH_CONCURRENCY,
+            analysis_period_days=analysis_period_days
         )
         
-        # Analyze content similarity (would fetch actual content)
-        similarity_pairs = await self._analyze_content_similarity(urls)
-        
-        # Generate recommendations
-        recommendations = self.recommendation_engine.generate_recommendations(
-            all_metrics, similarity_pairs
-        )
-        
-        # Identify specific issues
-        orphaned_content = self.content_analyzer.identify_orphaned_content(all_metrics)
-        
-        # Generate consolidation opportunities
-        consolidation_plans = self._generate_consolidation_plans(recommendations)
-        
-        # Calculate overall impact
-        impact_summary = self._calculate_impact_summary(recommendations, all_metrics)
+        if output_path is not None:
+            writer = open_record_writer(output_path)
+            try:
+                summary = await pipeline.run(domain, writer, urls=urls, sitemap_url=sitemap_url)
+            finally:
+                writer.close()
+            summary["output_path"] = str(output_path)
+            logger.info(f"Content analysis completed: records written to {output_path}")
+            return summary
+        
+        writer = CollectingRecordWriter()
+        summary = await pipeline.run(domain, writer, urls=urls, sitemap_url=sitemap_url)
+        
+        pages = [record for record in writer.records if record["record_type"] == "page"]
+        recommendations = [
+            record["recommendation"] for record in writer.records
+            if record["record_type"] in ("page", "merge")
+        ]
+        recommendations.sort(key=lambda r: (
+            self.recommendation_engine._priority_order(r["priority"]),
+            -r["confidence"]
+        ))
         
         analysis_result = {
             "domain": domain,
-            "analysis_date": datetime.now(timezone.utc).isoformat(),
-            "total_urls_analyzed": len(all_metrics),
-            "content_metrics": [metrics.__dict__ for metrics in all_metrics],
-            "recommendations": [rec.__dict__ for rec in recommendations],
-            "orphaned_content": [metrics.url for metrics in orphaned_content],
-            "consolidation_plans": consolidation_plans,
-            "impact_summary": impact_summary,
-            "similar_content_pairs": similarity_pairs
+            "analysis_date": summary["analysis_date"],
+            "total_urls_analyzed": summary["total_urls_analyzed"],
+            "failed_urls": [record["url"] for record in writer.records if record["record_type"] == "error"],
+            "content_metrics": [record["metrics"] for record in pages],
+            "recommendations": recommendations,
+            "orphaned_content": [record["url"] for record in writer.records if record["record_type"] == "orphan"],
+            "consolidation_plans": summary["consolidation_plans"],
+            "impact_summary": summary["impact_summary"],
+            "similar_content_pairs": [
+                (record["url"], record["target_url"], record["similarity_score"])
+                for record in writer.records if record["record_type"] == "similar_pair"
+            ]
         }
         
         logger.info(f"Content analysis completed: {len(recommendations)} recommendations generated")
         
         return analysis_result
     
-    async def _get_site_urls(self, domain: str) -> List[str]:
-        """Get all URLs for a site (would typically fetch from sitemap)."""
-        # Placeholder - would fetch from sitemap.xml or crawl
-        return [
-            f"https://{domain}/page-{i}"
-            for i in range(1, 51)  # Sample 50 URLs
-        ]
-    
-    async def _analyze_content_similarity(self, urls: List[str]) -> List[Tuple[str, str, float]]:
-        """Analyze content similarity between URLs."""
-        # In production, would fetch actual content for each URL
-        # For now, simulate some similar content pairs
-        
-        similarity_pairs = []
-        
-        # Simulate adding content to analyzer
-        for url in urls[:20]:  # Analyze first 20 for demo
-            title = f"Sample Title for {url}"
-            content = f"Sample content for {url} with some overlapping text and keywords."
-            keywords = ["sample", "content", "seo", "optimization"]
-            
-            self.similarity_analyzer.add_content(url, title, content, keywords)
-        
-        # Find similar content
-        similarity_pairs = self.similarity_analyzer.find_similar_content(0.7)
-        
-        return similarity_pairs
-    
     def _generate_consolidation_plans(self, 
                                       recommendations: List[PruningRecommendation]) -> List[Dict]:
         """Generate consolidation plans for merge recommendations."""
@@ -862,59 +875,16 @@ class ContentPruningManager:
                                   recommendations: List[PruningRecommendation],
                                   all_metrics: List[ContentMetrics]) -> Dict[str, Any]:
         """Calculate overall impact summary of recommendations."""
+        summary = ImpactSummary()
+        clicks_by_url = {}
+        for metrics in all_metrics:
+            summary.add_metrics(metrics)
+            clicks_by_url[metrics.url] = metrics.organic_clicks
         
-        # Count recommendations by action
-        action_counts = {}
-        for action in ContentAction:
-            action_counts[action.value] = len([r for r in recommendations if r.action == action])
-        
-        # Calculate traffic impact
-        total_current_traffic = sum(m.organic_clicks for m in all_metrics)
-        
-        # Estimate traffic changes from recommendations
-        traffic_to_remove = sum(
-            m.organic_clicks for m in all_metrics
-            for r in recommendations
-            if r.url == m.url and r.action in [ContentAction.DELETE, ContentAction.NOINDEX]
-        )
-        
-        traffic_to_consolidate = sum(
-            r.estimated_traffic_impact or 0 for r in recommendations
-            if r.action == ContentAction.MERGE
-        )
-        
-        # Estimate effort
-        total_effort_hours = sum(r.estimated_hours for r in recommendations)
-        
-        # Priority breakdown
-        priority_counts = {}
-        for priority in ["high", "medium", "low"]:
-            priority_counts[priority] = len([r for r in recommendations if r.priority == priority])
+        for rec in recommendations:
+            summary.add_recommendation(rec, clicks_by_url.get(rec.url, 0))
         
-        return {
-            "total_recommendations": len(recommendations),
-            "action_breakdown": action_counts,
-            "traffic_analysis": {
-                "current_total_traffic": total_current_traffic,
-                "traffic_to_remove": traffic_to_remove,
-                "traffic_to_consolidate": traffic_to_consolidate,
-                "estimated_net_impact": traffic_to_consolidate - traffic_to_remove
-            },
-            "effort_analysis": {
-                "total_estimated_hours": total_effort_hours,
-                "high_priority_hours": sum(r.estimated_hours for r in recommendations if r.priority == "high"),
-                "quick_wins": len([r for r in recommendations if r.estimated_hours <= 1.0])
-            },
-            "priority_breakdown": priority_counts,
-            "content_quality_impact": "Expected improvement in overall site quality through pruning",
-            "seo_benefits": [
-                "Eliminate thin content",
-                "Reduce keyword cannibalization", 
-                "Improve topical authority",
-                "Better crawl budget utilization",
-                "Enhanced user experience"
-            ]
-        }
+        return summary.as_dict()
     
     async def implement_recommendations(self, 
                                         recommendations: List[PruningRecommendation],
@@ -1034,7 +1004,9 @@ class ContentPruningManager:
 
 async def run_content_analysis(domain: str,
                                settings: Settings,
-                               urls: List[str] = None) -> Dict[str, Any]:
+                               urls: List[str] = None,
+                               output_path: Optional[Path] = None,
+                               sitemap_url: Optional[str] = None) -> Dict[str, Any]:
     """Run comprehensive content analysis for pruning opportunities."""
     
     manager = ContentPruningManager(settings)
@@ -1042,7 +1014,9 @@ async def run_content_analysis(domain: str,
     analysis_result = await manager.analyze_site_content(
         domain=domain,
         urls=urls,
-        analysis_period_days=90
+        analysis_period_days=90,
+        output_path=output_path,
+        sitemap_url=sitemap_url
     )
     
     logger.info(f"Content analysis completed for {domain}: {analysis_result['total_urls_analyzed']} URLs analyzed")
@@ -0,0 +1,994 @@
+"""Streaming content-pruning pipeline.
+
+Pages flow through five stages connected by bounded queues:
+
+    sitemap -> fetch -> extract -> metrics -> recommendation
+
+The sitemap stage walks (nested, optionally gzipped) XML sitemaps and
+enqueues URLs; fetchers download pages concurrently; extractors reduce each
+page to its title, word count, readability, quality score, link counts and
+hashed n-gram counts; the metrics stage joins batches of pages with Search
+Console performance and inbound links from the stored internal link graph;
+the recommendation stage generates recommendations and writes one record per
+page to a JSONL or Parquet writer as it goes. Orphaned pages are decided once
+the crawl is done, from the stored graph with the crawled internal links
+added, and written as ``orphan`` records. Without a stored graph, inbound
+links are only known once the crawl is done, so pages wait in a temporary
+file and are recommended after it.
+
+No page content is kept once its record is written. For duplicate
+detection (disable with ``detect_duplicates=False``) each page's
+``SIMILARITY_TERMS`` most frequent hashed n-grams go to a temporary file of
+fixed-width rows, corpus term statistics are summed as pages arrive, and a
+MinHash LSH index over the term sets pairs each page with earlier pages
+that may be similar. Once the crawl is done, TF-IDF cosine similarity is
+computed for those candidate pairs only, reading their rows back through a
+memory map; similar pairs are written as ``similar_pair`` records. In
+memory, every page keeps a merge summary and its MinHash signature, and
+crawled internal links are kept for the orphan pass as int32 node-id edge
+arrays, with one URL string per page.
+"""
+
+import asyncio
+import dataclasses
+import gzip
+import heapq
+import io
+import json
+import logging
+import pickle
+import tempfile
+import xml.etree.ElementTree as ET
+from abc import ABC, abstractmethod
+from array import array
+from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
+from enum import Enum
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple, Union
+from urllib.parse import urldefrag, urljoin, urlparse
+
+import httpx
+import numpy as np
+from scipy import sparse
+
+from ..config import GovernanceConfig
+from ..governance.minhash import MinHashLSHIndex
+from ..governance.quality import QualityScorer
+from ..governance.textprofile import TextProfile
+from ..gsc_sync import load_page_performance
+from ..instrumentation import traced_httpx_client
+from ..linking.graph import InternalLinkGraph, load_link_graph
+from .optimization import ContentMetrics, ContentPruningManager, ImpactSummary, PruningRecommendation
+from .similarity import pair_similarities, tfidf_weights
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_FETCH_CONCURRENCY = 16
+DEFAULT_QUEUE_SIZE = 1000
+DEFAULT_BATCH_SIZE = 500
+# Pages larger than this are truncated before extraction
+MAX_PAGE_BYTES = 5 * 1024 * 1024
+# Nested sitemap index depth followed
+MAX_SITEMAP_DEPTH = 5
+# Recommendations kept for the summary; the full set is in the output file
+TOP_RECOMMENDATIONS = 50
+# Traffic windows (days) loaded for every page besides the analysis period
+TRAFFIC_WINDOWS = (30, 90, 365)
+# TF-IDF cosine similarity at which pages are reported as similar; the
+# recommendation engine merges the closer pairs among them
+SIMILARITY_THRESHOLD = 0.7
+# Most frequent hashed n-grams kept per page for the similarity pass
+SIMILARITY_TERMS = 300
+# MinHash Jaccard of two pages' kept term sets at which they become
+# candidates for the cosine check; pages at SIMILARITY_THRESHOLD cosine
+# share far fewer terms than that, so this is set low
+CANDIDATE_JACCARD = 0.2
+CANDIDATE_PERMUTATIONS = 128
+# Candidate pairs scored per block of the similarity pass
+CANDIDATE_BLOCK = 8192
+
+USER_AGENT = 'Mozilla/5.0 (compatible; SEO-Bot/1.0; +https://example.com/bot)'
+
+# Queue sentinel closing a stage
+_DONE = object()
+
+# Fixed-width term row written per page for the similarity pass
+_TERM_ROW = np.dtype([
+    ('nnz', np.int32),
+    ('indices', np.int32, (SIMILARITY_TERMS,)),
+    ('counts', np.float32, (SIMILARITY_TERMS,)),
+])
+
+
+@dataclasses.dataclass
+class SitemapEntry:
+    """A page URL listed in a sitemap."""
+    url: str
+    last_modified: Optional[datetime] = None
+
+
+@dataclasses.dataclass
+class FetchedPage:
+    """Raw fetch result."""
+    url: str
+    status_code: int
+    html: str
+    last_modified: Optional[datetime] = None
+
+
+@dataclasses.dataclass
+class ExtractedPage:
+    """What the later stages need from a page; the HTML is dropped here."""
+    url: str
+    title: str
+    word_count: int
+    readability_score: float
+    quality_score: float
+    internal_links_out: int
+    external_links: int
+    last_modified: Optional[datetime] = None
+    # Distinct same-host URLs the page links to, without fragments
+    internal_targets: Tuple[str, ...] = ()
+    # Hashed n-gram counts (one CSR row) for the similarity pass
+    term_counts: Optional[sparse.csr_matrix] = None
+
+
+@dataclasses.dataclass
+class FailedPage:
+    """A URL that could not be fetched or extracted."""
+    url: str
+    error: str
+    status_code: Optional[int] = None
+
+
+class MergeFeatures(NamedTuple):
+    """The metrics merge recommendations read, kept per page for duplicate detection."""
+    url: str
+    title: str
+    organic_clicks: int
+    organic_impressions: int
+    internal_links_in: int
+    average_position: float
+    quality_score: float
+
+
+def _parse_lastmod(value: Optional[str]) -> Optional[datetime]:
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def parse_sitemap(data: bytes) -> Iterator[Tuple[str, str, Optional[datetime]]]:
+    """``(kind, loc, lastmod)`` for every ``<url>`` or nested ``<sitemap>``.
+
+    Parsed incrementally; gzipped sitemaps are detected by their magic bytes.
+    """
+    if data[:2] == b'\x1f\x8b':
+        data = gzip.decompress(data)
+    for _, element in ET.iterparse(io.BytesIO(data), events=('end',)):
+        kind = element.tag.rsplit('}', 1)[-1]
+        if kind not in ('url', 'sitemap'):
+            continue
+        loc = lastmod = None
+        for child in element:
+            name = child.tag.rsplit('}', 1)[-1]
+            if name == 'loc':
+                loc = (child.text or '').strip()
+            elif name == 'lastmod':
+                lastmod = _parse_lastmod(child.text)
+        if loc:
+            yield kind, loc, lastmod
+        element.clear()
+
+
+async def iter_sitemap(client: httpx.AsyncClient,
+                       sitemap_url: str,
+                       max_depth: int = MAX_SITEMAP_DEPTH) -> AsyncIterator[SitemapEntry]:
+    """Page URLs from a sitemap, following sitemap indexes depth-first."""
+    stack = [(sitemap_url, 0)]
+    visited = set()
+    while stack:
+        url, depth = stack.pop()
+        if url in visited:
+            continue
+        visited.add(url)
+        try:
+            response = await client.get(url)
+            response.raise_for_status()
+            entries = list(parse_sitemap(response.content))
+        except (httpx.HTTPError, ET.ParseError, OSError) as e:
+            logger.error(f"Failed to read sitemap {url}: {e}")
+            continue
+
+        children = []
+        for kind, loc, lastmod in entries:
+            if kind == 'sitemap':
+                if depth < max_depth:
+                    children.append((loc, depth + 1))
+            else:
+                yield SitemapEntry(loc, lastmod)
+        # Visit children in document order
+        stack.extend(reversed(children))
+
+
+def _extract_title(html: str) -> str:
+    lowered = html.lower()
+    start = lowered.find('<title')
+    if start < 0:
+        return ""
+    start = lowered.find('>', start)
+    end = lowered.find('</title', start)
+    if start < 0 or end < 0:
+        return ""
+    return ' '.join(html[start + 1:end].split())
+
+
+_SKIPPED_BLOCKS = ('script', 'style', 'noscript', 'template')
+
+
+def _strip_blocks(html: str) -> str:
+    """Drop script, style, noscript and template elements in one left-to-right pass."""
+    lowered = html.lower()
+    # Next opening position of each block tag, refreshed only once passed
+    next_open = {tag: lowered.find('<' + tag) for tag in _SKIPPED_BLOCKS}
+    parts = []
+    position = 0
+    while True:
+        pending = [(index, tag) for tag, index in next_open.items() if index >= 0]
+        if not pending:
+            parts.append(html[position:])
+            break
+        start, tag = min(pending)
+        parts.append(html[position:start])
+        end = lowered.find('</' + tag, start)
+        close = lowered.find('>', end) if end >= 0 else -1
+        if close < 0:
+            break
+        position = close + 1
+        for name, index in next_open.items():
+            if 0 <= index < position:
+                next_open[name] = lowered.find('<' + name, position)
+    return ' '.join(parts)
+
+
+class PruningRecordWriter(ABC):
+    """Writes pipeline records incrementally."""
+
+    @abstractmethod
+    def write(self, record: Dict[str, Any]) -> None:
+        """Write one record."""
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+class JSONLRecordWriter(PruningRecordWriter):
+    """One JSON object per line."""
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._handle = open(self.path, 'w', encoding='utf-8')
+
+    def write(self, record: Dict[str, Any]) -> None:
+        self._handle.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+
+    def close(self) -> None:
+        self._handle.close()
+
+
+# Flat Parquet columns; everything else goes into the JSON "details" column
+_PARQUET_COLUMNS = [
+    ('record_type', 'string'), ('url', 'string'), ('title', 'string'),
+    ('action', 'string'), ('priority', 'string'), ('confidence', 'float64'),
+    ('reason', 'string'), ('target_url', 'string'), ('similarity_score', 'float64'),
+    ('estimated_hours', 'float64'), ('organic_clicks', 'int64'), ('organic_impressions', 'int64'),
+    ('average_position', 'float64'), ('word_count', 'int64'), ('quality_score', 'float64'),
+    ('internal_links_in', 'int64'), ('content_age_days', 'int64'), ('error', 'string'),
+    ('details', 'string'),
+]
+
+
+class ParquetRecordWriter(PruningRecordWriter):
+    """Flattened records in Parquet row groups.
+
+    Raises:
+        ImportError: If pyarrow is not installed
+    """
+
+    def __init__(self, path: Union[str, Path], row_group_size: int = 10000):
+        if not PYARROW_AVAILABLE:
+            raise ImportError("pyarrow is required for Parquet output")
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.row_group_size = row_group_size
+        self.schema = pa.schema([(name, getattr(pa, kind)()) for name, kind in _PARQUET_COLUMNS])
+        self._writer = pq.ParquetWriter(str(self.path), self.schema)
+        self._rows: List[Dict[str, Any]] = []
+
+    def write(self, record: Dict[str, Any]) -> None:
+        metrics = record.get('metrics') or {}
+        recommendation = record.get('recommendation') or {}
+        row = {'record_type': record.get('record_type'), 'url': record.get('url'), 'error': record.get('error')}
+        for source in (record, metrics, recommendation):
+            for name, _ in _PARQUET_COLUMNS:
+                if name in source and row.get(name) is None:
+                    row[name] = source[name]
+        row['details'] = json.dumps(record, ensure_ascii=False, default=str)
+        self._rows.append(row)
+        if len(self._rows) >= self.row_group_size:
+            self._flush()
+
+    def _flush(self) -> None:
+        if self._rows:
+            self._writer.write_table(pa.Table.from_pylist(self._rows, schema=self.schema))
+            self._rows = []
+
+    def close(self) -> None:
+        self._flush()
+        self._writer.close()
+
+
+class CollectingRecordWriter(PruningRecordWriter):
+    """Keeps records in memory (for small sites and tests)."""
+
+    def __init__(self):
+        self.records: List[Dict[str, Any]] = []
+
+    def write(self, record: Dict[str, Any]) -> None:
+        self.records.append(record)
+
+
+def open_record_writer(path: Union[str, Path]) -> PruningRecordWriter:
+    """Parquet writer for ``.parquet`` paths, JSONL otherwise."""
+    if Path(path).suffix.lower() == '.parquet':
+        return ParquetRecordWriter(path)
+    return JSONLRecordWriter(path)
+
+
+def _plain(value: Any) -> Any:
+    """JSON-ready copy of dataclasses, enums and datetimes."""
+    if dataclasses.is_dataclass(value):
+        return {field.name: _plain(getattr(value, field.name)) for field in dataclasses.fields(value)}
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, dict):
+        return {key: _plain(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_plain(item) for item in value]
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+class StreamingPruningPipeline:
+    """Runs the pruning analysis as a bounded-memory streaming pipeline."""
+
+    def __init__(self,
+                 manager: ContentPruningManager,
+                 fetch_concurrency: int = DEFAULT_FETCH_CONCURRENCY,
+                 extract_workers: int = 2,
+                 queue_size: int = DEFAULT_QUEUE_SIZE,
+                 batch_size: int = DEFAULT_BATCH_SIZE,
+                 analysis_period_days: int = 90,
+                 detect_duplicates: bool = True,
+                 top_recommendations: int = TOP_RECOMMENDATIONS,
+                 client: Optional[httpx.AsyncClient] = None,
+                 session_scope=None):
+        """Initialize the pipeline.
+
+        Args:
+            manager: Pruning manager supplying the analyzer, recommendation
+                engine and consolidation planning
+            fetch_concurrency: Concurrent page fetches
+            extract_workers: Concurrent extraction workers
+            queue_size: Capacity of the URL queue; page queues hold two
+                items per worker
+            batch_size: Pages per metrics lookup and recommendation batch
+            analysis_period_days: Search Console window for traffic metrics
+            detect_duplicates: Find merge candidates by TF-IDF cosine similarity
+            top_recommendations: Recommendations kept in the returned summary
+            client: HTTP client to use (created per run when omitted)
+            session_scope: Database session factory (defaults to ``get_db_session``)
+        """
+        self.manager = manager
+        self.analyzer = manager.content_analyzer
+        self.similarity = manager.similarity_analyzer
+        self.engine = manager.recommendation_engine
+        self.fetch_concurrency = max(1, fetch_concurrency)
+        self.extract_workers = max(1, extract_workers)
+        self.queue_size = queue_size
+        self.batch_size = max(1, batch_size)
+        self.analysis_period_days = analysis_period_days
+        self.detect_duplicates = detect_duplicates
+        self.top_recommendations = top_recommendations
+        self.client = client
+        self.session_scope = session_scope
+        self.scorer = QualityScorer(GovernanceConfig())
+        self._api_performance: Optional[Dict[str, Dict]] = None
+
+    async def run(self,
+                  domain: str,
+                  writer: PruningRecordWriter,
+                  urls: Optional[Iterable[str]] = None,
+                  sitemap_url: Optional[str] = None) -> Dict[str, Any]:
+        """Analyze a site and stream records to ``writer``.
+
+        URLs come from ``urls`` when given, otherwise from ``sitemap_url``
+        (default ``https://<domain>/sitemap.xml``).
+
+        Returns:
+            Summary with counts, impact, top recommendations and consolidation plans
+        """
+        owns_client = self.client is None
+        client = self.client or traced_httpx_client(
+            'prune',
+            follow_redirects=True,
+            timeout=30.0,
+            headers={'User-Agent': USER_AGENT},
+            limits=httpx.Limits(max_connections=self.fetch_concurrency)
+        )
+        host = urlparse(domain if '://' in domain else f"https://{domain}").netloc.lower()
+
+        self._api_performance = None
+        self._run_state = {
+            'summary': ImpactSummary(),
+            'top': [],
+            'sequence': 0,
+            'pages': 0,
+            'failed': 0,
+            'features': {},
+            # Crawled links as node ids; stored graph pages keep their ids
+            'node_ids': {},
+            'node_urls': [],
+            'edge_sources': array('i'),
+            'edge_targets': array('i'),
+            'link_fallback': {},
+            'held': None,
+            'term_rows': tempfile.TemporaryFile() if self.detect_duplicates else None,
+            'document_frequency': None,
+            'term_frequency': None,
+            'lsh': MinHashLSHIndex(threshold=CANDIDATE_JACCARD, num_perm=CANDIDATE_PERMUTATIONS),
+            'candidate_left': array('i'),
+            'candidate_right': array('i'),
+        }
+
+        # Inbound links come from the project's stored link graph
+        loop = asyncio.get_running_loop()
+        graph = await loop.run_in_executor(None, lambda: load_link_graph(domain, self.session_scope))
+        self._run_state['graph'] = graph
+        if graph is not None:
+            self._run_state['in_degree'] = graph.in_degree()
+            self._run_state['node_ids'] = dict(graph.index)
+            self._run_state['node_urls'] = list(graph.urls)
+        else:
+            # Pages wait here until the crawl's links give their in-degree
+            self._run_state['held'] = tempfile.TemporaryFile()
+
+        url_queue: asyncio.Queue = asyncio.Queue(self.queue_size)
+        fetched_queue: asyncio.Queue = asyncio.Queue(self.fetch_concurrency * 2)
+        page_queue: asyncio.Queue = asyncio.Queue(self.extract_workers * 2 + self.batch_size)
+        batch_queue: asyncio.Queue = asyncio.Queue(2)
+
+        async def produce():
+            if urls is not None:
+                for url in urls:
+                    await url_queue.put(SitemapEntry(url))
+            else:
+                async for entry in iter_sitemap(client, sitemap_url or f"https://{host}/sitemap.xml"):
+                    await url_queue.put(entry)
+
+        fetchers = [asyncio.create_task(self._fetch_stage(client, url_queue, fetched_queue))
+                    for _ in range(self.fetch_concurrency)]
+        extractors = [asyncio.create_task(self._extract_stage(host, fetched_queue, page_queue))
+                      for _ in range(self.extract_workers)]
+        metrics_task = asyncio.create_task(self._metrics_stage(domain, page_queue, batch_queue))
+        recommend_task = asyncio.create_task(self._recommend_stage(batch_queue, writer))
+
+        async def close_stages():
+            await produce()
+            for _ in fetchers:
+                await url_queue.put(_DONE)
+            await asyncio.gather(*fetchers)
+            for _ in extractors:
+                await fetched_queue.put(_DONE)
+            await asyncio.gather(*extractors)
+            await page_queue.put(_DONE)
+            await metrics_task
+            await recommend_task
+
+        closer = asyncio.create_task(close_stages())
+        tasks = fetchers + extractors + [metrics_task, recommend_task, closer]
+        try:
+            # Surface the first failure instead of deadlocking on a full queue
+            done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+            for task in done:
+                if task.exception() is not None:
+                    raise task.exception()
+            await closer
+            return self._finish(domain, host, writer)
+        finally:
+            for task in tasks:
+                task.cancel()
+            for spill in ('held', 'term_rows'):
+                if self._run_state[spill] is not None:
+                    self._run_state[spill].close()
+            if owns_client:
+                await client.aclose()
+
+    async def _fetch_stage(self, client: httpx.AsyncClient, url_queue: asyncio.Queue, out: asyncio.Queue) -> None:
+        while True:
+            entry = await url_queue.get()
+            if entry is _DONE:
+                return
+            await out.put(await self._fetch(client, entry))
+
+    async def _fetch(self, client: httpx.AsyncClient, entry: SitemapEntry) -> Union[FetchedPage, FailedPage]:
+        try:
+            response = await client.get(entry.url)
+        except httpx.HTTPError as e:
+            return FailedPage(entry.url, f"Fetch failed: {e}")
+
+        if response.status_code >= 400:
+            return FailedPage(entry.url, f"HTTP {response.status_code}", response.status_code)
+        content_type = response.headers.get('content-type', 'text/html')
+        if 'html' not in content_type and 'xml' not in content_type:
+            return FailedPage(entry.url, f"Not an HTML page ({content_type})", response.status_code)
+
+        last_modified = entry.last_modified
+        if last_modified is None and response.headers.get('last-modified'):
+            try:
+                last_modified = parsedate_to_datetime(response.headers['last-modified'])
+            except (TypeError, ValueError):
+                pass
+
+        html = response.content[:MAX_PAGE_BYTES].decode(response.encoding or 'utf-8', errors='replace')
+        return FetchedPage(entry.url, response.status_code, html, last_modified)
+
+    async def _extract_stage(self, host: str, fetched_queue: asyncio.Queue, out: asyncio.Queue) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            fetched = await fetched_queue.get()
+            if fetched is _DONE:
+                return
+            if isinstance(fetched, FailedPage):
+                await out.put(fetched)
+                continue
+            try:
+                page = await loop.run_in_executor(None, self.extract, fetched, host)
+            except Exception as e:
+                page = FailedPage(fetched.url, f"Extraction failed: {e}", fetched.status_code)
+            await out.put(page)
+
+    def extract(self, fetched: FetchedPage, host: str) -> ExtractedPage:
+        """Reduce a fetched page to the fields later stages need."""
+        title = _extract_title(fetched.html)
+        body = _strip_blocks(fetched.html)
+        profile = TextProfile.from_content(body)
+
+        internal = external = 0
+        targets = {}
+        for link in profile.links:
+            href = link.href.strip()
+            if not href or href.startswith(('#', 'mailto:', 'tel:', 'javascript:')):
+                continue
+            target, _ = urldefrag(urljoin(fetched.url, href))
+            if urlparse(target).netloc.lower() == host:
+                internal += 1
+                targets.setdefault(target, None)
+            else:
+                external += 1
+
+        quality = self.scorer.score_content(body, title=title, profile=profile)
+        term_counts = self.similarity.document_counts(title, body, SIMILARITY_TERMS) if self.detect_duplicates else None
+
+        return ExtractedPage(
+            url=fetched.url,
+            title=title,
+            word_count=profile.word_count,
+            readability_score=profile.flesch_reading_ease(),
+            quality_score=quality.overall_score,
+            internal_links_out=internal,
+            external_links=external,
+            last_modified=fetched.last_modified,
+            internal_targets=tuple(targets),
+            term_counts=term_counts
+        )
+
+    async def _metrics_stage(self, domain: str, page_queue: asyncio.Queue, out: asyncio.Queue) -> None:
+        batch = []
+        while True:
+            page = await page_queue.get()
+            if page is not _DONE:
+                batch.append(page)
+            # Flush full batches, and partial ones when the extractors are behind
+            if batch and (page is _DONE or len(batch) >= self.batch_size or page_queue.empty()):
+                await out.put(await self._with_metrics(domain, batch))
+                batch = []
+            if page is _DONE:
+                await out.put(_DONE)
+                return
+
+    async def _with_metrics(self,
+                            domain: str,
+                            batch: List[Union[ExtractedPage, FailedPage]]) -> List[Tuple[Any, Optional[ContentMetrics]]]:
+        pages = [page for page in batch if isinstance(page, ExtractedPage)]
+        urls = [page.url for page in pages]
+        performance = await self._performance(domain, urls) if urls else {}
+        now = datetime.now(timezone.utc)
+        results = []
+        for page in batch:
+            if isinstance(page, FailedPage):
+                results.append((page, None))
+                continue
+            # Without a stored graph the in-degree is filled in after the crawl
+            node = self._graph_node(page.url)
+            internal_links_in = int(self._run_state['in_degree'][node]) if node is not None else 0
+            results.append((page, self.build_metrics(page, performance, internal_links_in, now)))
+        return results
+
+    def _graph_node(self, url: str) -> Optional[int]:
+        graph = self._run_state['graph']
+        return graph.index.get(url) if graph is not None else None
+
+    async def _performance(self, domain: str, urls: List[str]) -> Dict[int, Dict[str, Dict]]:
+        """Per-window page performance, from the synced GSC table or one API fallback."""
+        loop = asyncio.get_running_loop()
+        end = datetime.now(timezone.utc)
+        windows = sorted({self.analysis_period_days, *TRAFFIC_WINDOWS})
+        performance = {}
+        # Once the table has been found unsynced, later batches skip it
+        if self._api_performance is None:
+            for days in windows:
+                data = await loop.run_in_executor(
+                    None,
+                    lambda days=days: load_page_performance(
+                        domain, end - timedelta(days=days), end, pages=urls, session_scope=self.session_scope
+                    )
+                )
+                if data is None:
+                    break
+                performance[days] = data
+            else:
+                return performance
+
+        # Never synced: fetch the property once and reuse it for every batch
+        if self._api_performance is None:
+            self._api_performance = {}
+            if self.analyzer.gsc_adapter:
+                start = end - timedelta(days=self.analysis_period_days)
+                try:
+                    response = await self.analyzer.gsc_adapter.get_indexation_data(
+                        domain, start, end, use_synced=False
+                    )
+                    for row in response.get('rows', []):
+                        self._api_performance[row.get('keys', [''])[0]] = {
+                            'clicks': row.get('clicks', 0),
+                            'impressions': row.get('impressions', 0),
+                            'ctr': row.get('ctr', 0),
+                            'position': row.get('position', 0)
+                        }
+                except Exception as e:
+                    logger.error(f"Failed to get GSC data: {e}")
+        period = {url: self._api_performance[url] for url in urls if url in self._api_performance}
+        return {self.analysis_period_days: period}
+
+    def build_metrics(self,
+                      page: ExtractedPage,
+                      performance: Dict[int, Dict[str, Dict]],
+                      internal_links_in: int,
+                      now: datetime) -> ContentMetrics:
+        """ContentMetrics from an extracted page and its traffic.
+
+        Page speed and Core Web Vitals come from the technical audit and are
+        not measured here.
+        """
+        period = performance.get(self.analysis_period_days, {}).get(page.url, {})
+        clicks = int(period.get('clicks', 0))
+        impressions = int(period.get('impressions', 0))
+
+        def window_clicks(days: int) -> int:
+            if days not in performance:
+                return clicks
+            return int(performance[days].get(page.url, {}).get('clicks', 0))
+
+        age_days = 0
+        if page.last_modified is not None:
+            modified = page.last_modified if page.last_modified.tzinfo else page.last_modified.replace(tzinfo=timezone.utc)
+            age_days = max(0, (now - modified).days)
+
+        ranking_keywords = max(1, int(impressions / 100))
+        top_10_rankings = max(0, int(ranking_keywords * 0.1))
+        return ContentMetrics(
+            url=page.url,
+            title=page.title,
+            word_count=page.word_count,
+            organic_clicks=clicks,
+            organic_impressions=impressions,
+            average_position=float(period.get('position', 100.0) or 100.0),
+            ctr=float(period.get('ctr', 0.0)),
+            clicks_last_30d=window_clicks(30),
+            clicks_last_90d=window_clicks(90),
+            clicks_last_year=window_clicks(365),
+            quality_score=page.quality_score,
+            readability_score=page.readability_score,
+            page_speed_score=0,
+            core_web_vitals_pass=False,
+            mobile_friendly=False,
+            internal_links_in=internal_links_in,
+            internal_links_out=page.internal_links_out,
+            external_links=page.external_links,
+            ranking_keywords_count=ranking_keywords,
+            top_10_rankings=top_10_rankings,
+            featured_snippets=max(0, top_10_rankings // 3),
+            last_modified=page.last_modified,
+            content_age_days=age_days
+        )
+
+    async def _recommend_stage(self, batch_queue: asyncio.Queue, writer: PruningRecordWriter) -> None:
+        state = self._run_state
+        while True:
+            batch = await batch_queue.get()
+            if batch is _DONE:
+                return
+            pages = []
+            for page, metrics in batch:
+                if metrics is None:
+                    state['failed'] += 1
+                    writer.write({
+                        'record_type': 'error',
+                        'url': page.url,
+                        'status_code': page.status_code,
+                        'error': page.error
+                    })
+                else:
+                    pages.append((page, metrics))
+            if not pages:
+                continue
+            # Orphan status waits for the whole crawl's links; keep them as node ids
+            for page, _ in pages:
+                source = self._node_id(page.url)
+                for target in page.internal_targets:
+                    state['edge_sources'].append(source)
+                    state['edge_targets'].append(self._node_id(target))
+            if state['held'] is not None:
+                pickle.dump([(dataclasses.replace(page, internal_targets=()), metrics) for page, metrics in pages],
+                            state['held'])
+            else:
+                self._recommend_batch(pages, writer)
+
+    def _node_id(self, url: str) -> int:
+        state = self._run_state
+        node = state['node_ids'].get(url)
+        if node is None:
+            node = state['node_ids'][url] = len(state['node_urls'])
+            state['node_urls'].append(url)
+        return node
+
+    def _recommend_batch(self,
+                         pages: List[Tuple[ExtractedPage, ContentMetrics]],
+                         writer: PruningRecordWriter) -> None:
+        # Value and recommend the whole batch in one columnar pass
+        recommendations = self.engine.generate_page_recommendations([metrics for _, metrics in pages])
+        for (page, metrics), recommendation in zip(pages, recommendations):
+            self._recommend(page, metrics, recommendation, writer)
+
+    def _recommend_held(self, in_degree: np.ndarray, writer: PruningRecordWriter) -> None:
+        """Recommend the pages held back for lack of a stored link graph."""
+        state = self._run_state
+        held = state['held']
+        held.seek(0)
+        while True:
+            try:
+                pages = pickle.load(held)
+            except EOFError:
+                break
+            for page, metrics in pages:
+                metrics.internal_links_in = int(in_degree[state['node_ids'][page.url]])
+            self._recommend_batch(pages, writer)
+        held.close()
+        state['held'] = None
+
+    def _recommend(self,
+                   page: ExtractedPage,
+                   metrics: ContentMetrics,
+                   recommendation: PruningRecommendation,
+                   writer: PruningRecordWriter) -> None:
+        state = self._run_state
+        state['pages'] += 1
+        state['link_fallback'][state['node_ids'][page.url]] = self.analyzer.is_orphaned(metrics)
+
+        state['summary'].add_metrics(metrics)
+        self._record_recommendation(recommendation, metrics.organic_clicks)
+        writer.write({
+            'record_type': 'page',
+            'url': metrics.url,
+            'metrics': _plain(metrics),
+            'recommendation': _plain(recommendation)
+        })
+
+        # Rows line up with ``features``, so a URL listed twice is kept once
+        if page.term_counts is not None and page.term_counts.nnz and page.url not in state['features']:
+            self._add_term_row(len(state['features']), page.term_counts)
+            state['features'][page.url] = MergeFeatures(
+                metrics.url, metrics.title, metrics.organic_clicks, metrics.organic_impressions,
+                metrics.internal_links_in, metrics.average_position, metrics.quality_score
+            )
+
+    def _record_recommendation(self, recommendation: PruningRecommendation, organic_clicks: int) -> None:
+        state = self._run_state
+        state['summary'].add_recommendation(recommendation, organic_clicks)
+        # Keep the best recommendations: highest priority, then confidence
+        state['sequence'] += 1
+        key = (-self.engine._priority_order(recommendation.priority), recommendation.confidence, -state['sequence'])
+        if len(state['top']) < self.top_recommendations:
+            heapq.heappush(state['top'], (key, recommendation))
+        elif self.top_recommendations and key > state['top'][0][0]:
+            heapq.heapreplace(state['top'], (key, recommendation))
+
+    def _add_term_row(self, position: int, row: sparse.csr_matrix) -> None:
+        """Spill a page's term row, count its terms and pair it with LSH candidates."""
+        state = self._run_state
+        if state['document_frequency'] is None:
+            state['document_frequency'] = np.zeros(row.shape[1], dtype=np.int32)
+            state['term_frequency'] = np.zeros(row.shape[1], dtype=np.float32)
+        state['document_frequency'][row.indices] += 1
+        state['term_frequency'][row.indices] += row.data
+
+        record = np.zeros(1, dtype=_TERM_ROW)
+        record['nnz'] = row.nnz
+        record['indices'][0, :row.nnz] = row.indices
+        record['counts'][0, :row.nnz] = row.data
+        state['term_rows'].write(record.tobytes())
+
+        lsh = state['lsh']
+        signature = lsh.signature(row.indices)
+        for other in lsh.candidates(signature):
+            state['candidate_left'].append(other)
+            state['candidate_right'].append(position)
+        lsh.add_signature(position, signature)
+
+    def _similar_pairs(self) -> List[Tuple[str, str, float]]:
+        """Similar page pairs, most similar first, scored among the LSH candidates."""
+        state = self._run_state
+        urls = list(state['features'])
+        left = np.frombuffer(state['candidate_left'], dtype=np.intc)
+        right = np.frombuffer(state['candidate_right'], dtype=np.intc)
+        if len(left) == 0:
+            return []
+
+        params = self.similarity.vectorizer_params
+        try:
+            weights = tfidf_weights(
+                state['document_frequency'], state['term_frequency'], len(urls),
+                max_features=params['max_features'], min_df=params['min_df'], max_df=params['max_df']
+            )
+        except ValueError as e:
+            logger.warning(f"Could not vectorize content for similarity analysis: {e}")
+            return []
+
+        state['term_rows'].flush()
+        records = np.memmap(state['term_rows'], dtype=_TERM_ROW, mode='r', shape=(len(urls),))
+        found = []
+        for start in range(0, len(left), CANDIDATE_BLOCK):
+            block_left = left[start:start + CANDIDATE_BLOCK]
+            block_right = right[start:start + CANDIDATE_BLOCK]
+            # Only the rows this block reads are loaded
+            rows = np.unique(np.concatenate([block_left, block_right]))
+            block = records[rows]
+            nnz = block['nnz']
+            used = np.arange(SIMILARITY_TERMS) < nnz[:, np.newaxis]
+            counts = sparse.csr_matrix(
+                (block['counts'][used], block['indices'][used], np.concatenate([[0], np.cumsum(nnz)])),
+                shape=(len(rows), len(weights))
+            )
+            similarities = pair_similarities(
+                counts, weights, np.searchsorted(rows, block_left), np.searchsorted(rows, block_right)
+            )
+            keep = np.flatnonzero(similarities >= SIMILARITY_THRESHOLD)
+            found.extend(zip(block_left[keep].tolist(), block_right[keep].tolist(), similarities[keep].tolist()))
+        del records
+
+        found.sort(key=lambda pair: -pair[2])
+        return [(urls[i], urls[j], similarity) for i, j, similarity in found]
+
+    def _link_graph(self) -> Tuple[InternalLinkGraph, np.ndarray]:
+        """The stored link graph plus the crawled links, and a mask of the pages it covers.
+
+        Without a stored graph the crawl alone is used and covers every
+        crawled page; otherwise pages neither in the stored graph nor in a
+        crawled link are not covered.
+        """
+        state = self._run_state
+        urls = state['node_urls']
+        sources = np.frombuffer(state['edge_sources'], dtype=np.intc)
+        targets = np.frombuffer(state['edge_targets'], dtype=np.intc)
+        covered = np.ones(len(urls), dtype=bool)
+        stored = state['graph']
+        if stored is not None:
+            covered[len(stored):] = False
+            covered[sources] = True
+            covered[targets] = True
+            coo = stored.matrix.tocoo()
+            sources = np.concatenate([coo.row, sources])
+            targets = np.concatenate([coo.col, targets])
+        graph = InternalLinkGraph.from_index_edges(urls, sources, targets)
+        state['edge_sources'] = array('i')
+        state['edge_targets'] = array('i')
+        return graph, covered
+
+    def _orphaned_urls(self, graph: InternalLinkGraph, covered: np.ndarray, host: str) -> List[str]:
+        """Crawled pages nothing links to or the home page cannot reach.
+
+        Pages the graph does not cover fall back to the inbound-link heuristic.
+        """
+        home = f"https://{host}/"
+        # Without the canonical root, use the first root URL the graph has
+        disconnected = graph.disconnected(home if home in graph else None)
+        return [
+            graph.urls[node]
+            for node, fallback in self._run_state['link_fallback'].items()
+            if (disconnected[node] if covered[node] else fallback)
+        ]
+
+    def _finish(self, domain: str, host: str, writer: PruningRecordWriter) -> Dict[str, Any]:
+        state = self._run_state
+        graph, covered = self._link_graph()
+        if state['held'] is not None:
+            self._recommend_held(graph.in_degree(), writer)
+        orphaned = self._orphaned_urls(graph, covered, host)
+        for url in orphaned:
+            writer.write({'record_type': 'orphan', 'url': url})
+
+        pairs = self._similar_pairs() if self.detect_duplicates else []
+        for url, similar_url, similarity in pairs:
+            writer.write({
+                'record_type': 'similar_pair',
+                'url': url,
+                'target_url': similar_url,
+                'similarity_score': similarity
+            })
+        merges = self.engine._generate_merge_recommendations(pairs, list(state['features'].values()))
+        for merge in merges:
+            self._record_recommendation(merge, 0)
+            writer.write({'record_type': 'merge', 'url': merge.url, 'recommendation': _plain(merge)})
+
+        top = [recommendation for _, recommendation in sorted(state['top'], key=lambda item: item[0], reverse=True)]
+        summary = {
+            'domain': domain,
+            'analysis_date': datetime.now(timezone.utc).isoformat(),
+            'total_urls_analyzed': state['pages'],
+            'failed_urls': state['failed'],
+            'orphaned_count': len(orphaned),
+            'similar_pair_count': len(pairs),
+            'recommendations': [_plain(recommendation) for recommendation in top],
+            'consolidation_plans': self.manager._generate_consolidation_plans(merges),
+            'impact_summary': state['summary'].as_dict(),
+        }
+        writer.write({
+            'record_type': 'summary',
+            **{key: value for key, value in summary.items() if key != 'recommendations'}
+        })
+        logger.info(
+            f"Streaming pruning analysis for {domain}: {state['pages']} pages, "
+            f"{state['failed']} failed, {len(merges)} merge recommendations"
+        )
+        return summary
@@ -0,0 +1,222 @@
+"""Blocked sparse all-pairs cosine similarity.
+
+Rows of an L2-normalized CSR matrix are multiplied against the rest of the
+matrix one block at a time, so memory stays bounded by ``block_size`` rows
+of the product and only pairs above the threshold are kept. Documents are
+vectorized with a stateless hashing vectorizer, so the whole corpus is
+vectorized in one pass (optionally in parallel chunks) without building an
+n-gram vocabulary.
+"""
+
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+from scipy import sparse
+from sklearn.feature_extraction.text import HashingVectorizer, TfidfTransformer
+from sklearn.preprocessing import normalize
+
+
+logger = logging.getLogger(__name__)
+
+
+# Matrix shared with pool workers (set once per process by the initializer)
+_worker_matrix: Optional[sparse.csr_matrix] = None
+
+
+def _init_worker(matrix: sparse.csr_matrix) -> None:
+    global _worker_matrix
+    _worker_matrix = matrix
+
+
+def hash_counts(documents: Sequence[str],
+                ngram_range: Tuple[int, int] = (1, 2),
+                n_features: int = 2 ** 20) -> sparse.csr_matrix:
+    """Hashed n-gram counts for a chunk of documents."""
+    vectorizer = HashingVectorizer(
+        n_features=n_features,
+        stop_words='english',
+        ngram_range=ngram_range,
+        alternate_sign=False,
+        norm=None,
+        dtype=np.float32
+    )
+    return vectorizer.transform(documents)
+
+
+def tfidf_matrix(documents: Sequence[str],
+                 max_features: int = 5000,
+                 ngram_range: Tuple[int, int] = (1, 2),
+                 min_df: int = 2,
+                 max_df: float = 0.8,
+                 n_features: int = 2 ** 20,
+                 workers: Optional[int] = None,
+                 chunk_size: int = 2000) -> sparse.csr_matrix:
+    """TF-IDF matrix with the same document-frequency and feature limits as ``TfidfVectorizer``.
+
+    Raises:
+        ValueError: If no feature survives the document-frequency cutoffs
+    """
+    chunks = [documents[i:i + chunk_size] for i in range(0, len(documents), chunk_size)]
+    if workers and workers > 1 and len(chunks) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            parts = list(pool.map(hash_counts, chunks, [ngram_range] * len(chunks), [n_features] * len(chunks)))
+    else:
+        parts = [hash_counts(chunk, ngram_range, n_features) for chunk in chunks]
+    counts = sparse.vstack(parts, format='csr') if parts else sparse.csr_matrix((0, n_features))
+    return tfidf_from_counts(counts, max_features, min_df, max_df)
+
+
+def tfidf_from_counts(counts: sparse.csr_matrix,
+                      max_features: int = 5000,
+                      min_df: int = 2,
+                      max_df: float = 0.8) -> sparse.csr_matrix:
+    """TF-IDF matrix from hashed n-gram counts (see :func:`tfidf_matrix`).
+
+    Raises:
+        ValueError: If no feature survives the document-frequency cutoffs
+    """
+    n_features = counts.shape[1]
+    document_frequency = np.bincount(counts.indices, minlength=n_features)
+    n_documents = counts.shape[0]
+    allowed = (document_frequency >= min_df) & (document_frequency <= max_df * n_documents)
+    columns = np.flatnonzero(allowed)
+    if len(columns) == 0:
+        raise ValueError("After pruning, no terms remain")
+
+    if len(columns) > max_features:
+        frequency = np.asarray(counts[:, columns].sum(axis=0)).ravel()
+        columns = np.sort(columns[np.argsort(-frequency, kind='stable')[:max_features]])
+
+    return TfidfTransformer().fit_transform(counts[:, columns]).tocsr()
+
+
+def tfidf_weights(document_frequency: np.ndarray,
+                  term_frequency: np.ndarray,
+                  n_documents: int,
+                  max_features: int = 5000,
+                  min_df: int = 2,
+                  max_df: float = 0.8) -> np.ndarray:
+    """Per-feature IDF weights from corpus statistics, zero for dropped features.
+
+    Weighting counts by these and L2-normalizing gives the rows of
+    :func:`tfidf_from_counts` without holding the corpus; the statistics can
+    be accumulated one document at a time.
+
+    Args:
+        document_frequency: Documents containing each hashed feature
+        term_frequency: Total count of each hashed feature
+        n_documents: Documents counted
+
+    Raises:
+        ValueError: If no feature survives the document-frequency cutoffs
+    """
+    allowed = (document_frequency >= min_df) & (document_frequency <= max_df * n_documents)
+    columns = np.flatnonzero(allowed)
+    if len(columns) == 0:
+        raise ValueError("After pruning, no terms remain")
+
+    if len(columns) > max_features:
+        columns = np.sort(columns[np.argsort(-term_frequency[columns], kind='stable')[:max_features]])
+
+    # Smoothed IDF, as TfidfTransformer computes it
+    weights = np.zeros(len(document_frequency), dtype=np.float64)
+    weights[columns] = np.log((1 + n_documents) / (1 + document_frequency[columns])) + 1
+    return weights
+
+
+def pair_similarities(counts: sparse.csr_matrix,
+                      weights: np.ndarray,
+                      left: np.ndarray,
+                      right: np.ndarray) -> np.ndarray:
+    """TF-IDF cosine similarity of the row pairs ``(left[k], right[k])`` of ``counts``."""
+    matrix = normalize(sparse.csr_matrix(counts.multiply(weights[np.newaxis, :])))
+    return np.asarray(matrix[left].multiply(matrix[right]).sum(axis=1)).ravel()
+
+
+def top_terms(counts: sparse.csr_matrix, limit: int) -> sparse.csr_matrix:
+    """Keep at most ``limit`` of the highest counts in each row."""
+    counts = sparse.csr_matrix(counts)
+    if np.diff(counts.indptr).max(initial=0) <= limit:
+        return counts
+    rows = []
+    for i in range(counts.shape[0]):
+        row = counts[i]
+        if row.nnz > limit:
+            keep = np.sort(np.argsort(-row.data, kind='stable')[:limit])
+            row = sparse.csr_matrix((row.data[keep], row.indices[keep], [0, limit]), shape=row.shape)
+        rows.append(row)
+    return sparse.vstack(rows, format='csr')
+
+
+def _block_pairs(matrix: sparse.csr_matrix,
+                 start: int,
+                 stop: int,
+                 threshold: float) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Pairs ``(i, j)`` with ``start <= i < stop``, ``j > i`` and similarity >= threshold."""
+    # Only columns at or after the block are needed for the upper triangle
+    product = (matrix[start:stop] @ matrix[start:].T).tocoo()
+
+    rows = product.row + start
+    cols = product.col + start
+    # Rounding can push identical documents slightly above 1
+    similarities = np.minimum(product.data, 1.0)
+    keep = (cols > rows) & (similarities >= threshold)
+    return rows[keep], cols[keep], similarities[keep]
+
+
+def _worker_block(start: int, stop: int, threshold: float) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    return _block_pairs(_worker_matrix, start, stop, threshold)
+
+
+def similar_pairs(matrix,
+                  threshold: float,
+                  block_size: int = 1024,
+                  workers: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Row index pairs with cosine similarity at or above ``threshold``.
+
+    Args:
+        matrix: Document-term matrix (one row per document)
+        threshold: Minimum cosine similarity to keep
+        block_size: Rows multiplied per block
+        workers: Worker processes for the blocks; None or 1 runs in-process
+
+    Returns:
+        ``(rows, cols, similarities)`` arrays with ``rows < cols``, most
+        similar first
+    """
+    matrix = normalize(sparse.csr_matrix(matrix, dtype=np.float32), norm='l2', copy=False)
+    n_rows = matrix.shape[0]
+    blocks = [(start, min(start + block_size, n_rows)) for start in range(0, n_rows, block_size)]
+
+    if workers and workers > 1 and len(blocks) > 1:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(matrix,)) as pool:
+            results = list(pool.map(_worker_block, *zip(*[(s, e, threshold) for s, e in blocks])))
+    else:
+        results = [_block_pairs(matrix, start, stop, threshold) for start, stop in blocks]
+
+    if not results:
+        empty = np.empty(0, dtype=np.int64)
+        return empty, empty, np.empty(0, dtype=np.float32)
+
+    rows = np.concatenate([r[0] for r in results])
+    cols = np.concatenate([r[1] for r in results])
+    similarities = np.concatenate([r[2] for r in results])
+
+    order = np.argsort(-similarities, kind='stable')
+    logger.debug(f"Found {len(order)} pairs >= {threshold} among {n_rows} documents in {len(blocks)} blocks")
+    return rows[order], cols[order], similarities[order]
+
+
+def labeled_pairs(labels: List[str],
+                  matrix,
+                  threshold: float,
+                  block_size: int = 1024,
+                  workers: Optional[int] = None) -> List[Tuple[str, str, float]]:
+    """``(label_i, label_j, similarity)`` tuples for pairs at or above ``threshold``."""
+    rows, cols, similarities = similar_pairs(matrix, threshold, block_size, workers)
+    return [
+        (labels[i], labels[j], float(similarity))
+        for i, j, similarity in zip(rows.tolist(), cols.tolist(), similarities.tolist())
+    ]
@@ -0,0 +1,278 @@
+"""Columnar content valuation and recommendation.
+
+Content value, the recommended action and its effort are pure functions of
+a few per-page metrics, so they are computed for a whole site at once with
+NumPy masks over metric columns instead of Python branches per page. Value
+tiers, actions, priorities and effort levels are returned as small integer
+codes indexing the tables below, whose entries are the ``ContentValue`` and
+``ContentAction`` enum values. Merge candidates are grouped with a
+union-find over similarity pairs.
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+VALUE_TIERS = ("high", "medium", "low", "zero")
+ACTIONS = ("keep", "improve", "merge", "redirect", "delete", "noindex")
+PRIORITIES = ("high", "medium", "low")
+EFFORT_LEVELS = ("low", "medium", "high")
+
+HIGH, MEDIUM, LOW, ZERO = range(4)
+KEEP, IMPROVE, MERGE, REDIRECT, DELETE, NOINDEX = range(6)
+
+# Decision rules in evaluation order: (action, reason, confidence, priority)
+RULES = (
+    (DELETE, "Zero traffic and minimal visibility", 0.9, "high"),
+    (NOINDEX, "Very low value but some minimal visibility", 0.7, "medium"),
+    (REDIRECT, "Low value content with poor internal linking", 0.8, "medium"),
+    (IMPROVE, "Low value but connected - improvement opportunity", 0.6, "low"),
+    (IMPROVE, "Medium traffic but quality issues", 0.7, "medium"),
+    (KEEP, "Decent performance, maintain current state", 0.8, "low"),
+    (KEEP, "High-value content, maintain and optimize", 0.9, "low"),
+)
+
+_RULE_ACTIONS = np.array([rule[0] for rule in RULES], dtype=np.int8)
+_RULE_CONFIDENCE = np.array([rule[2] for rule in RULES])
+_RULE_PRIORITIES = np.array([PRIORITIES.index(rule[3]) for rule in RULES], dtype=np.int8)
+
+# Fixed effort per action; IMPROVE scales with word count
+_ACTION_HOURS = np.array([0.5, 2.0, 6.0, 1.0, 0.5, 0.5])
+_ACTION_EFFORT = np.array([0, 0, 2, 0, 0, 0], dtype=np.int8)
+
+IMPACT_TEMPLATES = {
+    "delete": "Minimal impact - removing {clicks} clicks from low-value content",
+    "redirect": "Neutral to positive - redirect {clicks} clicks to better content",
+    "merge": "Positive - consolidate traffic and improve topical authority",
+    "improve": "Positive - potential to increase {clicks} clicks through optimization",
+    "noindex": "Neutral - remove from search while preserving for internal use",
+    "keep": "Maintain current performance",
+}
+
+SEO_BENEFITS = {
+    "delete": "Remove low-quality content to improve overall site quality",
+    "redirect": "Consolidate link equity and eliminate thin content",
+    "merge": "Increase topical authority and eliminate keyword cannibalization",
+    "improve": "Enhance content quality to improve rankings and CTR",
+    "noindex": "Remove from search index while preserving internal value",
+    "keep": "Maintain current SEO value",
+}
+
+
+@dataclass
+class MetricColumns:
+    """Per-page metrics as parallel arrays."""
+    organic_clicks: np.ndarray
+    organic_impressions: np.ndarray
+    average_position: np.ndarray
+    ctr: np.ndarray
+    quality_score: np.ndarray
+    internal_links_in: np.ndarray
+    content_age_days: np.ndarray
+    word_count: np.ndarray
+
+    @classmethod
+    def from_records(cls, records: Sequence[Any]) -> "MetricColumns":
+        """Columns from ``ContentMetrics`` (or any objects with the same attributes)."""
+        count = len(records)
+
+        def column(name: str, dtype) -> np.ndarray:
+            return np.fromiter((getattr(record, name) for record in records), dtype=dtype, count=count)
+
+        return cls(
+            organic_clicks=column('organic_clicks', np.float64),
+            organic_impressions=column('organic_impressions', np.float64),
+            average_position=column('average_position', np.float64),
+            ctr=column('ctr', np.float64),
+            quality_score=column('quality_score', np.float64),
+            internal_links_in=column('internal_links_in', np.float64),
+            content_age_days=column('content_age_days', np.float64),
+            word_count=column('word_count', np.float64),
+        )
+
+    def __len__(self) -> int:
+        return len(self.organic_clicks)
+
+
+@dataclass
+class RecommendationColumns:
+    """Recommendation decisions as parallel code arrays."""
+    value_tier: np.ndarray
+    rule: np.ndarray
+    action: np.ndarray
+    confidence: np.ndarray
+    priority: np.ndarray
+    effort: np.ndarray
+    hours: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.action)
+
+
+def value_scores(columns: MetricColumns) -> np.ndarray:
+    """Weighted 0-100 content value score of every page."""
+    traffic_score = np.minimum(100, columns.organic_clicks * 2)  # Max 100 for 50+ clicks
+    impression_score = np.minimum(100, columns.organic_impressions / 10)  # Max 100 for 1000+ impressions
+    position_score = np.maximum(0, 100 - columns.average_position * 2)  # Better position = higher score
+    quality_score = columns.quality_score * 10  # Convert to 0-100 scale
+    link_score = np.minimum(100, columns.internal_links_in * 5)  # Max 100 for 20+ inbound links
+    freshness_score = np.maximum(0, 100 - (columns.content_age_days / 365) * 20)  # Newer = better
+
+    return (
+        traffic_score * 0.25 +
+        impression_score * 0.20 +
+        position_score * 0.15 +
+        quality_score * 0.15 +
+        link_score * 0.15 +
+        freshness_score * 0.10
+    )
+
+
+def value_tiers(columns: MetricColumns) -> np.ndarray:
+    """Index into :data:`VALUE_TIERS` of every page."""
+    scores = value_scores(columns)
+    return np.select([scores >= 70, scores >= 40, scores >= 15], [HIGH, MEDIUM, LOW], ZERO).astype(np.int8)
+
+
+def effort(actions: np.ndarray, word_count: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """``(effort level codes, hours)`` for each action."""
+    hours = _ACTION_HOURS[actions]
+    levels = _ACTION_EFFORT[actions]
+    improve = actions == IMPROVE
+    if improve.any():
+        # More effort for longer content
+        improve_hours = np.maximum(2.0, word_count[improve] / 500)
+        hours[improve] = improve_hours
+        levels[improve] = np.select([improve_hours > 6, improve_hours > 3], [2, 1], 0)
+    return levels, hours
+
+
+def recommend(columns: MetricColumns, tiers: Optional[np.ndarray] = None) -> RecommendationColumns:
+    """Action, confidence, priority and effort of every page.
+
+    Args:
+        columns: Page metrics
+        tiers: Value tier codes; computed from ``columns`` when omitted
+    """
+    if tiers is None:
+        tiers = value_tiers(columns)
+    no_visibility = (columns.organic_clicks == 0) & (columns.organic_impressions < 10)
+    rule = np.select(
+        [
+            (tiers == ZERO) & no_visibility,
+            tiers == ZERO,
+            (tiers == LOW) & (columns.internal_links_in <= 1),
+            tiers == LOW,
+            (tiers == MEDIUM) & (columns.quality_score < 6.0),
+            tiers == MEDIUM,
+        ],
+        list(range(6)),
+        6
+    ).astype(np.int8)
+    actions = _RULE_ACTIONS[rule]
+    levels, hours = effort(actions, columns.word_count)
+    return RecommendationColumns(
+        value_tier=np.asarray(tiers, dtype=np.int8),
+        rule=rule,
+        action=actions,
+        confidence=_RULE_CONFIDENCE[rule],
+        priority=_RULE_PRIORITIES[rule],
+        effort=levels,
+        hours=hours
+    )
+
+
+class UnionFind:
+    """Disjoint sets over ``0..size-1`` with path halving and union by size."""
+
+    def __init__(self, size: int):
+        self.parent = list(range(size))
+        self.size = [1] * size
+
+    def find(self, item: int) -> int:
+        parent = self.parent
+        while parent[item] != item:
+            parent[item] = parent[parent[item]]
+            item = parent[item]
+        return item
+
+    def union(self, a: int, b: int) -> int:
+        root_a, root_b = self.find(a), self.find(b)
+        if root_a == root_b:
+            return root_a
+        if self.size[root_a] < self.size[root_b]:
+            root_a, root_b = root_b, root_a
+        self.parent[root_b] = root_a
+        self.size[root_a] += self.size[root_b]
+        return root_a
+
+    def groups(self) -> List[List[int]]:
+        """Sets with more than one member, members in ascending order."""
+        members: Dict[int, List[int]] = {}
+        for item in range(len(self.parent)):
+            members.setdefault(self.find(item), []).append(item)
+        return [group for group in members.values() if len(group) > 1]
+
+
+def merge_scores(records: Sequence[Any]) -> np.ndarray:
+    """Score deciding which page of a merge group is kept as the primary.
+
+    Reads only clicks, impressions, inbound links, position and quality,
+    so compact per-page summaries can stand in for full metrics.
+    """
+    count = len(records)
+
+    def column(name: str) -> np.ndarray:
+        return np.fromiter((getattr(record, name) for record in records), dtype=np.float64, count=count)
+
+    return (
+        column('organic_clicks') * 2 +
+        column('organic_impressions') / 10 +
+        column('internal_links_in') * 5 +
+        (100 - column('average_position')) +
+        column('quality_score') * 5
+    )
+
+
+def merge_groups(size: int,
+                 left: np.ndarray,
+                 right: np.ndarray,
+                 similarity: np.ndarray,
+                 scores: np.ndarray) -> List[Tuple[int, np.ndarray, np.ndarray]]:
+    """Connected groups of similar pages, each with the page to keep.
+
+    Args:
+        size: Number of pages
+        left, right: Page indices of each similar pair
+        similarity: Similarity of each pair
+        scores: Merge score of every page (see :func:`merge_scores`)
+
+    Returns:
+        ``(primary, secondaries, primary_similarity)`` per group, where
+        ``primary_similarity`` is each secondary's direct pair similarity
+        to the primary (0 when the two are only connected through others)
+    """
+    sets = UnionFind(size)
+    for a, b in zip(left.tolist(), right.tolist()):
+        sets.union(a, b)
+
+    groups = [np.array(group) for group in sets.groups()]
+    primary_of = np.arange(size)
+    for members in groups:
+        primary_of[members] = members[np.argmax(scores[members])]
+
+    # Keep only pairs touching their group's primary
+    direct = np.zeros(size)
+    from_left = primary_of[left] == left
+    from_right = primary_of[right] == right
+    np.maximum.at(direct, right[from_left], similarity[from_left])
+    np.maximum.at(direct, left[from_right], similarity[from_right])
+
+    result = []
+    for members in groups:
+        primary = int(primary_of[members[0]])
+        secondaries = members[members != primary]
+        result.append((primary, secondaries, direct[secondaries]))
+    return result
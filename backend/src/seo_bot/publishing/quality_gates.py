@@ -11,6 +11,7 @@ from ..tech.accessibility import AccessibilityChecker
 from ..tech.audit import TechnicalSEOAuditor
 from ..tech.budgets import PerformanceBudgetManager
 from ..content.stc_check import SearchTaskCompletionChecker
+from ..governance.textprofile import TextProfile, get_text_profile
 
 logger = logging.getLogger(__name__)
 
@@ -38,8 +39,10 @@ class ContentQualityGate(QualityGate):
         score = 100.0
         
         try:
+            profile = get_text_profile(content.content)
+            
             # Word count check
-            word_count = len(content.content.split())
+            word_count = profile.word_count
             
             if word_count < self.min_word_count:
                 issues.append(f"Content too short: {word_count} words (minimum: {self.min_word_count})")
@@ -76,17 +79,17 @@ class ContentQualityGate(QualityGate):
                 score -= 10
             
             # Basic content structure checks
-            if not self._has_proper_headings(content.content):
+            if not self._has_proper_headings(profile):
                 warnings.append("Content lacks proper heading structure (H2, H3)")
                 score -= 5
             
             # Check for duplicate content patterns
-            if self._has_repetitive_content(content.content):
+            if self._has_repetitive_content(profile):
                 warnings.append("Content appears to have repetitive sections")
                 score -= 10
             
             # Readability check (simplified)
-            readability_score = self._calculate_basic_readability(content.content)
+            readability_score = self._calculate_basic_readability(profile)
             if readability_score < self.min_readability_score:
                 warnings.append(f"Low readability score: {readability_score:.1f} (minimum: {self.min_readability_score})")
                 score -= 10
@@ -130,59 +133,28 @@ class ContentQualityGate(QualityGate):
                 issues=[str(e)]
             )
     
-    def _has_proper_headings(self, content: str) -> bool:
+    def _has_proper_headings(self, profile: TextProfile) -> bool:
         """Check if content has proper heading structure."""
-        # Look for H2 or H3 tags
-        heading_pattern = r'<h[23][^>]*>|##\s|###\s'
-        return bool(re.search(heading_pattern, content, re.IGNORECASE))
+        # Look for H2 or H3 headings (HTML or Markdown)
+        return any(level in (2, 3) for level in profile.heading_levels)
     
-    def _has_repetitive_content(self, content: str) -> bool:
+    def _has_repetitive_content(self, profile: TextProfile) -> bool:
         """Check for repetitive content patterns."""
-        # Simple check for repeated paragraphs
-        sentences = content.split('.')
-        unique_sentences = set(sentence.strip().lower() for sentence in sentences if len(sentence.strip()) > 10)
+        # Simple check for repeated sentences
+        sentences = profile.sentences
+        unique_sentences = set(sentence for sentence in sentences if len(sentence) > 10)
         
         if len(sentences) > 10 and len(unique_sentences) / len(sentences) < 0.8:
             return True
         
         return False
     
-    def _calculate_basic_readability(self, content: str) -> float:
-        """Calculate basic readability score (simplified Flesch)."""
-        # Remove HTML tags
-        text = re.sub(r'<[^>]+>', '', content)
-        
-        # Count sentences and words
-        sentences = len(re.split(r'[.!?]+', text))
-        words = len(text.split())
-        syllables = self._count_syllables(text)
-        
-        if sentences == 0 or words == 0:
+    def _calculate_basic_readability(self, profile: TextProfile) -> float:
+        """Calculate basic readability score (Flesch Reading Ease)."""
+        if profile.word_count == 0:
             return 0.0
         
-        # Simplified Flesch Reading Ease
-        avg_sentence_length = words / sentences
-        avg_syllables_per_word = syllables / words
-        
-        score = 206.835 - (1.015 * avg_sentence_length) - (84.6 * avg_syllables_per_word)
-        return max(0.0, min(100.0, score))
-    
-    def _count_syllables(self, text: str) -> int:
-        """Count syllables in text (simplified)."""
-        # Very basic syllable counting
-        vowels = "aeiouyAEIOUY"
-        syllable_count = 0
-        prev_was_vowel = False
-        
-        for char in text:
-            if char in vowels:
-                if not prev_was_vowel:
-                    syllable_count += 1
-                prev_was_vowel = True
-            else:
-                prev_was_vowel = False
-        
-        return max(1, syllable_count)
+        return max(0.0, min(100.0, profile.flesch_reading_ease()))
     
     def _has_call_to_action(self, content: str) -> bool:
         """Check if content has call-to-action elements."""
@@ -268,14 +240,15 @@ class SEOQualityGate(QualityGate):
                     score -= 5
             
             # Content SEO checks
-            if not self._has_proper_heading_hierarchy(content.content):
+            profile = get_text_profile(content.content)
+            if not self._has_proper_heading_hierarchy(profile):
                 warnings.append("Content lacks proper heading hierarchy (H1 > H2 > H3)")
                 score -= 10
             
-            if not self._has_internal_links(content.content):
+            if not self._has_internal_links(profile):
                 recommendations.append("Consider adding relevant internal links")
             
-            if not self._has_external_links(content.content):
+            if not self._has_external_links(profile):
                 recommendations.append("Consider adding authoritative external references")
             
             # Image SEO checks
@@ -336,36 +309,24 @@ class SEOQualityGate(QualityGate):
         # Should be lowercase, use hyphens, no special characters
         return bool(re.match(r'^[a-z0-9-]+$', slug) and len(slug) > 3)
     
-    def _has_proper_heading_hierarchy(self, content: str) -> bool:
+    def _has_proper_heading_hierarchy(self, profile: TextProfile) -> bool:
         """Check for proper heading hierarchy."""
-        # Look for H1, H2, H3 tags in order
-        h1_pattern = r'<h1[^>]*>|#\s'
-        h2_pattern = r'<h2[^>]*>|##\s'
-        
-        has_h1 = bool(re.search(h1_pattern, content, re.IGNORECASE))
-        has_h2 = bool(re.search(h2_pattern, content, re.IGNORECASE))
-        
-        return has_h1 and has_h2
+        # Look for H1 and H2 headings (HTML or Markdown)
+        levels = set(profile.heading_levels)
+        return 1 in levels and 2 in levels
     
-    def _has_internal_links(self, content: str) -> bool:
+    def _has_internal_links(self, profile: TextProfile) -> bool:
         """Check for internal links."""
-        # Look for relative links or same-domain links
-        internal_link_patterns = [
-            r'<a[^>]*href=["\']\/[^"\']*["\']',  # Relative links
-            r'<a[^>]*href=["\'][^"\']*(?:\.html|\.php)["\']'  # Local file links
-        ]
-        
-        for pattern in internal_link_patterns:
-            if re.search(pattern, content, re.IGNORECASE):
-                return True
-        
-        return False
+        # Relative links or local file links
+        return any(
+            link.href.startswith('/') or link.href.lower().endswith(('.html', '.php'))
+            for link in profile.links
+        )
     
-    def _has_external_links(self, content: str) -> bool:
+    def _has_external_links(self, profile: TextProfile) -> bool:
         """Check for external links."""
-        # Look for absolute HTTP/HTTPS links
-        external_link_pattern = r'<a[^>]*href=["\']https?://[^"\']*["\']'
-        return bool(re.search(external_link_pattern, content, re.IGNORECASE))
+        # Absolute HTTP/HTTPS links
+        return any(link.is_absolute for link in profile.links)
     
     def _generate_seo_recommendations(self, content: ContentItem) -> List[str]:
         """Generate SEO recommendations."""
@@ -411,15 +372,17 @@ class AccessibilityQualityGate(QualityGate):
                     warnings.append("Featured image missing alt text")
                     score -= 5
             
+            profile = get_text_profile(content.content)
+            
             # Check content for images without alt text
-            image_alt_issues = self._check_content_images(content.content)
+            image_alt_issues = self._check_content_images(profile)
             if image_alt_issues:
                 issues.extend(image_alt_issues)
                 score -= min(30, len(image_alt_issues) * 5)
             
             # Heading structure check
             if self.require_heading_structure:
-                heading_issues = self._check_heading_structure(content.content)
+                heading_issues = self._check_heading_structure(profile)
                 if heading_issues:
                     warnings.extend(heading_issues)
                     score -= min(20, len(heading_issues) * 5)
@@ -461,36 +424,27 @@ class AccessibilityQualityGate(QualityGate):
                 issues=[str(e)]
             )
     
-    def _check_content_images(self, content: str) -> List[str]:
+    def _check_content_images(self, profile: TextProfile) -> List[str]:
         """Check images in content for alt text."""
         issues = []
         
-        # Find all img tags
-        img_pattern = r'<img[^>]*>'
-        img_tags = re.findall(img_pattern, content, re.IGNORECASE)
-        
-        for img_tag in img_tags:
+        for alt in profile.image_alts:
             # Check if alt attribute is present and not empty
-            alt_match = re.search(r'alt=["\']([^"\']*)["\']', img_tag, re.IGNORECASE)
-            if not alt_match or not alt_match.group(1).strip():
+            if not alt or not alt.strip():
                 issues.append("Image missing alt text")
         
         return issues
     
-    def _check_heading_structure(self, content: str) -> List[str]:
+    def _check_heading_structure(self, profile: TextProfile) -> List[str]:
         """Check heading structure for accessibility."""
         issues = []
         
-        # Find all heading tags
-        heading_pattern = r'<h([1-6])[^>]*>'
-        headings = re.findall(heading_pattern, content, re.IGNORECASE)
-        
-        if not headings:
+        if not profile.headings:
             issues.append("Content lacks heading structure")
             return issues
         
         # Check for proper hierarchy
-        heading_levels = [int(h) for h in headings]
+        heading_levels = profile.heading_levels
         
         # Should start with H1 or H2
         if heading_levels and heading_levels[0] > 2:
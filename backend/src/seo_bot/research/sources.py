@@ -9,11 +9,11 @@ from pathlib import Path
 from typing import Dict, List, Optional, Any
 from urllib.robotparser import RobotFileParser
 
-import httpx
 from selectolax.parser import HTMLParser
 # from readability import Document  # Skip for now - can add later
 
 from .models import Observation, SourceResult, ResearchConfig
+from ..instrumentation import traced_httpx_client
 from ..utils.http import RateLimiter, CacheManager
 
 
@@ -27,7 +27,8 @@ class BaseCollector:
         self.config = config
         self.rate_limiter = RateLimiter(delay=config.rate_limit_delay)
         self.cache = CacheManager()
-        self.session = httpx.AsyncClient(
+        self.session = traced_httpx_client(
+            'research',
             timeout=config.timeout_seconds,
             headers={"User-Agent": "SEO Research Bot/1.0"}
         )
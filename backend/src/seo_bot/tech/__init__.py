@@ -1,25 +1,44 @@
 """Technical optimization and monitoring systems for SEO-Bot."""
 
 from .budgets import PerformanceBudgetManager, BudgetViolation, OptimizationRecommendation
+from .performance_history import PerformanceHistoryStore
+from .psi_scheduler import PSIRequestScheduler, PSISchedulerConfig, QuotaExceededError
+from .template_sampling import TemplateSampler, URLTemplate, PassRateEstimate
 from .accessibility import AccessibilityChecker, AccessibilityIssue, WCAGLevel
 from .audit import TechnicalSEOAuditor, AuditResult, AuditSeverity
+from .audit_cache import AuditResultStore, compute_content_hash, compute_ruleset_hash
+from .contrast import ContrastEngine, StylesheetCache
 from .monitoring import (
     PerformanceMonitor, PerformanceMetrics, HealthChecker, RetryConfig,
     monitor_performance, monitor_operation, retry_with_backoff, CircuitBreaker,
     get_performance_monitor, get_health_checker, setup_error_handling
 )
+from .sketch import DDSketch
 
 __all__ = [
     "PerformanceBudgetManager",
     "BudgetViolation", 
     "OptimizationRecommendation",
+    "PerformanceHistoryStore",
+    "PSIRequestScheduler",
+    "PSISchedulerConfig",
+    "QuotaExceededError",
+    "TemplateSampler",
+    "URLTemplate",
+    "PassRateEstimate",
     "AccessibilityChecker",
     "AccessibilityIssue",
     "WCAGLevel",
+    "ContrastEngine",
+    "StylesheetCache",
     "TechnicalSEOAuditor",
     "AuditResult",
     "AuditSeverity",
+    "AuditResultStore",
+    "compute_content_hash",
+    "compute_ruleset_hash",
     "PerformanceMonitor",
+    "DDSketch",
     "PerformanceMetrics",
     "HealthChecker",
     "RetryConfig",
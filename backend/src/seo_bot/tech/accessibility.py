@@ -15,6 +15,9 @@ import aiohttp
 from bs4 import BeautifulSoup, Comment
 
 from ..config import Settings
+from ..instrumentation import traced_client_session
+from .audit_cache import CACHE_STATUS_FRESH, AuditResultStore, compute_content_hash, compute_ruleset_hash
+from .contrast import ContrastEngine, ParsedStylesheet, format_color
 
 
 logger = logging.getLogger(__name__)
@@ -121,6 +124,10 @@ class AccessibilityAuditResult:
     priority_fixes: List[str]
     quick_wins: List[str]
     
+    # Incremental audit bookkeeping
+    content_hash: Optional[str] = None
+    cache_status: str = CACHE_STATUS_FRESH  # "fresh" or "reused"
+    
     @property
     def compliance_percentage(self) -> float:
         """Calculate overall compliance percentage."""
@@ -145,11 +152,21 @@ class AccessibilityAuditResult:
 class AccessibilityChecker:
     """Comprehensive accessibility checker with WCAG compliance validation."""
     
-    def __init__(self, settings: Optional[Settings] = None, target_level: WCAGLevel = WCAGLevel.AA):
+    # Bump when check logic changes so stored results are re-evaluated
+    RULESET_VERSION = "2"
+    
+    def __init__(
+        self,
+        settings: Optional[Settings] = None,
+        target_level: WCAGLevel = WCAGLevel.AA,
+        result_store: Optional[AuditResultStore] = None,
+        contrast_engine: Optional[ContrastEngine] = None
+    ):
         """Initialize the accessibility checker."""
         self.settings = settings or Settings()
         self.target_level = target_level
         self.session: Optional[aiohttp.ClientSession] = None
+        self.result_store = result_store
         
         # Color contrast ratios for WCAG compliance
         self.contrast_ratios = {
@@ -157,12 +174,16 @@ class AccessibilityChecker:
             WCAGLevel.AAA: {"normal": 7.0, "large": 4.5}
         }
         
+        # Parsed stylesheets are shared across all pages audited by this checker
+        self.contrast_engine = contrast_engine or ContrastEngine()
+        self.max_contrast_issues = 50
+        
         # Common accessibility patterns and rules
         self.accessibility_rules = self._initialize_accessibility_rules()
     
     async def __aenter__(self):
         """Async context manager entry."""
-        self.session = aiohttp.ClientSession()
+        self.session = traced_client_session("accessibility")
         return self
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
@@ -218,7 +239,21 @@ class AccessibilityChecker:
         
         # Fetch page content
         html_content = await self._fetch_page_content(page_url, user_agent)
+        
         soup = BeautifulSoup(html_content, 'html.parser')
+        # Contrast findings depend on the stylesheets as well as the HTML
+        stylesheets = await self.contrast_engine.collect_stylesheets(soup, page_url, self.session)
+        
+        # Reuse previous findings when page, stylesheets and rules are unchanged
+        content_hash = compute_content_hash(
+            html_content, dependency_hashes=[sheet.content_hash for sheet in stylesheets]
+        )
+        ruleset_hash = self.get_ruleset_hash(include_lighthouse)
+        if self.result_store:
+            cached = self.result_store.get("accessibility", page_url, content_hash, ruleset_hash)
+            if cached is not None:
+                logger.info(f"Reusing accessibility audit for unchanged page: {page_url}")
+                return cached
         
         # Run all accessibility checks
         issues = []
@@ -229,7 +264,7 @@ class AccessibilityChecker:
         issues.extend(await self._check_heading_structure(soup, page_url))
         issues.extend(await self._check_keyboard_navigation(soup, page_url))
         issues.extend(await self._check_links_accessibility(soup, page_url))
-        issues.extend(await self._check_color_contrast(soup, page_url))
+        issues.extend(await self._check_color_contrast(soup, page_url, stylesheets))
         issues.extend(await self._check_focus_management(soup, page_url))
         issues.extend(await self._check_screen_reader_compatibility(soup, page_url))
         issues.extend(await self._check_layout_shift_prevention(soup, page_url))
@@ -244,11 +279,26 @@ class AccessibilityChecker:
                 logger.warning(f"Could not fetch Lighthouse score: {e}")
         
         # Generate audit result
-        return self._generate_audit_result(
+        result = self._generate_audit_result(
             page_url=page_url,
             issues=issues,
             lighthouse_score=lighthouse_score
         )
+        result.content_hash = content_hash
+        
+        if self.result_store:
+            self.result_store.put("accessibility", page_url, content_hash, ruleset_hash, result)
+        
+        return result
+    
+    def get_ruleset_hash(self, include_lighthouse: bool = True) -> str:
+        """Hash of the rules and options that determine audit findings."""
+        return compute_ruleset_hash(
+            self.RULESET_VERSION,
+            self.target_level.value,
+            self.accessibility_rules,
+            {"include_lighthouse": include_lighthouse}
+        )
     
     async def _fetch_page_content(self, url: str, user_agent: str = None) -> str:
         """Fetch page content for analysis."""
@@ -691,44 +741,54 @@ class AccessibilityChecker:
         
         return issues
     
-    async def _check_color_contrast(self, soup: BeautifulSoup, page_url: str) -> List[AccessibilityIssue]:
-        """Check color contrast compliance (basic checks only)."""
+    async def _check_color_contrast(
+        self,
+        soup: BeautifulSoup,
+        page_url: str,
+        stylesheets: Optional[List[ParsedStylesheet]] = None
+    ) -> List[AccessibilityIssue]:
+        """Check text color contrast against the resolved CSS cascade."""
         issues = []
+        ratios = self.contrast_ratios[self.target_level]
         
-        # This is a simplified color contrast check
-        # In practice, you'd need to compute actual contrast ratios from CSS
+        failures = await self.contrast_engine.find_contrast_failures(
+            soup, page_url, ratios["normal"], ratios["large"], session=self.session, stylesheets=stylesheets
+        )
         
-        # Check for inline styles with potential contrast issues
-        elements_with_style = soup.find_all(attrs={'style': True})
+        # Report each element once, using its worst text run
+        worst_by_element = {}
+        for failure in failures:
+            current = worst_by_element.get(id(failure.element))
+            if current is None or failure.ratio < current.ratio:
+                worst_by_element[id(failure.element)] = failure
         
-        for i, element in enumerate(elements_with_style):
-            style = element.get('style', '')
-            
-            # Basic check for light text on light background patterns
-            light_text_patterns = ['color:#fff', 'color:#ffffff', 'color:white', 'color: white']
-            light_bg_patterns = ['background:#fff', 'background:#ffffff', 'background:white', 'background: white']
-            
-            has_light_text = any(pattern in style.lower() for pattern in light_text_patterns)
-            has_light_bg = any(pattern in style.lower() for pattern in light_bg_patterns)
+        for i, failure in enumerate(worst_by_element.values()):
+            if i >= self.max_contrast_issues:
+                break
             
-            if has_light_text and has_light_bg:
-                issues.append(AccessibilityIssue(
-                    issue_id=f"potential_contrast_issue_{i}",
-                    category=AccessibilityCategory.COLOR_CONTRAST,
-                    severity=IssueSeverity.HIGH,
-                    wcag_level=WCAGLevel.AA,
-                    wcag_criteria="1.4.3",
-                    title="Potential color contrast issue",
-                    description="Element may have insufficient color contrast (manual verification needed).",
-                    element_selector=self._generate_selector(element),
-                    element_html=str(element)[:200],
-                    xpath=self._generate_xpath(element, soup),
-                    page_location=self._get_page_location(element),
-                    fix_suggestion="Verify color contrast meets WCAG AA ratio (4.5:1 for normal text).",
-                    fix_complexity="medium",
-                    estimated_fix_time=10,
-                    test_method="automated"
-                ))
+            element = failure.element
+            text_size = "large" if failure.is_large_text else "normal"
+            issues.append(AccessibilityIssue(
+                issue_id=f"color_contrast_{i}",
+                category=AccessibilityCategory.COLOR_CONTRAST,
+                severity=IssueSeverity.HIGH if failure.ratio < 3.0 else IssueSeverity.MEDIUM,
+                wcag_level=self.target_level,
+                wcag_criteria="1.4.6" if self.target_level == WCAGLevel.AAA else "1.4.3",
+                title="Insufficient color contrast",
+                description=(
+                    f"Text \"{failure.text[:50]}\" has a contrast ratio of {failure.ratio:.2f}:1 "
+                    f"({format_color(failure.foreground)} on {format_color(failure.background)}); "
+                    f"{failure.required_ratio}:1 is required for {text_size} text."
+                ),
+                element_selector=self._generate_selector(element),
+                element_html=str(element)[:200],
+                xpath=self._generate_xpath(element, soup),
+                page_location=self._get_page_location(element),
+                fix_suggestion=f"Adjust text or background color to reach at least {failure.required_ratio}:1 contrast.",
+                fix_complexity="easy",
+                estimated_fix_time=5,
+                test_method="automated"
+            ))
         
         return issues
     
@@ -1092,6 +1152,8 @@ class AccessibilityChecker:
             "page_url": result.page_url,
             "audit_timestamp": result.audit_timestamp.isoformat(),
             "wcag_target_level": result.wcag_target_level.value,
+            "cache_status": result.cache_status,
+            "content_hash": result.content_hash,
             "summary": {
                 "total_issues": result.total_issues,
                 "critical_issues": result.critical_issues,
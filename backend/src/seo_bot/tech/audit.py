@@ -17,7 +17,9 @@ import aiohttp
 from bs4 import BeautifulSoup, Comment
 
 from ..config import Settings
+from ..instrumentation import traced_client_session
 from ..models import Project
+from .audit_cache import CACHE_STATUS_FRESH, AuditResultStore, compute_content_hash, compute_ruleset_hash
 
 
 logger = logging.getLogger(__name__)
@@ -140,6 +142,10 @@ class TechnicalSEOAuditResult:
     quick_wins: List[str]
     optimization_suggestions: List[str]
     
+    # Incremental audit bookkeeping
+    content_hash: Optional[str] = None
+    cache_status: str = CACHE_STATUS_FRESH  # "fresh" or "reused"
+    
     @property
     def seo_health_score(self) -> float:
         """Calculate overall SEO health score (0-100)."""
@@ -175,10 +181,18 @@ class TechnicalSEOAuditResult:
 class TechnicalSEOAuditor:
     """Comprehensive technical SEO auditor with validation and optimization recommendations."""
     
-    def __init__(self, settings: Optional[Settings] = None):
+    # Bump when check logic changes so stored results are re-evaluated
+    RULESET_VERSION = "1"
+    
+    def __init__(
+        self,
+        settings: Optional[Settings] = None,
+        result_store: Optional[AuditResultStore] = None
+    ):
         """Initialize the technical SEO auditor."""
         self.settings = settings or Settings()
         self.session: Optional[aiohttp.ClientSession] = None
+        self.result_store = result_store
         
         # SEO validation rules
         self.meta_tag_rules = self._initialize_meta_tag_rules()
@@ -187,7 +201,7 @@ class TechnicalSEOAuditor:
     
     async def __aenter__(self):
         """Async context manager entry."""
-        self.session = aiohttp.ClientSession()
+        self.session = traced_client_session("technical_audit")
         return self
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
@@ -292,6 +306,16 @@ class TechnicalSEOAuditor:
         
         # Fetch page content and response headers
         html_content, response_headers = await self._fetch_page_with_headers(page_url, user_agent)
+        
+        # Reuse previous findings when page and rules are unchanged
+        content_hash = compute_content_hash(html_content, response_headers)
+        ruleset_hash = self.get_ruleset_hash(check_internal_links, validate_schema)
+        if self.result_store:
+            cached = self.result_store.get("technical_seo", page_url, content_hash, ruleset_hash)
+            if cached is not None:
+                logger.info(f"Reusing technical SEO audit for unchanged page: {page_url}")
+                return cached
+        
         soup = BeautifulSoup(html_content, 'html.parser')
         
         # Run all technical SEO checks
@@ -328,7 +352,7 @@ class TechnicalSEOAuditor:
         issues.extend(await self._validate_crawlability(soup, page_url))
         
         # Generate comprehensive audit result
-        return self._generate_audit_result(
+        result = self._generate_audit_result(
             page_url=page_url,
             issues=issues,
             soup=soup,
@@ -336,6 +360,22 @@ class TechnicalSEOAuditor:
             schema_result=schema_result,
             internal_links_count=internal_links_count
         )
+        result.content_hash = content_hash
+        
+        if self.result_store:
+            self.result_store.put("technical_seo", page_url, content_hash, ruleset_hash, result)
+        
+        return result
+    
+    def get_ruleset_hash(self, check_internal_links: bool = True, validate_schema: bool = True) -> str:
+        """Hash of the rules and options that determine audit findings."""
+        return compute_ruleset_hash(
+            self.RULESET_VERSION,
+            self.meta_tag_rules,
+            self.schema_validation_rules,
+            self.html_validation_rules,
+            {"check_internal_links": check_internal_links, "validate_schema": validate_schema}
+        )
     
     async def _fetch_page_with_headers(self, url: str, user_agent: str = None) -> Tuple[str, Dict[str, str]]:
         """Fetch page content and response headers."""
@@ -1404,6 +1444,8 @@ class TechnicalSEOAuditor:
         data = {
             "page_url": result.page_url,
             "audit_timestamp": result.audit_timestamp.isoformat(),
+            "cache_status": result.cache_status,
+            "content_hash": result.content_hash,
             "summary": {
                 "seo_health_score": result.seo_health_score,
                 "total_issues": result.total_issues,
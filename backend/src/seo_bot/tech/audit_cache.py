@@ -0,0 +1,188 @@
+"""Content-hash keyed audit result store for incremental page audits."""
+
+import copy
+import hashlib
+import json
+import logging
+import pickle
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Mapping, Optional, Sequence, Union
+
+
+logger = logging.getLogger(__name__)
+
+
+CACHE_STATUS_FRESH = "fresh"
+CACHE_STATUS_REUSED = "reused"
+
+# Response headers that influence technical audit findings
+AUDIT_RELEVANT_HEADERS = (
+    "strict-transport-security",
+    "content-security-policy",
+    "x-frame-options",
+    "x-content-type-options",
+    "x-robots-tag",
+    "link",
+)
+
+
+def compute_content_hash(html_content: str,
+                         response_headers: Optional[Mapping[str, str]] = None,
+                         dependency_hashes: Sequence[str] = ()) -> str:
+    """Hash page content, plus any audit-relevant response headers.
+
+    ``dependency_hashes`` are hashes of resources the findings also depend
+    on (such as resolved stylesheets), in document order.
+    """
+    digest = hashlib.sha256(html_content.encode("utf-8", errors="replace"))
+    for dependency in dependency_hashes:
+        digest.update(f"\ndependency:{dependency}".encode("utf-8"))
+
+    if response_headers:
+        normalized = {k.lower(): v for k, v in response_headers.items()}
+        for header in AUDIT_RELEVANT_HEADERS:
+            if header in normalized:
+                digest.update(f"\n{header}:{normalized[header]}".encode("utf-8", errors="replace"))
+
+    return digest.hexdigest()
+
+
+def compute_ruleset_hash(version: str, *rule_sets: Any) -> str:
+    """Hash an auditor's rule version and rule configuration."""
+    payload = json.dumps([version, *rule_sets], sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+@dataclass
+class CachedAuditEntry:
+    """A stored audit result with the hashes it was computed from."""
+
+    audit_type: str
+    page_url: str
+    content_hash: str
+    ruleset_hash: str
+    result: Any
+    stored_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+
+
+class AuditResultStore:
+    """Stores audit results keyed by page URL, content hash and rule-set hash.
+
+    A result is reused only when both the page content and the auditor's rule
+    set are unchanged since it was stored. Entries live in memory and, when a
+    cache directory is given, in one pickle file per page and audit type.
+    """
+
+    def __init__(self, cache_dir: Optional[Union[str, Path]] = None):
+        """Initialize the store, optionally backed by a directory."""
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self._entries: Dict[str, CachedAuditEntry] = {}
+        self.stats = {"hits": 0, "misses": 0, "stores": 0}
+
+        if self.cache_dir:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def _entry_key(self, audit_type: str, page_url: str) -> str:
+        """Generate storage key for an audit type and page."""
+        return hashlib.sha256(f"{audit_type}|{page_url}".encode("utf-8")).hexdigest()
+
+    def _entry_path(self, audit_type: str, key: str) -> Path:
+        """Get on-disk location of an entry."""
+        return self.cache_dir / audit_type / key[:2] / f"{key}.pkl"
+
+    def _load_entry(self, audit_type: str, key: str) -> Optional[CachedAuditEntry]:
+        """Load entry from memory or disk."""
+        entry = self._entries.get(key)
+        if entry is not None or not self.cache_dir:
+            return entry
+
+        path = self._entry_path(audit_type, key)
+        if not path.exists():
+            return None
+
+        try:
+            with open(path, "rb") as f:
+                entry = pickle.load(f)
+        except Exception as e:
+            logger.warning(f"Discarding unreadable audit cache entry {path}: {e}")
+            return None
+
+        self._entries[key] = entry
+        return entry
+
+    def get(
+        self,
+        audit_type: str,
+        page_url: str,
+        content_hash: str,
+        ruleset_hash: str
+    ) -> Optional[Any]:
+        """Return a copy of the stored result if content and rules are unchanged."""
+        entry = self._load_entry(audit_type, self._entry_key(audit_type, page_url))
+
+        if (
+            entry is None or
+            entry.content_hash != content_hash or
+            entry.ruleset_hash != ruleset_hash
+        ):
+            self.stats["misses"] += 1
+            return None
+
+        self.stats["hits"] += 1
+        result = copy.deepcopy(entry.result)
+        result.cache_status = CACHE_STATUS_REUSED
+        return result
+
+    def put(
+        self,
+        audit_type: str,
+        page_url: str,
+        content_hash: str,
+        ruleset_hash: str,
+        result: Any
+    ) -> None:
+        """Store a freshly computed audit result."""
+        key = self._entry_key(audit_type, page_url)
+        entry = CachedAuditEntry(
+            audit_type=audit_type,
+            page_url=page_url,
+            content_hash=content_hash,
+            ruleset_hash=ruleset_hash,
+            result=copy.deepcopy(result)
+        )
+        self._entries[key] = entry
+        self.stats["stores"] += 1
+
+        if self.cache_dir:
+            path = self._entry_path(audit_type, key)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(".tmp")
+            with open(tmp_path, "wb") as f:
+                pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+            tmp_path.replace(path)
+
+    def invalidate(self, audit_type: str, page_url: str) -> None:
+        """Remove a stored result so the page is re-audited."""
+        key = self._entry_key(audit_type, page_url)
+        self._entries.pop(key, None)
+
+        if self.cache_dir:
+            path = self._entry_path(audit_type, key)
+            if path.exists():
+                path.unlink()
+
+    def clear(self) -> None:
+        """Remove all stored results."""
+        self._entries.clear()
+
+        if self.cache_dir:
+            for path in self.cache_dir.rglob("*.pkl"):
+                path.unlink()
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of lookups served from the store."""
+        lookups = self.stats["hits"] + self.stats["misses"]
+        return self.stats["hits"] / lookups if lookups else 0.0
@@ -12,7 +12,11 @@ import aiohttp
 import time
 
 from ..config import PerformanceBudget, PerformanceBudgetsConfig, Settings
+from ..instrumentation import traced_client_session
 from ..models import Page, PerformanceMetric, Project
+from .performance_history import PerformanceHistoryStore
+from .psi_scheduler import PSIRequest, PSIRequestError, PSIRequestScheduler, PSISchedulerConfig
+from .template_sampling import TemplateSampler
 
 
 logger = logging.getLogger(__name__)
@@ -117,12 +121,15 @@ class PerformanceTestResult:
     cls: Optional[float] = None
     fcp_ms: Optional[int] = None
     ttfb_ms: Optional[int] = None
+    tbt_ms: Optional[int] = None
+    speed_index_ms: Optional[int] = None
     
     # Resource metrics
     total_size_kb: Optional[int] = None
     js_size_kb: Optional[int] = None
     css_size_kb: Optional[int] = None
     image_size_kb: Optional[int] = None
+    request_count: Optional[int] = None
     
     # Lighthouse scores
     performance_score: Optional[int] = None
@@ -134,6 +141,14 @@ class PerformanceTestResult:
     has_crux_data: bool = False
     crux_data: Optional[Dict[str, Any]] = None
     
+    # CrUX 75th percentile field metrics
+    field_lcp_ms: Optional[int] = None
+    field_inp_ms: Optional[int] = None
+    field_cls: Optional[float] = None
+    
+    # Served from the history store instead of a new API call
+    from_history: bool = False
+    
     @property
     def passes_cwv_thresholds(self) -> bool:
         """Check if page passes Core Web Vitals thresholds."""
@@ -150,25 +165,36 @@ class PerformanceTestResult:
 class PerformanceBudgetManager:
     """Manages performance budgets with Core Web Vitals monitoring and auto-optimization."""
     
-    def __init__(self, settings: Optional[Settings] = None):
+    def __init__(
+        self,
+        settings: Optional[Settings] = None,
+        scheduler_config: Optional[PSISchedulerConfig] = None,
+        history_store: Optional[PerformanceHistoryStore] = None
+    ):
         """Initialize the performance budget manager."""
         self.settings = settings or Settings()
         self.session: Optional[aiohttp.ClientSession] = None
         
+        # Parsed results are persisted here and reused while fresh
+        self.history_store = history_store
+        
         # PageSpeed Insights API configuration
         self.psi_base_url = "https://www.googleapis.com/pagespeedonline/runPagespeed/v5"
         self.psi_api_key = self.settings.pagespeed_api_key
         
-        # Rate limiting for API calls
+        # Rate limiting for single API calls
         self.last_api_call = 0
         self.api_call_interval = 1.0  # seconds between calls
         
+        # Concurrent scheduling for batch audits
+        self.scheduler = PSIRequestScheduler(self._fetch_psi_result, scheduler_config)
+        
         # Optimization cache
         self.optimization_cache: Dict[str, List[OptimizationRecommendation]] = {}
     
     async def __aenter__(self):
         """Async context manager entry."""
-        self.session = aiohttp.ClientSession()
+        self.session = traced_client_session("pagespeed")
         return self
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
@@ -190,12 +216,38 @@ class PerformanceBudgetManager:
         if not self.session:
             raise RuntimeError("Session not initialized. Use async context manager.")
         
+        # Reuse a recent result for the same URL and device
+        if self.history_store:
+            cached = self.history_store.get_fresh(url, device_type)
+            if cached:
+                logger.info(f"Using stored PageSpeed result for {url} ({device_type})")
+                return cached
+        
         # Rate limiting
         now = time.time()
         time_since_last = now - self.last_api_call
         if time_since_last < self.api_call_interval:
             await asyncio.sleep(self.api_call_interval - time_since_last)
         
+        try:
+            return await self._fetch_psi_result(url, device_type, strategy, include_categories)
+        finally:
+            self.last_api_call = time.time()
+    
+    async def _fetch_psi_result(
+        self,
+        url: str,
+        device_type: str = "mobile",
+        strategy: str = "mobile",
+        include_categories: List[str] = None
+    ) -> PerformanceTestResult:
+        """Issue a single PageSpeed Insights request without rate limiting."""
+        if not self.psi_api_key:
+            raise ValueError("PageSpeed Insights API key not configured")
+        
+        if not self.session:
+            raise RuntimeError("Session not initialized. Use async context manager.")
+        
         categories = include_categories or ["performance", "accessibility", "best-practices", "seo"]
         
         params = {
@@ -210,19 +262,28 @@ class PerformanceBudgetManager:
         
         try:
             async with self.session.get(self.psi_base_url, params=params) as response:
-                self.last_api_call = time.time()
-                
                 if response.status != 200:
                     error_text = await response.text()
                     logger.error(f"PageSpeed API error {response.status}: {error_text}")
-                    raise RuntimeError(f"PageSpeed API request failed: {response.status}")
+                    
+                    retry_after = response.headers.get("Retry-After")
+                    raise PSIRequestError(
+                        f"PageSpeed API request failed: {response.status}",
+                        status=response.status,
+                        retry_after=float(retry_after) if retry_after and retry_after.isdigit() else None
+                    )
                 
                 data = await response.json()
-                return self._parse_psi_response(url, device_type, data)
+                result = self._parse_psi_response(url, device_type, data)
+                
+                if self.history_store:
+                    self.history_store.record(result)
+                
+                return result
                 
         except aiohttp.ClientError as e:
             logger.error(f"Network error during PageSpeed test: {e}")
-            raise RuntimeError(f"Network error: {e}")
+            raise PSIRequestError(f"Network error: {e}")
     
     def _parse_psi_response(self, url: str, device_type: str, data: Dict[str, Any]) -> PerformanceTestResult:
         """Parse PageSpeed Insights API response."""
@@ -237,6 +298,9 @@ class PerformanceBudgetManager:
         fcp_audit = audits.get("first-contentful-paint", {})
         ttfb_audit = audits.get("server-response-time", {})
         
+        tbt_audit = audits.get("total-blocking-time", {})
+        speed_index_audit = audits.get("speed-index", {})
+        
         # Resource metrics
         resource_audit = audits.get("resource-summary", {})
         resource_details = resource_audit.get("details", {}).get("items", [])
@@ -245,11 +309,15 @@ class PerformanceBudgetManager:
         css_size = 0
         image_size = 0
         total_size = 0
+        request_count = 0
         
         for item in resource_details:
             resource_type = item.get("resourceType", "")
             transfer_size = item.get("transferSize", 0) // 1024  # Convert to KB
             
+            if resource_type == "total":
+                request_count = item.get("requestCount", request_count)
+            
             if resource_type == "script":
                 js_size += transfer_size
             elif resource_type == "stylesheet":
@@ -261,7 +329,12 @@ class PerformanceBudgetManager:
         
         # Check for CrUX data
         loading_experience = data.get("loadingExperience", {})
-        has_crux_data = bool(loading_experience.get("metrics"))
+        crux_metrics = loading_experience.get("metrics", {})
+        has_crux_data = bool(crux_metrics)
+        
+        field_lcp = crux_metrics.get("LARGEST_CONTENTFUL_PAINT_MS", {}).get("percentile")
+        field_inp = crux_metrics.get("INTERACTION_TO_NEXT_PAINT", {}).get("percentile")
+        field_cls = crux_metrics.get("CUMULATIVE_LAYOUT_SHIFT_SCORE", {}).get("percentile")
         
         result = PerformanceTestResult(
             url=url,
@@ -275,12 +348,15 @@ class PerformanceBudgetManager:
             cls=float(cls_audit.get("numericValue", 0)) if cls_audit.get("numericValue") is not None else None,
             fcp_ms=int(fcp_audit.get("numericValue", 0)) if fcp_audit.get("numericValue") else None,
             ttfb_ms=int(ttfb_audit.get("numericValue", 0)) if ttfb_audit.get("numericValue") else None,
+            tbt_ms=int(tbt_audit["numericValue"]) if tbt_audit.get("numericValue") is not None else None,
+            speed_index_ms=int(speed_index_audit["numericValue"]) if speed_index_audit.get("numericValue") else None,
             
             # Resource metrics
             total_size_kb=total_size,
             js_size_kb=js_size,
             css_size_kb=css_size,
             image_size_kb=image_size,
+            request_count=request_count or None,
             
             # Lighthouse scores
             performance_score=int(categories.get("performance", {}).get("score", 0) * 100),
@@ -290,7 +366,12 @@ class PerformanceBudgetManager:
             
             # CrUX data
             has_crux_data=has_crux_data,
-            crux_data=loading_experience if has_crux_data else None
+            crux_data=loading_experience if has_crux_data else None,
+            
+            # CrUX p75 field metrics (CLS percentile is reported x100)
+            field_lcp_ms=int(field_lcp) if field_lcp is not None else None,
+            field_inp_ms=int(field_inp) if field_inp is not None else None,
+            field_cls=field_cls / 100 if field_cls is not None else None
         )
         
         return result
@@ -547,6 +628,7 @@ class PerformanceBudgetManager:
             "pages_tested": 0,
             "pages_passing_cwv": 0,
             "template_results": {},
+            "page_results": {},
             "recommendations": [],
             "summary": {}
         }
@@ -559,10 +641,10 @@ class PerformanceBudgetManager:
                 f"{project.base_url}/sample-product",  # Product template  
             ]
         
-        # Test each URL across device types
+        # Schedule every URL x device test; results stream back as they complete
+        requests = []
         for url in sample_urls:
             template_type = self._detect_template_type(url, project.base_url)
-            budget = self._get_budget_for_template(template_type, budgets_config)
             
             if template_type not in audit_results["template_results"]:
                 audit_results["template_results"][template_type] = {
@@ -573,58 +655,72 @@ class PerformanceBudgetManager:
                     "cwv_pass_rate": 0
                 }
             
+            for device_type in device_types:
+                requests.append(PSIRequest(
+                    url=url,
+                    device_type=device_type,
+                    strategy=device_type,
+                    context=template_type
+                ))
+        
+        async for request, test_result, error in self._stream_test_results(requests):
+            url, device_type, template_type = request.url, request.device_type, request.context
+            
+            if error is not None:
+                logger.error(f"Error testing {url} on {device_type}: {error}")
+                continue
+            
+            budget = self._get_budget_for_template(template_type, budgets_config)
             template_results = audit_results["template_results"][template_type]
             
-            for device_type in device_types:
-                try:
-                    logger.info(f"Testing {url} on {device_type}")
-                    
-                    # Run performance test
-                    test_result = await self.test_page_performance(
-                        url=url,
-                        device_type=device_type,
-                        strategy=device_type
-                    )
-                    
-                    # Check for violations
-                    violations = self.check_budget_violations(
-                        test_result=test_result,
-                        budget=budget,
-                        template_type=template_type
-                    )
-                    
-                    # Generate recommendations
-                    recommendations = self.generate_optimization_recommendations(
-                        violations=violations,
-                        test_result=test_result
-                    )
-                    
-                    # Update audit results
-                    template_results["pages_tested"] += 1
-                    template_results["violations"].extend(violations)
-                    template_results["recommendations"].extend(recommendations)
-                    
-                    # Track performance scores
-                    if test_result.performance_score:
-                        current_avg = template_results["avg_performance_score"]
-                        page_count = template_results["pages_tested"]
-                        template_results["avg_performance_score"] = (
-                            (current_avg * (page_count - 1) + test_result.performance_score) / page_count
-                        )
-                    
-                    # Track CWV pass rate
-                    if test_result.passes_cwv_thresholds:
-                        audit_results["pages_passing_cwv"] += 1
-                    
-                    audit_results["pages_tested"] += 1
-                    audit_results["total_violations"] += len(violations)
-                    audit_results["critical_violations"] += len([v for v in violations if v.is_critical])
-                    
-                    logger.info(f"Completed {url} on {device_type}: {len(violations)} violations found")
-                    
-                except Exception as e:
-                    logger.error(f"Error testing {url} on {device_type}: {e}")
-                    continue
+            # Check for violations
+            violations = self.check_budget_violations(
+                test_result=test_result,
+                budget=budget,
+                template_type=template_type
+            )
+            
+            # Generate recommendations
+            recommendations = self.generate_optimization_recommendations(
+                violations=violations,
+                test_result=test_result
+            )
+            
+            # Update audit results
+            template_results["pages_tested"] += 1
+            template_results["violations"].extend(violations)
+            template_results["recommendations"].extend(recommendations)
+            
+            # Track performance scores
+            if test_result.performance_score:
+                current_avg = template_results["avg_performance_score"]
+                page_count = template_results["pages_tested"]
+                template_results["avg_performance_score"] = (
+                    (current_avg * (page_count - 1) + test_result.performance_score) / page_count
+                )
+            
+            # Track CWV pass rate
+            if test_result.passes_cwv_thresholds:
+                audit_results["pages_passing_cwv"] += 1
+            
+            # Per-page budget outcome, used for sample extrapolation
+            audit_results["page_results"].setdefault(url, {})[device_type] = not violations
+            
+            audit_results["pages_tested"] += 1
+            audit_results["total_violations"] += len(violations)
+            audit_results["critical_violations"] += len([v for v in violations if v.is_critical])
+            
+            logger.info(f"Completed {url} on {device_type}: {len(violations)} violations found")
+        
+        audit_results["api_usage"] = dict(self.scheduler.stats, quota_remaining=self.scheduler.quota_remaining)
+        
+        # Regressions against earlier runs, served from the history store
+        if self.history_store:
+            audit_results["regressions"] = [
+                regression
+                for request in requests
+                for regression in self.history_store.detect_regressions(request.url, request.device_type)
+            ]
         
         # Calculate summary metrics
         if audit_results["pages_tested"] > 0:
@@ -666,6 +762,88 @@ class PerformanceBudgetManager:
         
         return audit_results
     
+    async def run_sampled_audit(
+        self,
+        project: Project,
+        budgets_config: PerformanceBudgetsConfig,
+        site_urls: List[str],
+        device_types: List[str] = None,
+        sampler: Optional[TemplateSampler] = None,
+        dom_fingerprints: Optional[Dict[str, int]] = None,
+        max_total_samples: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """Audit a statistical sample per URL template and extrapolate budget pass rates."""
+        device_types = device_types or ["mobile", "desktop"]
+        sampler = sampler or TemplateSampler()
+        
+        templates = sampler.cluster_urls(site_urls, dom_fingerprints)
+        samples = sampler.select_samples(templates, max_total_samples)
+        sample_urls = [url for template_urls in samples.values() for url in template_urls]
+        
+        audit_results = await self.run_comprehensive_audit(
+            project=project,
+            budgets_config=budgets_config,
+            sample_urls=sample_urls,
+            device_types=device_types
+        )
+        
+        page_results = audit_results["page_results"]
+        extrapolation = {}
+        for device_type in device_types:
+            device_outcomes = {
+                url: devices[device_type]
+                for url, devices in page_results.items()
+                if device_type in devices
+            }
+            estimates = [sampler.estimate_pass_rate(template, device_outcomes) for template in templates]
+            
+            extrapolation[device_type] = {
+                "site": sampler.estimate_site_pass_rate(estimates),
+                "templates": [estimate.__dict__ for estimate in estimates]
+            }
+        
+        audit_results["sampling"] = {
+            "site_urls": len(set(site_urls)),
+            "templates": len(templates),
+            "sampled_urls": len(sample_urls),
+            "confidence": sampler.confidence,
+            "margin_of_error": sampler.margin_of_error,
+            "budget_pass_rates": extrapolation
+        }
+        
+        return audit_results
+    
+    async def _stream_test_results(self, requests: List[PSIRequest]):
+        """Yield stored results for fresh URLs, then schedule API calls for the rest."""
+        pending = []
+        for request in requests:
+            cached = self.history_store.get_fresh(request.url, request.device_type) if self.history_store else None
+            if cached:
+                yield request, cached, None
+            else:
+                pending.append(request)
+        
+        logger.info(
+            f"Scheduling {len(pending)} PageSpeed tests "
+            f"({len(requests) - len(pending)} served from history)"
+        )
+        
+        async for item in self.scheduler.stream(pending):
+            yield item
+    
+    def get_performance_trend(
+        self,
+        url: str,
+        device_type: str = "mobile",
+        metric: str = "lcp_ms",
+        days: int = 90
+    ) -> List[Tuple[str, float]]:
+        """Get a metric's daily trend from the history store without API calls."""
+        if not self.history_store:
+            raise RuntimeError("Performance history store not configured")
+        
+        return self.history_store.get_trend(url, device_type, metric, days)
+    
     def _detect_template_type(self, url: str, base_url: str) -> str:
         """Detect template type based on URL patterns."""
         relative_path = url.replace(base_url, "").strip("/").lower()
@@ -0,0 +1,681 @@
+"""Color contrast engine resolving the CSS cascade for WCAG contrast checks."""
+
+import asyncio
+import colorsys
+import hashlib
+import logging
+import re
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urljoin
+
+import aiohttp
+import numpy as np
+import soupsieve
+from bs4 import BeautifulSoup, Comment, NavigableString, Tag
+
+
+logger = logging.getLogger(__name__)
+
+
+RGBA = Tuple[float, float, float, float]
+
+WHITE: RGBA = (255.0, 255.0, 255.0, 1.0)
+BLACK: RGBA = (0.0, 0.0, 0.0, 1.0)
+TRANSPARENT: RGBA = (0.0, 0.0, 0.0, 0.0)
+
+BASE_FONT_SIZE_PX = 16.0
+
+# Properties the contrast engine needs from the cascade
+CONTRAST_PROPERTIES = {"color", "background-color", "background", "background-image", "font-size", "font-weight", "display"}
+
+# Elements whose text is never rendered
+NON_RENDERED_TAGS = {"script", "style", "noscript", "template", "head", "title", "meta", "link", "svg", "math"}
+
+# Pseudo-classes/elements that depend on interaction or generated content
+DYNAMIC_SELECTOR_RE = re.compile(r"::|:(hover|focus|focus-within|focus-visible|active|visited|target|before|after|placeholder|selection)\b")
+
+_NAMED_COLORS_SPEC = """
+aliceblue f0f8ff antiquewhite faebd7 aqua 00ffff aquamarine 7fffd4 azure f0ffff beige f5f5dc bisque ffe4c4
+black 000000 blanchedalmond ffebcd blue 0000ff blueviolet 8a2be2 brown a52a2a burlywood deb887 cadetblue 5f9ea0
+chartreuse 7fff00 chocolate d2691e coral ff7f50 cornflowerblue 6495ed cornsilk fff8dc crimson dc143c cyan 00ffff
+darkblue 00008b darkcyan 008b8b darkgoldenrod b8860b darkgray a9a9a9 darkgreen 006400 darkgrey a9a9a9
+darkkhaki bdb76b darkmagenta 8b008b darkolivegreen 556b2f darkorange ff8c00 darkorchid 9932cc darkred 8b0000
+darksalmon e9967a darkseagreen 8fbc8f darkslateblue 483d8b darkslategray 2f4f4f darkslategrey 2f4f4f
+darkturquoise 00ced1 darkviolet 9400d3 deeppink ff1493 deepskyblue 00bfff dimgray 696969 dimgrey 696969
+dodgerblue 1e90ff firebrick b22222 floralwhite fffaf0 forestgreen 228b22 fuchsia ff00ff gainsboro dcdcdc
+ghostwhite f8f8ff gold ffd700 goldenrod daa520 gray 808080 green 008000 greenyellow adff2f grey 808080
+honeydew f0fff0 hotpink ff69b4 indianred cd5c5c indigo 4b0082 ivory fffff0 khaki f0e68c lavender e6e6fa
+lavenderblush fff0f5 lawngreen 7cfc00 lemonchiffon fffacd lightblue add8e6 lightcoral f08080 lightcyan e0ffff
+lightgoldenrodyellow fafad2 lightgray d3d3d3 lightgreen 90ee90 lightgrey d3d3d3 lightpink ffb6c1
+lightsalmon ffa07a lightseagreen 20b2aa lightskyblue 87cefa lightslategray 778899 lightslategrey 778899
+lightsteelblue b0c4de lightyellow ffffe0 lime 00ff00 limegreen 32cd32 linen faf0e6 magenta ff00ff maroon 800000
+mediumaquamarine 66cdaa mediumblue 0000cd mediumorchid ba55d3 mediumpurple 9370db mediumseagreen 3cb371
+mediumslateblue 7b68ee mediumspringgreen 00fa9a mediumturquoise 48d1cc mediumvioletred c71585
+midnightblue 191970 mintcream f5fffa mistyrose ffe4e1 moccasin ffe4b5 navajowhite ffdead navy 000080
+oldlace fdf5e6 olive 808000 olivedrab 6b8e23 orange ffa500 orangered ff4500 orchid da70d6 palegoldenrod eee8aa
+palegreen 98fb98 paleturquoise afeeee palevioletred db7093 papayawhip ffefd5 peachpuff ffdab9 peru cd853f
+pink ffc0cb plum dda0dd powderblue b0e0e6 purple 800080 rebeccapurple 663399 red ff0000 rosybrown bc8f8f
+royalblue 4169e1 saddlebrown 8b4513 salmon fa8072 sandybrown f4a460 seagreen 2e8b57 seashell fff5ee
+sienna a0522d silver c0c0c0 skyblue 87ceeb slateblue 6a5acd slategray 708090 slategrey 708090 snow fffafa
+springgreen 00ff7f steelblue 4682b4 tan d2b48c teal 008080 thistle d8bfd8 tomato ff6347 turquoise 40e0d0
+violet ee82ee wheat f5deb3 white ffffff whitesmoke f5f5f5 yellow ffff00 yellowgreen 9acd32
+"""
+
+NAMED_COLORS: Dict[str, RGBA] = {}
+_tokens = _NAMED_COLORS_SPEC.split()
+for _name, _hex in zip(_tokens[::2], _tokens[1::2]):
+    NAMED_COLORS[_name] = (float(int(_hex[0:2], 16)), float(int(_hex[2:4], 16)), float(int(_hex[4:6], 16)), 1.0)
+NAMED_COLORS["transparent"] = TRANSPARENT
+
+# Browser default font sizes relative to the parent, for elements with no author font-size
+UA_FONT_SCALE = {"h1": 2.0, "h2": 1.5, "h3": 1.17, "h5": 0.83, "h6": 0.67, "small": 0.83, "sub": 0.83, "sup": 0.83}
+
+UA_BOLD_TAGS = {"b", "strong", "th", "h1", "h2", "h3", "h4", "h5", "h6"}
+
+FONT_SIZE_KEYWORDS = {
+    "xx-small": 9.0, "x-small": 10.0, "small": 13.0, "medium": 16.0,
+    "large": 18.0, "x-large": 24.0, "xx-large": 32.0, "xxx-large": 48.0
+}
+
+
+def _parse_channel(value: str, scale: float = 255.0) -> float:
+    """Parse an rgb() channel given as a number or percentage."""
+    value = value.strip()
+    if value.endswith("%"):
+        return float(value[:-1]) / 100.0 * scale
+    return float(value)
+
+
+def parse_color(value: str, current_color: Optional[RGBA] = None) -> Optional[RGBA]:
+    """Parse a CSS color value into RGBA (0-255 channels, 0-1 alpha)."""
+    value = value.strip().lower()
+    if not value:
+        return None
+
+    if value in NAMED_COLORS:
+        return NAMED_COLORS[value]
+    if value == "currentcolor":
+        return current_color
+
+    if value.startswith("#"):
+        digits = value[1:]
+        if len(digits) in (3, 4):
+            digits = "".join(c * 2 for c in digits)
+        if len(digits) not in (6, 8) or not re.fullmatch(r"[0-9a-f]+", digits):
+            return None
+        alpha = int(digits[6:8], 16) / 255.0 if len(digits) == 8 else 1.0
+        return (float(int(digits[0:2], 16)), float(int(digits[2:4], 16)), float(int(digits[4:6], 16)), alpha)
+
+    match = re.fullmatch(r"(rgba?|hsla?)\((.*)\)", value)
+    if not match:
+        return None
+
+    function, args = match.groups()
+    parts = [p for p in re.split(r"[\s,/]+", args.strip()) if p]
+    if len(parts) not in (3, 4):
+        return None
+
+    try:
+        alpha = _parse_channel(parts[3], 1.0) if len(parts) == 4 else 1.0
+        if function.startswith("rgb"):
+            r, g, b = (_parse_channel(p) for p in parts[:3])
+        else:
+            hue = float(parts[0].replace("deg", "")) / 360.0 % 1.0
+            saturation = _parse_channel(parts[1], 1.0)
+            lightness = _parse_channel(parts[2], 1.0)
+            r, g, b = (c * 255.0 for c in colorsys.hls_to_rgb(hue, lightness, saturation))
+    except ValueError:
+        return None
+
+    clamp = lambda c: min(255.0, max(0.0, c))  # noqa: E731
+    return (clamp(r), clamp(g), clamp(b), min(1.0, max(0.0, alpha)))
+
+
+def format_color(color: RGBA) -> str:
+    """Format an RGBA color as a hex string."""
+    return "#" + "".join(f"{round(channel):02x}" for channel in color[:3])
+
+
+def composite(top: RGBA, bottom: RGBA) -> RGBA:
+    """Alpha-composite ``top`` over an opaque ``bottom`` color."""
+    alpha = top[3]
+    if alpha >= 1.0:
+        return top
+    return (
+        top[0] * alpha + bottom[0] * (1 - alpha),
+        top[1] * alpha + bottom[1] * (1 - alpha),
+        top[2] * alpha + bottom[2] * (1 - alpha),
+        1.0
+    )
+
+
+def relative_luminance(rgb: np.ndarray) -> np.ndarray:
+    """WCAG relative luminance for an (N, 3) array of 0-255 sRGB colors."""
+    channels = rgb / 255.0
+    linear = np.where(channels <= 0.03928, channels / 12.92, ((channels + 0.055) / 1.055) ** 2.4)
+    return linear @ np.array([0.2126, 0.7152, 0.0722])
+
+
+def contrast_ratios(foregrounds: np.ndarray, backgrounds: np.ndarray) -> np.ndarray:
+    """Vectorized WCAG contrast ratios for paired (N, 3) color arrays."""
+    if len(foregrounds) == 0:
+        return np.zeros(0)
+
+    l1 = relative_luminance(foregrounds)
+    l2 = relative_luminance(backgrounds)
+    return (np.maximum(l1, l2) + 0.05) / (np.minimum(l1, l2) + 0.05)
+
+
+def _selector_specificity(selector: str) -> Tuple[int, int, int]:
+    """Approximate (ids, classes/attributes/pseudo-classes, types) specificity."""
+    stripped = re.sub(r"\[[^\]]*\]", " [] ", selector)
+    stripped = re.sub(r"\([^)]*\)", "", stripped)
+    ids = len(re.findall(r"#[\w-]+", stripped))
+    classes = len(re.findall(r"\.[\w-]+", stripped)) + stripped.count("[]") + len(re.findall(r"(?<!:):[\w-]+", stripped))
+    types = len(re.findall(r"(?:^|[\s>+~])([a-zA-Z][\w-]*)", stripped))
+    return (ids, classes, types)
+
+
+def _rightmost_compound(selector: str) -> str:
+    """Return the key (rightmost) compound selector."""
+    depth = 0
+    for index in range(len(selector) - 1, -1, -1):
+        char = selector[index]
+        if char in ")]":
+            depth += 1
+        elif char in "([":
+            depth -= 1
+        elif depth == 0 and char in " >+~":
+            return selector[index + 1:]
+    return selector
+
+
+def _parse_declarations(block: str) -> Dict[str, Tuple[str, bool]]:
+    """Parse a declaration block, keeping only contrast-relevant properties."""
+    declarations = {}
+    for declaration in block.split(";"):
+        if ":" not in declaration:
+            continue
+        name, value = declaration.split(":", 1)
+        name = name.strip().lower()
+        if name not in CONTRAST_PROPERTIES:
+            continue
+
+        value = value.strip()
+        important = value.lower().endswith("!important")
+        if important:
+            value = value[: -len("!important")].strip()
+
+        # Custom properties cannot be resolved statically
+        if "var(" in value:
+            continue
+        declarations[name] = (value, important)
+    return declarations
+
+
+@dataclass
+class CSSRule:
+    """A single selector with its contrast-relevant declarations."""
+
+    selector: str
+    specificity: Tuple[int, int, int]
+    declarations: Dict[str, Tuple[str, bool]]
+    order: int
+    compiled: object = field(default=None, repr=False)
+
+
+@dataclass
+class ParsedStylesheet:
+    """Rules from one stylesheet, bucketed by key selector for fast matching."""
+
+    rules: List[CSSRule] = field(default_factory=list)
+    by_id: Dict[str, List[CSSRule]] = field(default_factory=dict)
+    by_class: Dict[str, List[CSSRule]] = field(default_factory=dict)
+    by_tag: Dict[str, List[CSSRule]] = field(default_factory=dict)
+    universal: List[CSSRule] = field(default_factory=list)
+    # SHA-1 of the stylesheet text, so cached findings can depend on it
+    content_hash: str = ""
+
+    def add_rule(self, rule: CSSRule) -> None:
+        """Index a rule by its key selector."""
+        self.rules.append(rule)
+        key = _rightmost_compound(rule.selector)
+
+        id_match = re.search(r"#([\w-]+)", key)
+        class_match = re.search(r"\.([\w-]+)", key)
+        tag_match = re.match(r"([a-zA-Z][\w-]*)", key)
+
+        if id_match:
+            self.by_id.setdefault(id_match.group(1), []).append(rule)
+        elif class_match:
+            self.by_class.setdefault(class_match.group(1), []).append(rule)
+        elif tag_match:
+            self.by_tag.setdefault(tag_match.group(1).lower(), []).append(rule)
+        else:
+            self.universal.append(rule)
+
+    def candidate_rules(self, element: Tag) -> List[CSSRule]:
+        """Rules whose key selector could match the element."""
+        candidates = list(self.universal)
+        candidates.extend(self.by_tag.get(element.name, ()))
+
+        element_id = element.get("id")
+        if element_id:
+            candidates.extend(self.by_id.get(element_id, ()))
+        for class_name in element.get("class", ()):
+            candidates.extend(self.by_class.get(class_name, ()))
+        return candidates
+
+
+def parse_stylesheet(css_text: str, order_offset: int = 0) -> ParsedStylesheet:
+    """Parse CSS into contrast-relevant rules.
+
+    Screen-applicable ``@media`` and ``@supports`` blocks are flattened;
+    print-only media, keyframes and font-face blocks are skipped.
+    """
+    stylesheet = ParsedStylesheet(
+        content_hash=hashlib.sha1(css_text.encode("utf-8", errors="replace")).hexdigest()
+    )
+    css_text = re.sub(r"/\*.*?\*/", "", css_text, flags=re.DOTALL)
+    order = order_offset
+
+    def walk(text: str) -> None:
+        nonlocal order
+        position = 0
+        length = len(text)
+
+        while position < length:
+            open_brace = text.find("{", position)
+            if open_brace == -1:
+                break
+
+            prelude = text[position:open_brace].strip()
+            # Skip statements such as @import/@charset preceding the block
+            if ";" in prelude and prelude.lstrip().startswith("@"):
+                prelude = prelude.rsplit(";", 1)[-1].strip()
+
+            # Find matching close brace
+            depth = 1
+            cursor = open_brace + 1
+            while cursor < length and depth:
+                if text[cursor] == "{":
+                    depth += 1
+                elif text[cursor] == "}":
+                    depth -= 1
+                cursor += 1
+            body = text[open_brace + 1:cursor - 1]
+            position = cursor
+
+            if prelude.startswith("@"):
+                at_rule = prelude.lower()
+                if at_rule.startswith("@media"):
+                    media = at_rule[len("@media"):]
+                    if "print" in media and "screen" not in media:
+                        continue
+                    walk(body)
+                elif at_rule.startswith(("@supports", "@layer", "@container")):
+                    walk(body)
+                continue
+
+            declarations = _parse_declarations(body)
+            if not declarations:
+                continue
+
+            for selector in prelude.split(","):
+                selector = selector.strip()
+                if not selector or DYNAMIC_SELECTOR_RE.search(selector):
+                    continue
+                try:
+                    compiled = soupsieve.compile(selector)
+                except Exception:
+                    continue
+                stylesheet.add_rule(CSSRule(
+                    selector=selector,
+                    specificity=_selector_specificity(selector),
+                    declarations=declarations,
+                    order=order,
+                    compiled=compiled
+                ))
+                order += 1
+
+    walk(css_text)
+    return stylesheet
+
+
+@dataclass
+class TextContrastSample:
+    """Effective colors and size for a rendered text run."""
+
+    element: Tag
+    text: str
+    foreground: RGBA
+    background: RGBA
+    font_size_px: float
+    bold: bool
+
+    @property
+    def is_large_text(self) -> bool:
+        """WCAG large text: 18pt (24px) or 14pt (18.66px) bold."""
+        return self.font_size_px >= 24.0 or (self.bold and self.font_size_px >= 18.66)
+
+
+@dataclass
+class ContrastFailure:
+    """A text run below the required contrast ratio."""
+
+    element: Tag
+    text: str
+    ratio: float
+    required_ratio: float
+    foreground: RGBA
+    background: RGBA
+    is_large_text: bool
+
+
+class StylesheetCache:
+    """Per-site memo of parsed stylesheets, keyed by URL or inline content hash."""
+
+    def __init__(self, max_entries: int = 500):
+        """Initialize an empty cache."""
+        self.max_entries = max_entries
+        self._parsed: Dict[str, ParsedStylesheet] = {}
+        self._pending: Dict[str, asyncio.Future] = {}
+        self.stats = {"hits": 0, "misses": 0, "fetch_failures": 0}
+
+    def get_inline(self, css_text: str) -> ParsedStylesheet:
+        """Parse an inline ``<style>`` block, reusing identical blocks across pages."""
+        key = "inline:" + hashlib.sha1(css_text.encode("utf-8", errors="replace")).hexdigest()
+        cached = self._parsed.get(key)
+        if cached is not None:
+            self.stats["hits"] += 1
+            return cached
+
+        self.stats["misses"] += 1
+        parsed = parse_stylesheet(css_text)
+        self._store(key, parsed)
+        return parsed
+
+    async def get_linked(self, url: str, session: Optional[aiohttp.ClientSession]) -> ParsedStylesheet:
+        """Fetch and parse a linked stylesheet once per URL."""
+        cached = self._parsed.get(url)
+        if cached is not None:
+            self.stats["hits"] += 1
+            return cached
+
+        pending = self._pending.get(url)
+        if pending is not None:
+            self.stats["hits"] += 1
+            return await asyncio.shield(pending)
+
+        self.stats["misses"] += 1
+        future = asyncio.get_running_loop().create_future()
+        self._pending[url] = future
+        try:
+            css_text = await self._fetch(url, session)
+            parsed = parse_stylesheet(css_text)
+            self._store(url, parsed)
+            future.set_result(parsed)
+            return parsed
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            # Mark retrieved so failures nobody waited on are not reported as lost
+            future.exception()
+            raise
+        finally:
+            self._pending.pop(url, None)
+
+    async def _fetch(self, url: str, session: Optional[aiohttp.ClientSession]) -> str:
+        """Download stylesheet text; failures yield an empty stylesheet."""
+        if session is None:
+            return ""
+        try:
+            async with session.get(url) as response:
+                if response.status != 200:
+                    self.stats["fetch_failures"] += 1
+                    return ""
+                return await response.text()
+        except Exception as e:
+            logger.warning(f"Could not fetch stylesheet {url}: {e}")
+            self.stats["fetch_failures"] += 1
+            return ""
+
+    def _store(self, key: str, parsed: ParsedStylesheet) -> None:
+        """Insert into the cache, evicting the oldest entry when full."""
+        if len(self._parsed) >= self.max_entries:
+            self._parsed.pop(next(iter(self._parsed)))
+        self._parsed[key] = parsed
+
+
+class ContrastEngine:
+    """Computes effective text colors from the CSS cascade and checks WCAG contrast."""
+
+    def __init__(self, stylesheet_cache: Optional[StylesheetCache] = None):
+        """Initialize the engine with a (shareable) stylesheet cache."""
+        self.stylesheet_cache = stylesheet_cache or StylesheetCache()
+
+    async def collect_stylesheets(
+        self,
+        soup: BeautifulSoup,
+        page_url: str,
+        session: Optional[aiohttp.ClientSession] = None
+    ) -> List[ParsedStylesheet]:
+        """Gather linked and inline stylesheets in document order."""
+        tasks = []
+        for element in soup.find_all(["link", "style"]):
+            if element.name == "link":
+                rel = [r.lower() for r in element.get("rel", [])]
+                media = element.get("media", "all").lower()
+                if "stylesheet" not in rel or not element.get("href"):
+                    continue
+                if "print" in media and "screen" not in media:
+                    continue
+                tasks.append(self.stylesheet_cache.get_linked(urljoin(page_url, element["href"]), session))
+            else:
+                media = element.get("media", "all").lower()
+                if "print" in media and "screen" not in media:
+                    continue
+                tasks.append(self._inline(element.get_text()))
+
+        return list(await asyncio.gather(*tasks))
+
+    async def _inline(self, css_text: str) -> ParsedStylesheet:
+        """Awaitable wrapper so inline and linked sheets gather in order."""
+        return self.stylesheet_cache.get_inline(css_text)
+
+    def _cascade(self, element: Tag, stylesheets: List[ParsedStylesheet]) -> Dict[str, str]:
+        """Resolve specified values for one element."""
+        winners: Dict[str, Tuple[Tuple, str]] = {}
+
+        for sheet_index, sheet in enumerate(stylesheets):
+            for rule in sheet.candidate_rules(element):
+                if not rule.compiled.match(element):
+                    continue
+                for name, (value, important) in rule.declarations.items():
+                    priority = (important, 0, rule.specificity, sheet_index, rule.order)
+                    if name not in winners or priority > winners[name][0]:
+                        winners[name] = (priority, value)
+
+        inline = element.get("style")
+        if inline:
+            for name, (value, important) in _parse_declarations(inline).items():
+                priority = (important, 1, (0, 0, 0), len(stylesheets), 0)
+                if name not in winners or priority > winners[name][0]:
+                    winners[name] = (priority, value)
+
+        return {name: value for name, (_, value) in winners.items()}
+
+    @staticmethod
+    def _font_size(value: str, parent_px: float) -> float:
+        """Resolve a font-size value to pixels."""
+        value = value.strip().lower()
+        if value in FONT_SIZE_KEYWORDS:
+            return FONT_SIZE_KEYWORDS[value]
+        if value == "larger":
+            return parent_px * 1.2
+        if value == "smaller":
+            return parent_px / 1.2
+
+        match = re.fullmatch(r"([\d.]+)(px|pt|em|rem|%)?", value)
+        if not match:
+            return parent_px
+        number, unit = float(match.group(1)), match.group(2) or "px"
+        return {
+            "px": number,
+            "pt": number * 4 / 3,
+            "em": number * parent_px,
+            "rem": number * BASE_FONT_SIZE_PX,
+            "%": number / 100 * parent_px
+        }[unit]
+
+    @staticmethod
+    def _is_bold(value: str, parent_bold: bool) -> bool:
+        """Resolve font-weight to bold/not bold."""
+        value = value.strip().lower()
+        if value in ("bold", "bolder"):
+            return True
+        if value in ("normal", "lighter"):
+            return False
+        if value.isdigit():
+            return int(value) >= 700
+        return parent_bold
+
+    def compute_styles(
+        self,
+        soup: BeautifulSoup,
+        stylesheets: List[ParsedStylesheet]
+    ) -> List[TextContrastSample]:
+        """Compute effective foreground/background for every rendered text run."""
+        samples = []
+        root = soup.find("html") or soup
+        default_style = {"color": BLACK, "background": WHITE, "font_size": BASE_FONT_SIZE_PX, "bold": False, "image": False}
+
+        stack = [(root, default_style)]
+        while stack:
+            element, inherited = stack.pop()
+            if element.name in NON_RENDERED_TAGS or element.get("hidden") is not None or element.get("aria-hidden") == "true":
+                continue
+
+            specified = self._cascade(element, stylesheets) if isinstance(element, Tag) and element.name != "[document]" else {}
+            if specified.get("display", "").strip() == "none":
+                continue
+
+            color = inherited["color"]
+            if "color" in specified:
+                parsed = parse_color(specified["color"], inherited["color"])
+                if parsed is not None:
+                    color = composite(parsed, inherited["background"])
+
+            background = inherited["background"]
+            has_image = inherited["image"]
+            background_value = specified.get("background-color") or specified.get("background")
+            if background_value:
+                if "url(" in background_value or "gradient(" in background_value:
+                    has_image = True
+                else:
+                    parsed = self._background_color(background_value, color)
+                    if parsed is not None and parsed[3] > 0:
+                        background = composite(parsed, inherited["background"])
+                        has_image = False if parsed[3] >= 1.0 else has_image
+            if "url(" in specified.get("background-image", "") or "gradient(" in specified.get("background-image", ""):
+                has_image = True
+
+            style = {
+                "color": color,
+                "background": background,
+                "font_size": (
+                    self._font_size(specified["font-size"], inherited["font_size"]) if "font-size" in specified
+                    else inherited["font_size"] * UA_FONT_SCALE.get(element.name, 1.0)
+                ),
+                "bold": (
+                    self._is_bold(specified["font-weight"], inherited["bold"]) if "font-weight" in specified
+                    else inherited["bold"] or element.name in UA_BOLD_TAGS
+                ),
+                "image": has_image
+            }
+
+            for child in element.children:
+                if isinstance(child, Tag):
+                    stack.append((child, style))
+                elif isinstance(child, NavigableString) and not isinstance(child, Comment):
+                    text = child.strip()
+                    # Text over images cannot be judged statically
+                    if text and not style["image"]:
+                        samples.append(TextContrastSample(
+                            element=element,
+                            text=text,
+                            foreground=style["color"],
+                            background=style["background"],
+                            font_size_px=style["font_size"],
+                            bold=style["bold"]
+                        ))
+
+        return samples
+
+    @staticmethod
+    def _background_color(value: str, current_color: RGBA) -> Optional[RGBA]:
+        """Extract a color from a background or background-color value."""
+        parsed = parse_color(value, current_color)
+        if parsed is not None:
+            return parsed
+
+        # Shorthand: pick the first token that parses as a color
+        for token in re.findall(r"(?:rgba?|hsla?)\([^)]*\)|#[0-9a-fA-F]{3,8}|[a-zA-Z]+", value):
+            parsed = parse_color(token, current_color)
+            if parsed is not None:
+                return parsed
+        return None
+
+    def evaluate(
+        self,
+        samples: List[TextContrastSample],
+        normal_ratio: float,
+        large_ratio: float
+    ) -> List[ContrastFailure]:
+        """Batch-evaluate contrast ratios and return failing text runs."""
+        if not samples:
+            return []
+
+        foregrounds = np.array([s.foreground[:3] for s in samples], dtype=np.float64)
+        backgrounds = np.array([s.background[:3] for s in samples], dtype=np.float64)
+        large = np.array([s.is_large_text for s in samples], dtype=bool)
+
+        ratios = contrast_ratios(foregrounds, backgrounds)
+        required = np.where(large, large_ratio, normal_ratio)
+        # WCAG ratios are compared at two-decimal precision
+        failing = np.flatnonzero(np.round(ratios, 2) < required)
+
+        return [
+            ContrastFailure(
+                element=samples[i].element,
+                text=samples[i].text,
+                ratio=float(ratios[i]),
+                required_ratio=float(required[i]),
+                foreground=samples[i].foreground,
+                background=samples[i].background,
+                is_large_text=bool(large[i])
+            )
+            for i in failing
+        ]
+
+    async def find_contrast_failures(
+        self,
+        soup: BeautifulSoup,
+        page_url: str,
+        normal_ratio: float,
+        large_ratio: float,
+        session: Optional[aiohttp.ClientSession] = None,
+        stylesheets: Optional[List[ParsedStylesheet]] = None
+    ) -> List[ContrastFailure]:
+        """Resolve styles for a page and return text runs below the required ratio.
+
+        ``stylesheets`` from an earlier :meth:`collect_stylesheets` call are
+        reused; otherwise they are collected here.
+        """
+        if stylesheets is None:
+            stylesheets = await self.collect_stylesheets(soup, page_url, session)
+        samples = self.compute_styles(soup, stylesheets)
+        return self.evaluate(samples, normal_ratio, large_ratio)
@@ -5,12 +5,15 @@ import logging
 import time
 from contextlib import asynccontextmanager
 from datetime import datetime, timezone
-from typing import Any, Callable, Dict, List, Optional, Union
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Optional, Union
 from functools import wraps
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 import json
 from pathlib import Path
 
+from .sketch import DDSketch
+
 logger = logging.getLogger(__name__)
 
 
@@ -36,12 +39,33 @@ class PerformanceMetrics:
         return self.end_time - self.start_time
 
 
+@dataclass
+class OperationStats:
+    """Streaming aggregates for a single operation."""
+    
+    duration_sketch: DDSketch = field(default_factory=DDSketch)
+    success_count: int = 0
+    error_count: int = 0
+    
+    def merge(self, other: "OperationStats") -> None:
+        """Combine another operation's aggregates into this one."""
+        self.duration_sketch.merge(other.duration_sketch)
+        self.success_count += other.success_count
+        self.error_count += other.error_count
+
+
 class PerformanceMonitor:
-    """Monitor performance and errors across technical systems."""
+    """Monitor performance and errors across technical systems.
     
-    def __init__(self):
+    Durations are aggregated per operation in mergeable quantile sketches,
+    so memory stays bounded however long the process runs. Only the most
+    recent raw metrics are kept, for export.
+    """
+    
+    def __init__(self, max_recent_metrics: int = 1000):
         """Initialize performance monitor."""
-        self.metrics: List[PerformanceMetrics] = []
+        self.metrics: Deque[PerformanceMetrics] = deque(maxlen=max_recent_metrics)
+        self.operations: Dict[str, OperationStats] = {}
         self.error_counts: Dict[str, int] = {}
         self.success_counts: Dict[str, int] = {}
     
@@ -49,53 +73,71 @@ class PerformanceMonitor:
         """Record a performance metric."""
         self.metrics.append(metric)
         
+        stats = self.operations.get(metric.operation_name)
+        if stats is None:
+            stats = self.operations[metric.operation_name] = OperationStats()
+        stats.duration_sketch.add(max(0.0, metric.duration_ms))
+        
         # Update counters
         if metric.success:
+            stats.success_count += 1
             self.success_counts[metric.operation_name] = self.success_counts.get(metric.operation_name, 0) + 1
         else:
+            stats.error_count += 1
             self.error_counts[metric.operation_name] = self.error_counts.get(metric.operation_name, 0) + 1
     
     def get_stats(self, operation_name: Optional[str] = None) -> Dict[str, Any]:
         """Get performance statistics."""
         if operation_name:
-            relevant_metrics = [m for m in self.metrics if m.operation_name == operation_name]
+            stats = self.operations.get(operation_name)
+        elif self.operations:
+            stats = OperationStats()
+            for operation_stats in self.operations.values():
+                stats.merge(operation_stats)
         else:
-            relevant_metrics = self.metrics
+            stats = None
         
-        if not relevant_metrics:
+        if stats is None or stats.duration_sketch.count == 0:
             return {"error": "No metrics found"}
         
-        durations = [m.duration_ms for m in relevant_metrics]
-        success_count = len([m for m in relevant_metrics if m.success])
-        error_count = len([m for m in relevant_metrics if not m.success])
+        sketch = stats.duration_sketch
         
         return {
             "operation_name": operation_name or "all_operations",
-            "total_calls": len(relevant_metrics),
-            "success_count": success_count,
-            "error_count": error_count,
-            "success_rate": success_count / len(relevant_metrics) if relevant_metrics else 0,
-            "avg_duration_ms": sum(durations) / len(durations) if durations else 0,
-            "min_duration_ms": min(durations) if durations else 0,
-            "max_duration_ms": max(durations) if durations else 0,
-            "p95_duration_ms": self._percentile(durations, 95) if durations else 0,
-            "p99_duration_ms": self._percentile(durations, 99) if durations else 0
+            "total_calls": sketch.count,
+            "success_count": stats.success_count,
+            "error_count": stats.error_count,
+            "success_rate": stats.success_count / sketch.count,
+            "avg_duration_ms": sketch.mean,
+            "min_duration_ms": sketch.min,
+            "max_duration_ms": sketch.max,
+            "p50_duration_ms": sketch.quantile(0.50),
+            "p95_duration_ms": sketch.quantile(0.95),
+            "p99_duration_ms": sketch.quantile(0.99)
         }
     
-    def _percentile(self, values: List[float], percentile: int) -> float:
-        """Calculate percentile of values."""
-        if not values:
-            return 0
-        
-        sorted_values = sorted(values)
-        index = (percentile / 100) * (len(sorted_values) - 1)
-        
-        if index.is_integer():
-            return sorted_values[int(index)]
-        else:
-            lower = sorted_values[int(index)]
-            upper = sorted_values[int(index) + 1]
-            return lower + (upper - lower) * (index - int(index))
+    def snapshot(self) -> Dict[str, Any]:
+        """Serializable per-operation aggregates, for merging across worker processes."""
+        return {
+            name: {
+                "duration_sketch": stats.duration_sketch.to_dict(),
+                "success_count": stats.success_count,
+                "error_count": stats.error_count
+            }
+            for name, stats in self.operations.items()
+        }
+    
+    def merge_snapshot(self, snapshot: Dict[str, Any]) -> None:
+        """Merge aggregates produced by ``snapshot`` in another process."""
+        for name, data in snapshot.items():
+            incoming = OperationStats(
+                duration_sketch=DDSketch.from_dict(data["duration_sketch"]),
+                success_count=data["success_count"],
+                error_count=data["error_count"]
+            )
+            self.operations.setdefault(name, OperationStats()).merge(incoming)
+            self.success_counts[name] = self.success_counts.get(name, 0) + incoming.success_count
+            self.error_counts[name] = self.error_counts.get(name, 0) + incoming.error_count
     
     def export_metrics(self, output_path: Path) -> None:
         """Export metrics to JSON file."""
@@ -104,6 +146,7 @@ class PerformanceMonitor:
         export_data = {
             "timestamp": datetime.now(timezone.utc).isoformat(),
             "summary": self.get_stats(),
+            "operations": self.snapshot(),
             "metrics": [
                 {
                     "operation_name": m.operation_name,
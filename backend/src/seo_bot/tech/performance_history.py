@@ -0,0 +1,242 @@
+"""Historical store for PageSpeed Insights results used by performance budgets."""
+
+import logging
+import sqlite3
+import statistics
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple, Union
+
+if TYPE_CHECKING:
+    from .budgets import PerformanceTestResult
+
+
+logger = logging.getLogger(__name__)
+
+
+# Numeric PerformanceTestResult fields persisted per URL/device/day
+METRIC_COLUMNS = (
+    "lcp_ms",
+    "inp_ms",
+    "cls",
+    "fcp_ms",
+    "ttfb_ms",
+    "tbt_ms",
+    "speed_index_ms",
+    "total_size_kb",
+    "js_size_kb",
+    "css_size_kb",
+    "image_size_kb",
+    "request_count",
+    "performance_score",
+    "accessibility_score",
+    "best_practices_score",
+    "seo_score",
+    "field_lcp_ms",
+    "field_inp_ms",
+    "field_cls",
+)
+
+# Metrics where a higher value is better (regression means a drop)
+HIGHER_IS_BETTER = {"performance_score", "accessibility_score", "best_practices_score", "seo_score"}
+
+_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS psi_results (
+    url TEXT NOT NULL,
+    device_type TEXT NOT NULL,
+    day TEXT NOT NULL,
+    measured_at REAL NOT NULL,
+    test_id TEXT,
+    has_crux_data INTEGER NOT NULL DEFAULT 0,
+    {", ".join(f"{column} REAL" for column in METRIC_COLUMNS)},
+    PRIMARY KEY (url, device_type, day)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_psi_results_day ON psi_results (day);
+"""
+
+
+class PerformanceHistoryStore:
+    """SQLite-backed time series of parsed PageSpeed results.
+
+    One row is kept per URL, device type and UTC day; a newer test on the
+    same day replaces the earlier one. Results younger than the freshness
+    TTL are served instead of calling the PageSpeed API again.
+    """
+
+    def __init__(self, db_path: Union[str, Path] = ":memory:", freshness_ttl: timedelta = timedelta(hours=24)):
+        """Open (or create) the history database."""
+        self.db_path = str(db_path)
+        self.freshness_ttl = freshness_ttl
+
+        if self.db_path != ":memory:":
+            Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+
+        self.conn = sqlite3.connect(self.db_path)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self.conn.close()
+
+    def record(self, result: "PerformanceTestResult") -> None:
+        """Persist a parsed test result."""
+        self.record_many([result])
+
+    def record_many(self, results: List["PerformanceTestResult"]) -> None:
+        """Persist several parsed test results in one transaction."""
+        columns = ("url", "device_type", "day", "measured_at", "test_id", "has_crux_data") + METRIC_COLUMNS
+        placeholders = ", ".join("?" for _ in columns)
+        rows = []
+
+        for result in results:
+            timestamp = result.timestamp
+            if timestamp.tzinfo is None:
+                timestamp = timestamp.replace(tzinfo=timezone.utc)
+
+            rows.append((
+                result.url,
+                result.device_type,
+                timestamp.astimezone(timezone.utc).date().isoformat(),
+                timestamp.timestamp(),
+                result.test_id,
+                int(result.has_crux_data),
+                *(getattr(result, column, None) for column in METRIC_COLUMNS)
+            ))
+
+        with self.conn:
+            self.conn.executemany(
+                f"INSERT OR REPLACE INTO psi_results ({', '.join(columns)}) VALUES ({placeholders})",
+                rows
+            )
+
+    def _row_to_result(self, row: sqlite3.Row) -> "PerformanceTestResult":
+        """Rebuild a PerformanceTestResult from a stored row."""
+        from .budgets import PerformanceTestResult
+
+        integer_columns = {column for column in METRIC_COLUMNS if column not in ("cls", "field_cls")}
+        metrics = {
+            column: (int(row[column]) if column in integer_columns else row[column])
+            if row[column] is not None else None
+            for column in METRIC_COLUMNS
+        }
+
+        return PerformanceTestResult(
+            url=row["url"],
+            device_type=row["device_type"],
+            timestamp=datetime.fromtimestamp(row["measured_at"], tz=timezone.utc),
+            test_id=row["test_id"] or "",
+            has_crux_data=bool(row["has_crux_data"]),
+            from_history=True,
+            **metrics
+        )
+
+    def get_fresh(
+        self,
+        url: str,
+        device_type: str,
+        max_age: Optional[timedelta] = None
+    ) -> Optional["PerformanceTestResult"]:
+        """Return the latest result if it is within the freshness TTL."""
+        max_age = max_age if max_age is not None else self.freshness_ttl
+        cutoff = (datetime.now(timezone.utc) - max_age).timestamp()
+
+        row = self.conn.execute(
+            "SELECT * FROM psi_results WHERE url = ? AND device_type = ? AND measured_at >= ? "
+            "ORDER BY measured_at DESC LIMIT 1",
+            (url, device_type, cutoff)
+        ).fetchone()
+
+        return self._row_to_result(row) if row else None
+
+    def get_history(
+        self,
+        url: str,
+        device_type: str,
+        days: int = 90
+    ) -> List["PerformanceTestResult"]:
+        """Return daily results for a URL/device, oldest first."""
+        since = (datetime.now(timezone.utc) - timedelta(days=days)).date().isoformat()
+
+        rows = self.conn.execute(
+            "SELECT * FROM psi_results WHERE url = ? AND device_type = ? AND day >= ? ORDER BY day",
+            (url, device_type, since)
+        ).fetchall()
+
+        return [self._row_to_result(row) for row in rows]
+
+    def get_trend(
+        self,
+        url: str,
+        device_type: str,
+        metric: str,
+        days: int = 90
+    ) -> List[Tuple[str, float]]:
+        """Return (day, value) pairs for a single metric."""
+        if metric not in METRIC_COLUMNS:
+            raise ValueError(f"Unknown performance metric: {metric}")
+
+        since = (datetime.now(timezone.utc) - timedelta(days=days)).date().isoformat()
+
+        rows = self.conn.execute(
+            f"SELECT day, {metric} FROM psi_results "
+            f"WHERE url = ? AND device_type = ? AND day >= ? AND {metric} IS NOT NULL ORDER BY day",
+            (url, device_type, since)
+        ).fetchall()
+
+        return [(row[0], row[1]) for row in rows]
+
+    def detect_regressions(
+        self,
+        url: str,
+        device_type: str,
+        metrics: Optional[List[str]] = None,
+        baseline_days: int = 28,
+        threshold: float = 0.1
+    ) -> List[Dict[str, Any]]:
+        """Compare the latest run against the median of earlier runs.
+
+        A metric regresses when it is worse than its baseline median by more
+        than ``threshold`` (relative change).
+        """
+        metrics = metrics or ["lcp_ms", "inp_ms", "cls", "js_size_kb", "performance_score"]
+        history = self.get_history(url, device_type, days=baseline_days + 1)
+        if len(history) < 2:
+            return []
+
+        latest, baseline_runs = history[-1], history[:-1]
+        regressions = []
+
+        for metric in metrics:
+            current = getattr(latest, metric, None)
+            baseline_values = [getattr(run, metric) for run in baseline_runs if getattr(run, metric, None) is not None]
+            if current is None or not baseline_values:
+                continue
+
+            baseline = statistics.median(baseline_values)
+            if baseline == 0:
+                continue
+
+            change = (current - baseline) / abs(baseline)
+            worse = -change if metric in HIGHER_IS_BETTER else change
+
+            if worse > threshold:
+                regressions.append({
+                    "url": url,
+                    "device_type": device_type,
+                    "metric": metric,
+                    "current_value": current,
+                    "baseline_value": baseline,
+                    "relative_change": change,
+                    "baseline_runs": len(baseline_values),
+                    "measured_at": latest.timestamp.isoformat()
+                })
+
+        return regressions
+
+    def prune(self, retention_days: int = 400) -> int:
+        """Delete rows older than the retention period."""
+        cutoff = (datetime.now(timezone.utc) - timedelta(days=retention_days)).date().isoformat()
+        with self.conn:
+            cursor = self.conn.execute("DELETE FROM psi_results WHERE day < ?", (cutoff,))
+        return cursor.rowcount
@@ -0,0 +1,254 @@
+"""Concurrent, quota-aware scheduling of PageSpeed Insights requests."""
+
+import asyncio
+import logging
+import random
+import time
+from dataclasses import dataclass, replace
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterable, Optional, Tuple
+
+
+logger = logging.getLogger(__name__)
+
+
+# HTTP statuses worth retrying: rate limiting and transient server errors
+RETRYABLE_STATUSES = {429, 500, 502, 503, 504}
+
+
+class PSIRequestError(RuntimeError):
+    """PageSpeed Insights request failure with retry information."""
+
+    def __init__(self, message: str, status: Optional[int] = None, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.status = status
+        self.retry_after = retry_after
+
+    @property
+    def retryable(self) -> bool:
+        """Check if the failure is transient."""
+        return self.status is None or self.status in RETRYABLE_STATUSES
+
+
+class QuotaExceededError(RuntimeError):
+    """Raised when the daily PageSpeed Insights quota is used up."""
+
+
+@dataclass
+class PSISchedulerConfig:
+    """Limits for PageSpeed Insights request scheduling."""
+
+    max_qps: float = 4.0  # PSI allows 240 queries per minute per project
+    max_concurrency: int = 8
+    daily_quota: int = 25000
+    max_retries: int = 3
+    base_backoff_seconds: float = 1.0
+    max_backoff_seconds: float = 30.0
+    dedupe_window_seconds: float = 300.0
+
+
+@dataclass(frozen=True)
+class PSIRequest:
+    """A single URL/device PageSpeed test to schedule."""
+
+    url: str
+    device_type: str = "mobile"
+    strategy: str = "mobile"
+    context: Any = None  # Caller data returned alongside the result
+
+    @property
+    def dedupe_key(self) -> Tuple[str, str]:
+        """Identical URL and strategy share one API call."""
+        return (self.url, self.strategy)
+
+
+class _TokenBucket:
+    """Token bucket limiting request starts to a sustained rate."""
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self._tokens = self.capacity
+        self._last_refill = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        """Wait until a token is available and consume it."""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._last_refill) * self.rate)
+                self._last_refill = now
+
+                if self._tokens >= 1.0:
+                    self._tokens -= 1.0
+                    return
+
+                await asyncio.sleep((1.0 - self._tokens) / self.rate)
+
+
+class PSIRequestScheduler:
+    """Runs PageSpeed Insights requests concurrently within QPS and daily quota limits.
+
+    Identical URL/strategy requests are coalesced while in flight and served
+    from recent results within the dedupe window. Transient failures are
+    retried with exponential backoff and full jitter.
+    """
+
+    def __init__(
+        self,
+        fetch: Callable[[str, str, str], Awaitable[Any]],
+        config: Optional[PSISchedulerConfig] = None
+    ):
+        """Initialize the scheduler around a single-request fetch coroutine."""
+        self.fetch = fetch
+        self.config = config or PSISchedulerConfig()
+
+        self._bucket = _TokenBucket(self.config.max_qps)
+        self._semaphore = asyncio.Semaphore(self.config.max_concurrency)
+        self._inflight: Dict[Tuple[str, str], asyncio.Future] = {}
+        self._recent: Dict[Tuple[str, str], Tuple[float, Any]] = {}
+
+        self._quota_date = datetime.now(timezone.utc).date()
+        self.quota_used = 0
+
+        self.stats = {"api_calls": 0, "retries": 0, "deduplicated": 0, "failures": 0}
+
+    @property
+    def quota_remaining(self) -> int:
+        """API calls left in today's quota."""
+        self._roll_quota_day()
+        return max(0, self.config.daily_quota - self.quota_used)
+
+    def _roll_quota_day(self) -> None:
+        """Reset quota usage at UTC midnight."""
+        today = datetime.now(timezone.utc).date()
+        if today != self._quota_date:
+            self._quota_date = today
+            self.quota_used = 0
+
+    def _consume_quota(self) -> None:
+        """Reserve one API call from the daily quota."""
+        self._roll_quota_day()
+        if self.quota_used >= self.config.daily_quota:
+            raise QuotaExceededError(
+                f"PageSpeed Insights daily quota of {self.config.daily_quota} requests exhausted"
+            )
+        self.quota_used += 1
+
+    def _backoff_delay(self, attempt: int, error: Exception) -> float:
+        """Full-jitter exponential backoff, honouring Retry-After when given."""
+        retry_after = getattr(error, "retry_after", None)
+        if retry_after:
+            return min(self.config.max_backoff_seconds, retry_after)
+
+        ceiling = min(self.config.max_backoff_seconds, self.config.base_backoff_seconds * (2 ** attempt))
+        return random.uniform(0, ceiling)
+
+    @staticmethod
+    def _is_retryable(error: Exception) -> bool:
+        """Check if a failed attempt should be retried."""
+        if isinstance(error, PSIRequestError):
+            return error.retryable
+        return isinstance(error, (asyncio.TimeoutError, ConnectionError, OSError))
+
+    async def _fetch_with_retries(self, request: PSIRequest) -> Any:
+        """Run one request under the concurrency, rate and quota limits."""
+        attempt = 0
+        while True:
+            async with self._semaphore:
+                await self._bucket.acquire()
+                self._consume_quota()
+                self.stats["api_calls"] += 1
+
+                try:
+                    return await self.fetch(request.url, request.device_type, request.strategy)
+                except Exception as e:
+                    error = e
+
+            if attempt >= self.config.max_retries or not self._is_retryable(error):
+                self.stats["failures"] += 1
+                raise error
+
+            delay = self._backoff_delay(attempt, error)
+            attempt += 1
+            self.stats["retries"] += 1
+            logger.warning(
+                f"PageSpeed request for {request.url} ({request.strategy}) failed: {error}; "
+                f"retry {attempt}/{self.config.max_retries} in {delay:.2f}s"
+            )
+            await asyncio.sleep(delay)
+
+    def _relabel(self, result: Any, request: PSIRequest) -> Any:
+        """Attach the requesting device type to a shared result."""
+        if getattr(result, "device_type", request.device_type) != request.device_type:
+            return replace(result, device_type=request.device_type)
+        return result
+
+    async def submit(self, request: PSIRequest) -> Any:
+        """Schedule a request, reusing in-flight or recent identical requests."""
+        key = request.dedupe_key
+
+        recent = self._recent.get(key)
+        if recent and time.monotonic() - recent[0] <= self.config.dedupe_window_seconds:
+            self.stats["deduplicated"] += 1
+            return self._relabel(recent[1], request)
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            self.stats["deduplicated"] += 1
+            return self._relabel(await asyncio.shield(inflight), request)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            result = await self._fetch_with_retries(request)
+        except Exception as e:
+            future.set_exception(e)
+            # Mark retrieved so unawaited failures are not reported as lost
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            self._remember(key, result)
+            return result
+        finally:
+            self._inflight.pop(key, None)
+
+    def _remember(self, key: Tuple[str, str], result: Any) -> None:
+        """Store a result, expiring entries older than the dedupe window.
+
+        ``_recent`` is kept in insertion (and so completion-time) order, so
+        expired entries are always at its front.
+        """
+        now = time.monotonic()
+        self._recent.pop(key, None)
+        self._recent[key] = (now, result)
+        window = self.config.dedupe_window_seconds
+        while self._recent:
+            oldest = next(iter(self._recent))
+            if now - self._recent[oldest][0] <= window:
+                break
+            del self._recent[oldest]
+
+    async def stream(self, requests: Iterable[PSIRequest]) -> AsyncIterator[Tuple[PSIRequest, Any, Optional[Exception]]]:
+        """Run requests concurrently, yielding (request, result, error) as each completes."""
+
+        async def run(request: PSIRequest) -> Tuple[PSIRequest, Any, Optional[Exception]]:
+            try:
+                return request, await self.submit(request), None
+            except Exception as e:
+                return request, None, e
+
+        tasks = [asyncio.ensure_future(run(request)) for request in requests]
+        try:
+            for completed in asyncio.as_completed(tasks):
+                yield await completed
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+    def clear_recent(self) -> None:
+        """Forget completed results so the next request hits the API."""
+        self._recent.clear()
@@ -0,0 +1,141 @@
+"""Mergeable streaming quantile sketch for bounded-memory latency statistics."""
+
+import math
+from typing import Any, Dict, Optional
+
+
+class DDSketch:
+    """Relative-error quantile sketch (DDSketch) with logarithmic buckets.
+
+    Each positive value falls in bucket ``ceil(log_gamma(value))``, so any
+    quantile is returned within ``relative_accuracy`` of the true value.
+    Recording is O(1), memory is capped at ``max_buckets`` (the lowest
+    buckets are collapsed first, preserving upper-tail accuracy) and two
+    sketches with the same accuracy merge by adding bucket counts.
+    """
+
+    def __init__(self, relative_accuracy: float = 0.01, max_buckets: int = 2048):
+        """Initialize an empty sketch."""
+        if not 0 < relative_accuracy < 1:
+            raise ValueError("relative_accuracy must be between 0 and 1")
+
+        self.relative_accuracy = relative_accuracy
+        self.max_buckets = max_buckets
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+
+        self.bins: Dict[int, int] = {}
+        self.zero_count = 0
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def _key(self, value: float) -> int:
+        """Bucket index for a positive value."""
+        return math.ceil(math.log(value) / self._log_gamma)
+
+    def _value(self, key: int) -> float:
+        """Representative value of a bucket (minimizes relative error)."""
+        return 2 * self.gamma ** key / (self.gamma + 1)
+
+    def add(self, value: float, weight: int = 1) -> None:
+        """Record a non-negative value."""
+        if value < 0:
+            raise ValueError("DDSketch only records non-negative values")
+
+        if value == 0:
+            self.zero_count += weight
+        else:
+            key = self._key(value)
+            self.bins[key] = self.bins.get(key, 0) + weight
+            if len(self.bins) > self.max_buckets:
+                self._collapse()
+
+        self.count += weight
+        self.sum += value * weight
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    def _collapse(self) -> None:
+        """Fold the lowest buckets together until within the bucket limit."""
+        keys = sorted(self.bins)
+        excess = len(keys) - self.max_buckets
+        target = keys[excess]
+        for key in keys[:excess]:
+            self.bins[target] += self.bins.pop(key)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Approximate value at quantile ``q`` (0-1), or None when empty."""
+        if not 0 <= q <= 1:
+            raise ValueError("quantile must be between 0 and 1")
+        if self.count == 0:
+            return None
+        # Extremes are tracked exactly
+        if q == 0:
+            return self.min
+        if q == 1:
+            return self.max
+
+        rank = q * (self.count - 1)
+        if rank < self.zero_count:
+            return 0.0
+
+        cumulative = self.zero_count
+        for key in sorted(self.bins):
+            cumulative += self.bins[key]
+            if cumulative > rank:
+                return min(self.max, max(self.min, self._value(key)))
+        return self.max
+
+    @property
+    def mean(self) -> float:
+        """Exact mean of recorded values."""
+        return self.sum / self.count if self.count else 0.0
+
+    def merge(self, other: "DDSketch") -> None:
+        """Add another sketch's counts into this one."""
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("Cannot merge sketches with different relative accuracy")
+
+        for key, count in other.bins.items():
+            self.bins[key] = self.bins.get(key, 0) + count
+        if len(self.bins) > self.max_buckets:
+            self._collapse()
+
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self.sum += other.sum
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def copy(self) -> "DDSketch":
+        """Independent copy of the sketch."""
+        sketch = DDSketch(self.relative_accuracy, self.max_buckets)
+        sketch.merge(self)
+        return sketch
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-serializable state, for shipping between processes."""
+        return {
+            "relative_accuracy": self.relative_accuracy,
+            "max_buckets": self.max_buckets,
+            "bins": {str(key): count for key, count in self.bins.items()},
+            "zero_count": self.zero_count,
+            "count": self.count,
+            "sum": self.sum,
+            "min": self.min if self.count else None,
+            "max": self.max if self.count else None
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "DDSketch":
+        """Rebuild a sketch from ``to_dict`` output."""
+        sketch = cls(data["relative_accuracy"], data.get("max_buckets", 2048))
+        sketch.bins = {int(key): count for key, count in data["bins"].items()}
+        sketch.zero_count = data["zero_count"]
+        sketch.count = data["count"]
+        sketch.sum = data["sum"]
+        sketch.min = data["min"] if data["min"] is not None else math.inf
+        sketch.max = data["max"] if data["max"] is not None else -math.inf
+        return sketch
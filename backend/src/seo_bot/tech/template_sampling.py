@@ -0,0 +1,336 @@
+"""Template clustering and statistical sampling for performance budget audits."""
+
+import hashlib
+import logging
+import math
+import random
+import re
+from collections import defaultdict
+from dataclasses import dataclass, field
+from statistics import NormalDist
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+from urllib.parse import urlparse
+
+from bs4 import BeautifulSoup
+
+
+logger = logging.getLogger(__name__)
+
+
+_NUMERIC_RE = re.compile(r"^\d+$")
+_DATE_RE = re.compile(r"^(19|20)\d{2}(-\d{2}){0,2}$")
+_ID_RE = re.compile(r"^(?=.*\d)[0-9a-f-]{8,}$", re.IGNORECASE)
+_FILE_SLUG_RE = re.compile(r"^[\w-]+\.(html?|php|aspx?)$", re.IGNORECASE)
+
+
+@dataclass
+class URLTemplate:
+    """A group of URLs sharing a path pattern and page structure."""
+
+    template_id: str
+    path_pattern: str
+    dom_fingerprint: Optional[int]
+    urls: List[str] = field(default_factory=list)
+
+    @property
+    def population(self) -> int:
+        """Number of site URLs in this template."""
+        return len(self.urls)
+
+
+@dataclass
+class PassRateEstimate:
+    """Budget pass rate extrapolated from a sample, with a confidence interval."""
+
+    template_id: str
+    path_pattern: str
+    population: int
+    sampled: int
+    passed: int
+    pass_rate: float
+    ci_low: float
+    ci_high: float
+    confidence: float
+
+    @property
+    def estimated_passing_pages(self) -> int:
+        """Extrapolated number of passing pages in the template."""
+        return round(self.pass_rate * self.population)
+
+
+class TemplateSampler:
+    """Clusters site URLs into templates and sizes a sample per template.
+
+    URLs are grouped by a normalized path pattern (numeric ids, dates,
+    hashes and high-cardinality slugs collapse to placeholders) and, when
+    page HTML fingerprints are supplied, split further by structural
+    SimHash similarity. Sample sizes follow Cochran's formula with a
+    finite population correction.
+    """
+
+    def __init__(
+        self,
+        confidence: float = 0.90,
+        margin_of_error: float = 0.15,
+        min_per_template: int = 1,
+        max_per_template: Optional[int] = None,
+        literal_segment_limit: int = 20,
+        fingerprint_distance: int = 6,
+        seed: Optional[int] = None
+    ):
+        """Initialize the sampler."""
+        if not 0 < confidence < 1:
+            raise ValueError("confidence must be between 0 and 1")
+        if not 0 < margin_of_error < 1:
+            raise ValueError("margin_of_error must be between 0 and 1")
+
+        self.confidence = confidence
+        self.margin_of_error = margin_of_error
+        self.min_per_template = min_per_template
+        self.max_per_template = max_per_template
+        self.literal_segment_limit = literal_segment_limit
+        self.fingerprint_distance = fingerprint_distance
+        self.random = random.Random(seed)
+
+        self.z_score = NormalDist().inv_cdf(0.5 + confidence / 2)
+
+    def _normalize_segment(self, segment: str, is_last: bool) -> str:
+        """Replace obviously variable path segments with placeholders."""
+        segment = segment.lower()
+
+        if _NUMERIC_RE.match(segment):
+            return "{num}"
+        if _DATE_RE.match(segment):
+            return "{date}"
+        if _ID_RE.match(segment):
+            return "{id}"
+        if is_last and (_FILE_SLUG_RE.match(segment) or segment.count("-") >= 2):
+            return "{slug}"
+        return segment
+
+    def _split_path(self, url: str) -> Tuple[str, ...]:
+        """Normalized path segments of a URL."""
+        segments = [s for s in urlparse(url).path.split("/") if s]
+        return tuple(
+            self._normalize_segment(segment, i == len(segments) - 1)
+            for i, segment in enumerate(segments)
+        )
+
+    def build_path_patterns(self, urls: Iterable[str]) -> Dict[str, str]:
+        """Map each URL to its path pattern."""
+        url_segments = {url: list(self._split_path(url)) for url in urls}
+        max_depth = max((len(s) for s in url_segments.values()), default=0)
+
+        # Collapse positions whose literal values vary too much under the same prefix
+        for depth in range(max_depth):
+            values_by_prefix: Dict[Tuple[int, Tuple[str, ...]], set] = defaultdict(set)
+            for segments in url_segments.values():
+                if len(segments) > depth:
+                    values_by_prefix[(len(segments), tuple(segments[:depth]))].add(segments[depth])
+
+            for segments in url_segments.values():
+                if len(segments) <= depth:
+                    continue
+                values = values_by_prefix[(len(segments), tuple(segments[:depth]))]
+                if len(values) > self.literal_segment_limit:
+                    segments[depth] = "{slug}"
+
+        return {url: "/" + "/".join(segments) for url, segments in url_segments.items()}
+
+    @staticmethod
+    def compute_dom_fingerprint(html_content: str, max_depth: int = 6) -> int:
+        """64-bit SimHash over the page's structural tag/class shingles."""
+        soup = BeautifulSoup(html_content, "html.parser")
+        root = soup.body or soup
+        features: Dict[str, int] = defaultdict(int)
+
+        stack = [(root, 0, "")]
+        while stack:
+            element, depth, parent_path = stack.pop()
+            if depth > max_depth:
+                continue
+
+            for child in getattr(element, "children", []):
+                if not getattr(child, "name", None):
+                    continue
+                classes = ".".join(sorted(child.get("class", [])[:2]))
+                path = f"{parent_path}>{child.name}{'.' + classes if classes else ''}"
+                features[path] += 1
+                stack.append((child, depth + 1, path))
+
+        vector = [0] * 64
+        for feature, count in features.items():
+            # Log weighting so repeated list items do not dominate the fingerprint
+            weight = 1 + math.log(count)
+            digest = int.from_bytes(hashlib.md5(feature.encode("utf-8")).digest()[:8], "big")
+            for bit in range(64):
+                vector[bit] += weight if digest >> bit & 1 else -weight
+
+        return sum(1 << bit for bit in range(64) if vector[bit] > 0)
+
+    @staticmethod
+    def _hamming(a: int, b: int) -> int:
+        """Bit distance between two fingerprints."""
+        return bin(a ^ b).count("1")
+
+    def cluster_urls(
+        self,
+        urls: Iterable[str],
+        dom_fingerprints: Optional[Mapping[str, int]] = None
+    ) -> List[URLTemplate]:
+        """Group URLs into templates by path pattern and DOM fingerprint."""
+        urls = list(dict.fromkeys(urls))
+        dom_fingerprints = dom_fingerprints or {}
+        patterns = self.build_path_patterns(urls)
+
+        by_pattern: Dict[str, List[str]] = defaultdict(list)
+        for url in urls:
+            by_pattern[patterns[url]].append(url)
+
+        templates = []
+        for pattern, pattern_urls in sorted(by_pattern.items()):
+            # Greedy split on structural similarity; unfingerprinted URLs share one group
+            groups: List[Tuple[Optional[int], List[str]]] = []
+            for url in pattern_urls:
+                fingerprint = dom_fingerprints.get(url)
+                for group_fingerprint, group_urls in groups:
+                    if fingerprint is None and group_fingerprint is None:
+                        group_urls.append(url)
+                        break
+                    if (
+                        fingerprint is not None and group_fingerprint is not None and
+                        self._hamming(fingerprint, group_fingerprint) <= self.fingerprint_distance
+                    ):
+                        group_urls.append(url)
+                        break
+                else:
+                    groups.append((fingerprint, [url]))
+
+            for index, (fingerprint, group_urls) in enumerate(groups):
+                template_id = pattern if len(groups) == 1 else f"{pattern}#{index + 1}"
+                templates.append(URLTemplate(
+                    template_id=template_id,
+                    path_pattern=pattern,
+                    dom_fingerprint=fingerprint,
+                    urls=group_urls
+                ))
+
+        logger.info(f"Clustered {len(urls)} URLs into {len(templates)} templates")
+        return templates
+
+    def sample_size(self, population: int) -> int:
+        """Cochran sample size for a proportion, with finite population correction."""
+        if population <= 0:
+            return 0
+
+        n0 = (self.z_score ** 2) * 0.25 / (self.margin_of_error ** 2)
+        n = n0 / (1 + (n0 - 1) / population)
+        size = max(self.min_per_template, math.ceil(n))
+
+        if self.max_per_template is not None:
+            size = min(size, self.max_per_template)
+
+        return min(size, population)
+
+    def select_samples(
+        self,
+        templates: List[URLTemplate],
+        max_total_samples: Optional[int] = None
+    ) -> Dict[str, List[str]]:
+        """Pick a random sample of URLs per template.
+
+        When ``max_total_samples`` is set, per-template sizes are scaled down
+        proportionally, keeping at least ``min_per_template`` per template.
+        """
+        sizes = {t.template_id: self.sample_size(t.population) for t in templates}
+        total = sum(sizes.values())
+
+        if max_total_samples is not None and total > max_total_samples:
+            scale = max_total_samples / total
+            sizes = {
+                template_id: max(min(self.min_per_template, size), math.floor(size * scale))
+                for template_id, size in sizes.items()
+            }
+
+        samples = {}
+        for template in templates:
+            samples[template.template_id] = self.random.sample(template.urls, sizes[template.template_id])
+
+        logger.info(f"Selected {sum(len(s) for s in samples.values())} sample URLs from {len(templates)} templates")
+        return samples
+
+    def _fpc(self, population: int, sampled: int) -> float:
+        """Finite population correction factor for the variance."""
+        if population <= 1:
+            return 0.0
+        return max(0.0, (population - sampled) / (population - 1))
+
+    def estimate_pass_rate(
+        self,
+        template: URLTemplate,
+        sample_results: Mapping[str, bool]
+    ) -> PassRateEstimate:
+        """Wilson interval for a template's pass rate, narrowed by the finite population correction."""
+        template_urls = set(template.urls)
+        outcomes = [passed for url, passed in sample_results.items() if url in template_urls]
+        n = len(outcomes)
+        passed = sum(1 for outcome in outcomes if outcome)
+
+        if n == 0:
+            return PassRateEstimate(
+                template_id=template.template_id,
+                path_pattern=template.path_pattern,
+                population=template.population,
+                sampled=0,
+                passed=0,
+                pass_rate=0.0,
+                ci_low=0.0,
+                ci_high=1.0,
+                confidence=self.confidence
+            )
+
+        p = passed / n
+        z = self.z_score * math.sqrt(self._fpc(template.population, n))
+        denominator = 1 + z ** 2 / n
+        centre = (p + z ** 2 / (2 * n)) / denominator
+        half_width = z * math.sqrt(p * (1 - p) / n + z ** 2 / (4 * n ** 2)) / denominator
+
+        return PassRateEstimate(
+            template_id=template.template_id,
+            path_pattern=template.path_pattern,
+            population=template.population,
+            sampled=n,
+            passed=passed,
+            pass_rate=p,
+            ci_low=max(0.0, centre - half_width),
+            ci_high=min(1.0, centre + half_width),
+            confidence=self.confidence
+        )
+
+    def estimate_site_pass_rate(self, estimates: List[PassRateEstimate]) -> Dict[str, float]:
+        """Population-weighted (stratified) site pass rate with a normal-approximation interval."""
+        sampled = [e for e in estimates if e.sampled > 0]
+        population = sum(e.population for e in sampled)
+        if population == 0:
+            return {"pass_rate": 0.0, "ci_low": 0.0, "ci_high": 1.0, "population": 0, "sampled": 0}
+
+        pass_rate = 0.0
+        variance = 0.0
+        for estimate in sampled:
+            weight = estimate.population / population
+            pass_rate += weight * estimate.pass_rate
+            # Adjusted proportion keeps all-pass/all-fail strata from reporting zero variance
+            adjusted = (estimate.passed + 1) / (estimate.sampled + 2)
+            variance += (
+                weight ** 2 * adjusted * (1 - adjusted) / estimate.sampled *
+                self._fpc(estimate.population, estimate.sampled)
+            )
+
+        half_width = self.z_score * math.sqrt(variance)
+        return {
+            "pass_rate": pass_rate,
+            "ci_low": max(0.0, pass_rate - half_width),
+            "ci_high": min(1.0, pass_rate + half_width),
+            "population": population,
+            "sampled": sum(e.sampled for e in sampled)
+        }
@@ -1,7 +1,6 @@
 """Metrics aggregation and calculation utilities."""
 
 import logging
-import statistics
 from datetime import datetime, timedelta, timezone
 from typing import Dict, List, Optional, Tuple, Union
 from dataclasses import dataclass
@@ -36,127 +35,348 @@ class MetricPoint:
             self.dimensions = {}
 
 
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+# Quantile for each order-statistic aggregation method
+_METHOD_QUANTILES = {
+    AggregationMethod.MEDIAN: 0.5,
+    AggregationMethod.P95: 0.95,
+    AggregationMethod.P99: 0.99,
+}
+
+
+def _grouped_quantiles(sorted_values: np.ndarray, starts: np.ndarray, counts: np.ndarray, q: float) -> np.ndarray:
+    """Linear-interpolated quantile per contiguous group of value-sorted rows."""
+    position = starts + q * (counts - 1)
+    lower = np.floor(position).astype(np.int64)
+    upper = np.minimum(lower + 1, starts + counts - 1)
+    fraction = position - lower
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * fraction
+
+
+class ColumnarMetricStore:
+    """Append-only columnar storage for metric points.
+    
+    Timestamps are int64 microseconds since the epoch (UTC), values are
+    float64 and each dimension is dictionary-encoded into an int32 code
+    column (-1 when the point has no value for that dimension). Columns
+    grow by doubling, so appends are amortized O(1); rows are sorted by
+    time lazily, only when a time-ordered query needs it.
+    """
+    
+    MISSING_CODE = -1
+    
+    def __init__(self, initial_capacity: int = 1024):
+        """Initialize empty columns."""
+        self._capacity = max(1, initial_capacity)
+        self._size = 0
+        self._timestamps = np.empty(self._capacity, dtype=np.int64)
+        self._values = np.empty(self._capacity, dtype=np.float64)
+        self._dimension_codes: Dict[str, np.ndarray] = {}
+        self._dimension_values: Dict[str, List[str]] = {}
+        self._dimension_lookup: Dict[str, Dict[str, int]] = {}
+        self._is_sorted = True
+        self._naive_timestamps: Optional[bool] = None
+    
+    def __len__(self) -> int:
+        return self._size
+    
+    @property
+    def timestamps(self) -> np.ndarray:
+        """Timestamp column (microseconds since epoch, UTC)."""
+        return self._timestamps[:self._size]
+    
+    @property
+    def values(self) -> np.ndarray:
+        """Value column."""
+        return self._values[:self._size]
+    
+    def dimension_keys(self) -> List[str]:
+        """Dimension names seen so far."""
+        return list(self._dimension_codes)
+    
+    def dimension_codes(self, key: str) -> np.ndarray:
+        """Code column for a dimension (all missing if never seen)."""
+        if key not in self._dimension_codes:
+            return np.full(self._size, self.MISSING_CODE, dtype=np.int32)
+        return self._dimension_codes[key][:self._size]
+    
+    def dimension_values(self, key: str) -> List[str]:
+        """Dictionary for a dimension: code -> value."""
+        return self._dimension_values.get(key, [])
+    
+    def to_micros(self, timestamp: datetime) -> int:
+        """Convert a datetime to epoch microseconds, treating naive times as UTC."""
+        if self._naive_timestamps is None:
+            self._naive_timestamps = timestamp.tzinfo is None
+        if timestamp.tzinfo is None:
+            timestamp = timestamp.replace(tzinfo=timezone.utc)
+        delta = timestamp - _EPOCH
+        return (delta.days * 86400 + delta.seconds) * 1_000_000 + delta.microseconds
+    
+    def from_micros(self, micros: int) -> datetime:
+        """Convert epoch microseconds back to a datetime of the stored kind."""
+        timestamp = _EPOCH + timedelta(microseconds=int(micros))
+        return timestamp.replace(tzinfo=None) if self._naive_timestamps else timestamp
+    
+    def _reserve(self, additional: int) -> None:
+        """Grow all columns geometrically to fit ``additional`` more rows."""
+        required = self._size + additional
+        if required <= self._capacity:
+            return
+        
+        capacity = self._capacity
+        while capacity < required:
+            capacity *= 2
+        
+        self._timestamps = self._grow(self._timestamps, capacity)
+        self._values = self._grow(self._values, capacity)
+        for key, codes in self._dimension_codes.items():
+            self._dimension_codes[key] = self._grow(codes, capacity, fill=self.MISSING_CODE)
+        self._capacity = capacity
+    
+    def _grow(self, column: np.ndarray, capacity: int, fill=None) -> np.ndarray:
+        """Copy a column into a larger buffer."""
+        grown = np.empty(capacity, dtype=column.dtype) if fill is None else np.full(capacity, fill, dtype=column.dtype)
+        grown[:self._size] = column[:self._size]
+        return grown
+    
+    def _codes_for(self, key: str) -> np.ndarray:
+        """Code column buffer for a dimension, created on first use."""
+        codes = self._dimension_codes.get(key)
+        if codes is None:
+            codes = np.full(self._capacity, self.MISSING_CODE, dtype=np.int32)
+            self._dimension_codes[key] = codes
+            self._dimension_values[key] = []
+            self._dimension_lookup[key] = {}
+        return codes
+    
+    def _encode(self, key: str, value: str) -> int:
+        """Dictionary code for a dimension value."""
+        lookup = self._dimension_lookup[key]
+        code = lookup.get(value)
+        if code is None:
+            code = lookup[value] = len(self._dimension_values[key])
+            self._dimension_values[key].append(value)
+        return code
+    
+    def append(self, timestamp: datetime, value: float, dimensions: Optional[Dict[str, str]] = None) -> None:
+        """Append one point."""
+        self._reserve(1)
+        row = self._size
+        micros = self.to_micros(timestamp)
+        
+        if row and micros < self._timestamps[row - 1]:
+            self._is_sorted = False
+        
+        self._timestamps[row] = micros
+        self._values[row] = value
+        for key, dim_value in (dimensions or {}).items():
+            codes = self._codes_for(key)
+            codes[row] = self._encode(key, dim_value)
+        
+        self._size += 1
+    
+    def append_arrays(self,
+                      timestamps: np.ndarray,
+                      values: np.ndarray,
+                      dimensions: Optional[Dict[str, np.ndarray]] = None) -> None:
+        """Append many points from arrays (epoch microseconds or datetime64 timestamps)."""
+        timestamps = np.asarray(timestamps)
+        if np.issubdtype(timestamps.dtype, np.datetime64):
+            timestamps = timestamps.astype("datetime64[us]").astype(np.int64)
+            if self._naive_timestamps is None:
+                self._naive_timestamps = True
+        timestamps = timestamps.astype(np.int64, copy=False)
+        values = np.asarray(values, dtype=np.float64)
+        count = len(timestamps)
+        if count == 0:
+            return
+        
+        self._reserve(count)
+        start, end = self._size, self._size + count
+        
+        if (start and timestamps[0] < self._timestamps[start - 1]) or np.any(np.diff(timestamps) < 0):
+            self._is_sorted = False
+        
+        self._timestamps[start:end] = timestamps
+        self._values[start:end] = values
+        
+        for key, column in (dimensions or {}).items():
+            codes = self._codes_for(key)
+            uniques, inverse = np.unique(np.asarray(column, dtype=object).astype(str), return_inverse=True)
+            mapping = np.array([self._encode(key, value) for value in uniques], dtype=np.int32)
+            codes[start:end] = mapping[inverse]
+        
+        self._size = end
+    
+    def ensure_sorted(self) -> None:
+        """Sort all columns by timestamp (stable) if appends arrived out of order."""
+        if self._is_sorted:
+            return
+        
+        order = np.argsort(self.timestamps, kind="stable")
+        self._timestamps[:self._size] = self._timestamps[:self._size][order]
+        self._values[:self._size] = self._values[:self._size][order]
+        for codes in self._dimension_codes.values():
+            codes[:self._size] = codes[:self._size][order]
+        self._is_sorted = True
+    
+    def time_slice(self, start_time: Optional[datetime] = None, end_time: Optional[datetime] = None) -> slice:
+        """Row range (on time-sorted columns) within an inclusive time range."""
+        self.ensure_sorted()
+        timestamps = self.timestamps
+        lo = 0 if start_time is None else int(np.searchsorted(timestamps, self.to_micros(start_time), side="left"))
+        hi = self._size if end_time is None else int(np.searchsorted(timestamps, self.to_micros(end_time), side="right"))
+        return slice(lo, max(lo, hi))
+    
+    def point(self, row: int) -> MetricPoint:
+        """Materialize a single row as a MetricPoint."""
+        dimensions = {}
+        for key, codes in self._dimension_codes.items():
+            code = codes[row]
+            if code != self.MISSING_CODE:
+                dimensions[key] = self._dimension_values[key][code]
+        return MetricPoint(self.from_micros(self._timestamps[row]), float(self._values[row]), dimensions)
+
+
 class MetricsAggregator:
-    """Aggregates and analyzes time-series metrics data."""
+    """Aggregates and analyzes time-series metrics data.
+    
+    Points are held in a ColumnarMetricStore; aggregations run as NumPy
+    reductions over the columns rather than walking Python objects.
+    """
     
     def __init__(self):
         """Initialize metrics aggregator."""
-        self.data_points: List[MetricPoint] = []
+        self.store = ColumnarMetricStore()
+    
+    @property
+    def data_points(self) -> List[MetricPoint]:
+        """All points materialized as MetricPoint objects (O(n); prefer the aggregation methods)."""
+        return [self.store.point(row) for row in range(len(self.store))]
     
     def add_data_point(self, timestamp: datetime, value: float, dimensions: Dict[str, str] = None):
         """Add a metric data point."""
-        point = MetricPoint(timestamp, value, dimensions or {})
-        self.data_points.append(point)
+        self.store.append(timestamp, value, dimensions)
     
     def add_data_points(self, points: List[MetricPoint]):
         """Add multiple metric data points."""
-        self.data_points.extend(points)
+        for point in points:
+            self.store.append(point.timestamp, point.value, point.dimensions)
+    
+    def add_arrays(self,
+                   timestamps: np.ndarray,
+                   values: np.ndarray,
+                   dimensions: Optional[Dict[str, np.ndarray]] = None):
+        """Bulk-add points from columns, e.g. a GSC export loaded into NumPy."""
+        self.store.append_arrays(timestamps, values, dimensions)
     
     def aggregate_by_time(self, 
                           time_window: timedelta,
                           method: AggregationMethod = AggregationMethod.MEAN,
                           start_time: Optional[datetime] = None,
                           end_time: Optional[datetime] = None) -> List[Tuple[datetime, float]]:
-        """Aggregate data points by time windows."""
+        """Aggregate data points into fixed windows anchored at the first point in range."""
         
-        if not self.data_points:
+        if not len(self.store):
             return []
         
-        # Filter by time range if specified
-        filtered_points = self.data_points
-        if start_time or end_time:
-            filtered_points = [
-                p for p in self.data_points
-                if (start_time is None or p.timestamp >= start_time) and
-                   (end_time is None or p.timestamp <= end_time)
-            ]
+        rows = self.store.time_slice(start_time, end_time)
+        timestamps = self.store.timestamps[rows]
+        values = self.store.values[rows]
         
-        if not filtered_points:
+        if len(timestamps) == 0:
             return []
         
-        # Sort by timestamp
-        filtered_points.sort(key=lambda p: p.timestamp)
+        window_micros = max(1, time_window // timedelta(microseconds=1))
+        window_index = (timestamps - timestamps[0]) // window_micros
         
-        # Group by time windows
-        aggregated = []
-        current_window_start = filtered_points[0].timestamp
-        current_window_points = []
+        # Rows are time-sorted, so each non-empty window is a contiguous run
+        starts = np.flatnonzero(np.r_[True, window_index[1:] != window_index[:-1]])
+        counts = np.diff(np.r_[starts, len(values)])
+        aggregated = self._reduce_runs(values, starts, counts, method, runs_value_sorted=False)
         
-        for point in filtered_points:
-            # Check if point belongs to current window
-            if point.timestamp < current_window_start + time_window:
-                current_window_points.append(point.value)
-            else:
-                # Process current window
-                if current_window_points:
-                    agg_value = self._apply_aggregation_method(current_window_points, method)
-                    aggregated.append((current_window_start, agg_value))
-                
-                # Start new window
-                current_window_start = point.timestamp
-                current_window_points = [point.value]
-        
-        # Process final window
-        if current_window_points:
-            agg_value = self._apply_aggregation_method(current_window_points, method)
-            aggregated.append((current_window_start, agg_value))
-        
-        return aggregated
+        window_starts = timestamps[0] + window_index[starts] * window_micros
+        return [
+            (self.store.from_micros(window_start), float(value))
+            for window_start, value in zip(window_starts, aggregated)
+        ]
     
     def aggregate_by_dimension(self, 
                                dimension_key: str,
                                method: AggregationMethod = AggregationMethod.MEAN) -> Dict[str, float]:
         """Aggregate data points by dimension values."""
         
-        if not self.data_points:
+        if not len(self.store):
             return {}
         
-        # Group by dimension value
-        dimension_groups = {}
-        for point in self.data_points:
-            dim_value = point.dimensions.get(dimension_key, "unknown")
-            if dim_value not in dimension_groups:
-                dimension_groups[dim_value] = []
-            dimension_groups[dim_value].append(point.value)
-        
-        # Aggregate each group
-        aggregated = {}
-        for dim_value, values in dimension_groups.items():
-            aggregated[dim_value] = self._apply_aggregation_method(values, method)
-        
-        return aggregated
+        codes = self.store.dimension_codes(dimension_key)
+        labels = self.store.dimension_values(dimension_key) + ["unknown"]
+        # Missing values form their own "unknown" group
+        groups = np.where(codes == ColumnarMetricStore.MISSING_CODE, len(labels) - 1, codes)
+        values = self.store.values
+        
+        if method in (AggregationMethod.SUM, AggregationMethod.MEAN):
+            counts = np.bincount(groups, minlength=len(labels))
+            sums = np.bincount(groups, weights=values, minlength=len(labels))
+            present = np.flatnonzero(counts)
+            results = sums[present] if method == AggregationMethod.SUM else sums[present] / counts[present]
+        else:
+            order = np.lexsort((values, groups))
+            sorted_groups = groups[order]
+            starts = np.flatnonzero(np.r_[True, sorted_groups[1:] != sorted_groups[:-1]])
+            counts = np.diff(np.r_[starts, len(order)])
+            present = sorted_groups[starts]
+            results = self._reduce_runs(values[order], starts, counts, method, runs_value_sorted=True)
+        
+        return {labels[group]: float(value) for group, value in zip(present, results)}
+    
+    def _reduce_runs(self,
+                     values: np.ndarray,
+                     starts: np.ndarray,
+                     counts: np.ndarray,
+                     method: AggregationMethod,
+                     runs_value_sorted: bool) -> np.ndarray:
+        """Apply an aggregation to contiguous runs of ``values``."""
+        if method == AggregationMethod.SUM:
+            return np.add.reduceat(values, starts)
+        if method == AggregationMethod.MIN:
+            return values[starts] if runs_value_sorted else np.minimum.reduceat(values, starts)
+        if method == AggregationMethod.MAX:
+            return values[starts + counts - 1] if runs_value_sorted else np.maximum.reduceat(values, starts)
+        if method in _METHOD_QUANTILES:
+            if not runs_value_sorted:
+                run_ids = np.repeat(np.arange(len(starts)), counts)
+                values = values[np.lexsort((values, run_ids))]
+            return _grouped_quantiles(values, starts, counts, _METHOD_QUANTILES[method])
+        return np.add.reduceat(values, starts) / counts
     
     def calculate_trend(self, 
                         window_days: int = 7,
                         method: str = "linear") -> Dict[str, float]:
         """Calculate trend statistics for the metric."""
         
-        if len(self.data_points) < 2:
+        if len(self.store) < 2:
             return {"trend": 0.0, "confidence": 0.0}
         
         # Get data for trend calculation
         end_time = datetime.now(timezone.utc)
         start_time = end_time - timedelta(days=window_days)
         
-        trend_points = [
-            p for p in self.data_points
-            if start_time <= p.timestamp <= end_time
-        ]
+        rows = self.store.time_slice(start_time, end_time)
+        timestamps = self.store.timestamps[rows]
+        values = self.store.values[rows]
         
-        if len(trend_points) < 2:
+        if len(values) < 2:
             return {"trend": 0.0, "confidence": 0.0}
         
-        # Sort by timestamp
-        trend_points.sort(key=lambda p: p.timestamp)
-        
-        # Convert to numerical arrays
-        timestamps = [(p.timestamp - trend_points[0].timestamp).total_seconds() for p in trend_points]
-        values = [p.value for p in trend_points]
+        seconds = (timestamps - timestamps[0]) / 1_000_000
         
         if method == "linear":
             # Linear regression
-            correlation = np.corrcoef(timestamps, values)[0, 1] if len(timestamps) > 1 else 0
-            slope = np.polyfit(timestamps, values, 1)[0] if len(timestamps) > 1 else 0
+            correlation = np.corrcoef(seconds, values)[0, 1]
+            slope = np.polyfit(seconds, values, 1)[0]
             
             return {
                 "trend": slope,
@@ -165,52 +385,49 @@ class MetricsAggregator:
             }
         else:
             # Simple percentage change
-            if len(values) >= 2:
-                start_value = values[0]
-                end_value = values[-1]
-                
-                if start_value != 0:
-                    trend = ((end_value - start_value) / start_value) * 100
-                else:
-                    trend = 0.0
-                
-                return {
-                    "trend": trend,
-                    "confidence": min(1.0, len(values) / 10.0)  # More data = higher confidence
-                }
+            start_value = values[0]
+            end_value = values[-1]
+            
+            if start_value != 0:
+                trend = ((end_value - start_value) / start_value) * 100
             else:
-                return {"trend": 0.0, "confidence": 0.0}
+                trend = 0.0
+            
+            return {
+                "trend": trend,
+                "confidence": min(1.0, len(values) / 10.0)  # More data = higher confidence
+            }
     
     def detect_anomalies(self, 
                          sensitivity: float = 2.0,
                          window_size: int = 10) -> List[MetricPoint]:
-        """Detect anomalous data points using statistical methods."""
+        """Detect points more than ``sensitivity`` standard deviations from the preceding window."""
         
-        if len(self.data_points) < window_size:
+        if len(self.store) < window_size:
             return []
         
-        anomalies = []
+        self.store.ensure_sorted()
+        values = self.store.values
         
-        # Sort by timestamp
-        sorted_points = sorted(self.data_points, key=lambda p: p.timestamp)
+        if window_size < 2 or len(values) == window_size:
+            return []
         
-        for i in range(window_size, len(sorted_points)):
-            # Get window of previous points
-            window = sorted_points[i-window_size:i]
-            window_values = [p.value for p in window]
-            
-            # Calculate statistics
-            mean_val = statistics.mean(window_values)
-            std_val = statistics.stdev(window_values) if len(window_values) > 1 else 0
-            
-            # Check if current point is anomalous
-            current_point = sorted_points[i]
-            if std_val > 0:
-                z_score = abs(current_point.value - mean_val) / std_val
-                if z_score > sensitivity:
-                    anomalies.append(current_point)
+        # Rolling mean/sample std of the window preceding each point, via cumulative sums
+        cumsum = np.r_[0.0, np.cumsum(values)]
+        cumsum_sq = np.r_[0.0, np.cumsum(values ** 2)]
+        window_sums = cumsum[window_size:-1] - cumsum[:-window_size - 1]
+        window_sums_sq = cumsum_sq[window_size:-1] - cumsum_sq[:-window_size - 1]
         
-        return anomalies
+        means = window_sums / window_size
+        variances = np.maximum(0.0, (window_sums_sq - window_size * means ** 2) / (window_size - 1))
+        stds = np.sqrt(variances)
+        
+        current = values[window_size:]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            z_scores = np.abs(current - means) / stds
+        anomalous = np.flatnonzero((stds > 0) & (z_scores > sensitivity)) + window_size
+        
+        return [self.store.point(row) for row in anomalous]
     
     def calculate_percentiles(self, percentiles: List[float] = None) -> Dict[str, float]:
         """Calculate percentile values for the metric."""
@@ -218,21 +435,16 @@ class MetricsAggregator:
         if percentiles is None:
             percentiles = [50, 90, 95, 99]
         
-        if not self.data_points:
+        if not len(self.store):
             return {f"p{p}": 0.0 for p in percentiles}
         
-        values = [p.value for p in self.data_points]
-        
-        result = {}
-        for p in percentiles:
-            result[f"p{p}"] = np.percentile(values, p)
-        
-        return result
+        results = np.percentile(self.store.values, percentiles)
+        return {f"p{p}": float(value) for p, value in zip(percentiles, results)}
     
     def get_summary_stats(self) -> Dict[str, float]:
         """Get comprehensive summary statistics."""
         
-        if not self.data_points:
+        if not len(self.store):
             return {
                 "count": 0,
                 "mean": 0.0,
@@ -242,39 +454,16 @@ class MetricsAggregator:
                 "max": 0.0
             }
         
-        values = [p.value for p in self.data_points]
+        values = self.store.values
         
         return {
             "count": len(values),
-            "mean": statistics.mean(values),
-            "median": statistics.median(values),
-            "std": statistics.stdev(values) if len(values) > 1 else 0.0,
-            "min": min(values),
-            "max": max(values)
+            "mean": float(values.mean()),
+            "median": float(np.median(values)),
+            "std": float(values.std(ddof=1)) if len(values) > 1 else 0.0,
+            "min": float(values.min()),
+            "max": float(values.max())
         }
-    
-    def _apply_aggregation_method(self, values: List[float], method: AggregationMethod) -> float:
-        """Apply aggregation method to a list of values."""
-        
-        if not values:
-            return 0.0
-        
-        if method == AggregationMethod.MEAN:
-            return statistics.mean(values)
-        elif method == AggregationMethod.MEDIAN:
-            return statistics.median(values)
-        elif method == AggregationMethod.SUM:
-            return sum(values)
-        elif method == AggregationMethod.MIN:
-            return min(values)
-        elif method == AggregationMethod.MAX:
-            return max(values)
-        elif method == AggregationMethod.P95:
-            return np.percentile(values, 95)
-        elif method == AggregationMethod.P99:
-            return np.percentile(values, 99)
-        else:
-            return statistics.mean(values)
 
 
 class PerformanceCalculator:
@@ -0,0 +1,23 @@
+"""Shared pytest configuration."""
+
+import pytest
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--run-performance", action="store_true", default=False,
+        help="run wall-clock performance tests (skipped by default)"
+    )
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "performance: wall-clock performance tests, run with --run-performance")
+
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption("--run-performance"):
+        return
+    skip = pytest.mark.skip(reason="performance test; use --run-performance")
+    for item in items:
+        if item.get_closest_marker("performance"):
+            item.add_marker(skip)
@@ -0,0 +1,87 @@
+"""Unit tests for parallel batch quality audits."""
+
+import pytest
+
+from src.seo_bot.config import GovernanceConfig, Settings
+from src.seo_bot.governance.batch import AuditDocument, BatchQualityAuditor, run_batch_quality_audit
+from src.seo_bot.governance.quality import QualityScorer
+from src.seo_bot.governance.textprofile import content_hash
+
+
+def _document(i: int) -> AuditDocument:
+    body = " ".join(
+        f"<p>Section {i}.{j} explains how reusable containers cut kitchen waste by a measurable amount.</p>"
+        for j in range(12)
+    )
+    return AuditDocument(content_id=f"doc-{i}", content=f"<h2>Guide {i}</h2>{body}", title=f"Guide number {i}")
+
+
+async def _collect(stream):
+    return [result async for result in stream]
+
+
+class TestBatchQualityAuditor:
+    """Test sharding, skipping and result equivalence."""
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("workers", [1, 2])
+    async def test_scores_match_single_document_scoring(self, workers):
+        """Every document is scored exactly as the scorer would score it alone."""
+        config = GovernanceConfig()
+        documents = [_document(i) for i in range(9)]
+        auditor = BatchQualityAuditor(config, workers=workers, chunk_size=2)
+
+        results = await _collect(auditor.stream(documents))
+
+        assert sorted(r.document.content_id for r in results) == sorted(d.content_id for d in documents)
+        scorer = QualityScorer(config)
+        for result in results:
+            expected = scorer.score_content(result.document.content, title=result.document.title)
+            assert not result.skipped and result.error is None
+            assert result.quality_score.overall_score == pytest.approx(expected.overall_score)
+            assert result.content_hash == content_hash(result.document.content)
+
+    @pytest.mark.asyncio
+    async def test_skips_scored_and_duplicate_hashes(self):
+        """Hashes from earlier reports and repeats within the run are not rescored."""
+        first, second = _document(1), _document(2)
+        duplicate = AuditDocument(content_id="copy", content=second.content)
+        auditor = BatchQualityAuditor(
+            GovernanceConfig(), workers=1, scored_hashes={content_hash(first.content)}
+        )
+
+        results = await _collect(auditor.stream([first, second, duplicate]))
+
+        assert {r.document.content_id: r.skipped for r in results} == {"doc-1": True, "doc-2": False, "copy": True}
+
+    @pytest.mark.asyncio
+    async def test_errors_are_reported_and_retryable(self, monkeypatch):
+        """A failing document yields an error result and its hash stays unscored."""
+        def fail(self, content, **kwargs):
+            raise ValueError("broken")
+
+        monkeypatch.setattr(QualityScorer, "score_content", fail)
+        document = _document(3)
+        auditor = BatchQualityAuditor(GovernanceConfig(), workers=1)
+
+        results = await _collect(auditor.stream([document]))
+
+        assert results[0].error == "broken"
+        assert content_hash(document.content) not in auditor.scored_hashes
+
+
+class TestRunBatchQualityAudit:
+    """Test the governance wrapper."""
+
+    @pytest.mark.asyncio
+    async def test_streams_results_and_applies_governance(self, tmp_path):
+        """Scored documents are indexed for similarity and persisted at the end."""
+        config = GovernanceConfig(similarity_index_path=str(tmp_path / "index.npz"))
+        documents = [_document(i) for i in range(4)]
+
+        results = await _collect(run_batch_quality_audit(
+            "project", documents, Settings(), config, workers=1, chunk_size=3
+        ))
+
+        assert len(results) == 4
+        assert (tmp_path / "index.npz").exists()
@@ -0,0 +1,229 @@
+"""Unit tests for near-duplicate and shared-passage detection."""
+
+import pytest
+import numpy as np
+
+from src.seo_bot.governance.minhash import MinHashLSHIndex, jaccard, shingle_hashes
+from src.seo_bot.governance.quality import ContentSimilarityDetector
+from src.seo_bot.governance.segments import PassageIndex
+
+
+def _article(seed: int, words: int = 300) -> str:
+    rng = np.random.RandomState(seed)
+    vocabulary = [f"term{i}" for i in range(2000)]
+    return " ".join(rng.choice(vocabulary, words))
+
+
+def _edit(text: str, every: int) -> str:
+    words = text.split()
+    for i in range(0, len(words), every):
+        words[i] = "changed"
+    return " ".join(words)
+
+
+class TestMinHashLSHIndex:
+    """Test candidate lookup, re-ranking and maintenance."""
+
+    def test_shingles_and_jaccard(self):
+        """Identical texts share every shingle; case and punctuation are ignored."""
+        a = shingle_hashes("The quick brown fox jumps over the lazy dog", 3)
+        b = shingle_hashes("the quick, brown fox jumps over the LAZY dog.", 3)
+
+        assert len(a) == 7
+        assert jaccard(a, b) == 1.0
+        assert len(shingle_hashes("two words", 5)) == 1
+
+    def test_query_finds_near_duplicate_only(self):
+        """A lightly edited copy is found with its exact Jaccard; unrelated text is not."""
+        index = MinHashLSHIndex(threshold=0.5)
+        for seed in range(50):
+            index.add(f"doc{seed}", _article(seed))
+
+        near = _edit(_article(7), every=60)
+        matches = index.query(near)
+
+        assert [key for key, _ in matches] == ["doc7"]
+        expected = jaccard(shingle_hashes(near), index.shingles["doc7"])
+        assert matches[0][1] == pytest.approx(expected)
+        assert index.query(_article(999)) == []
+
+    def test_add_replaces_and_remove_cleans_buckets(self):
+        """Re-adding a key replaces its version and removal leaves no bucket entries."""
+        index = MinHashLSHIndex(threshold=0.8)
+        index.add("a", _article(1))
+        index.add("a", _article(2))
+
+        assert len(index) == 1
+        assert index.query(_article(1)) == []
+        assert index.query(_article(2))[0][0] == "a"
+
+        assert index.remove("a")
+        assert not index.remove("a")
+        assert all(not bucket for bucket in index.buckets)
+
+    def test_signature_only_keys_are_candidates(self):
+        """Keys added by signature are candidates but are not re-ranked by query."""
+        index = MinHashLSHIndex(threshold=0.5)
+        text = _article(5)
+        index.add_signature("a", index.signature(shingle_hashes(text)))
+
+        assert "a" in index.candidates(index.signature(shingle_hashes(_edit(text, every=60))))
+        assert index.query(text) == []
+
+    def test_exclude_skips_self(self):
+        """The queried document's own key can be excluded."""
+        index = MinHashLSHIndex()
+        index.add("a", _article(3))
+
+        assert index.query(_article(3), exclude="a") == []
+
+    def test_save_and_load(self, tmp_path):
+        """A reloaded index answers queries identically."""
+        index = MinHashLSHIndex(threshold=0.6, num_perm=64)
+        for seed in range(10):
+            index.add(f"doc{seed}", _article(seed))
+        path = tmp_path / "similarity" / "index.npz"
+        index.save(path)
+
+        loaded = MinHashLSHIndex.load(path)
+
+        assert (loaded.bands, loaded.rows) == (index.bands, index.rows)
+        near = _edit(_article(4), every=40)
+        assert loaded.query(near) == index.query(near)
+
+
+COPIED = ("Regular expressions compile into finite automata that scan each character once, "
+          "which keeps matching linear in the length of the input text")
+
+
+class TestPassageIndex:
+    """Test passage alignment and offsets."""
+
+    def test_finds_copied_passage_with_offsets(self):
+        """A passage copied into another document is returned with offsets in both texts."""
+        source = f"<p>{_article(1, 80)}.</p> {COPIED}. {_article(2, 60)}"
+        query = f"Intro text about something else entirely here. {COPIED}! Closing remarks follow."
+        index = PassageIndex()
+        index.add("source", source)
+        index.add("unrelated", _article(3, 200))
+
+        results = index.find(query)
+
+        assert list(results) == ["source"]
+        passage = results["source"][0]
+        assert passage.text == query[passage.start:passage.end]
+        assert COPIED in passage.text
+        assert COPIED in source[passage.source_start:passage.source_end]
+        assert passage.source_start >= source.index(COPIED) - 1
+
+    def test_sentence_match_below_window_length(self):
+        """Identical sentences shorter than a guaranteed window run still match."""
+        index = PassageIndex(kgram_size=6, window=20)
+        sentence = "Always back up the database before running migrations"
+        index.add("doc", f"{_article(4, 50)}. {sentence}. {_article(5, 50)}")
+
+        results = index.find(f"Start here now. {sentence.upper()}. End.")
+
+        assert results["doc"][0].text == sentence.upper() + "."
+
+    def test_exclude_sources_and_remove(self):
+        """Lookups can skip or restrict keys, and removed documents disappear."""
+        index = PassageIndex()
+        index.add("a", COPIED)
+        index.add("b", COPIED)
+
+        assert set(index.find(COPIED, exclude="a")) == {"b"}
+        assert set(index.find(COPIED, sources={"a"})) == {"a"}
+
+        index.remove("a")
+        index.remove("b")
+        assert index.find(COPIED) == {}
+        assert index.postings == {}
+
+    def test_boilerplate_postings_are_skipped(self):
+        """Fingerprints shared by too many documents do not produce candidates."""
+        index = PassageIndex(max_postings=2)
+        for key in "abc":
+            index.add(key, COPIED)
+
+        assert index.find(COPIED) == {}
+
+    def test_save_and_load(self, tmp_path):
+        """A reloaded index returns the same passages."""
+        index = PassageIndex()
+        index.add("source", f"{_article(6, 40)}. {COPIED}.")
+        path = tmp_path / "passages.npz"
+        index.save(path)
+
+        loaded = PassageIndex.load(path)
+
+        assert loaded.find(COPIED) == index.find(COPIED)
+
+
+class TestContentSimilarityDetector:
+    """Test the governance detector on top of the index."""
+
+    def test_finds_duplicate_with_metadata(self):
+        """Near-duplicates are reported with URL and match type."""
+        detector = ContentSimilarityDetector(similarity_threshold=0.5)
+        detector.add_content("original", f"<p>{_article(11)}</p>", url="https://example.com/a")
+        detector.add_content("other", _article(12), url="https://example.com/b")
+
+        results = detector.find_similar_content(_article(11), content_id="copy")
+
+        assert len(results) == 1
+        assert results[0].matching_content_id == "original"
+        assert results[0].matching_url == "https://example.com/a"
+        assert results[0].match_type == "exact"
+        assert results[0].passages[0].source_id == "original"
+        assert results[0].similar_segments[0] == results[0].passages[0].text
+
+    def test_overlapping_passages_beyond_near_duplicates(self):
+        """Partially copied content is reported even when the documents are not near-duplicates."""
+        detector = ContentSimilarityDetector()
+        detector.add_content("source", f"{_article(21)}. {COPIED}.")
+
+        query = f"{_article(22)}. {COPIED}."
+        assert detector.find_similar_content(query) == []
+
+        passages = detector.find_overlapping_passages(query, content_id="query")
+        assert COPIED in passages["source"][0].text
+
+    def test_remove_content(self):
+        """Removed content no longer matches."""
+        detector = ContentSimilarityDetector()
+        detector.add_content("a", _article(5))
+        detector.remove_content("a")
+
+        assert detector.find_similar_content(_article(5)) == []
+        assert "a" not in detector.content_metadata
+
+    def test_persists_with_index_path(self, tmp_path):
+        """A detector opened on a saved index keeps its content and metadata."""
+        path = tmp_path / "similarity.npz"
+        detector = ContentSimilarityDetector(index_path=path)
+        detector.add_content("a", _article(6), url="https://example.com/a")
+        detector.save()
+
+        reopened = ContentSimilarityDetector(index_path=path)
+        results = reopened.find_similar_content(_article(6))
+
+        assert results[0].matching_content_id == "a"
+        assert results[0].matching_url == "https://example.com/a"
+
+    def test_warns_when_saved_configuration_differs(self, tmp_path, caplog):
+        """A saved index keeps its own configuration and says so when another is requested."""
+        path = tmp_path / "similarity.npz"
+        detector = ContentSimilarityDetector(index_path=path, num_perm=64)
+        detector.add_content("a", _article(6))
+        detector.save()
+
+        with caplog.at_level("WARNING"):
+            ContentSimilarityDetector(index_path=path, num_perm=64)
+        assert not caplog.records
+
+        with caplog.at_level("WARNING"):
+            reopened = ContentSimilarityDetector(index_path=path, num_perm=128, shingle_size=4)
+        assert reopened.index.num_perm == 64
+        assert "num_perm=64 (requested 128)" in caplog.text
+        assert "shingle_size=5 (requested 4)" in caplog.text
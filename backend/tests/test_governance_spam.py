@@ -0,0 +1,163 @@
+"""Unit tests for single-pass spam detection."""
+
+import time
+
+import pytest
+
+from src.seo_bot.config import GovernanceConfig
+from src.seo_bot.governance.quality import SpamDetector, SpamSignal
+from src.seo_bot.governance.textscan import PhraseAutomaton, count_syllables, scan_text
+
+
+def _prose(sentences: int) -> str:
+    subjects = ["Gardeners", "Most cooks", "Our team", "Every reader", "Small shops", "Teachers", "Runners"]
+    verbs = ["prefer", "compare", "describe", "recommend", "review", "measure", "choose"]
+    objects = ["simple tools that last for years", "fresh ideas on weekends",
+               "clear notes before the meeting", "local options whenever possible",
+               "honest results over quick wins", "seasonal produce from nearby farms"]
+    return " ".join(
+        f"{subjects[i % 7]} {verbs[(i // 7) % 7]} {objects[i % 6]} in case {i}."
+        for i in range(sentences)
+    )
+
+
+@pytest.fixture
+def detector():
+    return SpamDetector(GovernanceConfig())
+
+
+class TestTextScan:
+    """Test the automaton and the single-pass counts."""
+
+    def test_automaton_finds_overlapping_phrases(self):
+        """Phrases that share suffixes and prefixes are all reported."""
+        automaton = PhraseAutomaton([("he", "he"), ("she", "she"), ("hers", "he rs"), ("his", "his")])
+
+        matches = automaton.find(["u", "she", "rs", "he", "rs", "his"])
+
+        assert sorted(matches) == [("he", 3), ("hers", 3), ("his", 5), ("she", 1)]
+
+    def test_automaton_multiword_fallback(self):
+        """A failed partial match falls back to the longest matching suffix."""
+        automaton = PhraseAutomaton([("a", "share this article"), ("b", "this article will")])
+
+        matches = automaton.find("please share this article will help".split())
+
+        assert sorted(matches) == [("a", 1), ("b", 2)]
+
+    def test_counts(self):
+        """Words, sentences, links and tags are counted in one pass."""
+        scan = scan_text('<p>Read <a href="/x">this guide</a> today. It helps!</p> <br/> Done...')
+
+        assert scan.words == ["read", "this", "guide", "today", "it", "helps", "done"]
+        assert scan.sentence_count == 3
+        assert scan.link_count == 1
+        assert scan.tag_counts["p"] == 1
+        assert scan.tag_counts["br"] == 1
+
+    def test_syllables(self):
+        """Syllables follow vowel groups with a silent trailing e."""
+        assert count_syllables("cake") == 1
+        assert count_syllables("table") == 2
+        assert count_syllables("readability") == 5
+        assert count_syllables("rhythm") == 1
+
+
+class TestSpamDetector:
+    """Test each spam signal."""
+
+    def test_clean_content(self, detector):
+        """Ordinary prose raises no signals."""
+        assert detector.detect_spam_signals(_prose(40), ["fresh ideas"]) == []
+
+    def test_keyword_density(self, detector):
+        """A keyword above 3% density is flagged."""
+        content = _prose(40) + " Best coffee grinder. " * 20
+
+        assert SpamSignal.KEYWORD_STUFFING in detector.detect_spam_signals(content, ["best coffee grinder"])
+        assert SpamSignal.KEYWORD_STUFFING not in detector.detect_spam_signals(content, ["espresso"])
+
+    def test_keyword_repetition(self, detector):
+        """Back-to-back or closely spaced occurrences are flagged below the density limit."""
+        prose = _prose(60)
+
+        back_to_back = f"{prose} seo seo seo seo."
+        close = f"{prose} seo and seo then one seo."
+        spread = f"{prose} seo one two three seo one two three seo."
+
+        assert SpamSignal.KEYWORD_STUFFING in detector.detect_spam_signals(back_to_back, ["SEO"])
+        assert SpamSignal.KEYWORD_STUFFING in detector.detect_spam_signals(close, ["seo"])
+        assert SpamSignal.KEYWORD_STUFFING not in detector.detect_spam_signals(spread, ["seo"])
+
+    def test_thin_content(self, detector):
+        """Short content is thin."""
+        assert SpamSignal.THIN_CONTENT in detector.detect_spam_signals(_prose(5))
+
+    def test_poor_readability(self, detector):
+        """Long sentences of long words are hard to read."""
+        sentence = " ".join(["institutionalization characteristically"] * 30) + "."
+
+        assert SpamSignal.LOW_READABILITY in detector.detect_spam_signals(sentence * 6)
+
+    def test_excessive_linking(self, detector):
+        """More than one link per fifty words is excessive."""
+        links = " ".join(f'<a href="/p{i}">page</a>' for i in range(20))
+
+        assert SpamSignal.EXCESSIVE_LINKING in detector.detect_spam_signals(_prose(40) + links)
+
+    def test_boilerplate(self, detector):
+        """Three distinct boilerplate phrases are flagged regardless of punctuation and case."""
+        content = (_prose(40) + " Click here, for more information. Share this article!"
+                   " SUBSCRIBE to our newsletter.")
+
+        assert SpamSignal.BOILERPLATE_TEXT in detector.detect_spam_signals(content)
+        assert SpamSignal.BOILERPLATE_TEXT not in detector.detect_spam_signals(_prose(40) + " Share this article!")
+
+    def test_auto_generated(self, detector):
+        """Sentences that keep repeating the same opening words are flagged."""
+        templated = " ".join(f"This product is great for task {i} at home." for i in range(40))
+
+        assert SpamSignal.AUTO_GENERATED in detector.detect_spam_signals(templated)
+
+    def test_keyword_automata_are_reused(self, detector):
+        """Keyword sets compile once, independent of order."""
+        detector.detect_spam_signals(_prose(5), ["b", "a"])
+        detector.detect_spam_signals(_prose(5), ["a", "b"])
+
+        assert len(detector._automata) == 2  # boilerplate only, plus {a, b}
+
+
+@pytest.mark.performance
+class TestSpamDetectorPerformance:
+    """Scanning stays linear on large and adversarial inputs."""
+
+    ADVERSARIAL = {
+        "unclosed_tags": lambda n: "<a " * n,
+        "long_attribute": lambda n: "<a href=\"" + "x " * n,
+        "keyword_runs": lambda n: "seo " * n,
+        "no_terminators": lambda n: "word " * n,
+        "terminators": lambda n: "!?." * n,
+    }
+
+    @pytest.mark.parametrize("name", sorted(ADVERSARIAL))
+    def test_large_adversarial_documents(self, detector, name):
+        """100KB+ pathological inputs are scanned well within a second."""
+        content = self.ADVERSARIAL[name](50_000)
+        assert len(content) > 100_000
+
+        started = time.perf_counter()
+        detector.detect_spam_signals(content, ["seo", "seo tools"])
+        assert time.perf_counter() - started < 2.0
+
+    def test_scaling_is_linear(self, detector):
+        """Quadrupling the input roughly quadruples the scan time."""
+        def timed(sentences):
+            content = _prose(sentences)
+            started = time.perf_counter()
+            detector.detect_spam_signals(content, ["fresh ideas"])
+            return time.perf_counter() - started
+
+        small = min(timed(2_000) for _ in range(3))
+        large = min(timed(8_000) for _ in range(3))
+
+        assert large < small * 8
@@ -0,0 +1,115 @@
+"""Unit tests for the shared text profile and its consumers."""
+
+import pytest
+
+from src.seo_bot.adapters.cms.base import ContentItem, ContentType
+from src.seo_bot.config import GovernanceConfig
+from src.seo_bot.governance.quality import QualityScorer
+from src.seo_bot.governance.textprofile import (
+    TextProfile,
+    clear_text_profile_cache,
+    get_text_profile,
+    profile_cache_info,
+)
+from src.seo_bot.publishing.quality_gates import AccessibilityQualityGate, ContentQualityGate, SEOQualityGate
+
+
+HTML = (
+    '<h1>Choosing a <em>Coffee</em> Grinder</h1>'
+    '<p>A burr grinder gives an even grind. <a href="/grinders">Compare grinders</a> before buying.</p>'
+    '<h2>Burr or blade</h2>'
+    '<p>Blade grinders are cheap. See <a href="https://example.org/study">the study</a>!</p>'
+    '<img src="a.png" alt="Burr grinder"><img src="b.png">'
+    '<h3>Cleaning</h3>'
+)
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    clear_text_profile_cache()
+    yield
+    clear_text_profile_cache()
+
+
+class TestTextProfile:
+    """Test structure extraction and keyword positions."""
+
+    def test_structure(self):
+        """Headings, links, images and paragraphs are extracted in document order."""
+        profile = TextProfile.from_content(HTML)
+
+        assert [(h.level, h.text) for h in profile.headings] == [
+            (1, "Choosing a Coffee Grinder"), (2, "Burr or blade"), (3, "Cleaning")
+        ]
+        assert [(link.href, link.text, link.is_absolute) for link in profile.links] == [
+            ("/grinders", "Compare grinders", False),
+            ("https://example.org/study", "the study", True),
+        ]
+        assert profile.image_alts == ["Burr grinder", None]
+        assert profile.paragraph_word_counts == [12, 8]
+        assert profile.sentences[0] == "choosing a coffee grinder a burr grinder gives an even grind"
+
+    def test_markdown_headings(self):
+        """Markdown headings are recognized at line starts, with closing hashes stripped."""
+        profile = TextProfile.from_content("# Title #\nText with a # sign.\n\n## Section\nMore.")
+
+        assert [(h.level, h.text) for h in profile.headings] == [(1, "Title"), (2, "Section")]
+
+    def test_keyword_positions(self):
+        """Keywords match whole tokens, case-insensitively, including phrases."""
+        profile = TextProfile.from_content("Coffee grinder tips. A COFFEE-grinder guide for coffeegrinder fans.")
+
+        assert profile.keyword_positions("coffee grinder") == [0, 4]
+        assert profile.keyword_density("coffee grinder") == pytest.approx(2 / 10)
+        assert profile.keyword_positions("espresso") == []
+
+    def test_cache_by_content_hash(self):
+        """Identical content is analyzed once and evicts nothing else."""
+        first = get_text_profile(HTML)
+        second = get_text_profile(str(HTML))
+
+        assert first is second
+        assert profile_cache_info() == {'hits': 1, 'misses': 1, 'size': 1}
+        assert get_text_profile(HTML + " ") is not first
+
+
+class TestProfileConsumers:
+    """Publishing gates and the governance scorer share one profile."""
+
+    @pytest.mark.asyncio
+    async def test_publish_then_governance_reuses_profile(self):
+        """Gates and the quality scorer analyze a document once."""
+        item = ContentItem(
+            title="Choosing a coffee grinder for home",
+            content=HTML,
+            content_type=ContentType.ARTICLE,
+            slug="coffee-grinder"
+        )
+
+        for gate in (ContentQualityGate(), SEOQualityGate(), AccessibilityQualityGate()):
+            await gate.evaluate(item)
+        score = QualityScorer(GovernanceConfig()).score_content(
+            HTML, title=item.title, target_keywords=["coffee grinder"]
+        )
+
+        assert profile_cache_info()['misses'] == 1
+        assert score.word_count == get_text_profile(HTML).word_count
+
+    def test_gate_checks_use_profile(self):
+        """Heading hierarchy, links and image alts come from the profile."""
+        profile = get_text_profile(HTML)
+        seo = SEOQualityGate()
+        accessibility = AccessibilityQualityGate()
+
+        assert seo._has_proper_heading_hierarchy(profile)
+        assert seo._has_internal_links(profile)
+        assert seo._has_external_links(profile)
+        assert accessibility._check_content_images(profile) == ["Image missing alt text"]
+        assert accessibility._check_heading_structure(profile) == []
+
+    def test_scorer_structure_counts(self):
+        """Structural signals feed the content quality assessment."""
+        scorer = QualityScorer(GovernanceConfig())
+        metrics = scorer._assess_seo_optimization(get_text_profile(HTML), "Coffee grinder", "", ["coffee grinder"])
+
+        assert "No internal links found" not in metrics['issues']
@@ -0,0 +1,198 @@
+"""Unit tests for Search Console sync into GSCData."""
+
+import pytest
+from contextlib import contextmanager
+from datetime import date, datetime
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from src.seo_bot.gsc_sync import (
+    ALL_DIMENSION,
+    PAGE_TOTAL_QUERY,
+    GSCSyncEngine,
+    find_project,
+    load_page_performance,
+    page_performance,
+    query_performance,
+)
+from src.seo_bot.models import Base, GSCData, Project
+
+
+class StubSearchConsole:
+    """Serves searchanalytics rows per day and dimension set, honoring paging."""
+
+    def __init__(self, days):
+        # days: {date: [(page, query, clicks, impressions, position), ...]}
+        self.days = days
+        self.requests = []
+
+    def searchanalytics(self):
+        return self
+
+    def query(self, siteUrl, body):
+        self.requests.append(body)
+        self._body = body
+        return self
+
+    def execute(self):
+        body = self._body
+        day = date.fromisoformat(body['startDate'])
+        rows = self.days.get(day, [])
+
+        if body['dimensions'] == ['page']:
+            totals = {}
+            for page, _, clicks, impressions, position in rows:
+                total = totals.setdefault(page, [0, 0, 0.0])
+                total[0] += clicks
+                total[1] += impressions
+                total[2] += position * impressions
+            result = [
+                {'keys': [page], 'clicks': c, 'impressions': i, 'ctr': c / i, 'position': w / i}
+                for page, (c, i, w) in sorted(totals.items())
+            ]
+        else:
+            result = [
+                {'keys': [page, query], 'clicks': c, 'impressions': i, 'ctr': c / i, 'position': p}
+                for page, query, c, i, p in rows
+            ]
+
+        start = body['startRow']
+        page = result[start:start + body['rowLimit']]
+        return {'rows': page} if page else {}
+
+
+def _rows(day_index: int, count: int):
+    return [
+        (f"https://example.com/p{i % 3}", f"query {day_index}-{i}", 1, 10, 2.0 + i % 3)
+        for i in range(count)
+    ]
+
+
+@pytest.fixture
+def session_factory():
+    engine = create_engine("sqlite:///:memory:", echo=False)
+    Base.metadata.create_all(engine)
+    return sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+@pytest.fixture
+def session(session_factory):
+    return session_factory()
+
+
+@pytest.fixture
+def project(session):
+    project = Project(name="Example", domain="example.com", base_url="https://example.com/")
+    session.add(project)
+    session.commit()
+    return project
+
+
+DAYS = {date(2024, 3, d): _rows(d, 7) for d in range(1, 6)}
+
+
+class TestGSCSyncEngine:
+    """Test paging, high-water mark and idempotent writes."""
+
+    def test_pages_through_row_limit(self, session, project):
+        """Every page of results is requested until a short page arrives."""
+        service = StubSearchConsole(DAYS)
+        engine = GSCSyncEngine(service, row_limit=3, batch_size=4)
+
+        result = engine.sync_property(session, project.id, project.base_url,
+                                      start_date=date(2024, 3, 1), end_date=date(2024, 3, 1))
+
+        query_requests = [r['startRow'] for r in service.requests if r['dimensions'] == ['page', 'query']]
+        assert query_requests == [0, 3, 6]
+        assert result.rows_written == 7 + 3
+        assert session.query(GSCData).filter(GSCData.query != PAGE_TOTAL_QUERY).count() == 7
+
+        row = session.query(GSCData).first()
+        assert row.country == ALL_DIMENSION
+        assert row.device == ALL_DIMENSION
+
+    def test_high_water_mark_limits_later_syncs(self, session, project):
+        """A second sync only requests dates after the last synced day."""
+        service = StubSearchConsole(DAYS)
+        engine = GSCSyncEngine(service)
+
+        first = engine.sync_property(session, project.id, project.base_url,
+                                     start_date=date(2024, 3, 1), end_date=date(2024, 3, 3))
+        assert first.high_water_mark == date(2024, 3, 3)
+
+        service.requests.clear()
+        second = engine.sync_property(session, project.id, project.base_url, end_date=date(2024, 3, 5))
+
+        assert second.days_synced == 2
+        assert {r['startDate'] for r in service.requests} == {"2024-03-04", "2024-03-05"}
+        assert engine.get_high_water_mark(session, project.id, project.base_url) == date(2024, 3, 5)
+
+        service.requests.clear()
+        third = engine.sync_property(session, project.id, project.base_url, end_date=date(2024, 3, 5))
+        assert third.days_synced == 0
+        assert service.requests == []
+
+    def test_resync_replaces_rows(self, session, project):
+        """Re-syncing a day does not duplicate rows or violate the unique constraint."""
+        engine = GSCSyncEngine(StubSearchConsole(DAYS))
+        for _ in range(2):
+            engine.sync_property(session, project.id, project.base_url,
+                                 start_date=date(2024, 3, 2), end_date=date(2024, 3, 2))
+
+        assert session.query(GSCData).count() == 7 + 3
+
+    def test_rejects_oversized_row_limit(self):
+        """Row limits above the API maximum are refused."""
+        with pytest.raises(ValueError):
+            GSCSyncEngine(StubSearchConsole({}), row_limit=50000)
+
+
+class TestGSCReaders:
+    """Test aggregation from the synced table."""
+
+    def test_page_and_query_performance(self, session, project):
+        """Readers sum clicks and impressions and weight position by impressions."""
+        GSCSyncEngine(StubSearchConsole(DAYS)).sync_property(
+            session, project.id, project.base_url, start_date=date(2024, 3, 1), end_date=date(2024, 3, 2)
+        )
+
+        pages = page_performance(session, project.id, datetime(2024, 3, 1), datetime(2024, 3, 2))
+        assert set(pages) == {"https://example.com/p0", "https://example.com/p1", "https://example.com/p2"}
+        p0 = pages["https://example.com/p0"]
+        assert p0['clicks'] == 6
+        assert p0['impressions'] == 60
+        assert p0['ctr'] == pytest.approx(0.1)
+        assert p0['position'] == pytest.approx(2.0)
+
+        only_day_one = page_performance(session, project.id, date(2024, 3, 1), date(2024, 3, 1),
+                                        pages=["https://example.com/p1"])
+        assert only_day_one["https://example.com/p1"]['impressions'] == 20
+
+        queries = query_performance(session, project.id, min_impressions=10, limit=5)
+        assert len(queries) == 5
+        assert all(q['query'] != PAGE_TOTAL_QUERY for q in queries)
+
+    def test_find_project_normalizes_site(self, session, project):
+        """Properties, URLs and www hosts resolve to the project domain."""
+        for site in ("https://www.example.com/", "sc-domain:example.com", "EXAMPLE.com"):
+            assert find_project(session, site).id == project.id
+        assert find_project(session, "other.com") is None
+
+    def test_load_page_performance_requires_sync(self, session_factory, session, project):
+        """Unsynced domains return None so callers fall back to the API."""
+        @contextmanager
+        def scope():
+            s = session_factory()
+            try:
+                yield s
+            finally:
+                s.close()
+
+        assert load_page_performance("example.com", session_scope=scope) is None
+
+        GSCSyncEngine(StubSearchConsole(DAYS)).sync_property(
+            session, project.id, project.base_url, start_date=date(2024, 3, 1), end_date=date(2024, 3, 1)
+        )
+        pages = load_page_performance("https://example.com", session_scope=scope)
+        assert len(pages) == 3
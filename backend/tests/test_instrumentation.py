@@ -0,0 +1,110 @@
+"""Unit tests for Prometheus instrumentation hooks."""
+
+import pytest
+
+pytest.importorskip("prometheus_client")
+
+import httpx
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+from sqlalchemy import create_engine, text
+
+from src.seo_bot.instrumentation import (
+    PrometheusMiddleware,
+    instrument_engine,
+    render_metrics,
+    traced_client_session,
+    traced_httpx_client
+)
+
+
+def sample(name, **labels):
+    """Current value of a registered sample (0 when absent)."""
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+class TestHTTPMiddleware:
+    """Test request latency recording."""
+
+    def test_records_route_template_not_raw_path(self):
+        """Path parameters collapse to the route template label."""
+        app = FastAPI()
+        app.add_middleware(PrometheusMiddleware)
+
+        @app.get("/projects/{project_id}")
+        async def get_project(project_id: str):
+            return {"id": project_id}
+
+        labels = {"method": "GET", "route": "/projects/{project_id}", "status": "200"}
+        before = sample("seo_bot_http_request_duration_seconds_count", **labels)
+
+        client = TestClient(app)
+        client.get("/projects/a")
+        client.get("/projects/b")
+
+        assert sample("seo_bot_http_request_duration_seconds_count", **labels) == before + 2
+        assert sample(
+            "seo_bot_http_request_duration_seconds_count",
+            method="GET", route="/projects/a", status="200"
+        ) == 0.0
+
+    def test_render_metrics_is_openmetrics(self):
+        """Exposition uses the OpenMetrics format and terminator."""
+        body, content_type = render_metrics()
+
+        assert content_type.startswith("application/openmetrics-text")
+        assert body.rstrip().endswith(b"# EOF")
+        assert b"seo_bot_http_request_duration_seconds" in body
+
+
+class TestResourceHooks:
+    """Test database pool and outbound HTTP hooks."""
+
+    def test_engine_checkouts_counted(self):
+        """Each pool checkout increments the counter and is released on checkin."""
+        engine = create_engine("sqlite://")
+        instrument_engine(engine)
+        before = sample("seo_bot_db_pool_checkouts_total")
+
+        with engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+            in_use = sample("seo_bot_db_pool_connections_in_use")
+
+        assert sample("seo_bot_db_pool_checkouts_total") == before + 1
+        assert sample("seo_bot_db_pool_connections_in_use") == in_use - 1
+
+    @pytest.mark.asyncio
+    async def test_outbound_requests_timed_by_host(self):
+        """Traced sessions record latency per host and status class."""
+        app = web.Application()
+        app.router.add_get("/", lambda request: web.Response(text="ok"))
+        server = TestServer(app)
+        await server.start_server()
+        try:
+            labels = {"client": "test", "host": server.host, "status": "2xx"}
+            before = sample("seo_bot_outbound_http_duration_seconds_count", **labels)
+
+            async with traced_client_session("test") as session:
+                async with session.get(str(server.make_url("/"))) as response:
+                    await response.text()
+
+            assert sample("seo_bot_outbound_http_duration_seconds_count", **labels) == before + 1
+        finally:
+            await server.close()
+
+    @pytest.mark.asyncio
+    async def test_httpx_clients_timed_by_host(self):
+        """Async and sync httpx clients record outbound latency through event hooks."""
+        transport = httpx.MockTransport(lambda request: httpx.Response(404))
+        labels = {"client": "test-httpx", "host": "api.example.com", "status": "4xx"}
+        before = sample("seo_bot_outbound_http_duration_seconds_count", **labels)
+
+        async with traced_httpx_client("test-httpx", transport=transport) as client:
+            await client.get("https://api.example.com/a")
+        with traced_httpx_client("test-httpx", asynchronous=False, transport=transport) as client:
+            client.get("https://api.example.com/b")
+
+        assert sample("seo_bot_outbound_http_duration_seconds_count", **labels) == before + 2
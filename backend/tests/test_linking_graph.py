@@ -0,0 +1,171 @@
+"""Unit tests for the CSR internal link graph."""
+
+import networkx as nx
+import numpy as np
+import pytest
+from contextlib import contextmanager
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from src.seo_bot.config import CoverageSLAConfig, Settings
+from src.seo_bot.linking.graph import InternalLinkGraph, load_link_graph
+from src.seo_bot.models import Base, InternalLink, Page, Project
+from src.seo_bot.monitor.coverage import CoverageFreshnessMonitor
+from src.seo_bot.prune.optimization import ContentAnalyzer, ContentMetrics
+
+
+HOME = "https://example.com/"
+
+# home -> a -> b -> c -> d (deep), island <-> island2 (unreachable), lonely (orphan)
+EDGES = [
+    (HOME, "https://example.com/a"),
+    ("https://example.com/a", "https://example.com/b"),
+    ("https://example.com/a", "https://example.com/b"),  # Duplicate link
+    ("https://example.com/b", "https://example.com/c"),
+    ("https://example.com/c", "https://example.com/d"),
+    ("https://example.com/d", HOME),
+    ("https://example.com/island", "https://example.com/island2"),
+    ("https://example.com/island2", "https://example.com/island"),
+    ("https://example.com/c", "https://example.com/c"),  # Self-link
+]
+PAGES = [HOME, "https://example.com/lonely"]
+
+
+def _metrics(url: str) -> ContentMetrics:
+    return ContentMetrics(
+        url=url, title=url, word_count=800, organic_clicks=0, organic_impressions=0,
+        average_position=50.0, ctr=0.0, clicks_last_30d=0, clicks_last_90d=0, clicks_last_year=0,
+        quality_score=7.0, readability_score=60.0, page_speed_score=80, core_web_vitals_pass=True,
+        mobile_friendly=True, internal_links_in=10, internal_links_out=5, external_links=1,
+        ranking_keywords_count=1, top_10_rankings=0, featured_snippets=0
+    )
+
+
+@pytest.fixture
+def graph():
+    return InternalLinkGraph.from_edges(EDGES, urls=PAGES)
+
+
+class TestInternalLinkGraph:
+    """Test degrees, depth, PageRank and the combined report."""
+
+    def test_degrees_ignore_duplicates_and_self_links(self, graph):
+        in_degree = dict(zip(graph.urls, graph.in_degree().tolist()))
+        assert graph.link_count == 7
+        assert in_degree["https://example.com/b"] == 1
+        assert in_degree["https://example.com/c"] == 1
+        assert in_degree["https://example.com/lonely"] == 0
+
+    def test_depths_from_home(self, graph):
+        depth = dict(zip(graph.urls, graph.depths(graph.index[HOME]).tolist()))
+        assert depth[HOME] == 0
+        assert depth["https://example.com/d"] == 4
+        assert depth["https://example.com/island"] == -1
+
+    def test_pagerank_matches_networkx(self, graph):
+        reference = nx.DiGraph()
+        reference.add_nodes_from(graph.urls)
+        rows, cols = graph.matrix.nonzero()
+        reference.add_edges_from((graph.urls[i], graph.urls[j]) for i, j in zip(rows, cols))
+        expected = nx.pagerank(reference, alpha=0.85, tol=1e-12)
+
+        rank = graph.pagerank()
+        assert rank.sum() == pytest.approx(1.0)
+        for url, score in zip(graph.urls, rank):
+            assert score == pytest.approx(expected[url], abs=1e-6)
+
+    def test_analyze_reports_in_one_pass(self, graph):
+        report = graph.analyze(max_depth=3, min_inbound=2)
+
+        assert report.home_url == HOME
+        assert report.orphaned == ["https://example.com/lonely"]
+        assert sorted(report.unreachable) == ["https://example.com/island", "https://example.com/island2"]
+        assert report.deep_pages == ["https://example.com/d"]
+        assert "https://example.com/a" in report.weakly_linked
+        assert "https://example.com/lonely" not in report.weakly_linked
+        assert report.depth_distribution[-1] == 3
+        assert report.link_equity[0][1] >= report.link_equity[-1][1]
+
+    def test_large_graph(self):
+        """A million links are analyzed with sparse operations."""
+        rng = np.random.default_rng(0)
+        size = 100_000
+        sources = rng.integers(0, size, 1_000_000)
+        targets = rng.integers(1, size, 1_000_000)
+        urls = [HOME] + [f"https://example.com/p{i}" for i in range(1, size)]
+        graph = InternalLinkGraph.from_index_edges(urls, sources, targets)
+
+        report = graph.analyze()
+        assert report.total_pages == size
+        assert abs(sum(score for _, score in report.link_equity)) <= 1.0
+
+
+@pytest.fixture
+def session_factory():
+    engine = create_engine("sqlite:///:memory:", echo=False)
+    Base.metadata.create_all(engine)
+    return sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+@pytest.fixture
+def session_scope(session_factory):
+    project = Project(name="Example", domain="example.com", base_url=HOME)
+    session = session_factory()
+    session.add(project)
+    session.flush()
+    pages = {}
+    for url in {url for edge in EDGES for url in edge} | set(PAGES):
+        page = Page(project_id=project.id, title=url, slug=url.rsplit('/', 1)[-1] or "home", url=url)
+        session.add(page)
+        pages[url] = page
+    session.flush()
+    for i, (source, target) in enumerate(EDGES):
+        session.add(InternalLink(from_page_id=pages[source].id, to_page_id=pages[target].id, anchor_text=f"link {i}"))
+    session.add(InternalLink(
+        from_page_id=pages[HOME].id, to_page_id=pages["https://example.com/lonely"].id,
+        anchor_text="removed", is_active=False
+    ))
+    session.commit()
+
+    @contextmanager
+    def scope():
+        yield session_factory()
+
+    return scope
+
+
+class TestLinkGraphIntegration:
+    """Test loading from InternalLink and the orphan consumers."""
+
+    def test_load_from_database(self, session_scope, graph):
+        loaded = load_link_graph("example.com", session_scope)
+
+        assert sorted(loaded.urls) == sorted(graph.urls)
+        assert loaded.link_count == graph.link_count
+        assert loaded.analyze().orphaned == ["https://example.com/lonely"]
+        assert load_link_graph("unknown.org", session_scope) is None
+
+    def test_content_analyzer_uses_graph(self, graph):
+        urls = [HOME, "https://example.com/b", "https://example.com/island", "https://example.com/new"]
+        metrics = [_metrics(url) for url in urls]
+        quiet = _metrics("https://example.com/new-quiet")
+        quiet.internal_links_in = 0
+        metrics.append(quiet)
+
+        # Pages missing from the graph fall back to the inbound-link heuristic;
+        # an unknown home URL falls back to the graph's root
+        orphaned = ContentAnalyzer(Settings()).identify_orphaned_content(
+            metrics, link_graph=graph, home_url="https://example.com"
+        )
+        assert [m.url for m in orphaned] == ["https://example.com/island", "https://example.com/new-quiet"]
+
+    @pytest.mark.asyncio
+    async def test_coverage_monitor_orphans(self, graph):
+        monitor = CoverageFreshnessMonitor(Settings(), CoverageSLAConfig(min_internal_links=2), "example.com")
+
+        orphaned = await monitor.get_orphaned_pages(link_graph=graph)
+
+        assert orphaned[0] == "https://example.com/lonely"
+        assert set(orphaned[1:3]) == {"https://example.com/island", "https://example.com/island2"}
+        assert "https://example.com/a" in orphaned[3:]
@@ -0,0 +1,211 @@
+"""Unit tests for the PageRank link-equity engine."""
+
+from contextlib import contextmanager
+
+import networkx as nx
+import numpy as np
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from src.seo_bot.content.brief_generator import InternalLinkingStrategy
+from src.seo_bot.keywords.cluster import HubSpokeAnalyzer
+from src.seo_bot.linking.graph import InternalLinkGraph
+from src.seo_bot.linking.pagerank import (
+    LinkEquityEngine,
+    current_link_equity,
+    load_keyword_equity,
+    load_link_equity,
+    refresh_link_equity,
+    snapshot_path,
+)
+from src.seo_bot.models import Base, InternalLink, Page, Project
+
+
+HOME = "https://example.com/"
+
+
+def _site(size: int = 2000, links: int = 20_000, seed: int = 0) -> InternalLinkGraph:
+    rng = np.random.default_rng(seed)
+    urls = [HOME] + [f"https://example.com/p{i}" for i in range(1, size)]
+    return InternalLinkGraph.from_index_edges(urls, rng.integers(0, size, links), rng.integers(0, size, links))
+
+
+def _networkx(graph: InternalLinkGraph) -> nx.DiGraph:
+    reference = nx.DiGraph()
+    reference.add_nodes_from(graph.urls)
+    rows, cols = graph.matrix.nonzero()
+    reference.add_edges_from((graph.urls[i], graph.urls[j]) for i, j in zip(rows, cols))
+    return reference
+
+
+class TestLinkEquityEngine:
+    """Test global, personalized and incremental PageRank."""
+
+    def test_personalized_matches_networkx(self):
+        graph = _site(300, 1500)
+        seeds = {HOME: 2.0, "https://example.com/p7": 1.0}
+        expected = nx.pagerank(_networkx(graph), alpha=0.85, personalization=seeds, dangling=seeds, tol=1e-12)
+
+        scores = LinkEquityEngine(graph).personalized(seeds)
+
+        for url, score in expected.items():
+            assert scores.get(url, 0.0) == pytest.approx(score, abs=1e-6)
+        assert LinkEquityEngine(graph).personalized(["https://other.org/"]) == {}
+
+    def test_warm_started_update_matches_cold_start(self):
+        engine = LinkEquityEngine(_site())
+        engine.compute()
+        cold_iterations = engine.iterations
+
+        added = [(HOME, "https://example.com/new"), ("https://example.com/new", "https://example.com/p3")]
+        removed = [(url, target) for url, target in zip(engine.graph.urls[:5], engine.graph.urls[5:10])]
+        removed.append(next(
+            (engine.graph.urls[i], engine.graph.urls[j]) for i, j in zip(*engine.graph.matrix.nonzero())
+        ))
+        engine.update_links(added, removed)
+
+        cold = LinkEquityEngine(engine.graph)
+        cold.compute()
+        assert engine.iterations < cold.iterations <= cold_iterations + 5
+        np.testing.assert_allclose(engine.scores, cold.scores, atol=1e-8)
+        assert engine.score("https://example.com/new") > 0
+        assert engine.graph.link_count == cold.graph.link_count
+
+    def test_with_links(self):
+        graph = InternalLinkGraph.from_edges([(HOME, "https://example.com/a")], urls=[HOME])
+        updated = graph.with_links(
+            added=[("https://example.com/a", "https://example.com/b")],
+            removed=[(HOME, "https://example.com/a"), (HOME, "https://example.com/missing")]
+        )
+
+        assert graph.link_count == 1
+        assert updated.urls == [HOME, "https://example.com/a", "https://example.com/b"]
+        assert updated.link_count == 1
+        assert updated.in_degree().tolist() == [0, 0, 1]
+
+    def test_save_and_load(self, tmp_path):
+        engine = LinkEquityEngine(_site(200, 1000), damping=0.9)
+        engine.compute()
+        path = tmp_path / "equity" / "example.com.npz"
+        engine.save(path)
+
+        loaded = LinkEquityEngine.load(path)
+        assert loaded.damping == 0.9
+        assert loaded.graph.urls == engine.graph.urls
+        assert (loaded.graph.matrix != engine.graph.matrix).nnz == 0
+        np.testing.assert_array_equal(loaded.scores, engine.scores)
+        assert loaded.rank_by_need([HOME, "https://example.com/unknown"])[0] == ("https://example.com/unknown", None)
+
+
+@pytest.fixture
+def session_scope():
+    engine = create_engine("sqlite:///:memory:", echo=False)
+    Base.metadata.create_all(engine)
+    factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    session = factory()
+    project = Project(name="Example", domain="example.com", base_url=HOME)
+    session.add(project)
+    session.flush()
+    pages = [
+        Page(project_id=project.id, title=f"Page {i}", slug=f"p{i}", url=HOME if i == 0 else f"https://example.com/p{i}",
+             target_keywords=[f"keyword {i}"])
+        for i in range(40)
+    ]
+    session.add_all(pages)
+    session.flush()
+    for i, page in enumerate(pages):
+        for j in {(i + 1) % 40, (i * 7) % 40} - {i}:
+            session.add(InternalLink(from_page_id=page.id, to_page_id=pages[j].id, anchor_text=f"link {i}-{j}"))
+    session.commit()
+
+    @contextmanager
+    def scope():
+        yield factory()
+
+    return scope
+
+
+class TestNightlySnapshots:
+    """Test warm starts from saved snapshots."""
+
+    def test_zero_iterations_returns_start(self):
+        engine = LinkEquityEngine(_site(50, 200), max_iterations=0)
+        scores = engine.compute()
+        assert engine.iterations == 0
+        np.testing.assert_allclose(scores, np.full(50, 1 / 50))
+
+    def test_refresh_warm_starts_from_snapshot(self, session_scope, tmp_path):
+        cold = refresh_link_equity("example.com", session_scope, tmp_path)
+        assert snapshot_path("example.com", tmp_path).exists()
+
+        warm = load_link_equity("example.com", session_scope, tmp_path)
+        assert warm.iterations < cold.iterations
+        np.testing.assert_allclose(warm.scores, cold.scores, atol=1e-8)
+        assert refresh_link_equity("unknown.org", session_scope, tmp_path) is None
+
+    def test_current_equity_reads_snapshot(self, session_scope, tmp_path):
+        """A saved snapshot is used as is; the graph is loaded only without one."""
+        @contextmanager
+        def no_database():
+            raise RuntimeError("database unavailable")
+            yield
+
+        computed = current_link_equity("example.com", session_scope, tmp_path)
+        assert computed is not None and computed.scores is not None
+        assert current_link_equity("example.com", no_database, tmp_path) is None
+
+        refreshed = refresh_link_equity("example.com", session_scope, tmp_path)
+        snapshot = current_link_equity("example.com", no_database, tmp_path)
+        np.testing.assert_array_equal(snapshot.scores, refreshed.scores)
+
+    def test_keyword_equity_for_project(self, session_scope, tmp_path):
+        with session_scope() as session:
+            project_id = session.query(Project.id).scalar()
+
+        equity = load_keyword_equity(project_id, session_scope, tmp_path)
+        assert len(equity) == 40
+        assert np.mean(list(equity.values())) == pytest.approx(1.0)
+
+
+class TestLinkEquityConsumers:
+    """Test that briefs and hub-spoke analysis use the equity scores."""
+
+    def test_linking_strategy_prefers_pages_needing_equity(self):
+        graph = InternalLinkGraph.from_edges([
+            (HOME, "https://example.com/strong"),
+            ("https://example.com/weak", "https://example.com/strong"),
+            ("https://example.com/strong", HOME),
+        ])
+        strategy = InternalLinkingStrategy(link_equity=LinkEquityEngine(graph))
+        pages = [
+            {'url': url, 'title': name, 'target_keywords': ['coffee grinder'],
+             'link_equity': strategy._page_equity(url)}
+            for url, name in [
+                ("https://example.com/strong", "Strong"),
+                ("https://example.com/weak", "Weak"),
+                ("https://example.com/unlinked", "Unlinked"),
+            ]
+        ]
+
+        targets = strategy._identify_spoke_targets(['coffee grinder'], pages)
+        assert [p['title'] for p in targets[0]['target_pages']] == ["Unlinked", "Weak", "Strong"]
+
+        suggestions = strategy._generate_contextual_suggestions([{'title': 'Choosing a coffee grinder'}], pages)
+        assert [s['anchor_text_suggestion'] for s in suggestions[0]['link_suggestions']] == ["Unlinked", "Weak"]
+
+        unranked = InternalLinkingStrategy()._identify_spoke_targets(['coffee grinder'], pages)
+        assert [p['title'] for p in unranked[0]['target_pages']] == ["Strong", "Weak", "Unlinked"]
+
+    def test_hub_spoke_equity(self):
+        keywords = ["coffee", "coffee grinder", "coffee beans", "coffee filter"]
+        embeddings = np.array([[1.0, 0.1], [0.9, 0.2], [0.95, 0.15], [0.9, 0.1]])
+        equity = {"coffee": 3.0, "coffee grinder": 0.2, "coffee beans": 1.5}
+
+        analyzer = HubSpokeAnalyzer(hub_threshold=0.5, keyword_equity=equity)
+        relationship = analyzer.analyze_hub_spoke_relationships({0: keywords}, {0: embeddings})[0]
+
+        assert relationship['hub_equity'] == equity[relationship['hub_keyword']]
+        assert relationship['spokes_needing_equity'][0] == "coffee filter"
+        assert "coffee" not in relationship['spokes_needing_equity']
+        assert 'hub_equity' not in HubSpokeAnalyzer().analyze_hub_spoke_relationships({0: keywords}, {0: embeddings})[0]
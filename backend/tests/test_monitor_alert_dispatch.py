@@ -0,0 +1,96 @@
+"""Unit tests for indexed alert rule dispatch."""
+
+import pytest
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock
+
+from src.seo_bot.config import MonitoringConfig, Settings
+from src.seo_bot.models import AlertSeverity
+from src.seo_bot.monitor.alerts import AlertManager, AlertRule, AlertType, MetricSample
+
+
+def make_rule(rule_id, metric_name="lcp", project_ids=None, threshold=2500, cooldown_minutes=60):
+    """Greater-than rule with no notification channels."""
+    return AlertRule(
+        id=rule_id,
+        name=rule_id,
+        description=rule_id,
+        alert_type=AlertType.PERFORMANCE_DEGRADATION,
+        severity=AlertSeverity.HIGH,
+        metric_name=metric_name,
+        condition="gt",
+        threshold_value=threshold,
+        project_ids=project_ids,
+        cooldown_minutes=cooldown_minutes
+    )
+
+
+@pytest.fixture
+def manager():
+    """Alert manager with only test rules and notifications stubbed."""
+    manager = AlertManager(Settings(), MonitoringConfig())
+    manager.alert_rules.clear()
+    manager._send_alert_notifications = AsyncMock()
+    return manager
+
+
+class TestRuleIndex:
+    """Test rule lookup by metric and project."""
+
+    def test_lookup_combines_global_and_project_rules(self, manager):
+        """Project-targeted rules only apply to their projects."""
+        manager.alert_rules["global"] = make_rule("global")
+        manager.alert_rules["p1_only"] = make_rule("p1_only", project_ids=["p1"])
+        manager.alert_rules["other_metric"] = make_rule("other_metric", metric_name="cls")
+
+        assert [r.id for r in manager.rule_index.lookup("lcp", "p1")] == ["global", "p1_only"]
+        assert [r.id for r in manager.rule_index.lookup("lcp", "p2")] == ["global"]
+        assert manager.rule_index.lookup("inp", "p1") == []
+
+    def test_index_rebuilt_when_rules_change(self, manager):
+        """Adding or removing rules invalidates the index."""
+        manager.alert_rules["a"] = make_rule("a")
+        assert len(manager.rule_index.lookup("lcp", "p1")) == 1
+
+        manager.alert_rules["b"] = make_rule("b")
+        assert len(manager.rule_index.lookup("lcp", "p1")) == 2
+
+        del manager.alert_rules["a"]
+        assert [r.id for r in manager.rule_index.lookup("lcp", "p1")] == ["b"]
+
+
+class TestBatchEvaluation:
+    """Test tick-level evaluation."""
+
+    @pytest.mark.asyncio
+    async def test_tick_respects_targeting_and_cooldown(self, manager):
+        """A rule fires once per cooldown even if several samples breach it."""
+        manager.alert_rules["global"] = make_rule("global")
+        manager.alert_rules["p2_only"] = make_rule("p2_only", project_ids=["p2"])
+        tick = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+        alerts = await manager.evaluate_metrics([
+            MetricSample("lcp", 3000, "p1", "https://a.example/"),
+            MetricSample("lcp", 3500, "p2", "https://b.example/"),
+            MetricSample("lcp", 1000, "p2", "https://c.example/"),
+            MetricSample("cls", 0.5, "p1"),
+        ], tick_time=tick)
+
+        assert [(a.context["rule_id"], a.project_id) for a in alerts] == [("global", "p1"), ("p2_only", "p2")]
+
+        later = await manager.evaluate_metrics([MetricSample("lcp", 4000, "p1")], tick_time=tick + timedelta(minutes=30))
+        after_cooldown = await manager.evaluate_metrics([MetricSample("lcp", 4000, "p1")], tick_time=tick + timedelta(minutes=61))
+
+        assert later == []
+        assert len(after_cooldown) == 1
+
+    @pytest.mark.asyncio
+    async def test_suppression_window_and_single_sample_api(self, manager):
+        """Suppressed ticks raise nothing; evaluate_metric delegates to the batch path."""
+        manager.alert_rules["global"] = make_rule("global")
+        tick = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        manager.add_suppression_window(tick - timedelta(minutes=5), tick + timedelta(minutes=5))
+
+        assert await manager.evaluate_metric("lcp", 3000, "p1", timestamp=tick) == []
+        assert len(await manager.evaluate_metric("lcp", 3000, "p1", timestamp=tick + timedelta(minutes=10))) == 1
+        assert len(manager.metric_history["lcp"]) == 2
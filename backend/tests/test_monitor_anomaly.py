@@ -0,0 +1,106 @@
+"""Unit tests for online anomaly detection."""
+
+import numpy as np
+import pytest
+from datetime import datetime, timedelta, timezone
+
+from src.seo_bot.monitor.alerts import AnomalyDetector
+from src.seo_bot.monitor.anomaly import OnlineAnomalyDetector
+
+
+class TestOnlineAnomalyDetector:
+    """Test streaming statistics and batch scoring."""
+
+    def test_windowed_stats_match_numpy(self):
+        """Windowed Welford statistics equal a recomputation over the ring."""
+        rng = np.random.default_rng(1)
+        values = rng.normal(50, 5, 500)
+        detector = OnlineAnomalyDetector(window_size=64)
+        for value in values:
+            detector.update("lcp", value)
+
+        stats = detector.series_stats("lcp")
+
+        assert np.allclose(detector.recent_values("lcp"), values[-64:])
+        assert stats["window_mean"] == pytest.approx(values[-64:].mean())
+        assert stats["window_std"] == pytest.approx(values[-64:].std(ddof=1))
+        assert stats["count"] == 500
+
+    def test_outlier_flagged_and_not_absorbed_first(self):
+        """An outlier is scored against the baseline that preceded it."""
+        rng = np.random.default_rng(2)
+        detector = OnlineAnomalyDetector()
+        detector.seed("clicks", rng.normal(100, 3, 100))
+
+        normal = detector.score("clicks", 101.0)
+        spike = detector.score("clicks", 160.0)
+
+        assert not normal.is_anomaly
+        assert spike.is_anomaly
+        assert spike.expected_value == pytest.approx(100, abs=2)
+
+    def test_min_samples_required(self):
+        """New series never alert before enough history exists."""
+        detector = OnlineAnomalyDetector(min_samples=20)
+        detector.seed("new", [1.0, 1.1, 0.9])
+
+        assert not detector.score("new", 100.0).is_anomaly
+
+    def test_seasonal_baseline(self):
+        """A value normal overall but wrong for its hour is flagged."""
+        detector = OnlineAnomalyDetector(season_slots=24, min_samples=20)
+        base = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        rng = np.random.default_rng(3)
+        timestamps = [base + timedelta(hours=h) for h in range(24 * 14)]
+        # Night traffic is low, day traffic high
+        values = [(20 if ts.hour < 6 else 100) + rng.normal(0, 1) for ts in timestamps]
+        detector.seed("sessions", values, timestamps)
+
+        night = base + timedelta(days=14, hours=3)
+        result = detector.score("sessions", 100.0, night)
+
+        assert result.is_anomaly
+        assert result.seasonal_z_score > detector.z_threshold
+
+    def test_batch_matches_sequential_with_repeated_series(self):
+        """Batch scoring many series, including repeats, equals one-at-a-time updates."""
+        rng = np.random.default_rng(4)
+        keys = [f"url-{i % 50}" for i in range(400)]
+        values = rng.normal(10, 2, 400)
+
+        batched = OnlineAnomalyDetector(initial_series_capacity=8)
+        sequential = OnlineAnomalyDetector()
+        batched.score_batch(keys, values)
+        for key, value in zip(keys, values):
+            sequential.update(key, value)
+
+        assert len(batched) == 50
+        for key in ("url-0", "url-49"):
+            assert batched.series_stats(key) == pytest.approx(sequential.series_stats(key))
+
+    def test_ring_widens_lazily(self):
+        """Short series do not reserve a full window each."""
+        detector = OnlineAnomalyDetector(window_size=1000)
+        detector.score_batch([f"url-{i}" for i in range(5000)], np.ones(5000))
+        assert detector._ring.nbytes < 5000 * 1000 * 8 / 10
+
+        values = np.arange(1500, dtype=np.float64)
+        detector.seed("long", values)
+        assert detector._ring.shape[1] == 1000
+        assert np.allclose(detector.recent_values("long"), values[-1000:])
+        assert np.allclose(detector.recent_values("url-7"), [1.0])
+
+
+class TestAnomalyDetectorSeries:
+    """Test that seeded baselines are the ones evaluation scores against."""
+
+    def test_seeded_baseline_used_for_project_url_series(self):
+        rng = np.random.default_rng(5)
+        detector = AnomalyDetector()
+        detector.train_model("clicks", rng.normal(100, 3, 100), project_id="p1", url="https://example.com/")
+
+        key = AnomalyDetector.series_key("clicks", "p1", "https://example.com/")
+        spike = detector.score_batch([key], [160.0])[0]
+        assert spike.is_anomaly
+        assert spike.expected_value == pytest.approx(100, abs=2)
+        assert detector.detect_anomaly("clicks", 160.0, project_id="p1", url="https://example.com/")[0]
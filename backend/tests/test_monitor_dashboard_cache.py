@@ -0,0 +1,169 @@
+"""Unit tests for the dashboard state cache."""
+
+import asyncio
+import pytest
+from datetime import datetime, timezone
+from unittest.mock import patch
+
+from src.seo_bot.monitor.dashboard import (
+    DashboardDataProcessor,
+    DashboardStateCache,
+    MetricData,
+    MetricType,
+    TimeRange,
+)
+from src.seo_bot.monitor.metric_store import MetricHistoryStore
+
+
+def _tick(traffic: float = 1000.0, lcp: float = 2000.0):
+    now = datetime.now(timezone.utc)
+    return [
+        MetricData(now, traffic, "organic_traffic", MetricType.TRAFFIC, {"source": "gsc"}),
+        MetricData(now, lcp, "lcp", MetricType.TECHNICAL, {"device": "mobile"}),
+        MetricData(now, 85.0, "performance_score", MetricType.TECHNICAL, {"device": "mobile"}),
+    ]
+
+
+class CountingCollector:
+    """Collect callback that counts calls and can be held open."""
+
+    def __init__(self):
+        self.calls = 0
+        self.release = asyncio.Event()
+        self.release.set()
+
+    async def __call__(self, project_id):
+        self.calls += 1
+        await self.release.wait()
+        return _tick()
+
+
+def _cache(collector=None, ttl=60.0):
+    store = MetricHistoryStore()
+    cache = DashboardStateCache(DashboardDataProcessor(), store, collector or CountingCollector(), ttl=ttl)
+    return cache, store
+
+
+def _record(cache, store, project_id, metrics):
+    store.append(project_id, metrics)
+    cache.record(project_id, metrics)
+
+
+class TestDashboardStateCache:
+    """Test memoization, invalidation and coalescing."""
+
+    @pytest.mark.asyncio
+    async def test_hit_until_new_metrics_arrive(self):
+        """Repeated reads are served from cache until the project receives metrics."""
+        cache, store = _cache()
+        _record(cache, store, "p1", _tick())
+
+        first = await cache.get("p1", TimeRange.LAST_DAY)
+        second = await cache.get("p1", TimeRange.LAST_DAY)
+        assert second is first
+        assert cache.stats["hits"] == 1
+
+        _record(cache, store, "p2", _tick())
+        assert await cache.get("p1", TimeRange.LAST_DAY) is first
+
+        _record(cache, store, "p1", _tick(traffic=1200.0))
+        third = await cache.get("p1", TimeRange.LAST_DAY)
+        assert third is not first
+        assert cache.stats["partial_builds"] == 1
+
+        traffic = next(w for w in third["kpi_widgets"] if w["id"] == "kpi_organic_traffic")
+        assert traffic["current_value"] == 1200.0
+
+    @pytest.mark.asyncio
+    async def test_only_changed_widgets_are_rebuilt(self):
+        """A traffic-only arrival reuses technical charts and widgets."""
+        cache, store = _cache()
+        _record(cache, store, "p1", _tick())
+        first = await cache.get("p1", TimeRange.LAST_DAY)
+
+        processor = cache.data_processor
+        with patch.object(processor, "create_chart_data", wraps=processor.create_chart_data) as charts, \
+                patch.object(processor, "create_kpi_widgets", wraps=processor.create_kpi_widgets) as widgets, \
+                patch.object(processor, "calculate_system_health", wraps=processor.calculate_system_health):
+            now = datetime.now(timezone.utc)
+            _record(cache, store, "p1", [MetricData(now, 1500.0, "organic_traffic", MetricType.TRAFFIC)])
+            second = await cache.get("p1", TimeRange.LAST_DAY)
+
+        assert charts.call_count == 1
+        assert widgets.call_count == 1
+        technical_before = next(c for c in first["charts"] if c["chart_id"] == "chart_technical")
+        technical_after = next(c for c in second["charts"] if c["chart_id"] == "chart_technical")
+        assert technical_after is technical_before
+        assert [w["id"] for w in second["kpi_widgets"]] == [w["id"] for w in first["kpi_widgets"]]
+
+    @pytest.mark.asyncio
+    async def test_ttl_forces_full_rebuild(self):
+        """An expired entry is rebuilt from scratch."""
+        cache, store = _cache(ttl=0.0)
+        _record(cache, store, "p1", _tick())
+
+        await cache.get("p1", TimeRange.LAST_DAY)
+        await cache.get("p1", TimeRange.LAST_DAY)
+
+        assert cache.stats["full_builds"] == 2
+        assert cache.stats["hits"] == 0
+
+    @pytest.mark.asyncio
+    async def test_expired_project_without_update_loop_is_recollected(self):
+        """Once the TTL lapses with no recorded metrics, the project is collected again."""
+        collector = CountingCollector()
+        cache, _ = _cache(collector, ttl=60.0)
+
+        await cache.get("p1", TimeRange.LAST_DAY)
+        await cache.get("p1", TimeRange.LAST_DAY)
+        assert collector.calls == 1
+
+        cache.recorded_at["p1"] -= 61.0
+        cache.entries[("p1", TimeRange.LAST_DAY)].computed_at -= 61.0
+        await cache.get("p1", TimeRange.LAST_DAY)
+        assert collector.calls == 2
+
+    @pytest.mark.asyncio
+    async def test_fed_project_is_not_recollected(self):
+        """Metrics recorded within the TTL are used as they are."""
+        collector = CountingCollector()
+        cache, store = _cache(collector, ttl=60.0)
+        _record(cache, store, "p1", _tick())
+
+        await cache.get("p1", TimeRange.LAST_DAY)
+        _record(cache, store, "p1", _tick(traffic=1300.0))
+        await cache.get("p1", TimeRange.LAST_DAY)
+
+        assert collector.calls == 0
+
+    @pytest.mark.asyncio
+    async def test_concurrent_requests_share_one_build(self):
+        """Simultaneous requests for a project and range collect once."""
+        collector = CountingCollector()
+        collector.release.clear()
+        cache, _ = _cache(collector)
+
+        requests = [asyncio.ensure_future(cache.get("p1", TimeRange.LAST_DAY)) for _ in range(5)]
+        await asyncio.sleep(0)
+        collector.release.set()
+        states = await asyncio.gather(*requests)
+
+        assert collector.calls == 1
+        assert all(state is states[0] for state in states)
+        assert cache.stats["coalesced"] == 4
+        assert cache.stats["full_builds"] == 1
+
+    @pytest.mark.asyncio
+    async def test_ranges_are_cached_separately(self):
+        """Each time range has its own entry."""
+        cache, store = _cache()
+        _record(cache, store, "p1", _tick())
+
+        day = await cache.get("p1", TimeRange.LAST_DAY)
+        week = await cache.get("p1", TimeRange.LAST_WEEK)
+
+        assert day is not week
+        assert set(cache.entries) == {("p1", TimeRange.LAST_DAY), ("p1", TimeRange.LAST_WEEK)}
+
+        cache.invalidate("p1")
+        assert cache.entries == {}
@@ -0,0 +1,220 @@
+"""Unit tests for dashboard WebSocket broadcasting."""
+
+import asyncio
+import json
+import numpy as np
+import pytest
+from datetime import datetime, timezone
+
+from src.seo_bot.monitor.dashboard import (
+    DashboardWebSocketManager,
+    MetricType,
+    apply_state_delta,
+    compute_state_delta,
+    dumps_payload,
+)
+
+
+class FakeWebSocket:
+    """Records text frames; optionally blocks until released."""
+
+    def __init__(self, blocked: bool = False):
+        self.sent = []
+        self.release = asyncio.Event()
+        if not blocked:
+            self.release.set()
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, text: str):
+        await self.release.wait()
+        self.sent.append(json.loads(text))
+
+
+def _state(traffic: float, position: float = 12.0):
+    return {
+        "project_id": "p1",
+        "kpi_widgets": [
+            {"id": "kpi_organic_traffic", "current_value": traffic, "threshold_warning": None},
+            {"id": "kpi_average_position", "current_value": position, "threshold_warning": None},
+        ],
+        "system_health": {"status": "healthy", "issues": []},
+    }
+
+
+class TestStateDelta:
+    """Test delta computation and application."""
+
+    def test_round_trip(self):
+        """Applying a delta reproduces the new state."""
+        old = {"a": 1, "b": {"c": [1, 2, 3], "d": None}, "gone": True}
+        new = {"a": 1, "b": {"c": [1, 5, 3], "d": "x"}, "e": [1]}
+
+        changed, removed = compute_state_delta(old, new)
+
+        assert apply_state_delta(old, changed, removed) == new
+        assert (["b", "c", 1], 5) in changed
+        assert ["gone"] in removed
+        assert all(path[0] != "a" for path, _ in changed)
+
+    def test_lists_of_different_length_are_replaced(self):
+        """Resized lists are sent whole."""
+        changed, removed = compute_state_delta({"x": [1, 2]}, {"x": [1, 2, 3]})
+
+        assert changed == [(["x"], [1, 2, 3])]
+        assert removed == []
+
+    def test_payload_encoding(self):
+        """Datetimes, enums and NumPy scalars encode the same with or without orjson."""
+        payload = json.loads(dumps_payload({
+            "at": datetime(2024, 3, 1, tzinfo=timezone.utc),
+            "type": MetricType.TRAFFIC,
+            "score": np.float64(91.5),
+            "count": np.int64(3),
+        }))
+
+        assert payload == {"at": "2024-03-01T00:00:00+00:00", "type": "traffic", "score": 91.5, "count": 3}
+
+    def test_identical_states_have_empty_delta(self):
+        """No operations are produced for unchanged states."""
+        assert compute_state_delta(_state(10.0), _state(10.0)) == ([], [])
+
+
+class TestDashboardWebSocketManager:
+    """Test project indexing, deltas and backpressure."""
+
+    @pytest.mark.asyncio
+    async def test_broadcast_only_reaches_project(self):
+        """Updates go to the target project's connections only."""
+        manager = DashboardWebSocketManager()
+        ws_a, ws_b = FakeWebSocket(), FakeWebSocket()
+        await manager.connect(ws_a, "p1")
+        await manager.connect(ws_b, "p2")
+
+        await manager.broadcast_update({"type": "ping"}, "p1")
+
+        assert ws_a.sent == [{"type": "ping"}]
+        assert ws_b.sent == []
+        assert set(manager.project_connections) == {"p1", "p2"}
+
+    @pytest.mark.asyncio
+    async def test_delta_after_ack(self):
+        """Clients get a snapshot first, then deltas against their acknowledged version."""
+        manager = DashboardWebSocketManager()
+        ws = FakeWebSocket()
+        await manager.connect(ws, "p1")
+
+        first = await manager.broadcast_state("p1", _state(100.0))
+        assert ws.sent[-1]["type"] == "dashboard_update"
+        assert ws.sent[-1]["version"] == first
+
+        await manager.handle_message(ws, json.dumps({"type": "ack", "version": first}))
+        second = await manager.broadcast_state("p1", _state(110.0))
+
+        delta = ws.sent[-1]
+        assert delta["type"] == "dashboard_delta"
+        assert delta["base_version"] == first
+        assert delta["version"] == second
+        assert delta["set"] == [[["kpi_widgets", 0, "current_value"], 110.0]]
+        assert apply_state_delta(ws.sent[0]["data"], delta["set"], delta["unset"]) == _state(110.0)
+
+    @pytest.mark.asyncio
+    async def test_unacknowledged_client_gets_snapshots(self):
+        """Without an ack, or after a resync request, the full state is sent."""
+        manager = DashboardWebSocketManager()
+        ws = FakeWebSocket()
+        await manager.connect(ws, "p1")
+
+        version = await manager.broadcast_state("p1", _state(1.0))
+        await manager.broadcast_state("p1", _state(2.0))
+        assert [m["type"] for m in ws.sent] == ["dashboard_update", "dashboard_update"]
+
+        await manager.handle_message(ws, json.dumps({"type": "ack", "version": version}))
+        await manager.handle_message(ws, json.dumps({"type": "resync"}))
+        await manager.broadcast_state("p1", _state(3.0))
+        assert ws.sent[-1]["type"] == "dashboard_update"
+
+    @pytest.mark.asyncio
+    async def test_evicted_base_falls_back_to_snapshot(self):
+        """A client acked on a version no longer in history gets a snapshot."""
+        manager = DashboardWebSocketManager(history_size=2)
+        ws = FakeWebSocket()
+        await manager.connect(ws, "p1")
+
+        version = await manager.broadcast_state("p1", _state(1.0))
+        manager.acknowledge(ws, version)
+        await manager.broadcast_state("p1", _state(2.0))
+        await manager.broadcast_state("p1", _state(3.0))
+
+        assert ws.sent[-1]["type"] == "dashboard_update"
+        assert ws.sent[-1]["data"] == _state(3.0)
+
+    @pytest.mark.asyncio
+    async def test_payload_serialized_once_per_base(self, monkeypatch):
+        """Clients sharing an acknowledged version share one encoded payload."""
+        manager = DashboardWebSocketManager()
+        sockets = [FakeWebSocket() for _ in range(5)]
+        for ws in sockets:
+            await manager.connect(ws, "p1")
+
+        calls = []
+        original = manager._encode_state
+        monkeypatch.setattr(manager, "_encode_state", lambda *args: calls.append(args[2]) or original(*args))
+
+        version = await manager.broadcast_state("p1", _state(1.0))
+        for ws in sockets[:3]:
+            manager.acknowledge(ws, version)
+        await manager.broadcast_state("p1", _state(2.0))
+
+        assert calls == [None, version, None] or calls == [None, None, version]
+
+    @pytest.mark.asyncio
+    async def test_slow_client_does_not_block_and_is_conflated(self):
+        """A blocked client keeps only the newest pending payload while others proceed."""
+        manager = DashboardWebSocketManager(send_timeout=0.05)
+        fast, slow = FakeWebSocket(), FakeWebSocket(blocked=True)
+        await manager.connect(fast, "p1")
+        await manager.connect(slow, "p1")
+
+        for value in (1.0, 2.0, 3.0):
+            await manager.broadcast_state("p1", _state(value))
+
+        assert len(fast.sent) == 3
+        assert slow.sent == []
+        assert manager.clients[slow].dropped_updates == 1
+
+        slow.release.set()
+        await asyncio.sleep(0.01)
+
+        # The in-flight first payload, then only the latest one
+        assert [m["data"]["kpi_widgets"][0]["current_value"] for m in slow.sent] == [1.0, 3.0]
+
+    @pytest.mark.asyncio
+    async def test_stalled_client_is_dropped(self):
+        """A client stuck on one send past the stall timeout is disconnected."""
+        manager = DashboardWebSocketManager(send_timeout=0.01, stall_timeout=0.0)
+        slow = FakeWebSocket(blocked=True)
+        await manager.connect(slow, "p1")
+
+        await manager.broadcast_state("p1", _state(1.0))
+        await asyncio.sleep(0.01)
+        await manager.broadcast_state("p1", _state(2.0))
+
+        assert slow not in manager.clients
+        assert "p1" not in manager.project_connections
+
+    @pytest.mark.asyncio
+    async def test_failed_send_disconnects(self):
+        """Send errors remove the connection."""
+        manager = DashboardWebSocketManager()
+        ws = FakeWebSocket()
+
+        async def fail(text):
+            raise RuntimeError("closed")
+
+        ws.send_text = fail
+        await manager.connect(ws, "p1")
+        await manager.broadcast_update({"type": "ping"}, "p1")
+
+        assert manager.active_connections == []
@@ -0,0 +1,149 @@
+"""Unit tests for the dashboard metric history store."""
+
+import pytest
+from datetime import datetime, timedelta, timezone
+
+from src.seo_bot.monitor.dashboard import (
+    DashboardServer,
+    MetricData,
+    MetricType,
+    TimeRange,
+)
+from src.seo_bot.monitor.metric_store import MetricHistoryStore, RAW, MINUTE, HOUR, DAY
+from src.seo_bot.config import MonitoringConfig, Settings
+
+
+BASE = datetime(2024, 3, 1, 12, 0, tzinfo=timezone.utc)
+
+
+def _metric(offset_seconds: float, value: float, name: str = "lcp", dimensions=None) -> MetricData:
+    return MetricData(
+        timestamp=BASE + timedelta(seconds=offset_seconds),
+        value=value,
+        metric_name=name,
+        metric_type=MetricType.TECHNICAL,
+        dimensions=dimensions if dimensions is not None else {"device": "mobile"}
+    )
+
+
+class TestMetricHistoryStore:
+    """Test appends, rollups and retention."""
+
+    def test_raw_round_trip(self):
+        """Raw samples come back per project in time order."""
+        store = MetricHistoryStore()
+        store.append("p1", [_metric(30, 2.0), _metric(0, 1.0)])
+        store.append("p2", [_metric(0, 9.0)])
+
+        points = store.query("p1", since=BASE - timedelta(hours=1), resolution=RAW)
+
+        assert [p.value for p in points] == [1.0, 2.0]
+        assert points[0].metric_type == MetricType.TECHNICAL
+        assert points[0].dimensions == {"device": "mobile"}
+        assert points[0].timestamp == BASE
+
+    def test_rollups_aggregate_buckets(self):
+        """Each resolution keeps count/mean/min/max/last per bucket."""
+        store = MetricHistoryStore()
+        store.append("p1", [_metric(0, 10.0), _metric(30, 20.0), _metric(90, 60.0)])
+
+        minutes = store.query("p1", since=BASE, resolution=MINUTE)
+        assert [(p.timestamp, p.value) for p in minutes] == [
+            (BASE, 15.0),
+            (BASE + timedelta(minutes=1), 60.0),
+        ]
+
+        hours = store.rollup_stats("p1", "lcp", HOUR, since=BASE)
+        assert len(hours) == 1
+        assert hours[0]["count"] == 3
+        assert hours[0]["mean"] == pytest.approx(30.0)
+        assert hours[0]["min"] == 10.0
+        assert hours[0]["max"] == 60.0
+        assert hours[0]["last"] == 60.0
+
+    def test_late_sample_does_not_replace_last(self):
+        """An out-of-order sample updates the aggregates but not the latest value."""
+        store = MetricHistoryStore()
+        store.append("p1", [_metric(40, 5.0)])
+        store.append("p1", [_metric(10, 1.0)])
+
+        stats = store.rollup_stats("p1", "lcp", MINUTE, since=BASE)
+
+        assert stats[0]["count"] == 2
+        assert stats[0]["last"] == 5.0
+
+    def test_dimensions_are_separate_series(self):
+        """Series differing only by dimensions are rolled up separately."""
+        store = MetricHistoryStore()
+        store.append("p1", [
+            _metric(0, 1.0, dimensions={"device": "mobile"}),
+            _metric(0, 3.0, dimensions={"device": "desktop"}),
+        ])
+
+        points = store.query("p1", since=BASE, resolution=DAY)
+
+        assert sorted(p.value for p in points) == [1.0, 3.0]
+
+    def test_query_filters(self):
+        """Queries filter by metric type and name."""
+        store = MetricHistoryStore()
+        store.append("p1", [
+            _metric(0, 1.0, name="lcp"),
+            MetricData(BASE, 100.0, "organic_traffic", MetricType.TRAFFIC, {"source": "gsc"}),
+        ])
+
+        assert [p.metric_name for p in store.query("p1", BASE, metric_types=["traffic"])] == ["organic_traffic"]
+        assert [p.metric_name for p in store.query("p1", BASE, metric_names=["lcp"], resolution=HOUR)] == ["lcp"]
+
+    def test_compact_applies_retention_per_resolution(self):
+        """Compaction drops raw rows before the daily rollups that summarize them."""
+        store = MetricHistoryStore()
+        store.append("p1", [_metric(0, 1.0)])
+
+        deleted = store.compact(now=BASE + timedelta(days=10))
+
+        assert deleted[RAW] == 1
+        assert deleted[MINUTE] == 1
+        assert deleted[HOUR] == 0
+        assert deleted[DAY] == 0
+        assert store.query("p1", BASE - timedelta(days=1), resolution=RAW) == []
+        assert len(store.query("p1", BASE - timedelta(days=1), resolution=DAY)) == 1
+
+    def test_persists_across_reopen(self, tmp_path):
+        """History survives closing and reopening the database file."""
+        db_path = tmp_path / "metrics" / "history.db"
+        store = MetricHistoryStore(db_path)
+        store.append("p1", [_metric(0, 4.0)])
+        store.close()
+
+        reopened = MetricHistoryStore(db_path)
+        assert [p.value for p in reopened.query("p1", BASE, resolution=MINUTE)] == [4.0]
+
+    def test_rejects_unknown_resolution(self):
+        """Only configured rollup resolutions can be queried."""
+        with pytest.raises(ValueError):
+            MetricHistoryStore().query("p1", BASE, resolution=300)
+
+
+class TestDashboardHistory:
+    """Test the dashboard reading history from the store."""
+
+    @pytest.mark.asyncio
+    async def test_dashboard_state_reads_range_rollup(self):
+        """Charts for a week are drawn from hourly rollups of stored samples."""
+        store = MetricHistoryStore()
+        server = DashboardServer(Settings(), MonitoringConfig(), metric_store=store)
+
+        now = datetime.now(timezone.utc)
+        server.record_metrics("p1", [
+            MetricData(now - timedelta(days=2, seconds=i * 30), 1000.0 + i, "organic_traffic", MetricType.TRAFFIC)
+            for i in range(10)
+        ])
+        server.record_metrics("other", [MetricData(now, 5.0, "organic_traffic", MetricType.TRAFFIC)])
+
+        state = await server._get_dashboard_state("p1", TimeRange.LAST_WEEK)
+
+        traffic_chart = next(c for c in state["charts"] if c["chart_id"] == "chart_traffic")
+        history = [p for p in traffic_chart["data_points"] if p["metric_name"] == "organic_traffic"]
+        assert len(history) <= 2
+        assert sum(p["value"] for p in history) / len(history) == pytest.approx(1004.5, abs=5)
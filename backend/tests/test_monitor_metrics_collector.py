@@ -0,0 +1,113 @@
+"""Unit tests for concurrent dashboard metric collection."""
+
+import asyncio
+import time
+import pytest
+from datetime import datetime, timezone
+from unittest.mock import patch
+
+from src.seo_bot.monitor.dashboard import MetricData, MetricsCollector, MetricType
+from src.seo_bot.config import Settings
+
+
+def _metric(name: str, metric_type: MetricType, value: float = 1.0) -> MetricData:
+    return MetricData(datetime.now(timezone.utc), value, name, metric_type)
+
+
+class TestConcurrentCollection:
+    """Test deadlines, stale fallbacks and latency tracking."""
+
+    @pytest.mark.asyncio
+    async def test_sources_run_concurrently(self):
+        """Total collection time is bounded by the slowest source, not the sum."""
+        collector = MetricsCollector(Settings())
+
+        async def slow(*args):
+            await asyncio.sleep(0.1)
+            return [_metric("x", MetricType.TRAFFIC)]
+
+        with patch.object(collector, "collect_traffic_metrics", slow), \
+                patch.object(collector, "collect_technical_metrics", slow), \
+                patch.object(collector, "collect_content_metrics", slow):
+            started = time.perf_counter()
+            metrics = await collector.collect_all_metrics("p1", "example.com")
+            elapsed = time.perf_counter() - started
+
+        assert len(metrics) == 3
+        assert elapsed < 0.25
+
+    @pytest.mark.asyncio
+    async def test_timeout_serves_last_known_good_as_stale(self):
+        """A source that misses its deadline returns its previous metrics marked stale."""
+        collector = MetricsCollector(Settings(), source_timeouts={"technical": 0.05})
+        first = await collector.collect_all_metrics("p1", "example.com")
+        previous_lcp = next(m for m in first if m.metric_name == "lcp")
+
+        async def hang(domain):
+            await asyncio.sleep(1)
+
+        with patch.object(collector, "collect_technical_metrics", hang):
+            results = await collector.collect_sources("p1", "example.com")
+
+        technical = results["technical"]
+        assert technical.stale
+        assert technical.outcome == "timeout"
+        lcp = next(m for m in technical.metrics if m.metric_name == "lcp")
+        assert lcp.stale
+        assert lcp.value == previous_lcp.value
+        assert lcp.timestamp == previous_lcp.timestamp
+
+        assert not results["traffic"].stale
+        assert all(not m.stale for m in results["traffic"].metrics)
+
+    @pytest.mark.asyncio
+    async def test_error_without_history_returns_nothing(self):
+        """A failing source with no earlier result contributes no metrics."""
+        collector = MetricsCollector(Settings())
+
+        async def fail(project_id):
+            raise RuntimeError("quota exceeded")
+
+        with patch.object(collector, "collect_content_metrics", fail):
+            metrics = await collector.collect_all_metrics("p1", "example.com")
+
+        assert all(m.metric_type != MetricType.CONTENT for m in metrics)
+        status = collector.last_collection[("content", "p1")]
+        assert status.outcome == "error"
+        assert status.error == "quota exceeded"
+        assert collector.metrics_buffer == metrics
+
+    @pytest.mark.asyncio
+    async def test_last_known_good_is_per_project(self):
+        """Fallback values never leak between projects."""
+        collector = MetricsCollector(Settings())
+        await collector.collect_all_metrics("p1", "one.example")
+
+        async def empty(*args):
+            return []
+
+        with patch.object(collector, "collect_traffic_metrics", empty):
+            results = await collector.collect_sources("p2", "two.example")
+
+        assert results["traffic"].metrics == []
+        assert results["traffic"].outcome == "empty"
+
+    @pytest.mark.asyncio
+    async def test_source_stats(self):
+        """Latency percentiles and latest outcome are reported per source."""
+        collector = MetricsCollector(Settings(), source_timeouts={"traffic": 0.01})
+
+        async def hang(project_id):
+            await asyncio.sleep(1)
+
+        await collector.collect_all_metrics("p1", "example.com")
+        with patch.object(collector, "collect_traffic_metrics", hang):
+            await collector.collect_all_metrics("p1", "example.com")
+
+        stats = collector.get_source_stats()
+
+        assert set(stats) == {"traffic", "technical", "content"}
+        assert stats["traffic"]["collections"] == 2
+        assert stats["traffic"]["last_outcome"] == "timeout"
+        assert stats["traffic"]["latency_max_seconds"] >= 0.01
+        assert stats["technical"]["last_outcome"] == "ok"
@@ -0,0 +1,290 @@
+"""Unit tests for the streaming content-pruning pipeline."""
+
+import gzip
+import json
+from contextlib import contextmanager
+from unittest.mock import AsyncMock
+
+import httpx
+import pytest
+from scipy import sparse
+
+from src.seo_bot.config import Settings
+from src.seo_bot.prune.optimization import (
+    ContentAction,
+    ContentPruningManager,
+    ContentSimilarityAnalyzer,
+    ImpactSummary,
+)
+from src.seo_bot.prune.pipeline import (
+    CollectingRecordWriter,
+    StreamingPruningPipeline,
+    _strip_blocks,
+    open_record_writer,
+    parse_sitemap,
+)
+
+
+SITE = "https://example.com"
+
+URLSET = """<?xml version="1.0" encoding="UTF-8"?>
+<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
+{entries}
+</urlset>"""
+
+
+def _urlset(paths, lastmod="2024-01-15"):
+    entries = "\n".join(f"<url><loc>{SITE}{path}</loc><lastmod>{lastmod}</lastmod></url>" for path in paths)
+    return URLSET.format(entries=entries).encode()
+
+
+def _page(title, body):
+    paragraphs = "".join(f"<p>{body} Paragraph {i} adds a little more detail.</p>" for i in range(3))
+    return (
+        f"<html><head><title>{title}</title><script>var tracking = 'ignored words';</script></head>"
+        f"<body><h1>{title}</h1>{paragraphs}"
+        f"<a href=\"/other\">Other</a><a href=\"https://elsewhere.org/\">Source</a></body></html>"
+    )
+
+
+DUPLICATE_BODY = (
+    "Composting kitchen scraps at home reduces landfill waste and produces rich soil for gardens "
+    "while saving money on fertilizer every single season of the year."
+)
+
+PAGES = {
+    "/": (
+        "<html><head><title>Home</title></head><body><p>Welcome to the garden and bike blog.</p>"
+        "<a href=\"/compost#intro\">Compost</a><a href=\"/bikes\">Bikes</a></body></html>"
+    ),
+    "/compost": _page("Home composting guide", DUPLICATE_BODY),
+    "/compost-copy": _page("Home composting guide", DUPLICATE_BODY),
+    "/bikes": _page("Choosing a city bike", "Frame size, gearing and tyre width matter most when picking a bike for commuting."),
+    # Same topic as /compost in different words: few shared 5-word shingles
+    "/compost-tips": _page(
+        "Composting at home",
+        "Kitchen scraps composting at home produces rich garden soil, cuts landfill waste "
+        "and saves money on fertilizer each season."
+    ),
+}
+
+
+@contextmanager
+def _no_database():
+    raise RuntimeError("database unavailable")
+    yield
+
+
+def _handler(request: httpx.Request) -> httpx.Response:
+    path = request.url.path
+    if path == "/sitemap.xml":
+        index = (
+            '<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">'
+            f"<sitemap><loc>{SITE}/posts.xml.gz</loc></sitemap>"
+            f"<sitemap><loc>{SITE}/pages.xml</loc></sitemap>"
+            "</sitemapindex>"
+        )
+        return httpx.Response(200, content=index.encode())
+    if path == "/posts.xml.gz":
+        return httpx.Response(200, content=gzip.compress(_urlset(["/compost", "/compost-copy"])))
+    if path == "/pages.xml":
+        return httpx.Response(200, content=_urlset(["/bikes", "/missing"]))
+    if path in PAGES:
+        return httpx.Response(200, text=PAGES[path], headers={"content-type": "text/html; charset=utf-8"})
+    return httpx.Response(404, text="not found")
+
+
+def _pipeline(**kwargs):
+    client = httpx.AsyncClient(transport=httpx.MockTransport(_handler))
+    manager = ContentPruningManager(Settings())
+    return StreamingPruningPipeline(
+        manager, fetch_concurrency=2, batch_size=2, client=client, session_scope=_no_database, **kwargs
+    )
+
+
+class TestSitemapParsing:
+    """Test sitemap parsing."""
+
+    def test_parses_urls_and_gzip(self):
+        """Plain and gzipped sitemaps yield the same entries."""
+        data = _urlset(["/a", "/b"], lastmod="2024-03-01T10:00:00Z")
+        plain = list(parse_sitemap(data))
+        assert plain == list(parse_sitemap(gzip.compress(data)))
+        assert [(kind, loc) for kind, loc, _ in plain] == [("url", f"{SITE}/a"), ("url", f"{SITE}/b")]
+        assert plain[0][2].year == 2024 and plain[0][2].tzinfo is not None
+
+    def test_strip_blocks_removes_scripts(self):
+        """Script and style contents never reach the text profile."""
+        html = "<p>keep</p><script>drop()</script><style>.x{}</style><p>also</p>"
+        stripped = _strip_blocks(html)
+        assert "drop" not in stripped and ".x" not in stripped
+        assert "keep" in stripped and "also" in stripped
+
+
+class TestStreamingPruningPipeline:
+    """Test the end-to-end streaming analysis."""
+
+    @pytest.mark.asyncio
+    async def test_streams_records_from_sitemap_index(self):
+        """Every sitemap URL produces a page or error record."""
+        writer = CollectingRecordWriter()
+        summary = await _pipeline().run("example.com", writer)
+
+        pages = {r["url"]: r for r in writer.records if r["record_type"] == "page"}
+        errors = [r for r in writer.records if r["record_type"] == "error"]
+        assert set(pages) == {f"{SITE}/compost", f"{SITE}/compost-copy", f"{SITE}/bikes"}
+        assert [e["url"] for e in errors] == [f"{SITE}/missing"]
+        assert errors[0]["status_code"] == 404
+        assert summary["total_urls_analyzed"] == 3 and summary["failed_urls"] == 1
+
+        metrics = pages[f"{SITE}/bikes"]["metrics"]
+        assert metrics["title"] == "Choosing a city bike"
+        assert metrics["internal_links_out"] == 1 and metrics["external_links"] == 1
+        assert metrics["content_age_days"] > 0
+        assert "tracking" not in json.dumps(metrics)
+
+    @pytest.mark.asyncio
+    async def test_duplicates_become_merge_recommendations(self):
+        """Near-identical pages are paired and merged into one another."""
+        writer = CollectingRecordWriter()
+        summary = await _pipeline().run("example.com", writer)
+
+        merges = [r for r in writer.records if r["record_type"] == "merge"]
+        assert len(merges) == 1
+        recommendation = merges[0]["recommendation"]
+        assert recommendation["action"] == ContentAction.MERGE.value
+        assert {recommendation["url"], recommendation["target_url"]} == {f"{SITE}/compost", f"{SITE}/compost-copy"}
+        assert summary["impact_summary"]["action_breakdown"]["merge"] == 1
+
+    @pytest.mark.asyncio
+    async def test_topical_overlap_is_similar(self):
+        """Reworded pages on one topic are paired by TF-IDF cosine, not only verbatim copies."""
+        urls = [f"{SITE}{path}" for path in ("/compost", "/compost-tips", "/bikes")]
+        writer = CollectingRecordWriter()
+        summary = await _pipeline().run("example.com", writer, urls=urls)
+
+        pairs = {
+            frozenset((r["url"], r["target_url"])): r["similarity_score"]
+            for r in writer.records if r["record_type"] == "similar_pair"
+        }
+        assert summary["similar_pair_count"] == len(pairs)
+        assert pairs.get(frozenset((f"{SITE}/compost", f"{SITE}/compost-tips")), 0) >= 0.7
+        assert not any(f"{SITE}/bikes" in pair for pair in pairs)
+
+    def test_count_rows_match_document_similarity(self):
+        """Pairs from per-page count rows equal those from the whole-corpus analyzer."""
+        analyzer = ContentSimilarityAnalyzer()
+        documents = {
+            f"{SITE}{path}": ("Title", html)
+            for path, html in PAGES.items()
+        }
+        for url, (title, html) in documents.items():
+            analyzer.add_content(url, title, html)
+        counts = sparse.vstack(
+            [analyzer.document_counts(title, html) for title, html in documents.values()], format="csr"
+        )
+
+        expected = analyzer.find_similar_content(0.5)
+        assert expected
+        assert analyzer.find_similar_counts(list(documents), counts, 0.5) == expected
+
+    @pytest.mark.asyncio
+    async def test_orphans_from_crawled_links(self):
+        """Without a stored link graph, orphans come from the links found while crawling."""
+        urls = [f"{SITE}{path}" for path in ("/", "/compost", "/compost-copy", "/bikes")]
+        writer = CollectingRecordWriter()
+        summary = await _pipeline().run("example.com", writer, urls=urls)
+
+        orphans = [r["url"] for r in writer.records if r["record_type"] == "orphan"]
+        assert orphans == [f"{SITE}/compost-copy"]
+        assert summary["orphaned_count"] == 1
+
+    @pytest.mark.asyncio
+    async def test_inbound_links_from_crawl_without_stored_graph(self):
+        """Without a stored link graph, page records carry the crawl's in-degree."""
+        urls = [f"{SITE}{path}" for path in ("/", "/compost", "/compost-copy", "/bikes")]
+        writer = CollectingRecordWriter()
+        await _pipeline().run("example.com", writer, urls=urls)
+
+        inbound = {r["url"]: r["metrics"]["internal_links_in"] for r in writer.records if r["record_type"] == "page"}
+        assert inbound == {f"{SITE}/": 0, f"{SITE}/compost": 1, f"{SITE}/compost-copy": 0, f"{SITE}/bikes": 1}
+
+    @pytest.mark.asyncio
+    async def test_stored_graph_extended_with_crawled_links(self, monkeypatch):
+        """Links only the stored graph knows keep a page from being orphaned."""
+        from src.seo_bot.linking.graph import InternalLinkGraph
+        from src.seo_bot.prune import pipeline as pipeline_module
+
+        stored = InternalLinkGraph.from_edges([(f"{SITE}/", f"{SITE}/compost-copy")])
+        monkeypatch.setattr(pipeline_module, "load_link_graph", lambda *args, **kwargs: stored)
+        urls = [f"{SITE}{path}" for path in ("/", "/compost", "/compost-copy", "/bikes")]
+        writer = CollectingRecordWriter()
+        summary = await _pipeline().run("example.com", writer, urls=urls)
+
+        inbound = {r["url"]: r["metrics"]["internal_links_in"] for r in writer.records if r["record_type"] == "page"}
+        assert inbound[f"{SITE}/compost-copy"] == 1
+        assert summary["orphaned_count"] == 0
+
+    @pytest.mark.asyncio
+    async def test_unsynced_domain_queries_api_once(self, monkeypatch):
+        """Without synced GSC data the table is checked once and the API queried once."""
+        from src.seo_bot.prune import pipeline as pipeline_module
+
+        loads = []
+        monkeypatch.setattr(pipeline_module, "load_page_performance", lambda *args, **kwargs: loads.append(args))
+        adapter = AsyncMock()
+        adapter.get_indexation_data.return_value = {
+            "rows": [{"keys": [f"{SITE}/bikes"], "clicks": 40, "impressions": 900, "ctr": 0.04, "position": 6.0}]
+        }
+        pipeline = _pipeline()
+        pipeline.analyzer.gsc_adapter = adapter
+        writer = CollectingRecordWriter()
+
+        await pipeline.run("example.com", writer)
+
+        pages = {r["url"]: r for r in writer.records if r["record_type"] == "page"}
+        assert pages[f"{SITE}/bikes"]["metrics"]["organic_clicks"] == 40
+        assert len(loads) == 1
+        adapter.get_indexation_data.assert_awaited_once()
+        assert adapter.get_indexation_data.await_args.kwargs == {"use_synced": False}
+
+    @pytest.mark.asyncio
+    async def test_impact_summary_matches_records(self):
+        """The running summary equals one recomputed from the written records."""
+        writer = CollectingRecordWriter()
+        summary = await _pipeline(detect_duplicates=False).run(
+            "example.com", writer, urls=[f"{SITE}/compost", f"{SITE}/bikes"]
+        )
+
+        expected = ImpactSummary()
+        for record in writer.records:
+            if record["record_type"] != "page":
+                continue
+            metrics = record["metrics"]
+            expected.current_total_traffic += metrics["organic_clicks"]
+            rec = record["recommendation"]
+            expected.total_recommendations += 1
+            expected.action_counts[rec["action"]] += 1
+            expected.priority_counts[rec["priority"]] += 1
+            expected.total_effort_hours += rec["estimated_hours"]
+            if rec["priority"] == "high":
+                expected.high_priority_hours += rec["estimated_hours"]
+            if rec["estimated_hours"] <= 1.0:
+                expected.quick_wins += 1
+        assert summary["impact_summary"] == expected.as_dict()
+        assert summary["similar_pair_count"] == 0
+
+    @pytest.mark.asyncio
+    async def test_writes_jsonl(self, tmp_path):
+        """Records are streamed one JSON object per line, ending with the summary."""
+        path = tmp_path / "prune.jsonl"
+        writer = open_record_writer(path)
+        try:
+            await _pipeline().run("example.com", writer)
+        finally:
+            writer.close()
+
+        records = [json.loads(line) for line in path.read_text().splitlines()]
+        assert records[-1]["record_type"] == "summary"
+        assert records[-1]["total_urls_analyzed"] == 3
+        assert sum(r["record_type"] == "page" for r in records) == 3
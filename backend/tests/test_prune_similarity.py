@@ -0,0 +1,130 @@
+"""Unit tests for blocked sparse similarity in content pruning."""
+
+import numpy as np
+import pytest
+from scipy import sparse
+from sklearn.metrics.pairwise import cosine_similarity
+
+from src.seo_bot.prune.optimization import ContentSimilarityAnalyzer
+from src.seo_bot.prune.similarity import (
+    hash_counts,
+    pair_similarities,
+    similar_pairs,
+    tfidf_from_counts,
+    tfidf_matrix,
+    tfidf_weights,
+)
+
+
+def _matrix(rows: int = 60, cols: int = 40, seed: int = 0) -> sparse.csr_matrix:
+    rng = np.random.RandomState(seed)
+    dense = rng.rand(rows, cols) * (rng.rand(rows, cols) < 0.2)
+    dense[7] = dense[3] * 2.0  # Same direction as row 3
+    return sparse.csr_matrix(dense)
+
+
+def _text(seed: int, words: int = 120) -> str:
+    rng = np.random.RandomState(seed)
+    return " ".join(rng.choice([f"topic{i}" for i in range(300)], words))
+
+
+class TestSimilarPairs:
+    """Test the blocked all-pairs engine."""
+
+    @pytest.mark.parametrize("block_size", [1, 7, 1024])
+    def test_matches_brute_force(self, block_size):
+        """Every block size returns exactly the pairs of a dense cosine matrix."""
+        matrix = _matrix()
+        dense = cosine_similarity(matrix)
+        expected = {
+            (i, j) for i in range(dense.shape[0]) for j in range(i + 1, dense.shape[0])
+            if dense[i, j] >= 0.5
+        }
+
+        rows, cols, similarities = similar_pairs(matrix, 0.5, block_size=block_size)
+
+        assert set(zip(rows.tolist(), cols.tolist())) == expected
+        assert np.all(rows < cols)
+        assert np.all(np.diff(similarities) <= 0)
+        for i, j, similarity in zip(rows, cols, similarities):
+            assert similarity == pytest.approx(dense[i, j], abs=1e-5)
+
+    def test_parallel_blocks_match_serial(self):
+        """Running blocks in a process pool gives the same pairs."""
+        matrix = _matrix(rows=40)
+
+        serial = similar_pairs(matrix, 0.4, block_size=8)
+        parallel = similar_pairs(matrix, 0.4, block_size=8, workers=2)
+
+        assert set(zip(*[a.tolist() for a in serial[:2]])) == set(zip(*[a.tolist() for a in parallel[:2]]))
+
+    def test_identical_rows_capped_at_one(self):
+        """Parallel vectors score exactly 1."""
+        rows, cols, similarities = similar_pairs(_matrix(), 0.99)
+
+        assert (3, 7) in set(zip(rows.tolist(), cols.tolist()))
+        assert similarities.max() <= 1.0
+
+
+class TestTfidfMatrix:
+    """Test hashed TF-IDF vectorization."""
+
+    def test_document_frequency_cutoffs(self):
+        """Terms in one document or in nearly all of them are dropped."""
+        documents = ["common rare1 shared", "common shared", "common second", "common second"]
+
+        matrix = tfidf_matrix(documents, ngram_range=(1, 1), min_df=2, max_df=0.8)
+
+        # shared and second survive; common (100% of documents) and rare1 do not
+        assert matrix.shape == (4, 2)
+        assert matrix[0].nnz == 1
+
+    def test_raises_when_nothing_survives(self):
+        """An empty vocabulary raises like TfidfVectorizer."""
+        with pytest.raises(ValueError):
+            tfidf_matrix(["alpha", "beta"], min_df=2)
+
+
+class TestPairSimilarities:
+    """Test TF-IDF cosine from accumulated corpus statistics."""
+
+    def test_matches_tfidf_matrix(self):
+        """Weights from summed statistics score pairs like the full TF-IDF matrix."""
+        counts = hash_counts([_text(seed, words=60) for seed in range(10)], n_features=2 ** 12)
+        counts = sparse.csr_matrix(counts)
+        document_frequency = np.bincount(counts.indices, minlength=counts.shape[1])
+        term_frequency = np.asarray(counts.sum(axis=0)).ravel()
+        left, right = np.array([0, 2, 5]), np.array([1, 7, 9])
+
+        weights = tfidf_weights(document_frequency, term_frequency, counts.shape[0], max_features=200)
+        matrix = tfidf_from_counts(counts, max_features=200)
+
+        expected = [(matrix[i] @ matrix[j].T).toarray()[0, 0] for i, j in zip(left, right)]
+        assert pair_similarities(counts, weights, left, right) == pytest.approx(expected, abs=1e-5)
+
+    def test_raises_when_nothing_survives(self):
+        """No surviving feature raises like tfidf_from_counts."""
+        with pytest.raises(ValueError):
+            tfidf_weights(np.array([1, 1]), np.array([1.0, 1.0]), 2)
+
+
+class TestContentSimilarityAnalyzer:
+    """Test the prune analyzer on top of the engine."""
+
+    def test_finds_duplicate_pages(self):
+        """Pages with the same body are paired, distinct pages are not."""
+        analyzer = ContentSimilarityAnalyzer(block_size=4)
+        for seed in range(12):
+            analyzer.add_content(f"https://example.com/{seed}", "Title", _text(seed))
+        analyzer.add_content("https://example.com/copy", "Title", _text(5))
+
+        pairs = analyzer.find_similar_content(0.9)
+
+        assert pairs == [("https://example.com/5", "https://example.com/copy", pytest.approx(1.0, abs=1e-4))]
+
+    def test_small_corpus_returns_no_pairs(self):
+        """A corpus too small for the frequency cutoffs yields no pairs instead of failing."""
+        analyzer = ContentSimilarityAnalyzer()
+        analyzer.add_content("https://example.com/a", "A", "unique words here")
+
+        assert analyzer.find_similar_content() == []
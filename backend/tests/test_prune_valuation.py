@@ -0,0 +1,167 @@
+"""Unit tests for columnar content valuation and recommendation."""
+
+import random
+import time
+
+import numpy as np
+import pytest
+
+from src.seo_bot.prune.optimization import (
+    ContentAction,
+    ContentMetrics,
+    ContentValue,
+    PruningRecommendationEngine,
+)
+from src.seo_bot.prune.valuation import MetricColumns, UnionFind, merge_groups, value_tiers, VALUE_TIERS
+
+
+def _metrics(i: int, rng: random.Random) -> ContentMetrics:
+    clicks = rng.choice([0, 0, rng.randint(0, 5), rng.randint(0, 200)])
+    return ContentMetrics(
+        url=f"https://example.com/page-{i}",
+        title=f"Page {i}",
+        word_count=rng.randint(100, 5000),
+        organic_clicks=clicks,
+        organic_impressions=rng.choice([0, rng.randint(0, 20), rng.randint(0, 5000)]),
+        average_position=rng.uniform(1, 100),
+        ctr=rng.random() * 0.1,
+        clicks_last_30d=clicks,
+        clicks_last_90d=clicks,
+        clicks_last_year=clicks,
+        quality_score=rng.uniform(0, 10),
+        readability_score=60.0,
+        page_speed_score=80,
+        core_web_vitals_pass=True,
+        mobile_friendly=True,
+        internal_links_in=rng.choice([0, 1, 2, rng.randint(0, 30)]),
+        internal_links_out=5,
+        external_links=2,
+        ranking_keywords_count=1,
+        top_10_rankings=0,
+        featured_snippets=0,
+        content_age_days=rng.randint(0, 2000)
+    )
+
+
+def _reference_value(m: ContentMetrics) -> ContentValue:
+    """The per-page branches the columnar path replaces."""
+    total = (
+        min(100, m.organic_clicks * 2) * 0.25 +
+        min(100, m.organic_impressions / 10) * 0.20 +
+        max(0, 100 - m.average_position * 2) * 0.15 +
+        m.quality_score * 10 * 0.15 +
+        min(100, m.internal_links_in * 5) * 0.15 +
+        max(0, 100 - (m.content_age_days / 365) * 20) * 0.10
+    )
+    if total >= 70:
+        return ContentValue.HIGH
+    if total >= 40:
+        return ContentValue.MEDIUM
+    if total >= 15:
+        return ContentValue.LOW
+    return ContentValue.ZERO
+
+
+def _reference_action(m: ContentMetrics, value: ContentValue) -> ContentAction:
+    if value == ContentValue.ZERO:
+        if m.organic_clicks == 0 and m.organic_impressions < 10:
+            return ContentAction.DELETE
+        return ContentAction.NOINDEX
+    if value == ContentValue.LOW:
+        return ContentAction.REDIRECT if m.internal_links_in <= 1 else ContentAction.IMPROVE
+    if value == ContentValue.MEDIUM:
+        return ContentAction.IMPROVE if m.quality_score < 6.0 else ContentAction.KEEP
+    return ContentAction.KEEP
+
+
+@pytest.fixture
+def site():
+    rng = random.Random(7)
+    return [_metrics(i, rng) for i in range(3000)]
+
+
+class TestColumnarValuation:
+    """The columnar path decides exactly as the per-page rules do."""
+
+    def test_value_tiers_match_per_page_rules(self, site):
+        tiers = value_tiers(MetricColumns.from_records(site))
+        assert [VALUE_TIERS[t] for t in tiers] == [_reference_value(m).value for m in site]
+
+    def test_recommendations_match_per_page_rules(self, site):
+        engine = PruningRecommendationEngine()
+        recommendations = engine.generate_page_recommendations(site)
+
+        assert [r.url for r in recommendations] == [m.url for m in site]
+        for metrics, recommendation in zip(site, recommendations):
+            value = _reference_value(metrics)
+            assert recommendation.action == _reference_action(metrics, value)
+            assert recommendation.detailed_analysis["content_value"] == value.value
+            single = engine._generate_single_recommendation(metrics, value)
+            assert single == recommendation
+
+    def test_improve_effort_scales_with_length(self):
+        engine = PruningRecommendationEngine()
+        rng = random.Random(1)
+        short, long = _metrics(0, rng), _metrics(1, rng)
+        short.word_count, long.word_count = 800, 4000
+        assert engine._estimate_effort(ContentAction.IMPROVE, short) == ("low", 2.0)
+        assert engine._estimate_effort(ContentAction.IMPROVE, long) == ("high", 8.0)
+        assert engine._estimate_effort(ContentAction.MERGE, long) == ("high", 6.0)
+
+
+class TestMergeGroups:
+    """Test union-find merge grouping."""
+
+    def test_union_find_groups(self):
+        sets = UnionFind(6)
+        sets.union(0, 1)
+        sets.union(2, 1)
+        sets.union(4, 5)
+        assert sorted(sets.groups()) == [[0, 1, 2], [4, 5]]
+
+    def test_chain_merges_into_single_primary(self, site):
+        """Pages of a similar chain merge into its best performer only when directly similar to it."""
+        engine = PruningRecommendationEngine()
+        pages = site[:4]
+        for i, page in enumerate(pages):
+            page.organic_clicks = 1000 * i
+        pairs = [
+            (pages[0].url, pages[1].url, 0.85),
+            (pages[1].url, pages[2].url, 0.95),
+            (pages[2].url, pages[3].url, 0.5),  # Below the merge threshold
+            (pages[0].url, "https://example.com/unknown", 0.99),
+        ]
+
+        merges = engine._generate_merge_recommendations(pairs, pages)
+
+        # pages[2] is the primary; pages[0] is only similar to it through pages[1]
+        assert [(r.url, r.target_url) for r in merges] == [(pages[1].url, pages[2].url)]
+        assert merges[0].similarity_score == 0.95
+        assert merges[0].action == ContentAction.MERGE
+
+    def test_similarity_to_primary_per_secondary(self):
+        """Each secondary reports its direct pair similarity to the primary, 0 when indirect."""
+        groups = merge_groups(
+            3, np.array([0, 1]), np.array([1, 2]), np.array([0.8, 0.9]), np.array([10.0, 1.0, 2.0])
+        )
+        primary, secondaries, similarity = groups[0]
+        assert primary == 0
+        assert secondaries.tolist() == [1, 2]
+        assert similarity.tolist() == [0.8, 0.0]
+
+
+@pytest.mark.performance
+class TestValuationPerformance:
+    """Columnar valuation scales to large sites."""
+
+    def test_300k_pages_value_in_seconds(self):
+        rng = random.Random(3)
+        template = [_metrics(i, rng) for i in range(1000)]
+        site = [template[i % 1000] for i in range(300_000)]
+
+        started = time.perf_counter()
+        recommendations = PruningRecommendationEngine().generate_page_recommendations(site)
+        elapsed = time.perf_counter() - started
+
+        assert len(recommendations) == 300_000
+        assert elapsed < 10.0
@@ -0,0 +1,140 @@
+"""Unit tests for incremental audit result store."""
+
+import pytest
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, Mock
+
+from src.seo_bot.tech.audit_cache import (
+    AuditResultStore,
+    compute_content_hash,
+    compute_ruleset_hash,
+    CACHE_STATUS_FRESH,
+    CACHE_STATUS_REUSED
+)
+from src.seo_bot.tech.accessibility import AccessibilityChecker
+from src.seo_bot.tech.contrast import parse_stylesheet
+from src.seo_bot.tech.audit import TechnicalSEOAuditor
+
+
+SAMPLE_HTML = """
+<html lang="en"><head><title>Sample page title for audit caching tests</title></head>
+<body><main><h1>Heading</h1><img src="a.png"><a href="/about">About us</a></main></body></html>
+"""
+
+
+class TestHashing:
+    """Test content and rule-set hashing."""
+
+    def test_content_hash_is_stable(self):
+        """Identical content hashes identically."""
+        assert compute_content_hash(SAMPLE_HTML) == compute_content_hash(SAMPLE_HTML)
+        assert compute_content_hash(SAMPLE_HTML) != compute_content_hash(SAMPLE_HTML + " ")
+
+    def test_content_hash_includes_relevant_headers(self):
+        """Security headers change the hash, unrelated headers do not."""
+        base = compute_content_hash(SAMPLE_HTML, {"Date": "today"})
+
+        assert base == compute_content_hash(SAMPLE_HTML, {"Date": "tomorrow"})
+        assert base != compute_content_hash(SAMPLE_HTML, {"X-Frame-Options": "DENY"})
+
+    def test_ruleset_hash_changes_with_rules(self):
+        """Rule changes and version bumps invalidate results."""
+        rules = {"title": {"min_length": 30}}
+
+        assert compute_ruleset_hash("1", rules) == compute_ruleset_hash("1", rules)
+        assert compute_ruleset_hash("1", rules) != compute_ruleset_hash("2", rules)
+        assert compute_ruleset_hash("1", rules) != compute_ruleset_hash("1", {"title": {"min_length": 40}})
+
+
+class TestAuditResultStore:
+    """Test AuditResultStore functionality."""
+
+    def test_get_requires_matching_hashes(self):
+        """Results are only reused for unchanged content and rules."""
+        store = AuditResultStore()
+        result = Mock(cache_status=CACHE_STATUS_FRESH)
+        store.put("accessibility", "https://example.com/", "c1", "r1", result)
+
+        assert store.get("accessibility", "https://example.com/", "c1", "r1") is not None
+        assert store.get("accessibility", "https://example.com/", "c2", "r1") is None
+        assert store.get("accessibility", "https://example.com/", "c1", "r2") is None
+        assert store.get("technical_seo", "https://example.com/", "c1", "r1") is None
+        assert store.stats["hits"] == 1
+        assert store.stats["misses"] == 3
+
+    def test_persistence_across_instances(self, tmp_path):
+        """Entries written to disk are visible to a new store."""
+        store = AuditResultStore(tmp_path)
+        store.put("task_completion", "https://example.com/", "c1", "r1", {"value": 1})
+
+        reloaded = AuditResultStore(tmp_path)
+        entry = reloaded._load_entry("task_completion", reloaded._entry_key("task_completion", "https://example.com/"))
+
+        assert entry is not None
+        assert entry.result == {"value": 1}
+
+    def test_invalidate_and_clear(self, tmp_path):
+        """Invalidated entries are re-audited."""
+        store = AuditResultStore(tmp_path)
+        store.put("accessibility", "https://example.com/a", "c1", "r1", SimpleNamespace(cache_status=CACHE_STATUS_FRESH))
+        store.put("accessibility", "https://example.com/b", "c1", "r1", SimpleNamespace(cache_status=CACHE_STATUS_FRESH))
+
+        store.invalidate("accessibility", "https://example.com/a")
+        assert store.get("accessibility", "https://example.com/a", "c1", "r1") is None
+
+        store.clear()
+        assert not list(tmp_path.rglob("*.pkl"))
+
+
+class TestIncrementalAudits:
+    """Test auditors reuse results for unchanged pages."""
+
+    @pytest.mark.asyncio
+    async def test_accessibility_audit_reuses_unchanged_page(self, tmp_path):
+        """Second audit of identical HTML is served from the store."""
+        checker = AccessibilityChecker(result_store=AuditResultStore(tmp_path))
+        checker.session = Mock()
+        checker._fetch_page_content = AsyncMock(return_value=SAMPLE_HTML)
+
+        first = await checker.audit_page_accessibility("https://example.com/", include_lighthouse=False)
+        second = await checker.audit_page_accessibility("https://example.com/", include_lighthouse=False)
+
+        assert first.cache_status == CACHE_STATUS_FRESH
+        assert second.cache_status == CACHE_STATUS_REUSED
+        assert second.total_issues == first.total_issues
+        assert second.content_hash == first.content_hash
+
+    @pytest.mark.asyncio
+    async def test_accessibility_audit_reevaluates_changed_stylesheet(self, tmp_path):
+        """A stylesheet change invalidates findings for unchanged HTML."""
+        checker = AccessibilityChecker(result_store=AuditResultStore(tmp_path))
+        checker.session = Mock()
+        checker._fetch_page_content = AsyncMock(return_value=SAMPLE_HTML)
+        checker.contrast_engine.collect_stylesheets = AsyncMock(
+            return_value=[parse_stylesheet("h1 { color: #000; }")]
+        )
+
+        first = await checker.audit_page_accessibility("https://example.com/", include_lighthouse=False)
+        checker.contrast_engine.collect_stylesheets = AsyncMock(
+            return_value=[parse_stylesheet("h1 { color: #eee; }")]
+        )
+        second = await checker.audit_page_accessibility("https://example.com/", include_lighthouse=False)
+
+        assert second.cache_status == CACHE_STATUS_FRESH
+        assert second.content_hash != first.content_hash
+
+    @pytest.mark.asyncio
+    async def test_technical_audit_reevaluates_changed_page(self):
+        """Changed HTML is audited afresh."""
+        auditor = TechnicalSEOAuditor(result_store=AuditResultStore())
+        auditor.session = Mock()
+        auditor._fetch_page_with_headers = AsyncMock(return_value=(SAMPLE_HTML, {}))
+
+        await auditor.audit_page_technical_seo("https://example.com/")
+        auditor._fetch_page_with_headers = AsyncMock(
+            return_value=(SAMPLE_HTML.replace("About us", "Contact"), {})
+        )
+        result = await auditor.audit_page_technical_seo("https://example.com/")
+
+        assert result.cache_status == CACHE_STATUS_FRESH
+        assert auditor.result_store.stats["misses"] == 2
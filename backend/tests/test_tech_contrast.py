@@ -0,0 +1,147 @@
+"""Unit tests for the CSS-aware color contrast engine."""
+
+import asyncio
+
+import numpy as np
+import pytest
+from bs4 import BeautifulSoup
+from unittest.mock import AsyncMock
+
+from src.seo_bot.tech.accessibility import AccessibilityChecker, AccessibilityCategory
+from src.seo_bot.tech.contrast import (
+    ContrastEngine,
+    StylesheetCache,
+    contrast_ratios,
+    parse_color,
+    parse_stylesheet
+)
+
+
+class TestColorMath:
+    """Test color parsing and WCAG ratio math."""
+
+    def test_parse_color_formats(self):
+        """Hex, rgb(), hsl() and named colors parse to RGBA."""
+        assert parse_color("#fff") == (255.0, 255.0, 255.0, 1.0)
+        assert parse_color("rgb(0, 0, 0)") == (0.0, 0.0, 0.0, 1.0)
+        assert parse_color("rgba(255 0 0 / 50%)") == (255.0, 0.0, 0.0, 0.5)
+        assert parse_color("hsl(0, 100%, 50%)") == (255.0, 0.0, 0.0, 1.0)
+        assert parse_color("RebeccaPurple") == (102.0, 51.0, 153.0, 1.0)
+        assert parse_color("var(--brand)") is None
+
+    def test_contrast_ratios_match_wcag_reference(self):
+        """Black on white is 21:1 and #777 on white is about 4.48:1."""
+        foregrounds = np.array([[0, 0, 0], [119, 119, 119]], dtype=float)
+        backgrounds = np.array([[255, 255, 255], [255, 255, 255]], dtype=float)
+
+        ratios = contrast_ratios(foregrounds, backgrounds)
+
+        assert ratios[0] == pytest.approx(21.0)
+        assert ratios[1] == pytest.approx(4.48, abs=0.01)
+
+
+class TestCascade:
+    """Test cascade resolution and effective colors."""
+
+    def test_media_print_and_dynamic_selectors_skipped(self):
+        """Only screen rules without interaction state are kept."""
+        sheet = parse_stylesheet(
+            "p { color: red } a:hover { color: blue } "
+            "@media print { p { color: black } } @media (min-width: 600px) { .x { color: green } }"
+        )
+
+        assert [rule.selector for rule in sheet.rules] == ["p", ".x"]
+
+    @pytest.mark.asyncio
+    async def test_specificity_inheritance_and_background(self):
+        """Text inherits color and sits on its nearest opaque background."""
+        html = """
+        <html><head><style>
+            body { color: #333; }
+            .card { background-color: #222; }
+            #hero p { color: #eee; }
+            p { color: #444 !important; }
+        </style></head>
+        <body><div class="card"><span>Inherited</span></div>
+        <section id="hero"><p>Important wins</p></section></body></html>
+        """
+        engine = ContrastEngine()
+        soup = BeautifulSoup(html, "html.parser")
+        sheets = await engine.collect_stylesheets(soup, "https://example.com/")
+        samples = {s.text: s for s in engine.compute_styles(soup, sheets)}
+
+        assert samples["Inherited"].foreground[:3] == (51.0, 51.0, 51.0)
+        assert samples["Inherited"].background[:3] == (34.0, 34.0, 34.0)
+        assert samples["Important wins"].foreground[:3] == (68.0, 68.0, 68.0)
+
+    @pytest.mark.asyncio
+    async def test_large_text_threshold_and_background_images(self):
+        """Large text uses the lower ratio; text over images is not judged."""
+        html = """
+        <body>
+          <h1 style="color:#949494">Large heading</h1>
+          <p style="color:#949494">Small paragraph</p>
+          <div style="background:url(hero.jpg)"><p style="color:#fff">Over image</p></div>
+        </body>
+        """
+        engine = ContrastEngine()
+        failures = await engine.find_contrast_failures(
+            BeautifulSoup(html, "html.parser"), "https://example.com/", 4.5, 3.0
+        )
+
+        assert [f.text for f in failures] == ["Small paragraph"]
+
+    @pytest.mark.asyncio
+    async def test_linked_stylesheet_fetched_once_per_site(self):
+        """Linked stylesheets are fetched once and reused across pages."""
+        cache = StylesheetCache()
+        cache._fetch = AsyncMock(return_value=".muted { color: #aaa; }")
+        engine = ContrastEngine(cache)
+        html = '<head><link rel="stylesheet" href="/site.css"></head><body><p class="muted">Faint</p></body>'
+
+        for page in ("https://example.com/a", "https://example.com/b"):
+            failures = await engine.find_contrast_failures(BeautifulSoup(html, "html.parser"), page, 4.5, 3.0)
+            assert [f.text for f in failures] == ["Faint"]
+
+        cache._fetch.assert_awaited_once()
+        assert cache.stats["hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_concurrent_waiters_see_failure(self):
+        """A failed fetch or parse is raised to requests waiting on it."""
+        release = asyncio.Event()
+
+        async def fetch(url, session):
+            await release.wait()
+            raise RuntimeError("broken stylesheet")
+
+        cache = StylesheetCache()
+        cache._fetch = fetch
+        first = asyncio.ensure_future(cache.get_linked("https://example.com/site.css", None))
+        await asyncio.sleep(0)
+        second = asyncio.ensure_future(cache.get_linked("https://example.com/site.css", None))
+        await asyncio.sleep(0)
+        release.set()
+
+        results = await asyncio.wait_for(asyncio.gather(first, second, return_exceptions=True), timeout=1)
+        assert all(isinstance(result, RuntimeError) for result in results)
+        assert not cache._pending
+
+
+class TestAccessibilityIntegration:
+    """Test contrast issues surface from the accessibility checker."""
+
+    @pytest.mark.asyncio
+    async def test_checker_reports_ratio(self):
+        """Failing text produces a color contrast issue with the measured ratio."""
+        checker = AccessibilityChecker()
+        soup = BeautifulSoup(
+            '<style>.note { color: #bbb; background: #fff; }</style><p class="note">Low contrast</p>',
+            "html.parser"
+        )
+
+        issues = await checker._check_color_contrast(soup, "https://example.com/")
+
+        assert len(issues) == 1
+        assert issues[0].category == AccessibilityCategory.COLOR_CONTRAST
+        assert "1.92:1" in issues[0].description
@@ -0,0 +1,133 @@
+"""Unit tests for the PageSpeed result history store."""
+
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from src.seo_bot.config import Settings
+from src.seo_bot.tech.budgets import PerformanceBudgetManager, PerformanceTestResult
+from src.seo_bot.tech.performance_history import PerformanceHistoryStore
+
+
+def make_result(days_ago: int = 0, lcp_ms: int = 2000, url: str = "https://example.com/") -> PerformanceTestResult:
+    """Create a test result measured some days ago."""
+    return PerformanceTestResult(
+        url=url,
+        device_type="mobile",
+        timestamp=datetime.now(timezone.utc) - timedelta(days=days_ago),
+        test_id=f"test-{days_ago}",
+        lcp_ms=lcp_ms,
+        inp_ms=150,
+        cls=0.05,
+        js_size_kb=180,
+        performance_score=90
+    )
+
+
+class TestPerformanceHistoryStore:
+    """Test PerformanceHistoryStore functionality."""
+
+    def test_round_trip(self, tmp_path):
+        """Stored results are rebuilt with their metrics."""
+        store = PerformanceHistoryStore(tmp_path / "psi.db")
+        store.record(make_result())
+
+        restored = PerformanceHistoryStore(tmp_path / "psi.db").get_fresh("https://example.com/", "mobile")
+
+        assert restored is not None
+        assert restored.lcp_ms == 2000
+        assert restored.cls == pytest.approx(0.05)
+        assert restored.from_history
+
+    def test_one_row_per_day(self):
+        """A later test on the same day replaces the earlier one."""
+        store = PerformanceHistoryStore()
+        store.record(make_result(lcp_ms=2000))
+        store.record(make_result(lcp_ms=2100))
+
+        history = store.get_history("https://example.com/", "mobile")
+
+        assert len(history) == 1
+        assert history[0].lcp_ms == 2100
+
+    def test_freshness_ttl(self):
+        """Results older than the TTL are not reused."""
+        store = PerformanceHistoryStore(freshness_ttl=timedelta(hours=12))
+        store.record(make_result(days_ago=1))
+
+        assert store.get_fresh("https://example.com/", "mobile") is None
+        assert store.get_fresh("https://example.com/", "mobile", max_age=timedelta(days=2)) is not None
+
+    def test_trend_and_regressions(self):
+        """Trends come from the store and regressions are flagged against the baseline median."""
+        store = PerformanceHistoryStore()
+        store.record_many([make_result(days_ago=d, lcp_ms=2000) for d in range(1, 8)])
+        store.record(make_result(days_ago=0, lcp_ms=2600))
+
+        trend = store.get_trend("https://example.com/", "mobile", "lcp_ms")
+        regressions = store.detect_regressions("https://example.com/", "mobile")
+
+        assert len(trend) == 8
+        assert trend[-1][1] == 2600
+        assert [r["metric"] for r in regressions] == ["lcp_ms"]
+        assert regressions[0]["relative_change"] == pytest.approx(0.3)
+
+    def test_unknown_metric_rejected(self):
+        """Trend queries only accept stored metric columns."""
+        with pytest.raises(ValueError):
+            PerformanceHistoryStore().get_trend("https://example.com/", "mobile", "lcp_ms; DROP TABLE")
+
+    def test_prune(self):
+        """Rows past retention are deleted."""
+        store = PerformanceHistoryStore()
+        store.record_many([make_result(days_ago=500), make_result(days_ago=1)])
+
+        assert store.prune(retention_days=400) == 1
+
+
+class TestBudgetManagerHistory:
+    """Test PerformanceBudgetManager reuse of stored results."""
+
+    @pytest.mark.asyncio
+    async def test_fresh_result_skips_api(self):
+        """A fresh stored result is returned without calling PageSpeed."""
+        store = PerformanceHistoryStore()
+        store.record(make_result())
+
+        manager = PerformanceBudgetManager(Settings(pagespeed_api_key="test"), history_store=store)
+        manager.session = Mock()
+        manager._fetch_psi_result = AsyncMock()
+
+        result = await manager.test_page_performance("https://example.com/")
+
+        assert result.from_history
+        manager._fetch_psi_result.assert_not_called()
+
+    def test_parse_records_extended_fields(self):
+        """Parsed responses keep TBT, request counts and CrUX percentiles."""
+        manager = PerformanceBudgetManager(Settings(pagespeed_api_key="test"))
+        data = {
+            "lighthouseResult": {
+                "audits": {
+                    "total-blocking-time": {"numericValue": 0},
+                    "speed-index": {"numericValue": 3100.4},
+                    "resource-summary": {"details": {"items": [
+                        {"resourceType": "total", "requestCount": 42, "transferSize": 0}
+                    ]}}
+                },
+                "categories": {}
+            },
+            "loadingExperience": {"metrics": {
+                "LARGEST_CONTENTFUL_PAINT_MS": {"percentile": 2300},
+                "CUMULATIVE_LAYOUT_SHIFT_SCORE": {"percentile": 12}
+            }}
+        }
+
+        result = manager._parse_psi_response("https://example.com/", "mobile", data)
+
+        assert result.tbt_ms == 0
+        assert result.speed_index_ms == 3100
+        assert result.request_count == 42
+        assert result.field_lcp_ms == 2300
+        assert result.field_cls == pytest.approx(0.12)
@@ -0,0 +1,204 @@
+"""Unit tests for concurrent PageSpeed Insights scheduling against a fake PSI server."""
+
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from src.seo_bot.config import PerformanceBudgetsConfig, Settings
+from src.seo_bot.tech.budgets import PerformanceBudgetManager
+from src.seo_bot.tech.psi_scheduler import (
+    PSIRequest,
+    PSIRequestError,
+    PSIRequestScheduler,
+    PSISchedulerConfig,
+    QuotaExceededError
+)
+
+
+def make_psi_payload(url: str, lcp_ms: int = 1800) -> dict:
+    """Build a minimal PageSpeed Insights response."""
+    return {
+        "id": url,
+        "lighthouseResult": {
+            "audits": {
+                "largest-contentful-paint": {"numericValue": lcp_ms},
+                "interaction-to-next-paint": {"numericValue": 150},
+                "cumulative-layout-shift": {"numericValue": 0.05},
+                "resource-summary": {"details": {"items": [
+                    {"resourceType": "script", "transferSize": 300 * 1024}
+                ]}}
+            },
+            "categories": {"performance": {"score": 0.9}}
+        },
+        "loadingExperience": {}
+    }
+
+
+class FakePSIServer:
+    """Local stand-in for the PageSpeed Insights API."""
+
+    def __init__(self, latency: float = 0.05, fail_first: int = 0):
+        self.latency = latency
+        self.fail_first = fail_first
+        self.calls = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def handle(self, request: web.Request) -> web.Response:
+        self.calls.append((request.query["url"], request.query["strategy"]))
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.latency)
+            if len(self.calls) <= self.fail_first:
+                return web.Response(status=503, text="backend unavailable")
+            return web.json_response(make_psi_payload(request.query["url"]))
+        finally:
+            self.in_flight -= 1
+
+
+@asynccontextmanager
+async def run_fake_psi(**kwargs):
+    """Serve a FakePSIServer on localhost for the duration of a test."""
+    fake = FakePSIServer(**kwargs)
+    app = web.Application()
+    app.router.add_get("/runPagespeed", fake.handle)
+    server = TestServer(app)
+    await server.start_server()
+    fake.url = str(server.make_url("/runPagespeed"))
+    try:
+        yield fake
+    finally:
+        await server.close()
+
+
+def fast_config(**overrides) -> PSISchedulerConfig:
+    """Scheduler config with no meaningful rate limit or backoff."""
+    values = dict(max_qps=1000.0, max_concurrency=16, base_backoff_seconds=0.01, max_backoff_seconds=0.02)
+    values.update(overrides)
+    return PSISchedulerConfig(**values)
+
+
+class TestPSIRequestScheduler:
+    """Test scheduling behaviour with a stub fetch coroutine."""
+
+    @pytest.mark.asyncio
+    async def test_deduplicates_identical_requests(self):
+        """Concurrent and recent identical URL+strategy requests share one call."""
+        calls = []
+
+        async def fetch(url, device_type, strategy):
+            calls.append((url, strategy))
+            await asyncio.sleep(0.01)
+            return SimpleNamespace(url=url, device_type=device_type)
+
+        scheduler = PSIRequestScheduler(fetch, fast_config())
+        requests = [PSIRequest("https://example.com/a")] * 5
+        results = [item async for item in scheduler.stream(requests)]
+        await scheduler.submit(PSIRequest("https://example.com/a"))
+
+        assert len(calls) == 1
+        assert len(results) == 5
+        assert scheduler.stats["deduplicated"] == 5
+
+    @pytest.mark.asyncio
+    async def test_recent_results_expire(self):
+        """Results older than the dedupe window are evicted as new ones arrive."""
+        async def fetch(url, device_type, strategy):
+            return SimpleNamespace(url=url, device_type=device_type)
+
+        scheduler = PSIRequestScheduler(fetch, fast_config(dedupe_window_seconds=0.05))
+        await scheduler.submit(PSIRequest("https://example.com/a"))
+        await scheduler.submit(PSIRequest("https://example.com/b"))
+        await asyncio.sleep(0.1)
+        await scheduler.submit(PSIRequest("https://example.com/c"))
+
+        assert [key[0] for key in scheduler._recent] == ["https://example.com/c"]
+
+    @pytest.mark.asyncio
+    async def test_daily_quota_is_enforced(self):
+        """Requests beyond the daily quota fail without calling the API."""
+        async def fetch(url, device_type, strategy):
+            return SimpleNamespace(url=url, device_type=device_type)
+
+        scheduler = PSIRequestScheduler(fetch, fast_config(daily_quota=2))
+        requests = [PSIRequest(f"https://example.com/{i}") for i in range(3)]
+        results = [item async for item in scheduler.stream(requests)]
+
+        errors = [error for _, _, error in results if error is not None]
+        assert len(errors) == 1
+        assert isinstance(errors[0], QuotaExceededError)
+        assert scheduler.quota_remaining == 0
+
+    @pytest.mark.asyncio
+    async def test_non_retryable_errors_fail_fast(self):
+        """Client errors are not retried."""
+        attempts = []
+
+        async def fetch(url, device_type, strategy):
+            attempts.append(url)
+            raise PSIRequestError("bad request", status=400)
+
+        scheduler = PSIRequestScheduler(fetch, fast_config())
+        with pytest.raises(PSIRequestError):
+            await scheduler.submit(PSIRequest("https://example.com/"))
+
+        assert len(attempts) == 1
+
+    @pytest.mark.asyncio
+    async def test_qps_limit_spaces_requests(self):
+        """Sustained request rate stays within max_qps."""
+        async def fetch(url, device_type, strategy):
+            return SimpleNamespace(url=url, device_type=device_type)
+
+        scheduler = PSIRequestScheduler(fetch, fast_config(max_qps=20.0))
+        requests = [PSIRequest(f"https://example.com/{i}") for i in range(30)]
+
+        started = time.monotonic()
+        _ = [item async for item in scheduler.stream(requests)]
+        elapsed = time.monotonic() - started
+
+        # 20 burst tokens, then 10 more at 20/s
+        assert elapsed >= 0.4
+
+
+class TestBudgetAuditWithFakeServer:
+    """Test PerformanceBudgetManager against a local fake PSI server."""
+
+    @pytest.mark.asyncio
+    async def test_comprehensive_audit_runs_concurrently(self):
+        """URL x device tests overlap and stream into violation checks."""
+        urls = [f"https://example.com/blog/post-{i}" for i in range(20)]
+
+        async with run_fake_psi(latency=0.1) as fake, \
+                PerformanceBudgetManager(Settings(pagespeed_api_key="test"), fast_config()) as manager:
+            manager.psi_base_url = fake.url
+            project = SimpleNamespace(domain="example.com", base_url="https://example.com")
+
+            started = time.monotonic()
+            results = await manager.run_comprehensive_audit(project, PerformanceBudgetsConfig(), sample_urls=urls)
+            elapsed = time.monotonic() - started
+
+        assert results["pages_tested"] == 40
+        assert len(fake.calls) == 40
+        assert fake.max_in_flight > 1
+        assert elapsed < 40 * 0.1
+        # 300KB of script against the 200KB article budget
+        assert results["total_violations"] == 40
+
+    @pytest.mark.asyncio
+    async def test_transient_failures_are_retried(self):
+        """503 responses are retried with backoff."""
+        async with run_fake_psi(latency=0.0, fail_first=2) as fake, \
+                PerformanceBudgetManager(Settings(pagespeed_api_key="test"), fast_config()) as manager:
+            manager.psi_base_url = fake.url
+            result = await manager.scheduler.submit(PSIRequest("https://example.com/"))
+
+        assert result.lcp_ms == 1800
+        assert len(fake.calls) == 3
+        assert manager.scheduler.stats["retries"] == 2
@@ -0,0 +1,96 @@
+"""Unit tests for streaming quantile sketches and bounded performance monitoring."""
+
+import random
+
+import pytest
+
+from src.seo_bot.tech.monitoring import PerformanceMetrics, PerformanceMonitor
+from src.seo_bot.tech.sketch import DDSketch
+
+
+def exact_quantile(values, q):
+    """Nearest-rank quantile of a list."""
+    ordered = sorted(values)
+    return ordered[int(q * (len(ordered) - 1))]
+
+
+class TestDDSketch:
+    """Test DDSketch accuracy, bounds and merging."""
+
+    def test_quantiles_within_relative_accuracy(self):
+        """Quantiles stay within the configured relative error."""
+        rng = random.Random(7)
+        values = [rng.lognormvariate(4, 1.2) for _ in range(20000)]
+        sketch = DDSketch(relative_accuracy=0.01)
+        for value in values:
+            sketch.add(value)
+
+        for q in (0.5, 0.95, 0.99):
+            expected = exact_quantile(values, q)
+            assert sketch.quantile(q) == pytest.approx(expected, rel=0.011)
+        assert sketch.count == len(values)
+        assert sketch.mean == pytest.approx(sum(values) / len(values))
+
+    def test_bucket_count_is_bounded(self):
+        """Collapsing keeps memory capped while preserving the upper tail."""
+        sketch = DDSketch(relative_accuracy=0.01, max_buckets=64)
+        for exponent in range(-6, 7):
+            for step in range(1, 100):
+                sketch.add(step * 10.0 ** exponent)
+
+        assert len(sketch.bins) <= 64
+        assert sketch.quantile(1.0) == sketch.max
+
+    def test_merge_matches_single_sketch(self):
+        """Merged per-worker sketches equal one sketch of all values."""
+        combined, left, right = DDSketch(), DDSketch(), DDSketch()
+        for value in range(1, 1001):
+            combined.add(value)
+            (left if value % 2 else right).add(value)
+
+        left.merge(DDSketch.from_dict(right.to_dict()))
+
+        assert left.count == combined.count
+        assert left.quantile(0.95) == combined.quantile(0.95)
+
+    def test_zero_and_empty(self):
+        """Zero durations are counted and empty sketches return None."""
+        sketch = DDSketch()
+        assert sketch.quantile(0.5) is None
+
+        sketch.add(0.0)
+        sketch.add(0.0)
+        sketch.add(10.0)
+        assert sketch.quantile(0.5) == 0.0
+
+
+class TestPerformanceMonitor:
+    """Test PerformanceMonitor streaming aggregates."""
+
+    def test_stats_and_bounded_history(self):
+        """Stats cover all calls while raw history is capped."""
+        monitor = PerformanceMonitor(max_recent_metrics=10)
+        for i in range(100):
+            monitor.record_metric(PerformanceMetrics("fetch", 0.0, (i + 1) / 1000, success=i % 10 != 0))
+
+        stats = monitor.get_stats("fetch")
+
+        assert len(monitor.metrics) == 10
+        assert stats["total_calls"] == 100
+        assert stats["error_count"] == 10
+        assert stats["max_duration_ms"] == pytest.approx(100.0)
+        assert stats["p95_duration_ms"] == pytest.approx(95.0, rel=0.02)
+
+    def test_merge_snapshot_across_workers(self):
+        """Snapshots from another process combine into overall stats."""
+        worker_a, worker_b = PerformanceMonitor(), PerformanceMonitor()
+        worker_a.record_metric(PerformanceMetrics("parse", 0.0, 0.010, success=True))
+        worker_b.record_metric(PerformanceMetrics("parse", 0.0, 0.030, success=False))
+        worker_b.record_metric(PerformanceMetrics("render", 0.0, 0.050, success=True))
+
+        worker_a.merge_snapshot(worker_b.snapshot())
+
+        assert worker_a.get_stats("parse")["total_calls"] == 2
+        assert worker_a.error_counts["parse"] == 1
+        assert worker_a.get_stats()["total_calls"] == 3
+        assert PerformanceMonitor().get_stats() == {"error": "No metrics found"}
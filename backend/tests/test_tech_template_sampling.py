@@ -0,0 +1,167 @@
+"""Unit tests for template clustering and sampling."""
+
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import pytest
+
+from src.seo_bot.config import PerformanceBudgetsConfig, Settings
+from src.seo_bot.tech.budgets import PerformanceBudgetManager, PerformanceTestResult
+from src.seo_bot.tech.psi_scheduler import PSISchedulerConfig
+from src.seo_bot.tech.template_sampling import TemplateSampler, URLTemplate
+
+
+def make_site_urls():
+    """Build a site with a few clear templates."""
+    urls = ["https://example.com/", "https://example.com/about", "https://example.com/contact"]
+    urls += [f"https://example.com/blog/how-to-fix-thing-{i}" for i in range(500)]
+    urls += [f"https://example.com/products/{1000 + i}" for i in range(2000)]
+    urls += [f"https://example.com/category/cat{i}" for i in range(50)]
+    return urls
+
+
+ARTICLE_HTML = "<html><body><header class='site'></header><main><article><h1>T</h1><p>a</p><p>b</p></article></main><footer></footer></body></html>"
+LISTING_HTML = "<html><body><header class='site'></header><div class='grid'><ul><li><a>1</a></li><li><a>2</a></li></ul></div><aside><form><input></form></aside></body></html>"
+
+
+class TestTemplateClustering:
+    """Test URL clustering into templates."""
+
+    def test_path_patterns(self):
+        """Ids, slugs and high-cardinality segments collapse into placeholders."""
+        templates = TemplateSampler().cluster_urls(make_site_urls())
+        patterns = {t.path_pattern: t.population for t in templates}
+
+        assert patterns["/blog/{slug}"] == 500
+        assert patterns["/products/{num}"] == 2000
+        assert patterns["/category/{slug}"] == 50
+        assert patterns["/about"] == 1
+
+    def test_dom_fingerprints_split_templates(self):
+        """Pages with the same path pattern but different structure are separated."""
+        sampler = TemplateSampler()
+        urls = [f"https://example.com/p/{i}" for i in range(10)]
+        fingerprints = {
+            url: sampler.compute_dom_fingerprint(ARTICLE_HTML if i < 6 else LISTING_HTML)
+            for i, url in enumerate(urls)
+        }
+
+        templates = sampler.cluster_urls(urls, fingerprints)
+
+        assert sorted(t.population for t in templates) == [4, 6]
+
+    def test_fingerprint_tolerates_content_changes(self):
+        """Same structure with different text produces the same fingerprint."""
+        sampler = TemplateSampler()
+
+        assert sampler.compute_dom_fingerprint(ARTICLE_HTML) == sampler.compute_dom_fingerprint(
+            ARTICLE_HTML.replace(">a<", ">different words<")
+        )
+
+
+class TestSampling:
+    """Test sample sizing and extrapolation."""
+
+    def test_sample_size_uses_finite_population_correction(self):
+        """Small templates are sampled almost fully, large ones plateau."""
+        sampler = TemplateSampler(confidence=0.95, margin_of_error=0.1)
+
+        assert sampler.sample_size(1) == 1
+        assert sampler.sample_size(10) == 10
+        assert sampler.sample_size(200000) == 96
+        assert sampler.sample_size(1000) < sampler.sample_size(200000)
+
+    def test_large_site_needs_few_hundred_samples(self):
+        """A 200k URL site with a handful of templates needs a few hundred tests."""
+        urls = [f"https://example.com/products/{i}" for i in range(150000)]
+        urls += [f"https://example.com/blog/a-post-about-{i}" for i in range(50000)]
+        sampler = TemplateSampler(seed=1)
+
+        samples = sampler.select_samples(sampler.cluster_urls(urls))
+
+        assert sum(len(s) for s in samples.values()) < 100
+
+    def test_max_total_samples_scales_down(self):
+        """A global cap is honoured while keeping every template represented."""
+        sampler = TemplateSampler(seed=1)
+        templates = sampler.cluster_urls(make_site_urls())
+
+        samples = sampler.select_samples(templates, max_total_samples=40)
+
+        assert sum(len(s) for s in samples.values()) <= 40 + len(templates)
+        assert all(len(s) >= 1 for s in samples.values())
+
+    def test_pass_rate_interval(self):
+        """Pass-rate estimates carry an interval around the sample rate."""
+        sampler = TemplateSampler(confidence=0.95)
+        template = URLTemplate("t", "/p/{num}", None, [f"u{i}" for i in range(1000)])
+        results = {f"u{i}": i % 4 != 0 for i in range(40)}
+
+        estimate = sampler.estimate_pass_rate(template, results)
+
+        assert estimate.sampled == 40
+        assert estimate.pass_rate == pytest.approx(0.75)
+        assert estimate.ci_low < 0.75 < estimate.ci_high
+        assert estimate.estimated_passing_pages == 750
+
+    def test_fully_sampled_template_has_no_uncertainty(self):
+        """Testing every page yields an exact pass rate."""
+        sampler = TemplateSampler()
+        template = URLTemplate("t", "/about", None, ["a", "b"])
+
+        estimate = sampler.estimate_pass_rate(template, {"a": True, "b": False})
+
+        assert estimate.ci_low == pytest.approx(0.5)
+        assert estimate.ci_high == pytest.approx(0.5)
+
+    def test_site_estimate_is_population_weighted(self):
+        """Site pass rate weights templates by their size."""
+        sampler = TemplateSampler()
+        big = URLTemplate("big", "/p/{num}", None, [f"p{i}" for i in range(900)])
+        small = URLTemplate("small", "/about", None, [f"a{i}" for i in range(100)])
+        results = {**{f"p{i}": True for i in range(30)}, **{f"a{i}": False for i in range(30)}}
+
+        site = sampler.estimate_site_pass_rate([
+            sampler.estimate_pass_rate(big, results),
+            sampler.estimate_pass_rate(small, results)
+        ])
+
+        assert site["pass_rate"] == pytest.approx(0.9)
+        assert site["ci_low"] < 0.9 < site["ci_high"]
+
+
+class TestSampledBudgetAudit:
+    """Test PerformanceBudgetManager.run_sampled_audit."""
+
+    @pytest.mark.asyncio
+    async def test_sampled_audit_extrapolates_per_template(self):
+        """Only sampled URLs are tested and pass rates are extrapolated."""
+        tested = []
+
+        async def fake_fetch(url, device_type, strategy):
+            tested.append(url)
+            # Product pages ship too much JavaScript
+            return PerformanceTestResult(
+                url=url, device_type=device_type, timestamp=datetime.now(timezone.utc), test_id="t",
+                lcp_ms=1500, inp_ms=100, cls=0.01, js_size_kb=500 if "/products/" in url else 100
+            )
+
+        manager = PerformanceBudgetManager(
+            Settings(pagespeed_api_key="test"),
+            PSISchedulerConfig(max_qps=1000.0, max_concurrency=32)
+        )
+        manager.session = object()
+        manager.scheduler.fetch = fake_fetch
+        project = SimpleNamespace(domain="example.com", base_url="https://example.com")
+
+        results = await manager.run_sampled_audit(
+            project, PerformanceBudgetsConfig(), make_site_urls(),
+            device_types=["mobile"], sampler=TemplateSampler(seed=3)
+        )
+
+        sampling = results["sampling"]
+        templates = {t["path_pattern"]: t for t in sampling["budget_pass_rates"]["mobile"]["templates"]}
+        assert len(tested) == sampling["sampled_urls"] < 200
+        assert templates["/products/{num}"]["pass_rate"] == 0.0
+        assert templates["/blog/{slug}"]["pass_rate"] == 1.0
+        assert sampling["budget_pass_rates"]["mobile"]["site"]["pass_rate"] < 0.3
@@ -5,6 +5,7 @@ import numpy as np
 from datetime import datetime, timezone, timedelta
 
 from src.seo_bot.utils.metrics import (
+    ColumnarMetricStore,
     MetricsAggregator,
     PerformanceCalculator,
     MetricPoint,
@@ -234,6 +235,53 @@ class TestMetricsAggregator:
         assert stats["count"] == 0
 
 
+class TestColumnarMetricStore:
+    """Test columnar storage and vectorized aggregations."""
+    
+    def test_growth_and_out_of_order_appends(self):
+        """Columns grow past capacity and are sorted lazily by time."""
+        store = ColumnarMetricStore(initial_capacity=2)
+        base_time = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        for i in reversed(range(10)):
+            store.append(base_time + timedelta(minutes=i), float(i), {"device": "mobile"})
+        
+        store.ensure_sorted()
+        
+        assert len(store) == 10
+        assert list(store.values) == [float(i) for i in range(10)]
+        assert store.point(0).timestamp == base_time
+        assert store.point(0).dimensions == {"device": "mobile"}
+    
+    def test_time_windows_match_manual_grouping(self):
+        """Window aggregates equal per-window reductions computed by hand."""
+        aggregator = MetricsAggregator()
+        base_time = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        values = np.arange(1, 13, dtype=float)
+        for i, value in enumerate(values):
+            aggregator.add_data_point(base_time + timedelta(minutes=20 * i), value)
+        
+        medians = aggregator.aggregate_by_time(timedelta(hours=1), AggregationMethod.MEDIAN)
+        maxima = aggregator.aggregate_by_time(timedelta(hours=1), AggregationMethod.MAX)
+        
+        assert [t for t, _ in medians] == [base_time + timedelta(hours=h) for h in range(4)]
+        assert [v for _, v in medians] == [float(np.median(values[i:i + 3])) for i in range(0, 12, 3)]
+        assert [v for _, v in maxima] == [3.0, 6.0, 9.0, 12.0]
+    
+    def test_bulk_arrays_and_grouped_aggregation(self):
+        """Array ingestion encodes dimensions and groups with bincount."""
+        aggregator = MetricsAggregator()
+        timestamps = np.arange(6, dtype=np.int64) * 1_000_000
+        values = np.array([1.0, 2.0, 3.0, 4.0, 5.0, 6.0])
+        aggregator.add_arrays(timestamps, values, {"device": np.array(["m", "d", "m", "d", "m", "d"])})
+        aggregator.add_data_point(datetime(1970, 1, 1, 0, 1, tzinfo=timezone.utc), 10.0)
+        
+        sums = aggregator.aggregate_by_dimension("device", AggregationMethod.SUM)
+        p95 = aggregator.aggregate_by_dimension("device", AggregationMethod.P95)
+        
+        assert sums == {"m": 9.0, "d": 12.0, "unknown": 10.0}
+        assert p95["d"] == pytest.approx(np.percentile([2.0, 4.0, 6.0], 95))
+
+
 class TestPerformanceCalculator:
     """Test PerformanceCalculator functionality."""
     